@@ -7,7 +7,7 @@ Provides conversational AI endpoint for Telegram and other clients.
 import json
 import logging
 from typing import Optional, AsyncGenerator
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
@@ -57,40 +57,34 @@ async def chat(request: ChatRequest):
 
 
 @router.post("/chat/stream")
-async def chat_stream(request: ChatRequest):
+async def chat_stream(request: ChatRequest, http_request: Request):
     """
     Streaming chat endpoint using Server-Sent Events (SSE).
 
-    Streams Claude's response word-by-word as it's generated.
+    Streams Claude's response token-by-token as it's generated.
     This provides a better UX for web clients (like LibreChat).
+    If the client disconnects, generation and pending tool calls stop.
 
     Stream format (newline-delimited JSON):
     - {"type": "content", "text": "word"}  - Text chunks
     - {"type": "tool_use", "name": "get_meetings", "input": {...}}  - Tool calls
     - {"type": "tool_result", "name": "get_meetings", "output": "..."}  - Tool results
-    - {"type": "done", "tools_used": [...]}  - End of stream
+    - {"type": "warning", "message": "..."}  - Response truncated
+    - {"type": "done", "tools_used": [...], "usage": {...}}  - End of stream
     - {"type": "error", "message": "..."}  - Error occurred
     """
     async def generate() -> AsyncGenerator[str, None]:
         try:
             service = get_chat_service()
 
-            # For now, use the non-streaming endpoint and return the full response
-            # TODO: Implement true streaming with anthropic.messages.stream()
-            response = await service.process_message(request)
-
-            # Stream the response character by character for better UX
-            words = response.response.split(' ')
-            for i, word in enumerate(words):
-                chunk = word + (' ' if i < len(words) - 1 else '')
-                yield f"data: {json.dumps({'type': 'content', 'text': chunk})}\n\n"
-
-            # Send tools used
-            if response.tools_used:
-                yield f"data: {json.dumps({'type': 'tool_summary', 'tools': response.tools_used})}\n\n"
-
-            # Send done event
-            yield f"data: {json.dumps({'type': 'done'})}\n\n"
+            async for chunk in service.process_message_stream(
+                request, is_disconnected=http_request.is_disconnected
+            ):
+                if "tool" in chunk:
+                    chunk = {**chunk, "name": chunk["tool"]}
+                yield f"data: {json.dumps(chunk, default=str)}\n\n"
+                if chunk["type"] == "error":
+                    break
 
         except Exception as e:
             logger.exception("Streaming chat error")
@@ -214,7 +208,7 @@ class OpenAIChatResponse(BaseModel):
     usage: dict
 
 @router.post("/chat/completions")
-async def openai_chat_completions(request: OpenAIChatRequest):
+async def openai_chat_completions(request: OpenAIChatRequest, http_request: Request):
     """
     OpenAI-compatible chat completions endpoint for LibreChat integration.
 
@@ -273,7 +267,9 @@ async def openai_chat_completions(request: OpenAIChatRequest):
                     created_time = int(time.time())
 
                     # Stream from Anthropic via our streaming service
-                    async for chunk in service.process_message_stream(jarvis_request):
+                    async for chunk in service.process_message_stream(
+                        jarvis_request, is_disconnected=http_request.is_disconnected
+                    ):
                         if chunk["type"] == "content":
                             # Text content from Claude - track for storage
                             full_response_text.append(chunk["text"])
@@ -538,6 +534,11 @@ async def get_available_models():
 async def chat_health():
     """Check if chat service is healthy."""
     from app.features.letta import get_letta_service
+    from app.features.chat.context_snapshot import get_context_snapshot
+    from app.features.chat.tools import get_prefetch_stats
+    from app.services.cache import get_cache_stats
+    from app.features.database import get_write_queue_stats
+    from app.features.memory import get_memory_extraction_queue
 
     letta = get_letta_service()
     letta_status = await letta.health_check()
@@ -545,10 +546,35 @@ async def chat_health():
     return {
         "status": "ok",
         "model": "claude-haiku-4-5-20251001",
-        "letta": letta_status
+        "letta": letta_status,
+        "context_snapshot": get_context_snapshot().get_stats(),
+        "caches": get_cache_stats(),
+        "tool_prefetch": get_prefetch_stats(),
+        "write_queues": get_write_queue_stats(),
+        "memory_extraction": get_memory_extraction_queue().get_stats()
     }
 
 
+@router.post("/chat/cache/purge")
+async def purge_chat_cache():
+    """
+    Delete expired entries from the shared cache tier (cache_entries table).
+
+    Only needed with CACHE_SHARED_BACKEND=supabase; Redis expires keys itself.
+
+    SCHEDULING RECOMMENDATION:
+    - Call hourly via Cloud Scheduler
+    """
+    from app.services.cache import purge_expired_shared_entries
+
+    try:
+        purged = await purge_expired_shared_entries()
+        return {"status": "success", "purged": purged}
+    except Exception as e:
+        logger.exception("Cache purge error")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # =============================================================================
 # LETTA BATCH PROCESSING ENDPOINTS
 # =============================================================================
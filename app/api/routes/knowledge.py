@@ -61,6 +61,7 @@ class ContextResponse(BaseModel):
     query: str
     context: str
     token_estimate: int
+    dropped: List[Dict[str, Any]] = []
 
 
 class IndexStats(BaseModel):
@@ -75,6 +76,7 @@ class HealthStatus(BaseModel):
     supabase_connected: bool
     openai_configured: bool
     total_chunks: int
+    query_embedding_cache: Optional[Dict[str, Any]] = None
 
 
 class EmbedRequest(BaseModel):
@@ -159,20 +161,18 @@ async def get_rag_context(request: ContextRequest):
     try:
         knowledge = get_knowledge_service()
         
-        context = await knowledge.get_context_for_query(
+        packed = await knowledge.get_packed_context_for_query(
             query=request.query,
             source_types=request.source_types,
             contact_id=request.contact_id,
             max_tokens=request.max_tokens
         )
         
-        # Estimate tokens (rough: 4 chars per token)
-        token_estimate = len(context) // 4
-        
         return ContextResponse(
             query=request.query,
-            context=context,
-            token_estimate=token_estimate
+            context=packed.text,
+            token_estimate=packed.tokens,
+            dropped=packed.dropped
         )
     except Exception as e:
         logger.error(f"Context retrieval failed: {e}")
@@ -294,7 +294,8 @@ async def knowledge_health_check():
             status=health.get("status", "unknown"),
             supabase_connected=health.get("supabase_connected", False),
             openai_configured=health.get("openai_configured", False),
-            total_chunks=health.get("total_chunks", 0)
+            total_chunks=health.get("total_chunks", 0),
+            query_embedding_cache=health.get("query_embedding_cache")
         )
     except Exception as e:
         logger.error(f"Health check failed: {e}")
@@ -341,7 +342,8 @@ async def generate_embedding(request: EmbedRequest):
 @router.post("/reindex")
 async def trigger_reindex(
     source_types: Optional[List[str]] = None,
-    limit: Optional[int] = None
+    limit: Optional[int] = None,
+    concurrency: Optional[int] = None
 ):
     """
     Trigger a reindex of the knowledge base.
@@ -349,6 +351,7 @@ async def trigger_reindex(
     **Warning**: This can be slow for large datasets.
     Use source_types filter to reindex specific content.
     Use limit for testing.
+    Use concurrency to control parallel indexing workers.
 
     Example: POST /knowledge/reindex with body:
     {"source_types": ["meeting", "journal"], "limit": 100}
@@ -358,7 +361,8 @@ async def trigger_reindex(
 
         results = await knowledge.reindex_all(
             content_types=source_types,
-            limit=limit
+            limit=limit,
+            concurrency=concurrency
         )
 
         return {
@@ -370,6 +374,25 @@ async def trigger_reindex(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/compact")
+async def compact_knowledge(older_than_days: int = Query(7, ge=1, le=365)):
+    """
+    Hard-delete soft-deleted knowledge chunks older than older_than_days.
+
+    Re-indexing retires stale chunks with a soft delete and failed runs can
+    leave staged chunks behind; this reclaims their storage.
+
+    SCHEDULING RECOMMENDATION:
+    - Call daily via Cloud Scheduler
+    - Call again while the response has "more": true
+    """
+    knowledge = get_knowledge_service()
+    result = await knowledge.compact(older_than_days=older_than_days)
+    if result.get("status") == "error":
+        raise HTTPException(status_code=500, detail=result.get("error"))
+    return result
+
+
 class IncrementalIndexRequest(BaseModel):
     """Request for incremental indexing."""
     source_types: Optional[List[str]] = Field(
@@ -377,6 +400,10 @@ class IncrementalIndexRequest(BaseModel):
         description="Types to index. Default: meeting, journal, reflection, email, contact"
     )
     batch_size: int = Field(50, ge=1, le=200, description="Records per type per run")
+    concurrency: Optional[int] = Field(
+        None, ge=1, le=32,
+        description="Parallel indexing workers (default: KNOWLEDGE_INDEX_CONCURRENCY)"
+    )
 
 
 @router.post("/index/incremental")
@@ -395,6 +422,7 @@ async def incremental_index(request: Optional[IncrementalIndexRequest] = None):
         from app.features.knowledge.indexer import (
             INDEX_FUNCTION_MAP, TABLE_NAME_MAP,
         )
+        from app.features.knowledge.scheduler import IndexingScheduler
         knowledge = get_knowledge_service()
         db = knowledge.db
 
@@ -404,13 +432,15 @@ async def incremental_index(request: Optional[IncrementalIndexRequest] = None):
             "task", "book", "highlight", "application",
         ]
         batch_size = request.batch_size if request else 50
+        concurrency = request.concurrency if request else None
 
         results: Dict[str, Any] = {}
+        skipped: Dict[str, int] = {}
+        scheduler = IndexingScheduler(db, concurrency=concurrency)
 
         for source_type in source_types:
             table_name = TABLE_NAME_MAP.get(source_type)
-            index_func = INDEX_FUNCTION_MAP.get(source_type)
-            if not table_name or not index_func:
+            if not table_name or source_type not in INDEX_FUNCTION_MAP:
                 continue
 
             try:
@@ -434,35 +464,31 @@ async def incremental_index(request: Optional[IncrementalIndexRequest] = None):
                 existing_ids = {r["source_id"] for r in (existing_result.data or [])}
                 new_ids = [id for id in all_ids if id not in existing_ids][:batch_size]
 
-                indexed = 0
-                errors = 0
-                for record_id in new_ids:
-                    try:
-                        count = await index_func(record_id, db)
-                        indexed += count
-                    except Exception as e:
-                        logger.warning(f"Failed to index {source_type} {record_id}: {e}")
-                        errors += 1
-
-                results[source_type] = {
-                    "indexed": indexed,
-                    "new_records": len(new_ids),
-                    "skipped": len(existing_ids),
-                    "errors": errors,
-                }
-                if new_ids:
-                    logger.info(
-                        f"Incremental index {source_type}: {indexed} chunks from {len(new_ids)} new records"
-                    )
+                skipped[source_type] = len(existing_ids)
+                scheduler.enqueue(source_type, new_ids)
             except Exception as e:
                 logger.error(f"Incremental index failed for {source_type}: {e}")
                 results[source_type] = {"error": str(e)}
 
+        # Index all new records across types in parallel (bounded by concurrency)
+        for source_type, counts in (await scheduler.run()).items():
+            results[source_type] = {
+                "indexed": counts["indexed"],
+                "new_records": counts["records"],
+                "skipped": skipped.get(source_type, 0),
+                "errors": counts["errors"],
+            }
+            if counts["records"]:
+                logger.info(
+                    f"Incremental index {source_type}: {counts['indexed']} chunks from {counts['records']} new records"
+                )
+
         total_indexed = sum(r.get("indexed", 0) for r in results.values() if isinstance(r, dict))
         return {
             "status": "completed",
             "total_indexed": total_indexed,
             "results": results,
+            "progress": scheduler.progress(),
         }
     except Exception as e:
         logger.error(f"Incremental index failed: {e}")
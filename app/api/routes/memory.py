@@ -7,17 +7,17 @@ Provides endpoints for:
 - Correcting/updating existing memories
 - Deleting memories
 - Searching memories
-- Bulk seeding from existing data
+- Bulk seeding from existing data (resumable background jobs)
 """
 
 import logging
 from typing import List, Optional
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel, Field
 
-from app.api.dependencies import get_memory, get_database
+from app.api.dependencies import get_memory
 from app.features.memory.service import MemoryType
 
 router = APIRouter(tags=["Memory"])
@@ -445,11 +445,25 @@ async def search_memories(request: SearchMemoryRequest):
 # MEMORY SEEDING ENDPOINTS
 # ============================================================================
 
+async def _start_seeding_job(source: str, params: dict) -> SeedingStatusResponse:
+    """Create a resumable seeding job (app/features/memory/seeding.py) and report it."""
+    from app.features.memory.seeding import get_seeding_runner
+    
+    job = await get_seeding_runner().create_job(source, params)
+    return SeedingStatusResponse(
+        status="started",
+        memories_added=0,  # Progress: GET /memory/seed/jobs/{job_id}
+        source=source,
+        details={"job_id": job["id"], **job["params"]}
+    )
+
+
+def _days_ago(days: int) -> str:
+    return (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+
+
 @router.post("/memory/seed/contacts", response_model=SeedingStatusResponse)
-async def seed_from_contacts(
-    background_tasks: BackgroundTasks,
-    limit: int = 50
-):
+async def seed_from_contacts(limit: int = 50):
     """
     Seed memories from existing contacts.
     
@@ -459,72 +473,10 @@ async def seed_from_contacts(
     - Meaningful notes (filters out system IDs and garbage)
     
     Uses Mem0's automatic deduplication to prevent duplicates.
-    Runs in background to avoid timeout.
+    Runs as a resumable background job; poll /memory/seed/jobs/{job_id}.
     """
-    memory_service = get_memory()
-    db = get_database()
-    
     try:
-        # Fetch contacts
-        result = db.client.table("contacts").select(
-            "first_name, last_name, company, job_title, notes, linkedin_url"
-        ).order(
-            "updated_at", desc=True
-        ).limit(limit).execute()
-        
-        contacts = result.data or []
-        
-        # Seed in background
-        async def _seed():
-            count = 0
-            for contact in contacts:
-                name = f"{contact.get('first_name', '')} {contact.get('last_name', '')}".strip()
-                
-                # Skip contacts without meaningful names
-                if not name or len(name) < 2:
-                    continue
-                
-                # Build comprehensive relationship info
-                job_title = contact.get("job_title", "")
-                company = contact.get("company", "")
-                
-                if job_title and company:
-                    info = f"{name} is {job_title} at {company}"
-                    await memory_service.remember_relationship(info, name)
-                    count += 1
-                elif job_title:
-                    info = f"{name} is {job_title}"
-                    await memory_service.remember_relationship(info, name)
-                    count += 1
-                elif company:
-                    info = f"{name} works at {company}"
-                    await memory_service.remember_relationship(info, name)
-                    count += 1
-                
-                # Only add notes if they're meaningful text
-                notes = contact.get("notes", "")
-                if notes and len(notes) > 10:
-                    # Filter out system IDs and numeric-only notes
-                    if not notes.isdigit() and not notes.strip().startswith("1") or len(notes) > 20:
-                        # Also filter out notes that look like "Created from Beeper"
-                        if "created from" not in notes.lower():
-                            await memory_service.remember_relationship(
-                                f"About {name}: {notes[:300]}",
-                                name
-                            )
-                            count += 1
-            
-            logger.info(f"Seeded {count} memories from {len(contacts)} contacts")
-        
-        background_tasks.add_task(_seed)
-        
-        return SeedingStatusResponse(
-            status="started",
-            memories_added=0,  # Will be counted in background
-            source="contacts",
-            details={"contacts_found": len(contacts)}
-        )
-        
+        return await _start_seeding_job("contacts", {"contacts_limit": limit})
     except Exception as e:
         logger.exception("Failed to seed from contacts")
         raise HTTPException(status_code=500, detail=str(e))
@@ -532,7 +484,6 @@ async def seed_from_contacts(
 
 @router.post("/memory/seed/meetings", response_model=SeedingStatusResponse)
 async def seed_from_meetings(
-    background_tasks: BackgroundTasks,
     limit: int = 30,
     days_back: int = 90
 ):
@@ -548,54 +499,12 @@ async def seed_from_meetings(
         limit: Maximum meetings to process
         days_back: How far back to look (default 90 days)
     """
-    memory_service = get_memory()
-    db = get_database()
-    
     try:
-        from datetime import timedelta
-        cutoff = (datetime.now(timezone.utc) - timedelta(days=days_back)).isoformat()
-        
-        # Fetch recent meetings with summaries
-        result = db.client.table("meetings").select(
-            "title, summary, contact_name, date, topics_discussed"
-        ).gte(
-            "date", cutoff
-        ).not_.is_(
-            "summary", "null"
-        ).order(
-            "date", desc=True
-        ).limit(limit).execute()
-        
-        meetings = result.data or []
-        
-        async def _seed():
-            count = 0
-            for meeting in meetings:
-                contact = meeting.get("contact_name", "")
-                summary = meeting.get("summary", "")
-                title = meeting.get("title", "")
-                date = meeting.get("date", "")
-                
-                if summary and contact:
-                    await memory_service.remember_interaction(
-                        f"Meeting '{title}': {summary[:200]}",
-                        contact_name=contact,
-                        interaction_date=date,
-                        source="meeting_seed"
-                    )
-                    count += 1
-            
-            logger.info(f"Seeded {count} memories from {len(meetings)} meetings")
-        
-        background_tasks.add_task(_seed)
-        
-        return SeedingStatusResponse(
-            status="started",
-            memories_added=0,
-            source="meetings",
-            details={"meetings_found": len(meetings), "days_back": days_back}
-        )
-        
+        return await _start_seeding_job("meetings", {
+            "meetings_limit": limit,
+            "since": _days_ago(days_back),
+            "days_back": days_back,
+        })
     except Exception as e:
         logger.exception("Failed to seed from meetings")
         raise HTTPException(status_code=500, detail=str(e))
@@ -603,7 +512,6 @@ async def seed_from_meetings(
 
 @router.post("/memory/seed/transcripts", response_model=SeedingStatusResponse)
 async def seed_from_transcripts(
-    background_tasks: BackgroundTasks,
     limit: int = 20,
     days_back: int = 60
 ):
@@ -617,69 +525,19 @@ async def seed_from_transcripts(
     - Relationship information
     - Key decisions and plans
     
-    This is CPU/token intensive, so limit is lower by default.
+    Short transcripts are analyzed several per Claude call, with a few
+    calls in flight at once.
     
     Args:
         limit: Maximum transcripts to process (default 20)
         days_back: How far back to look (default 60 days)
     """
-    memory_service = get_memory()
-    db = get_database()
-    
     try:
-        from datetime import timedelta
-        from app.services.llm import ClaudeMultiAnalyzer
-        
-        cutoff = (datetime.now(timezone.utc) - timedelta(days=days_back)).isoformat()
-        
-        # Fetch transcripts with actual content
-        result = db.client.table("transcripts").select(
-            "id, full_text, source_file, created_at"
-        ).gte(
-            "created_at", cutoff
-        ).not_.is_(
-            "full_text", "null"
-        ).order(
-            "created_at", desc=True
-        ).limit(limit).execute()
-        
-        transcripts = result.data or []
-        
-        async def _seed():
-            llm = ClaudeMultiAnalyzer()
-            total_count = 0
-            
-            for transcript in transcripts:
-                text = transcript.get("full_text", "")
-                source = transcript.get("source_file", "unknown")
-                
-                if not text or len(text) < 100:
-                    continue
-                
-                try:
-                    # Use the memory service's built-in method
-                    count = await memory_service.seed_from_raw_transcript(
-                        transcript_text=text,
-                        source_file=source,
-                        llm_client=llm
-                    )
-                    total_count += count
-                            
-                except Exception as e:
-                    logger.warning(f"Failed to extract from transcript {source}: {e}")
-                    continue
-            
-            logger.info(f"Seeded {total_count} memories from {len(transcripts)} transcripts")
-        
-        background_tasks.add_task(_seed)
-        
-        return SeedingStatusResponse(
-            status="started",
-            memories_added=0,
-            source="transcripts",
-            details={"transcripts_found": len(transcripts), "days_back": days_back}
-        )
-        
+        return await _start_seeding_job("transcripts", {
+            "transcripts_limit": limit,
+            "since": _days_ago(days_back),
+            "days_back": days_back,
+        })
     except Exception as e:
         logger.exception("Failed to seed from transcripts")
         raise HTTPException(status_code=500, detail=str(e))
@@ -748,7 +606,6 @@ TRANSCRIPT:
 
 @router.post("/memory/seed/all", response_model=SeedingStatusResponse)
 async def seed_all_memories(
-    background_tasks: BackgroundTasks,
     contacts_limit: int = 50,
     meetings_limit: int = 30,
     transcripts_limit: int = 20,
@@ -758,7 +615,7 @@ async def seed_all_memories(
     Comprehensive memory seeding from all sources.
     
     This is the recommended endpoint for initial memory setup.
-    Seeds from:
+    Seeds from (concurrently):
     1. Contacts (relationships, companies, notes)
     2. Meetings (interaction history with summaries)
     3. Transcripts (rich extraction using Claude)
@@ -769,117 +626,17 @@ async def seed_all_memories(
         transcripts_limit: Max transcripts to process (default 20)
         days_back: How far back to look for meetings/transcripts
     
-    Note: This is a background job. Check /memory/stats for results.
+    Note: This is a resumable background job. Check /memory/seed/jobs/{job_id}
+    for progress; it survives restarts.
     """
-    memory_service = get_memory()
-    db = get_database()
-    
     try:
-        from datetime import timedelta
-        from app.services.llm import ClaudeMultiAnalyzer
-        
-        cutoff = (datetime.now(timezone.utc) - timedelta(days=days_back)).isoformat()
-        
-        # Fetch all data upfront
-        contacts_result = db.client.table("contacts").select(
-            "first_name, last_name, company, job_title, notes, linkedin_url"
-        ).order("updated_at", desc=True).limit(contacts_limit).execute()
-        
-        meetings_result = db.client.table("meetings").select(
-            "title, summary, contact_name, date, topics_discussed"
-        ).gte("date", cutoff).not_.is_("summary", "null").order(
-            "date", desc=True
-        ).limit(meetings_limit).execute()
-        
-        transcripts_result = db.client.table("transcripts").select(
-            "id, full_text, source_file, created_at"
-        ).gte("created_at", cutoff).not_.is_("full_text", "null").order(
-            "created_at", desc=True
-        ).limit(transcripts_limit).execute()
-        
-        contacts = contacts_result.data or []
-        meetings = meetings_result.data or []
-        transcripts = transcripts_result.data or []
-        
-        async def _seed_all():
-            total = 0
-            
-            # 1. Seed from contacts
-            for contact in contacts:
-                name = f"{contact.get('first_name', '')} {contact.get('last_name', '')}".strip()
-                if not name:
-                    continue
-                
-                parts = [name]
-                if contact.get("job_title"):
-                    parts.append(f"is {contact['job_title']}")
-                if contact.get("company"):
-                    parts.append(f"at {contact['company']}")
-                
-                if len(parts) > 1:
-                    await memory_service.remember_relationship(" ".join(parts), name)
-                    total += 1
-                
-                if contact.get("notes"):
-                    await memory_service.remember_relationship(
-                        f"About {name}: {contact['notes'][:300]}", name
-                    )
-                    total += 1
-            
-            logger.info(f"Seeded {total} memories from contacts")
-            
-            # 2. Seed from meetings
-            meetings_count = 0
-            for meeting in meetings:
-                contact = meeting.get("contact_name", "")
-                summary = meeting.get("summary", "")
-                title = meeting.get("title", "")
-                date = meeting.get("date", "")
-                
-                if summary and contact:
-                    await memory_service.remember_interaction(
-                        f"Meeting '{title}': {summary[:150]}",
-                        contact_name=contact,
-                        interaction_date=date,
-                        source="initial_seed"
-                    )
-                    meetings_count += 1
-            
-            total += meetings_count
-            logger.info(f"Seeded {meetings_count} memories from meetings")
-            
-            # 3. Seed from transcripts (most intensive)
-            llm = ClaudeMultiAnalyzer()
-            transcripts_count = 0
-            
-            for transcript in transcripts:
-                text = transcript.get("full_text", "")
-                source = transcript.get("source_file", "unknown")
-                
-                if text and len(text) >= 100:
-                    count = await memory_service.seed_from_raw_transcript(
-                        text, source, llm
-                    )
-                    transcripts_count += count
-            
-            total += transcripts_count
-            logger.info(f"Seeded {transcripts_count} memories from transcripts")
-            logger.info(f"TOTAL: Seeded {total} memories from all sources")
-        
-        background_tasks.add_task(_seed_all)
-        
-        return SeedingStatusResponse(
-            status="started",
-            memories_added=0,
-            source="all",
-            details={
-                "contacts_found": len(contacts),
-                "meetings_found": len(meetings),
-                "transcripts_found": len(transcripts),
-                "days_back": days_back
-            }
-        )
-        
+        return await _start_seeding_job("all", {
+            "contacts_limit": contacts_limit,
+            "meetings_limit": meetings_limit,
+            "transcripts_limit": transcripts_limit,
+            "since": _days_ago(days_back),
+            "days_back": days_back,
+        })
     except Exception as e:
         logger.exception("Failed to start comprehensive seeding")
         raise HTTPException(status_code=500, detail=str(e))
@@ -887,7 +644,6 @@ async def seed_all_memories(
 
 @router.post("/memory/seed/beeper", response_model=SeedingStatusResponse)
 async def seed_from_beeper_messages(
-    background_tasks: BackgroundTasks,
     hours: int = 24,
     limit: int = 100,
 ):
@@ -904,85 +660,70 @@ async def seed_from_beeper_messages(
         hours: How many hours back to look (default 24)
         limit: Max messages to process (default 100)
     """
-    memory_service = get_memory()
-    db = get_database()
-    
     try:
-        from datetime import timedelta
-        
-        since = datetime.now(timezone.utc) - timedelta(hours=hours)
-        
-        # Fetch recent Beeper messages
-        result = db.client.table("beeper_messages").select(
-            "id, content, is_outgoing, timestamp, beeper_chat_id"
-        ).gte(
-            "timestamp", since.isoformat()
-        ).order(
-            "timestamp", desc=True
-        ).limit(limit).execute()
-        
-        messages = result.data or []
-        
-        if not messages:
-            return SeedingStatusResponse(
-                status="no_messages",
-                memories_added=0,
-                source="beeper",
-                details={"hours_back": hours, "messages_found": 0}
-            )
-        
-        # Group messages by chat for context
-        chats = {}
-        for msg in messages:
-            chat_id = msg.get("beeper_chat_id", "unknown")
-            if chat_id not in chats:
-                chats[chat_id] = []
-            chats[chat_id].append(msg)
-        
-        # Process in background
-        async def _extract():
-            count = 0
-            for chat_id, chat_msgs in chats.items():
-                # Build conversation context
-                conversation = []
-                for m in sorted(chat_msgs, key=lambda x: x.get("timestamp", "")):
-                    speaker = "Aaron" if m.get("is_outgoing") else "Contact"
-                    content = m.get("content", "")
-                    if content:
-                        conversation.append(f"{speaker}: {content}")
-                
-                if not conversation:
-                    continue
-                
-                # Extract memories from this conversation
-                text = "\n".join(conversation)
-                extracted = await memory_service.extract_from_text(
-                    text=text,
-                    source="beeper",
-                    source_id=chat_id
-                )
-                count += extracted
-            
-            logger.info(f"Extracted {count} memories from {len(chats)} Beeper conversations")
-        
-        background_tasks.add_task(_extract)
-        
-        return SeedingStatusResponse(
-            status="started",
-            memories_added=0,  # Background count
-            source="beeper",
-            details={
-                "hours_back": hours,
-                "messages_found": len(messages),
-                "chats_found": len(chats)
-            }
-        )
-        
+        return await _start_seeding_job("beeper", {
+            "beeper_limit": limit,
+            "beeper_since": (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat(),
+            "hours_back": hours,
+        })
     except Exception as e:
         logger.exception("Failed to seed from Beeper messages")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/memory/seed/jobs")
+async def list_seeding_jobs(limit: int = 20):
+    """Recent seeding jobs, newest first."""
+    from app.features.memory.seeding import get_seeding_runner
+    
+    try:
+        jobs = await get_seeding_runner().list_jobs(limit=limit)
+        return {"status": "success", "count": len(jobs), "jobs": jobs}
+    except Exception as e:
+        logger.exception("Failed to list seeding jobs")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/memory/seed/jobs/{job_id}")
+async def get_seeding_job(job_id: str):
+    """
+    Status of a seeding job.
+    
+    Per stage: status, records processed, memories added, failed records
+    and the checkpoint cursor the job resumes from.
+    """
+    from app.features.memory.seeding import get_seeding_runner
+    
+    try:
+        job = await get_seeding_runner().get_job(job_id)
+    except Exception as e:
+        logger.exception("Failed to get seeding job")
+        raise HTTPException(status_code=500, detail=str(e))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Seeding job not found")
+    return job
+
+
+@router.post("/memory/seed/jobs/{job_id}/cancel", response_model=MemoryResponse)
+async def cancel_seeding_job(job_id: str):
+    """Stop a running seeding job (it can be resumed later)."""
+    from app.features.memory.seeding import get_seeding_runner
+    
+    if not await get_seeding_runner().cancel_job(job_id):
+        raise HTTPException(status_code=409, detail="Job is not running")
+    return MemoryResponse(status="cancelled", message=f"Seeding job {job_id} cancelled")
+
+
+@router.post("/memory/seed/jobs/{job_id}/resume", response_model=MemoryResponse)
+async def resume_seeding_job(job_id: str):
+    """Resume a failed or cancelled seeding job from its last checkpoint."""
+    from app.features.memory.seeding import get_seeding_runner
+    
+    if await get_seeding_runner().resume_job(job_id) is None:
+        raise HTTPException(status_code=409, detail="Job not found or not failed/cancelled")
+    return MemoryResponse(status="started", message=f"Seeding job {job_id} resumed")
+
+
 # ============================================================================
 # ARCHIVE EXTERNAL CONVERSATIONS (Telegram /archive command)
 # ============================================================================
@@ -1128,6 +869,7 @@ async def consolidate_all_memories(
     hours_back: int = 24,
     include_letta: bool = True,
     include_mem0: bool = True,
+    use_watermarks: bool = True,
 ):
     """
     Comprehensive memory consolidation from ALL data sources.
@@ -1140,16 +882,20 @@ async def consolidate_all_memories(
     - meetings → Mem0 (meeting context)
     - journals → Mem0 (introspective content)
     
+    Sources run concurrently, and each one continues from its watermark
+    (the last record a previous run extracted), so runs never overlap or
+    leave gaps.
+    
     SCHEDULING RECOMMENDATION:
     - Call 2x daily (morning + evening) for full coverage
-    - Use hours_back=12 for 2x daily, hours_back=24 for 1x daily
     
     Cost: ~$0.01-0.05 per run depending on data volume
     
     Args:
-        hours_back: How far back to look for new data
+        hours_back: Look-back for sources that have no watermark yet
         include_letta: Process chat_messages → Letta archival
         include_mem0: Extract Mem0 memories from all sources
+        use_watermarks: False = reprocess the hours_back window only
     """
     from app.features.memory.consolidation import get_consolidation_service
     
@@ -1159,7 +905,8 @@ async def consolidate_all_memories(
         result = await consolidator.consolidate_all(
             hours_back=hours_back,
             include_letta=include_letta,
-            include_mem0=include_mem0
+            include_mem0=include_mem0,
+            use_watermarks=use_watermarks
         )
         logger.info(f"Memory consolidation complete: {result}")
     
@@ -1170,6 +917,7 @@ async def consolidate_all_memories(
         "hours_back": hours_back,
         "include_letta": include_letta,
         "include_mem0": include_mem0,
+        "use_watermarks": use_watermarks,
         "message": "Consolidation running in background. Check /memory/stats for results."
     }
 
@@ -1212,8 +960,8 @@ async def consolidate_beeper_only(
     consolidator = get_consolidation_service()
     
     async def _run():
-        count = await consolidator._extract_from_beeper(hours_back)
-        logger.info(f"Beeper consolidation complete: {count} memories extracted")
+        result = await consolidator.consolidate_source("beeper_messages", hours_back)
+        logger.info(f"Beeper consolidation complete: {result.get('extracted', 0)} memories extracted")
     
     background_tasks.add_task(_run)
     
@@ -179,6 +179,11 @@ def log_llm_cost(
     if cache_read_tokens > 0:
         event["cache_read_tokens"] = cache_read_tokens
 
+    # input_tokens excludes cached tokens (Anthropic usage semantics)
+    prompt_tokens = input_tokens + cache_creation_tokens + cache_read_tokens
+    if prompt_tokens and (cache_creation_tokens or cache_read_tokens):
+        event["cache_hit_ratio"] = round(cache_read_tokens / prompt_tokens, 4)
+
     if savings_usd > 0:
         event["savings_usd"] = round(savings_usd, 6)
 
@@ -2,6 +2,7 @@
 
 from app.features.chat.service import ChatService, ChatRequest, ChatResponse, get_chat_service
 from app.features.chat.tools import TOOLS, execute_tool
+from app.features.chat.context_snapshot import ContextSnapshotService, get_context_snapshot
 
 __all__ = [
     "ChatService",
@@ -9,5 +10,7 @@ __all__ = [
     "ChatResponse",
     "get_chat_service",
     "TOOLS",
-    "execute_tool"
+    "execute_tool",
+    "ContextSnapshotService",
+    "get_context_snapshot",
 ]
@@ -0,0 +1,285 @@
+"""
+Context snapshot - precomputed system-prompt context blocks for chat.
+
+Every chat turn injects the same few context blocks into the system prompt
+(recent journals, open tasks, recent meetings, learned behavior rules).
+They change rarely, so building them per turn wastes three Supabase
+round-trips and a memory search on the critical path.
+
+The snapshot keeps each block precomputed and versioned:
+- get() returns the current value instantly; a block older than its TTL
+  is refreshed in the background (stale-while-revalidate)
+- Tool writes invalidate the blocks built from the tables they touch
+  (invalidate_for_tool, called by the tool registry). An invalidated block
+  is refreshed right away, and the next get() waits briefly
+  (SNAPSHOT_WAIT_SECONDS) for that refresh so the user sees their own write
+- Only the very first get() of a block waits for a full load
+
+Writes that bypass chat tools (pipelines, other services) are picked up
+within the block's TTL.
+
+Usage:
+    snapshot = get_context_snapshot()
+    snapshot.register("tasks", load_tasks, tables={"tasks"})
+
+    blocks = await snapshot.get_many("journals", "tasks")
+    snapshot.invalidate_for_tool("create_task", {"title": "..."})
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, Optional
+
+logger = logging.getLogger("Jarvis.Chat.ContextSnapshot")
+
+SNAPSHOT_TTL_SECONDS = float(os.getenv("CONTEXT_SNAPSHOT_TTL_SECONDS", "60"))
+# Max wait for an in-flight refresh of an invalidated block before serving the stale value
+SNAPSHOT_WAIT_SECONDS = float(os.getenv("CONTEXT_SNAPSHOT_WAIT_SECONDS", "1.0"))
+# Max wait for the first load of a block
+SNAPSHOT_LOAD_TIMEOUT_SECONDS = float(os.getenv("CONTEXT_SNAPSHOT_LOAD_TIMEOUT_SECONDS", "2.0"))
+
+Loader = Callable[[], Awaitable[str]]
+
+# Tables each write tool changes. Generic database tools name their table
+# in the input (table / table_name); tools that can touch anything
+# invalidate every block.
+ALL_TABLES = "*"
+TOOL_TABLES: Dict[str, FrozenSet[str]] = {
+    "create_task": frozenset({"tasks"}),
+    "update_task": frozenset({"tasks"}),
+    "complete_task": frozenset({"tasks"}),
+    "delete_task": frozenset({"tasks"}),
+    "create_meeting": frozenset({"meetings", "tasks"}),
+    "create_reflection": frozenset({"reflections"}),
+    "remember_fact": frozenset({"memories"}),
+    "remember_behavior": frozenset({"memories"}),
+    "correct_memory": frozenset({"memories"}),
+    "forget_memory": frozenset({"memories"}),
+    "execute_sql_write": frozenset({ALL_TABLES}),
+    "quick_sync": frozenset({ALL_TABLES}),
+}
+_TABLE_INPUT_TOOLS = frozenset({"update_record", "update_data_batch", "insert_data_batch"})
+
+
+class ContextBlock:
+    """One cached context block and its refresh state."""
+
+    __slots__ = (
+        "name", "loader", "tables", "ttl", "value", "version", "loaded_at",
+        "invalidated", "refresh_task", "load_time",
+    )
+
+    def __init__(self, name: str, loader: Loader, tables: FrozenSet[str], ttl: float):
+        self.name = name
+        self.loader = loader
+        self.tables = tables
+        self.ttl = ttl
+        self.value = ""
+        self.version = 0           # Bumped whenever value changes
+        self.loaded_at = 0.0       # monotonic time of the last successful load, 0 = never
+        self.invalidated = 0       # Invalidation generation; non-zero = stale because of a write
+        self.refresh_task: Optional[asyncio.Task] = None
+        self.load_time = 0.0
+
+    @property
+    def fresh(self) -> bool:
+        return self.loaded_at > 0 and not self.invalidated and time.monotonic() - self.loaded_at < self.ttl
+
+
+class ContextSnapshotService:
+    """
+    Versioned, background-refreshed cache of chat context blocks.
+
+    get()/refresh run on the event loop; invalidate() may be called from
+    any thread (sync tools run on the tool executor).
+    """
+
+    def __init__(self):
+        self._blocks: Dict[str, ContextBlock] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._generation = 0
+
+    def register(
+        self,
+        name: str,
+        loader: Loader,
+        tables: Iterable[str],
+        ttl: float = SNAPSHOT_TTL_SECONDS
+    ) -> None:
+        """
+        Register a context block.
+
+        Args:
+            name: Block name used with get()
+            loader: Coroutine function building the block text (must not raise
+                for missing data; return "" instead)
+            tables: Tables the block is built from, for write invalidation
+            ttl: Seconds before the block is refreshed in the background
+        """
+        with self._lock:
+            if name not in self._blocks:
+                self._blocks[name] = ContextBlock(name, loader, frozenset(tables), ttl)
+
+    # ==================== READ ====================
+
+    async def get(self, name: str) -> str:
+        """Current text of a block ("" if unknown or never loaded successfully)."""
+        block = self._blocks.get(name)
+        if block is None:
+            return ""
+        self._loop = asyncio.get_running_loop()
+
+        if block.fresh:
+            return block.value
+
+        task = self._start_refresh(block)
+        if block.loaded_at == 0:
+            timeout = SNAPSHOT_LOAD_TIMEOUT_SECONDS
+        elif block.invalidated:
+            timeout = SNAPSHOT_WAIT_SECONDS
+        else:
+            return block.value  # Expired: serve stale, refresh in background
+
+        try:
+            await asyncio.wait_for(asyncio.shield(task), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.debug(f"Context block {name} still refreshing after {timeout:.1f}s, serving v{block.version}")
+        except Exception:
+            pass  # Logged by _refresh
+        return block.value
+
+    async def get_many(self, *names: str) -> Dict[str, str]:
+        """Several blocks at once; waits (if at all) run concurrently."""
+        values = await asyncio.gather(*(self.get(name) for name in names))
+        return dict(zip(names, values))
+
+    # ==================== REFRESH ====================
+
+    def _start_refresh(self, block: ContextBlock) -> asyncio.Task:
+        if block.refresh_task is None or block.refresh_task.done():
+            block.refresh_task = asyncio.create_task(self._refresh(block))
+        return block.refresh_task
+
+    async def _refresh(self, block: ContextBlock) -> None:
+        generation = block.invalidated
+        start = time.monotonic()
+        try:
+            value = await block.loader()
+        except Exception as e:
+            logger.warning(f"Context block {block.name} refresh failed: {e}")
+            if block.loaded_at:
+                # Keep serving the last good value, retry after another TTL
+                block.loaded_at = time.monotonic()
+                block.invalidated = 0
+            return
+
+        value = value or ""
+        with self._lock:
+            if value != block.value:
+                block.value = value
+                block.version += 1
+            block.loaded_at = time.monotonic()
+            block.load_time = block.loaded_at - start
+            # A write that landed while loading keeps the block invalidated
+            if block.invalidated == generation:
+                block.invalidated = 0
+
+        if block.invalidated:
+            block.refresh_task = None
+            self._start_refresh(block)
+        logger.debug(f"Context block {block.name} refreshed in {block.load_time:.2f}s (v{block.version})")
+
+    async def warm(self) -> None:
+        """Load every registered block (e.g. at startup) so the first turn hits the cache."""
+        self._loop = asyncio.get_running_loop()
+        tasks = [self._start_refresh(block) for block in list(self._blocks.values())]
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info(f"Context snapshot warmed: {len(tasks)} blocks")
+
+    async def close(self) -> None:
+        """Cancel in-flight refreshes (app shutdown)."""
+        tasks = [b.refresh_task for b in self._blocks.values() if b.refresh_task and not b.refresh_task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    # ==================== INVALIDATION ====================
+
+    def invalidate(self, tables: Iterable[str]) -> int:
+        """
+        Mark blocks built from any of tables as stale and refresh them.
+
+        Thread-safe. ALL_TABLES ("*") invalidates every block.
+
+        Returns:
+            Number of blocks invalidated
+        """
+        tables = set(tables)
+        if not tables:
+            return 0
+        with self._lock:
+            self._generation += 1
+            hit = [
+                block for block in self._blocks.values()
+                if ALL_TABLES in tables or block.tables & tables
+            ]
+            for block in hit:
+                block.invalidated = self._generation
+
+        if hit and self._loop is not None and not self._loop.is_closed():
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            for block in hit:
+                if running is self._loop:
+                    self._start_refresh(block)
+                else:
+                    self._loop.call_soon_threadsafe(self._start_refresh, block)
+        if hit:
+            logger.debug(f"Invalidated context blocks {[b.name for b in hit]} for tables {sorted(tables)}")
+        return len(hit)
+
+    def invalidate_for_tool(self, tool_name: str, tool_input: Optional[Dict[str, Any]] = None) -> int:
+        """Invalidate the blocks a write tool may have changed."""
+        if tool_name in _TABLE_INPUT_TOOLS:
+            table = (tool_input or {}).get("table") or (tool_input or {}).get("table_name")
+            tables = {table} if table else {ALL_TABLES}
+        else:
+            tables = TOOL_TABLES.get(tool_name, ())
+        return self.invalidate(tables)
+
+    # ==================== STATS ====================
+
+    def versions(self) -> Dict[str, int]:
+        """Current version of every block."""
+        return {name: block.version for name, block in self._blocks.items()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-block version, age and last load time."""
+        now = time.monotonic()
+        return {
+            name: {
+                "version": block.version,
+                "age_seconds": round(now - block.loaded_at, 1) if block.loaded_at else None,
+                "stale": not block.fresh,
+                "load_time_seconds": round(block.load_time, 3),
+                "chars": len(block.value),
+            }
+            for name, block in self._blocks.items()
+        }
+
+
+_context_snapshot: Optional[ContextSnapshotService] = None
+
+
+def get_context_snapshot() -> ContextSnapshotService:
+    """Get the process-wide context snapshot."""
+    global _context_snapshot
+    if _context_snapshot is None:
+        _context_snapshot = ContextSnapshotService()
+    return _context_snapshot
@@ -0,0 +1,523 @@
+"""
+Conversation window - fit chat history into the model's context on the first try.
+
+Replaces the per-request `len(text) // 4` estimate and the "prompt is too
+long -> keep the last 4 messages" recovery:
+
+1. Token counts are exact-tokenizer counts (tokenizer.py), cached per
+   message, so each turn only counts what is new
+2. Local counts are calibrated to Claude's tokenizer per model from the
+   input token usage of real responses (record_usage); prompts close to the
+   limit are verified with Anthropic's count_tokens endpoint before sending
+3. When history outgrows the budget (or max_history messages), the oldest
+   turns are folded into a rolling summary stored per conversation in
+   chat_conversation_summaries, instead of being dropped. Folding goes down
+   to FOLD_KEEP_RATIO of the budget so it happens once every few turns, not
+   on every message. The summary call runs in the background, off the
+   reply path: the request that triggers it already sends only the kept
+   turns, and the next request picks up the new summary. Older turns are
+   only ever represented by a stored summary, so a fold that keeps failing
+   can't make every turn resend the whole history; failed folds are
+   retried with per-conversation backoff
+4. Without a conversation_id (nothing to store the summary under) the
+   oldest turns are dropped, as before
+5. If the model still rejects the prompt mid tool loop, trim_history()
+   drops the oldest whole turns, never splitting a tool_use from its
+   tool_result
+
+Usage:
+    manager = ConversationWindowManager(anthropic_client)
+    window = await manager.build(
+        history=request.conversation_history,
+        message=request.message,
+        system_prompt=system_prompt,
+        tools=all_tools,
+        model=model,
+        conversation_id=request.conversation_id,
+        max_history=50,
+    )
+    system_prompt += window.system_block()
+    messages = window.messages
+    ...
+    record_usage(model, window.local_tokens, response.usage)
+
+    # "prompt is too long" from Claude
+    messages, dropped = trim_history(messages)
+"""
+
+import os
+import json
+import math
+import time
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.features.knowledge.tokenizer import count_tokens
+from app.services.cache import LRUTTLCache
+
+logger = logging.getLogger("Jarvis.Chat.ContextWindow")
+
+MODEL_CONTEXT_TOKENS = int(os.getenv("CHAT_MODEL_CONTEXT_TOKENS", "200000"))
+# Upper bound for history alone, whatever the model allows
+CHAT_HISTORY_MAX_TOKENS = int(os.getenv("CHAT_HISTORY_MAX_TOKENS", "140000"))
+SAFETY_MARGIN_TOKENS = 2000
+# After folding, the kept history uses at most this share of the budget / max_history
+FOLD_KEEP_RATIO = float(os.getenv("CHAT_FOLD_KEEP_RATIO", "0.6"))
+# Verify with the count_tokens endpoint when the estimate exceeds this share of the limit
+VERIFY_RATIO = 0.9
+
+SUMMARY_MODEL = os.getenv("CHAT_SUMMARY_MODEL", "claude-haiku-4-5-20251001")
+SUMMARY_MAX_TOKENS = 1024
+SUMMARY_TIMEOUT_SECONDS = 20.0
+SUMMARY_INPUT_MESSAGE_CHARS = 6000  # Per folded message, for the summarizer
+# Backoff after a failed fold (summary call or save), doubling per failure
+FOLD_RETRY_SECONDS = 60.0
+FOLD_RETRY_MAX_SECONDS = 3600.0
+
+MESSAGE_OVERHEAD_TOKENS = 4  # Role / turn framing per message
+DEFAULT_TOKEN_RATIO = 1.15   # Claude tokens per cl100k token, until calibrated
+_RATIO_BOUNDS = (0.7, 2.0)
+_RATIO_ALPHA = 0.3           # EMA weight of a new observation
+
+BOUNDARY_SIGNATURE_MESSAGES = 3
+
+SUMMARY_PROMPT = """You maintain a running summary of a conversation between the user and Jarvis, their personal AI assistant. Older messages are removed from the conversation and only your summary remains, so fold the new messages into the summary.
+
+Keep: facts the user stated about themselves or others, decisions, requests still open, commitments, and names, dates and numbers that may be referred to later. Note what was being worked on at the end. Drop greetings and small talk.
+
+Write compact bullet points in the language of the conversation, at most 300 words.
+
+<previous_summary>
+{previous}
+</previous_summary>
+
+<new_messages>
+{messages}
+</new_messages>
+
+Return only the updated summary."""
+
+_message_token_cache = LRUTTLCache(maxsize=8192, ttl=3600)
+_token_ratios: Dict[str, float] = {}
+
+
+# ==================== TOKEN COUNTING ====================
+
+def _content_text(content: Any) -> str:
+    """Text of a message content (string or content blocks)."""
+    if isinstance(content, str):
+        return content
+    return json.dumps(content, default=lambda o: getattr(o, "__dict__", str(o)))
+
+
+def _message_key(role: str, content: str) -> str:
+    return hashlib.sha1(f"{role}\n{content}".encode("utf-8", "replace")).hexdigest()
+
+
+def message_tokens(role: str, content: Any) -> int:
+    """Local token count of one message, cached by content."""
+    text = _content_text(content)
+    key = _message_key(role, text)
+    tokens = _message_token_cache.get(key)
+    if tokens is None:
+        tokens = count_tokens(text) + MESSAGE_OVERHEAD_TOKENS
+        _message_token_cache.set(key, tokens)
+    return tokens
+
+
+def tools_tokens(tools: Sequence[Dict[str, Any]]) -> int:
+    """Local token count of the tool definitions (cached; they rarely change)."""
+    if not tools:
+        return 0
+    return message_tokens("tools", json.dumps(list(tools), sort_keys=True, default=str))
+
+
+def token_ratio(model: str) -> float:
+    """Calibrated Claude-tokens-per-local-token ratio for model."""
+    return _token_ratios.get(model, DEFAULT_TOKEN_RATIO)
+
+
+def calibrated(model: str, local_tokens: int) -> int:
+    """Estimate of Claude's count for local_tokens."""
+    return math.ceil(local_tokens * token_ratio(model))
+
+
+def _observe_ratio(model: str, ratio: float) -> None:
+    ratio = min(max(ratio, _RATIO_BOUNDS[0]), _RATIO_BOUNDS[1])
+    current = _token_ratios.get(model)
+    _token_ratios[model] = ratio if current is None else (1 - _RATIO_ALPHA) * current + _RATIO_ALPHA * ratio
+
+
+def record_usage(model: str, local_tokens: int, usage: Any) -> None:
+    """
+    Calibrate local counts with the input tokens Claude actually billed.
+
+    Args:
+        model: Model used
+        local_tokens: ConversationWindow.local_tokens of the prompt sent
+        usage: response.usage of the first call with that prompt
+    """
+    if not local_tokens or usage is None:
+        return
+    actual = (
+        (getattr(usage, "input_tokens", 0) or 0)
+        + (getattr(usage, "cache_creation_input_tokens", 0) or 0)
+        + (getattr(usage, "cache_read_input_tokens", 0) or 0)
+    )
+    if actual:
+        _observe_ratio(model, actual / local_tokens)
+
+
+def record_overflow(model: str) -> None:
+    """The model rejected a prompt as too long: estimate more conservatively."""
+    _observe_ratio(model, token_ratio(model) * 1.1)
+
+
+# ==================== SUMMARY BOUNDARY ====================
+
+def _signature(messages: List[Dict[str, Any]], end: int) -> str:
+    """Hash of up to BOUNDARY_SIGNATURE_MESSAGES messages ending at index end."""
+    start = max(0, end - BOUNDARY_SIGNATURE_MESSAGES + 1)
+    digest = hashlib.sha1()
+    for msg in messages[start:end + 1]:
+        digest.update(_message_key(msg["role"], _content_text(msg["content"])).encode())
+    return digest.hexdigest()
+
+
+def _find_boundary(messages: List[Dict[str, Any]], boundary_hash: str) -> Optional[int]:
+    """Index of the last folded message in this history, if present."""
+    for i in range(len(messages)):
+        if _signature(messages, i) == boundary_hash:
+            return i
+    return None
+
+
+# ==================== TRIMMING ====================
+
+def _is_turn_start(msg: Dict[str, Any]) -> bool:
+    """A user message that starts a turn (not tool results answering a tool_use)."""
+    if msg["role"] != "user":
+        return False
+    content = msg["content"]
+    if isinstance(content, str):
+        return True
+    return not any(
+        (block.get("type") if isinstance(block, dict) else getattr(block, "type", None)) == "tool_result"
+        for block in content
+    )
+
+
+def trim_history(messages: List[Dict[str, Any]], keep_ratio: float = 0.5) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Drop the oldest whole turns so at most keep_ratio of the history tokens remain.
+
+    The current turn (the last turn start onwards, including its tool calls)
+    is always kept, and a tool_use is never separated from its tool_result.
+
+    Returns:
+        (trimmed messages, number dropped); 0 dropped means only the current
+        turn is left and nothing more can be trimmed
+    """
+    starts = [i for i, msg in enumerate(messages) if _is_turn_start(msg)]
+    if len(starts) < 2:
+        return messages, 0
+
+    current = starts[-1]
+    counts = [message_tokens(m["role"], m["content"]) for m in messages[:current]]
+    target = sum(counts) * keep_ratio
+    cut = next(i for i in starts[1:] if sum(counts[i:]) <= target)
+    return messages[cut:], cut
+
+
+# ==================== WINDOW ====================
+
+@dataclass
+class ConversationWindow:
+    """Messages to send plus the summary of everything folded out."""
+    messages: List[Dict[str, Any]] = field(default_factory=list)
+    summary: str = ""
+    omitted: int = 0           # Older messages dropped without a summary
+    folded: int = 0            # Messages being folded into the summary (in the background)
+    local_tokens: int = 0      # Whole prompt (system + tools + messages), local count
+    estimated_tokens: int = 0  # Calibrated to Claude's tokenizer (or verified)
+    limit: int = 0
+
+    def system_block(self) -> str:
+        """Text to append to the system prompt (summary / omission note)."""
+        parts = []
+        if self.summary:
+            parts.append(
+                "\n\n**EARLIER IN THIS CONVERSATION (summary of older messages no longer shown):**\n"
+                + self.summary
+            )
+        if self.omitted:
+            parts.append(
+                f"\n\n[Note: {self.omitted} earlier messages omitted due to context length. "
+                "Focusing on recent conversation.]"
+            )
+        return "".join(parts)
+
+
+def _as_dict(msg: Any) -> Dict[str, Any]:
+    if isinstance(msg, dict):
+        return {"role": msg["role"], "content": msg["content"]}
+    return {"role": msg.role, "content": msg.content}
+
+
+class ConversationWindowManager:
+    """Builds token-budgeted message lists, folding old turns into a summary."""
+
+    def __init__(self, client):
+        """
+        Args:
+            client: anthropic.AsyncAnthropic (summaries and count_tokens)
+        """
+        self.client = client
+        self._folds: Dict[str, asyncio.Task] = {}  # conversation_id -> fold in flight
+        # conversation_id -> (consecutive failures, monotonic time of next attempt)
+        self._fold_failures = LRUTTLCache(maxsize=1024, ttl=FOLD_RETRY_MAX_SECONDS * 2)
+
+    async def build(
+        self,
+        history: Sequence[Any],
+        message: str,
+        system_prompt: str,
+        tools: Sequence[Dict[str, Any]],
+        model: str,
+        conversation_id: Optional[str] = None,
+        max_history: int = 50,
+        max_output_tokens: int = 8000
+    ) -> ConversationWindow:
+        """
+        Choose the history to send with message.
+
+        Args:
+            history: Prior messages (ChatMessage or {"role", "content"}), oldest first
+            message: The new user message
+            system_prompt: System prompt the request will use
+            tools: Tool definitions the request will use
+            model: Model the request will use
+            conversation_id: Key for the rolling summary; None disables folding
+            max_history: Max history messages to send
+            max_output_tokens: max_tokens of the request
+
+        Returns:
+            ConversationWindow whose messages end with the new user message
+        """
+        limit = MODEL_CONTEXT_TOKENS - max_output_tokens - SAFETY_MARGIN_TOKENS
+        window = ConversationWindow(limit=limit)
+
+        full = [_as_dict(m) for m in history]
+        start = 0
+        summary_row = await self._load_summary(conversation_id) if conversation_id else None
+        if summary_row:
+            boundary = _find_boundary(full, summary_row["boundary_hash"])
+            if boundary is not None:
+                window.summary = summary_row["summary"]
+                start = boundary + 1
+        messages = full[start:]
+
+        counts = [message_tokens(m["role"], m["content"]) for m in messages]
+        current = {"role": "user", "content": message}
+        static = count_tokens(system_prompt) + tools_tokens(tools) + message_tokens("user", message)
+
+        budget = self._history_budget(model, limit, static, window.summary)
+        if len(messages) > max_history or sum(counts) > budget:
+            cut = self._fold_point(messages, counts, max_history, budget)
+            to_fold = messages[:cut]
+            if to_fold and conversation_id:
+                # If the stored boundary isn't in this history, still build on
+                # the stored summary rather than overwriting earlier folds
+                previous = window.summary or (summary_row or {}).get("summary") or ""
+                boundary_hash = _signature(full, start + cut - 1)
+                if self._schedule_fold(conversation_id, previous, to_fold, boundary_hash, summary_row):
+                    window.folded = len(to_fold)
+            # Not covered by a stored summary yet: left out until the fold lands
+            messages, counts = messages[cut:], counts[cut:]
+            window.omitted += len(to_fold)
+
+        window.messages = messages + [current]
+        self._measure(window, model, static, counts)
+
+        if window.estimated_tokens > VERIFY_RATIO * limit:
+            await self._verify(window, model, system_prompt, tools, static, counts)
+
+        logger.info(
+            f"Context window: {len(window.messages)} messages, ~{window.estimated_tokens:,}/{limit:,} tokens"
+            + (", summary covers earlier turns" if window.summary else "")
+            + (f", folding {window.folded} in background" if window.folded else "")
+            + (f", omitted {window.omitted}" if window.omitted else "")
+        )
+        return window
+
+    # ==================== BUDGET ====================
+
+    @staticmethod
+    def _history_budget(model: str, limit: int, static: int, summary: str) -> int:
+        """History budget in local tokens."""
+        fixed = calibrated(model, static + count_tokens(ConversationWindow(summary=summary).system_block()))
+        budget = min(CHAT_HISTORY_MAX_TOKENS, limit - fixed)
+        return max(0, int(budget / token_ratio(model)))
+
+    @staticmethod
+    def _fold_point(messages: List[Dict[str, Any]], counts: List[int], max_history: int, budget: int) -> int:
+        """
+        Index of the first message to keep.
+
+        Keeps the newest messages within FOLD_KEEP_RATIO of the budget and of
+        max_history, starting on a user turn.
+        """
+        keep_messages = max(2, int(max_history * FOLD_KEEP_RATIO))
+        keep_tokens = int(budget * FOLD_KEEP_RATIO)
+        cut = len(messages)
+        used = 0
+        while cut > 0 and len(messages) - cut < keep_messages and used + counts[cut - 1] <= keep_tokens:
+            cut -= 1
+            used += counts[cut]
+        while cut < len(messages) and messages[cut]["role"] != "user":
+            cut += 1
+        return cut
+
+    def _measure(self, window: ConversationWindow, model: str, static: int, counts: List[int]) -> None:
+        window.local_tokens = static + count_tokens(window.system_block()) + sum(counts)
+        window.estimated_tokens = calibrated(model, window.local_tokens)
+
+    # ==================== SUMMARY ====================
+
+    async def _load_summary(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        from app.features.chat.storage import get_chat_storage
+        return await get_chat_storage().get_conversation_summary(conversation_id)
+
+    def _schedule_fold(
+        self,
+        conversation_id: str,
+        previous: str,
+        to_fold: List[Dict[str, Any]],
+        boundary_hash: str,
+        summary_row: Optional[Dict[str, Any]]
+    ) -> bool:
+        """Start folding in the background; False if one is running or a failed one is backing off."""
+        if conversation_id in self._folds:
+            return False
+        failure = self._fold_failures.get(conversation_id)
+        if failure and time.monotonic() < failure[1]:
+            return False
+        task = asyncio.create_task(self._fold(conversation_id, previous, to_fold, boundary_hash, summary_row))
+        self._folds[conversation_id] = task
+        task.add_done_callback(lambda _: self._folds.pop(conversation_id, None))
+        return True
+
+    async def _fold(
+        self,
+        conversation_id: str,
+        previous: str,
+        to_fold: List[Dict[str, Any]],
+        boundary_hash: str,
+        summary_row: Optional[Dict[str, Any]]
+    ) -> None:
+        """Fold messages into the rolling summary; a failure backs off further folds."""
+        summary = await self._summarize(previous, to_fold)
+        if not summary:
+            self._fold_failed(conversation_id)
+            return
+
+        from app.features.chat.storage import get_chat_storage
+
+        previously_folded = (summary_row or {}).get("folded_messages") or 0
+        try:
+            await get_chat_storage().save_conversation_summary(
+                conversation_id=conversation_id,
+                summary=summary,
+                boundary_hash=boundary_hash,
+                folded_messages=previously_folded + len(to_fold),
+                summary_tokens=count_tokens(summary),
+                model=SUMMARY_MODEL,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to save conversation summary for {conversation_id}: {e}")
+            self._fold_failed(conversation_id)
+            return
+        self._fold_failures.delete(conversation_id)
+
+    def _fold_failed(self, conversation_id: str) -> None:
+        failures = (self._fold_failures.get(conversation_id) or (0, 0.0))[0] + 1
+        delay = min(FOLD_RETRY_SECONDS * 2 ** (failures - 1), FOLD_RETRY_MAX_SECONDS)
+        self._fold_failures.set(conversation_id, (failures, time.monotonic() + delay))
+        logger.info(f"Conversation {conversation_id}: fold failed {failures}x, next attempt in {delay:.0f}s")
+
+    async def _summarize(self, previous: str, to_fold: List[Dict[str, Any]]) -> Optional[str]:
+        """Updated summary including to_fold; None on failure."""
+        lines = []
+        for msg in to_fold:
+            text = _content_text(msg["content"])
+            if len(text) > SUMMARY_INPUT_MESSAGE_CHARS:
+                text = text[:SUMMARY_INPUT_MESSAGE_CHARS] + " [...]"
+            lines.append(f"{msg['role'].upper()}: {text}")
+        prompt = SUMMARY_PROMPT.format(previous=previous or "(none yet)", messages="\n\n".join(lines))
+
+        try:
+            response = await asyncio.wait_for(
+                self.client.messages.create(
+                    model=SUMMARY_MODEL,
+                    max_tokens=SUMMARY_MAX_TOKENS,
+                    temperature=0,
+                    messages=[{"role": "user", "content": prompt}]
+                ),
+                timeout=SUMMARY_TIMEOUT_SECONDS
+            )
+            summary = "".join(b.text for b in response.content if getattr(b, "type", "") == "text").strip()
+            if summary:
+                logger.info(f"Folded {len(to_fold)} messages into conversation summary ({count_tokens(summary)} tokens)")
+            return summary or None
+        except Exception as e:
+            logger.warning(f"Conversation summary failed for {len(to_fold)} older messages: {e}")
+            return None
+
+    # ==================== VERIFICATION ====================
+
+    async def _verify(
+        self,
+        window: ConversationWindow,
+        model: str,
+        system_prompt: str,
+        tools: Sequence[Dict[str, Any]],
+        static: int,
+        counts: List[int]
+    ) -> None:
+        """Count exactly with the API near the limit; trim oldest messages if still over."""
+        try:
+            result = await self.client.messages.count_tokens(
+                model=model,
+                system=system_prompt + window.system_block(),
+                tools=list(tools),
+                messages=window.messages
+            )
+            exact = result.input_tokens
+        except Exception as e:
+            logger.debug(f"count_tokens unavailable, using estimate: {e}")
+            return
+
+        _observe_ratio(model, exact / max(window.local_tokens, 1))
+        window.estimated_tokens = exact
+        if exact <= window.limit:
+            return
+
+        # Still over: drop the oldest history (keeps the new message)
+        excess = math.ceil((exact - window.limit) / token_ratio(model))
+        history, current = window.messages[:-1], window.messages[-1]
+        dropped = 0
+        while history and excess > 0:
+            history.pop(0)
+            excess -= counts[dropped]
+            dropped += 1
+        while history and history[0]["role"] != "user":
+            history.pop(0)
+            dropped += 1
+        window.messages = history + [current]
+        window.omitted += dropped
+        self._measure(window, model, static, counts[dropped:])
+        logger.warning(f"Prompt over limit by count_tokens ({exact:,} > {window.limit:,}), dropped {dropped} messages")
+
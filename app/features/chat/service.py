@@ -12,11 +12,12 @@ This module provides a Claude-powered conversational interface that can:
 Works similarly to Claude Desktop + MCP, but via Telegram.
 """
 
+import asyncio
 import json
 import logging
 import os
 import time
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Awaitable, Callable, List, Any, Optional, Tuple
 from datetime import datetime, timezone
 
 import anthropic
@@ -25,8 +26,11 @@ from pydantic import BaseModel, Field
 # Import config to ensure .env is loaded
 from app.core.config import settings
 
-from app.features.chat.tools import TOOLS, execute_tool, get_all_tools
-from app.features.memory import get_memory_service
+from app.features.chat.context_snapshot import get_context_snapshot
+from app.features.chat.context_window import ConversationWindowManager, record_overflow, record_usage, trim_history
+from app.features.chat.tools import execute_tool_calls, iter_tool_results, get_all_tools, start_tool_prefetch
+from app.features.memory import MemoryType, add_memory_write_listener, get_memory_service, get_memory_extraction_queue
+from app.services.cache import get_cache
 
 # =============================================================================
 # SMART CONVERSATION-LEVEL MEMORY CACHE
@@ -37,11 +41,15 @@ from app.features.memory import get_memory_service
 # 2. CACHE REUSE: Follow-up messages reuse cached context (fast!)
 # 3. SMART REFRESH: If topic shifts significantly, refresh memory
 # 4. TIME-BASED REFRESH: After 30 min idle, refresh on next message
+# 5. MEMORY CORRECTIONS: Updating/deleting a memory drops every cached context
+#
+# Lives in the app cache (app/services/cache.py): bounded LRU per process,
+# shared across instances when CACHE_SHARED_BACKEND is set.
 #
 # The search_memories tool can ALWAYS be used mid-conversation to get
 # fresh/different memories when needed.
 # =============================================================================
-_conversation_memory_cache: Dict[str, Tuple[float, str, str]] = {}  # conv_id -> (time, context, topic_hint)
+CONVERSATION_CACHE_NAMESPACE = "chat_memory_context"
 _CONVERSATION_CACHE_TTL = 1800.0  # 30 minutes
 _CONVERSATION_CACHE_MAX_SIZE = 100
 _TOPIC_REFRESH_KEYWORDS = [
@@ -50,13 +58,17 @@ _TOPIC_REFRESH_KEYWORDS = [
     "actually,", "by the way", "unrelated,", "speaking of",
 ]
 
-def _get_cached_memory_context(conversation_id: str) -> Optional[str]:
+def _get_conversation_cache():
+    return get_cache(
+        CONVERSATION_CACHE_NAMESPACE,
+        maxsize=_CONVERSATION_CACHE_MAX_SIZE,
+        ttl=_CONVERSATION_CACHE_TTL
+    )
+
+async def _get_cached_memory_context(conversation_id: str) -> Optional[str]:
     """Get cached memory context for a conversation if still valid."""
-    if conversation_id in _conversation_memory_cache:
-        cached_time, cached_context, _ = _conversation_memory_cache[conversation_id]
-        if time.time() - cached_time < _CONVERSATION_CACHE_TTL:
-            return cached_context
-    return None
+    cached = await _get_conversation_cache().get(conversation_id)
+    return cached["context"] if cached else None
 
 def _should_refresh_memory(conversation_id: str, new_message: str) -> bool:
     """Check if we should refresh memory based on topic shift indicators."""
@@ -68,22 +80,30 @@ def _should_refresh_memory(conversation_id: str, new_message: str) -> bool:
     
     return False
 
-def _set_cached_memory_context(conversation_id: str, context: str, topic_hint: str = "") -> None:
-    """Cache memory context for a conversation."""
-    global _conversation_memory_cache
-    _conversation_memory_cache[conversation_id] = (time.time(), context, topic_hint)
-    
-    # Prune old entries if too large
-    if len(_conversation_memory_cache) > _CONVERSATION_CACHE_MAX_SIZE:
-        sorted_keys = sorted(_conversation_memory_cache.keys(), 
-                            key=lambda k: _conversation_memory_cache[k][0])
-        for old_key in sorted_keys[:len(sorted_keys) // 2]:
-            del _conversation_memory_cache[old_key]
-
-def _invalidate_memory_cache(conversation_id: str) -> None:
+async def _set_cached_memory_context(conversation_id: str, context: str, topic_hint: str = "") -> None:
+    """Cache memory context for a conversation (LRU-bounded, oldest evicted)."""
+    await _get_conversation_cache().set(conversation_id, {"context": context, "topic_hint": topic_hint})
+
+async def _invalidate_memory_cache(conversation_id: str) -> None:
     """Invalidate cache for a conversation (force refresh on next message)."""
-    if conversation_id in _conversation_memory_cache:
-        del _conversation_memory_cache[conversation_id]
+    await _get_conversation_cache().delete(conversation_id)
+
+async def _on_memory_write(operation: str, memory_type: Optional[MemoryType]) -> None:
+    """
+    Keep chat caches consistent with memory writes.
+
+    Corrections and deletions must not keep showing the old memory, so they
+    drop every cached conversation context. New behavior rules (and any
+    change) refresh the behavior_rules snapshot block. Plain additions leave
+    conversation contexts alone - they are additive and reachable through
+    search_memories.
+    """
+    if operation in ("update", "delete"):
+        await _get_conversation_cache().clear()
+    if operation != "add" or memory_type == MemoryType.BEHAVIOR:
+        get_context_snapshot().invalidate({"memories"})
+
+add_memory_write_listener(_on_memory_write)
 # =============================================================================
 
 # Cost tracking (per 1M tokens)
@@ -113,6 +133,8 @@ logger = logging.getLogger("Jarvis.Chat")
 # Voice memo processing and journaling use Sonnet via llm.py (quality matters more there)
 MODEL_ID = os.getenv("CLAUDE_CHAT_MODEL", "claude-haiku-4-5-20251001")
 MAX_TOOL_CALLS = 8  # Increased to handle multi-step requests
+DISCONNECT_CHECK_INTERVAL = 0.5  # Seconds between client-disconnect checks while streaming
+BEHAVIOR_RULES_TTL_SECONDS = float(os.getenv("BEHAVIOR_RULES_TTL_SECONDS", "600"))
 
 
 class ChatMessage(BaseModel):
@@ -185,9 +207,7 @@ These rules override ALL other instructions. Violating them is a critical failur
 ═══════════════════════════════════════════════════════════════════════════════
 
 CURRENT CONTEXT:
-- Date: {current_date}
-- Time: {current_time}
-- User Location: {user_location}
+- Date, time and user location: see CURRENT CONTEXT at the end of this prompt (updated every message)
 
 AVAILABLE TOOLS:
 - **Database queries**: meetings, contacts, tasks, emails, calendar events, reflections, journals, messages
@@ -647,9 +667,9 @@ THE USER TRUSTS YOU. DO NOT BETRAY THAT TRUST BY LYING ABOUT TOOL RESULTS.
    - Call search_memories to verify deletion
    - Don't assume - query the data
 
-5. **CURRENT DATE IS {current_date}** - do NOT say dates have passed if they haven't
+5. **USE THE CURRENT DATE FROM CURRENT CONTEXT** - do NOT say dates have passed if they haven't
    - January 10th has NOT passed if today is before January 10th
-   - Check the date above before making temporal claims
+   - Check the date in CURRENT CONTEXT before making temporal claims
 
 6. **SILENT FAILURES ARE YOUR ENEMY**
    - If a tool result contains "error" anywhere, you MUST tell the user
@@ -719,8 +739,19 @@ YOU HAVE DIRECT ACCESS TO THE DATABASE. TRUST YOUR TOOLS WHEN THEY SUCCEED.
 
 Remember: You have access to a rich personal knowledge base. Use the tools to provide genuinely helpful, personalized responses."""
 
+# The instructions contain no per-request values, so they form a stable,
+# cacheable prompt prefix. Everything that changes goes after them (SystemPrompt).
+SYSTEM_INSTRUCTIONS = SYSTEM_PROMPT_TEMPLATE.format()
+
+CURRENT_CONTEXT_TEMPLATE = """
+
+CURRENT CONTEXT (updated every message):
+- Date: {current_date}
+- Time: {current_time}
+- User Location: {user_location}"""
+
 # Default prompt (used when we can't get dynamic context)
-SYSTEM_PROMPT = SYSTEM_PROMPT_TEMPLATE.format(
+SYSTEM_PROMPT = SYSTEM_INSTRUCTIONS + CURRENT_CONTEXT_TEMPLATE.format(
     current_date="(use get_current_time tool)",
     current_time="(use get_current_time tool)",
     user_location="Unknown (user can tell you via chat)"
@@ -728,38 +759,74 @@ SYSTEM_PROMPT = SYSTEM_PROMPT_TEMPLATE.format(
 
 
 # =============================================================================
-# PROMPT CACHING HELPERS (for web chat only)
+# PROMPT CACHING (all clients)
 # =============================================================================
+# Anthropic caches the longest previously seen prompt prefix ending at a
+# cache_control breakpoint (5 min TTL, refreshed on every hit). Request order
+# is tools -> system -> messages, so the prompt is laid out from most to
+# least stable, with one breakpoint after each layer (max 4):
+#
+# 1. Tools (~16K tokens)                  identical for every request
+# 2. System: instructions + client style  identical per client type
+# 3. System: session context              behavior rules, Letta, journals, tasks,
+#                                         meetings, memories, conversation summary -
+#                                         precomputed/cached, changes rarely
+# 4. Messages                             breakpoint on the last message, so tool
+#                                         loop iterations and the next turn reuse it
+#    (after 3, no breakpoint) System: volatile - current date/time, proactive context
+#
+# Telegram benefits as much as web: layers 1-2 are shared by every request
+# of the same client type, whatever the conversation.
+# =============================================================================
+
+PROMPT_CACHING_ENABLED = os.getenv("CHAT_PROMPT_CACHING", "true").lower() != "false"
+_CACHE_CONTROL = {"type": "ephemeral"}
+
+
+class SystemPrompt:
+    """System prompt split into stable, session and volatile segments."""
+
+    __slots__ = ("stable", "session", "volatile")
+
+    def __init__(self, stable: str, session: str = "", volatile: str = ""):
+        self.stable = stable
+        self.session = session
+        self.volatile = volatile
+
+    @property
+    def text(self) -> str:
+        return self.stable + self.session + self.volatile
+
+    def __str__(self) -> str:
+        return self.text
+
 
-def _prepare_system_with_cache(system_prompt: str, enable_caching: bool = False) -> list:
+def _prepare_system_with_cache(system_prompt: SystemPrompt, enable_caching: bool = True):
     """
-    Prepare system prompt for Claude API with optional caching.
-    
-    For web chat (multi-turn), we cache the system prompt to save 90% on repeated tokens.
-    System prompt is ~3K tokens, stays constant across a conversation.
+    Prepare the system prompt for the Claude API.
+
+    With caching, returns text blocks with breakpoints after the stable and
+    the session segment; the volatile segment comes last, uncached.
     
     Args:
-        system_prompt: The full system prompt string
-        enable_caching: Whether to add cache_control breakpoint
+        system_prompt: Segmented system prompt
+        enable_caching: Whether to add cache_control breakpoints
         
     Returns:
-        List of system message blocks (with or without cache_control)
+        Plain string (no caching) or list of system text blocks
     """
     if not enable_caching:
-        # For Telegram ad-hoc requests, just return plain string
-        return system_prompt
-    
-    # For web chat, return structured format with cache control
-    return [
-        {
-            "type": "text",
-            "text": system_prompt,
-            "cache_control": {"type": "ephemeral"}  # 5-min cache (default)
-        }
-    ]
+        return system_prompt.text
 
+    blocks = [{"type": "text", "text": system_prompt.stable, "cache_control": _CACHE_CONTROL}]
+    if system_prompt.session.strip():
+        blocks.append({"type": "text", "text": system_prompt.session, "cache_control": _CACHE_CONTROL})
+    if system_prompt.volatile.strip():
+        blocks.append({"type": "text", "text": system_prompt.volatile})
+    return blocks
 
-def _prepare_tools_with_cache(tools: list, enable_caching: bool = False) -> list:
+
+def _prepare_tools_with_cache(tools: list, enable_caching: bool = True) -> list:
     """
     Prepare tools list for Claude API with optional caching.
     
@@ -776,16 +843,37 @@ def _prepare_tools_with_cache(tools: list, enable_caching: bool = False) -> list
     if not enable_caching or not tools:
         return tools
     
-    # Deep copy to avoid modifying original
-    import copy
-    cached_tools = copy.deepcopy(tools)
-    
-    # Add cache_control to the LAST tool (marks end of cacheable prefix)
-    cached_tools[-1]["cache_control"] = {"type": "ephemeral"}
+    # Copy only the last tool - the rest are passed through unchanged
+    cached_tools = list(tools)
+    cached_tools[-1] = {**cached_tools[-1], "cache_control": _CACHE_CONTROL}
     
     return cached_tools
 
 
+def _prepare_messages_with_cache(messages: list, enable_caching: bool = True) -> list:
+    """
+    Put a cache breakpoint on the last message.
+
+    The next call in the tool loop (and the next turn) starts with this
+    exact prefix, so it is read from cache instead of re-processed. The
+    conversation list itself is not modified.
+    """
+    if not enable_caching or not messages:
+        return messages
+
+    last = messages[-1]
+    content = last.get("content") if isinstance(last, dict) else None
+    if isinstance(content, str):
+        if not content:
+            return messages
+        blocks = [{"type": "text", "text": content, "cache_control": _CACHE_CONTROL}]
+    elif isinstance(content, list) and content and isinstance(content[-1], dict):
+        blocks = content[:-1] + [{**content[-1], "cache_control": _CACHE_CONTROL}]
+    else:
+        return messages
+    return messages[:-1] + [{**last, "content": blocks}]
+
+
 def _calculate_cost_with_cache(
     model: str,
     input_tokens: int,
@@ -796,14 +884,20 @@ def _calculate_cost_with_cache(
     """
     Calculate cost including prompt caching savings.
     
+    Anthropic reports input_tokens EXCLUDING cached tokens: the prompt is
+    input_tokens + cache_creation_tokens + cache_read_tokens.
+    
     Returns dict with:
     - total_cost: Total cost in USD
     - breakdown: Dict with individual costs
     - savings: How much was saved via caching
+    - cache_hit_ratio: Share of prompt tokens read from cache (0-1)
     """
+    prompt_tokens = input_tokens + cache_creation_tokens + cache_read_tokens
+    input_price = COST_PER_1M_INPUT.get(model, 0.80)
+    
     # Input cost (non-cached tokens)
-    uncached_input = input_tokens - cache_read_tokens
-    input_cost = (uncached_input / 1_000_000) * COST_PER_1M_INPUT.get(model, 0.80)
+    input_cost = (input_tokens / 1_000_000) * input_price
     
     # Output cost
     output_cost = (output_tokens / 1_000_000) * COST_PER_1M_OUTPUT.get(model, 4.00)
@@ -813,7 +907,7 @@ def _calculate_cost_with_cache(
     cache_read_cost = (cache_read_tokens / 1_000_000) * COST_PER_1M_CACHE_READ.get(model, 0.08)
     
     # What it would have cost without caching
-    cost_without_cache = ((input_tokens + cache_creation_tokens) / 1_000_000) * COST_PER_1M_INPUT.get(model, 0.80) + output_cost
+    cost_without_cache = (prompt_tokens / 1_000_000) * input_price + output_cost
     
     total_cost = input_cost + output_cost + cache_write_cost + cache_read_cost
     savings = cost_without_cache - total_cost
@@ -827,11 +921,13 @@ def _calculate_cost_with_cache(
             "cache_read": cache_read_cost,
         },
         "savings": max(0, savings),
+        "cache_hit_ratio": round(cache_read_tokens / prompt_tokens, 4) if prompt_tokens else 0.0,
         "tokens": {
             "input": input_tokens,
             "output": output_tokens,
             "cache_creation": cache_creation_tokens,
             "cache_read": cache_read_tokens,
+            "prompt": prompt_tokens,
         }
     }
 
@@ -844,16 +940,34 @@ class ChatService:
     """Handles conversational AI with tool use and memory."""
     
     def __init__(self):
+        # Async client so generations (and streams) never block the event loop.
         # Disable automatic retries - better to fail fast than consume rate limit budget
-        self.client = anthropic.Anthropic(
+        self.client = anthropic.AsyncAnthropic(
             api_key=os.getenv("ANTHROPIC_API_KEY"),
             max_retries=0  # Don't auto-retry on 429 - we handle it ourselves
         )
         # Get memory service
         self.memory = get_memory_service()
-        # Cache behavior rules at startup (refreshed each conversation)
-        self._behavior_rules_cache: Optional[str] = None
-        self._behavior_rules_loaded: bool = False
+        # Token-budgeted history with rolling summaries
+        self._window = ConversationWindowManager(self.client)
+        self._register_context_blocks()
+
+    def _register_context_blocks(self) -> None:
+        """
+        Register the system-prompt context blocks with the context snapshot.
+
+        They are served precomputed to every turn and refreshed in the
+        background (TTL) or when a tool writes the tables they read.
+        """
+        from app.features.database import get_async_database
+
+        adb = get_async_database()
+        snapshot = get_context_snapshot()
+        snapshot.register("journals", lambda: adb.run(self._get_recent_journals_context, 3), tables={"journals"})
+        snapshot.register("tasks", lambda: adb.run(self._get_task_context), tables={"tasks"})
+        snapshot.register("meetings", lambda: adb.run(self._get_recent_meetings_context, 3), tables={"meetings"})
+        # Behavior rules only change through the memory tools
+        snapshot.register("behavior_rules", self._get_behavior_rules, tables={"memories"}, ttl=BEHAVIOR_RULES_TTL_SECONDS)
 
     async def _openai_fallback(self, messages: list, system_prompt: str, error_reason: str) -> ChatResponse:
         """Fall back to OpenAI GPT-4o when Claude is unavailable.
@@ -915,55 +1029,40 @@ class ChatService:
         - "Batch database operations"
         - "Don't use web search for simple questions"
         
-        These are always included in the system prompt.
+        These are always included in the system prompt. Loaded through the
+        context snapshot ("behavior_rules" block), which caches the result;
+        errors propagate so the snapshot keeps the last good rules.
         """
         from app.features.memory import MemoryType
         
-        # Return cached if already loaded this session
-        if self._behavior_rules_loaded and self._behavior_rules_cache is not None:
-            return self._behavior_rules_cache
+        # Search for behavior memories specifically
+        # Using a generic query that will match behavior rules
+        memories = await self.memory.search(
+            query="behavior rule guideline how to act",
+            limit=20,
+            memory_type=MemoryType.BEHAVIOR
+        )
         
-        try:
-            # Search for behavior memories specifically
-            # Using a generic query that will match behavior rules
-            memories = await self.memory.search(
-                query="behavior rule guideline how to act",
-                limit=20,
-                memory_type=MemoryType.BEHAVIOR
-            )
-            
-            if not memories:
-                self._behavior_rules_cache = ""
-                self._behavior_rules_loaded = True
-                return ""
-            
-            # Format behavior rules clearly
-            lines = ["\n**LEARNED BEHAVIOR RULES (follow these guidelines):**"]
-            for mem in memories:
-                memory_text = mem.get("memory", "")
-                if memory_text:
-                    # Clean up the [BEHAVIOR RULE] prefix if present
-                    if "[BEHAVIOR RULE]" in memory_text:
-                        rule = memory_text.split("[BEHAVIOR RULE]")[-1].split("[CONTEXT]")[0].strip()
-                    else:
-                        rule = memory_text
-                    if rule:
-                        lines.append(f"• {rule}")
-            
-            context = "\n".join(lines) if len(lines) > 1 else ""
-            self._behavior_rules_cache = context
-            self._behavior_rules_loaded = True
-            
-            if context:
-                logger.info(f"Loaded {len(memories)} behavior rules for conversation")
-            
-            return context
-            
-        except Exception as e:
-            logger.warning(f"Could not load behavior rules: {e}")
-            self._behavior_rules_cache = ""
-            self._behavior_rules_loaded = True
+        if not memories:
             return ""
+        
+        # Format behavior rules clearly
+        lines = ["\n**LEARNED BEHAVIOR RULES (follow these guidelines):**"]
+        for mem in memories:
+            memory_text = mem.get("memory", "")
+            if memory_text:
+                # Clean up the [BEHAVIOR RULE] prefix if present
+                if "[BEHAVIOR RULE]" in memory_text:
+                    rule = memory_text.split("[BEHAVIOR RULE]")[-1].split("[CONTEXT]")[0].strip()
+                else:
+                    rule = memory_text
+                if rule:
+                    lines.append(f"• {rule}")
+        
+        context = "\n".join(lines) if len(lines) > 1 else ""
+        if context:
+            logger.info(f"Loaded {len(memories)} behavior rules")
+        return context
     
     async def _get_memory_context(self, message: str, conversation_id: Optional[str] = None, force_refresh: bool = False) -> str:
         """
@@ -986,7 +1085,7 @@ class ChatService:
         
         # Check conversation cache first (fast path - no API call)
         if conversation_id and not force_refresh:
-            cached_context = _get_cached_memory_context(conversation_id)
+            cached_context = await _get_cached_memory_context(conversation_id)
             if cached_context is not None:
                 logger.debug(f"Using cached memory context for conversation {conversation_id[:8]}...")
                 # Add note that search_memories is available for more
@@ -1017,7 +1116,7 @@ class ChatService:
             if conversation_id:
                 # Extract topic hint from first few words of message
                 topic_hint = " ".join(message.split()[:5])
-                _set_cached_memory_context(conversation_id, context, topic_hint)
+                await _set_cached_memory_context(conversation_id, context, topic_hint)
                 logger.info(f"Cached memory context for conversation {conversation_id[:8]}... (30min TTL)")
             
             return context
@@ -1025,9 +1124,9 @@ class ChatService:
             logger.warning(f"Could not get memory context: {e}")
             return "\n\n**MEMORY STATUS:** Memory service unavailable - use search_memories tool."
     
-    async def _save_memory_from_conversation(self, user_message: str, assistant_response: str) -> None:
+    def _queue_memory_extraction(self, user_message: str, conversation_id: Optional[str] = None) -> None:
         """
-        Extract and save memories from the conversation intelligently.
+        Queue the user's message for background memory extraction.
         
         Uses a smarter heuristic than just keywords - we want to capture:
         - Personal facts (I am, my job, etc.)
@@ -1038,7 +1137,8 @@ class ChatService:
         
         The actual extraction is done by Claude Haiku via Mem0's add() method,
         which intelligently parses the text for facts. The heuristic here just
-        gates the API call to avoid unnecessary costs.
+        gates the API call to avoid unnecessary costs. Extraction runs on the
+        memory extraction queue, batched per conversation, after the reply.
         """
         try:
             user_lower = user_message.lower()
@@ -1079,17 +1179,15 @@ class ChatService:
             if is_pure_question and not has_meaningful_content:
                 return
             
-            # If it has meaningful content, extract memories
+            # If it has meaningful content, extract memories (in the background)
             if has_meaningful_content:
-                combined = f"User said: {user_message}"
-                count = await self.memory.extract_from_text(
-                    text=combined,
+                get_memory_extraction_queue().submit(
+                    f"User said: {user_message}",
+                    group=conversation_id or "chat",
                     source="chat",
                 )
-                if count > 0:
-                    logger.info(f"Extracted {count} memories from chat")
         except Exception as e:
-            logger.warning(f"Could not save memory: {e}")
+            logger.warning(f"Could not queue memory extraction: {e}")
     
     def _get_recent_journals_context(self, limit: int = 3) -> str:
         """
@@ -1467,8 +1565,19 @@ If Aaron says "yes" or confirms, USE THE RELEVANT TOOLS to actually do the resea
             logger.warning(f"Failed to get proactive outreach context: {e}")
             return ""
     
-    def _build_system_prompt(self, memory_context: str = "", journal_context: str = "", letta_context: str = "", behavior_rules: str = "", proactive_context: str = "", task_context: str = "", meeting_context: str = "") -> str:
-        """Build system prompt with current date/time/location, memory, journal, Letta context, behavior rules, proactive outreach context, task awareness, and recent meetings."""
+    async def _get_snapshot_context(self) -> Tuple[str, str, str, str]:
+        """Journal, task, meeting and behavior-rule blocks from the context snapshot."""
+        blocks = await get_context_snapshot().get_many("journals", "tasks", "meetings", "behavior_rules")
+        return blocks["journals"], blocks["tasks"], blocks["meetings"], blocks["behavior_rules"]
+
+    def _build_system_prompt(self, memory_context: str = "", journal_context: str = "", letta_context: str = "", behavior_rules: str = "", proactive_context: str = "", task_context: str = "", meeting_context: str = "", client_type: str = "telegram") -> SystemPrompt:
+        """
+        Build the segmented system prompt (see PROMPT CACHING above).
+
+        - stable: instructions + client-specific style (same for every request of a client type)
+        - session: behavior rules, Letta, journal, task, meeting and memory context
+        - volatile: current date/time/location and proactive outreach context
+        """
         from datetime import datetime
         from app.features.chat.tools import _get_user_location
         
@@ -1488,42 +1597,28 @@ If Aaron says "yes" or confirms, USE THE RELEVANT TOOLS to actually do the resea
             now = datetime.utcnow()
             current_date = now.strftime("%A, %B %d, %Y") + " (UTC)"
             current_time = now.strftime("%I:%M %p") + " (UTC)"
-        
-        base_prompt = SYSTEM_PROMPT_TEMPLATE.format(
+
+        stable = self._add_client_specific_instructions(SYSTEM_INSTRUCTIONS, client_type)
+
+        # Session context: slow-changing, ordered from most to least stable
+        # (behavior rules, Letta episodes, journal mood/focus, pending tasks,
+        # recent meetings, Mem0 memories)
+        session = "".join(
+            block for block in (
+                behavior_rules, letta_context, journal_context, task_context, meeting_context, memory_context
+            ) if block
+        )
+
+        volatile = CURRENT_CONTEXT_TEMPLATE.format(
             current_date=current_date,
             current_time=current_time,
             user_location=f"{location_str} ({timezone_str})"
         )
-
-        # Append proactive outreach context FIRST (most recent context)
+        # Proactive outreach context (most recent context) goes right next to "now"
         if proactive_context:
-            base_prompt += proactive_context
-
-        # Append behavior rules (these are learned guidelines)
-        if behavior_rules:
-            base_prompt += behavior_rules
-
-        # Append Letta episodic context (conversation history, topics, decisions)
-        if letta_context:
-            base_prompt += letta_context
-
-        # Append journal context (user's current mood/focus)
-        if journal_context:
-            base_prompt += journal_context
-
-        # Append task context (pending/overdue tasks)
-        if task_context:
-            base_prompt += task_context
-
-        # Append recent meetings context (who user talked to recently)
-        if meeting_context:
-            base_prompt += meeting_context
-
-        # Append Mem0 semantic memory context last
-        if memory_context:
-            base_prompt += memory_context
+            volatile += proactive_context
 
-        return base_prompt
+        return SystemPrompt(stable, session, volatile)
 
     def _add_client_specific_instructions(self, base_prompt: str, client_type: str) -> str:
         """
@@ -1580,10 +1675,20 @@ WEB CHAT MODE - PERSONALITY & STYLE:
 a genuine intellectual exchange, not robotic task completion.
 """
     
-    async def process_message_stream(self, request: ChatRequest):
+    async def process_message_stream(
+        self,
+        request: ChatRequest,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None
+    ):
         """
         Process a user message and yield streaming chunks.
 
+        Fully async: the Claude stream and tool calls never block the event
+        loop, so one instance can serve many concurrent streams. If
+        is_disconnected (e.g. Starlette's request.is_disconnected) reports
+        the client has gone, the Claude stream is closed and no further
+        tools run.
+
         Yields dictionaries with:
         - {"type": "content", "text": "..."} for text chunks
         - {"type": "tool_use", "tool": "...", "input": {...}} for tool calls
@@ -1591,9 +1696,19 @@ a genuine intellectual exchange, not robotic task completion.
         - {"type": "done", "tools_used": [...]} when complete
         - {"type": "error", "message": "..."} on error
         """
-        import asyncio
-        import time
+
+        async def client_gone() -> bool:
+            if is_disconnected is None:
+                return False
+            try:
+                return await is_disconnected()
+            except Exception:
+                return False
         
+        # Likely first tool calls ("what's on today" -> calendar) start now and
+        # run alongside context gathering and the first Claude call
+        prefetch = start_tool_prefetch(request.message)
+
         try:
             start_time = time.time()
             
@@ -1603,25 +1718,21 @@ a genuine intellectual exchange, not robotic task completion.
                 self._get_memory_context(request.message, conversation_id=request.conversation_id)
             )
             letta_task = asyncio.create_task(self._get_letta_context())
-            behavior_task = asyncio.create_task(self._get_behavior_rules())
             proactive_task = asyncio.create_task(self._get_proactive_outreach_context())
 
-            # Journal + task + meeting context are sync/fast, run directly
-            journal_context = self._get_recent_journals_context(limit=3)
-            task_context = self._get_task_context()
-            meeting_context = self._get_recent_meetings_context(limit=3)
+            # Journal, task, meeting and behavior-rule blocks are precomputed (context_snapshot)
+            snapshot_task = asyncio.create_task(self._get_snapshot_context())
 
             # Wait for async tasks (in parallel) with timeout
             try:
-                memory_context, letta_context, behavior_rules, proactive_context = await asyncio.wait_for(
-                    asyncio.gather(memory_task, letta_task, behavior_task, proactive_task, return_exceptions=True),
+                memory_context, letta_context, proactive_context = await asyncio.wait_for(
+                    asyncio.gather(memory_task, letta_task, proactive_task, return_exceptions=True),
                     timeout=2.0  # 2 second max for context gathering
                 )
             except asyncio.TimeoutError:
                 logger.warning("Context gathering timed out after 2s, proceeding without")
                 memory_context = ""
                 letta_context = ""
-                behavior_rules = ""
                 proactive_context = ""
 
             # Handle exceptions from gather
@@ -1631,61 +1742,40 @@ a genuine intellectual exchange, not robotic task completion.
             if isinstance(letta_context, Exception):
                 logger.warning(f"Letta context failed: {letta_context}")
                 letta_context = ""
-            if isinstance(behavior_rules, Exception):
-                logger.warning(f"Behavior rules failed: {behavior_rules}")
-                behavior_rules = ""
             if isinstance(proactive_context, Exception):
                 logger.warning(f"Proactive context failed: {proactive_context}")
                 proactive_context = ""
 
+            journal_context, task_context, meeting_context, behavior_rules = await snapshot_task
+
             context_time = time.time() - start_time
             logger.info(f"Context gathered in {context_time:.2f}s (parallel)")
 
-            system_prompt = self._build_system_prompt(memory_context, journal_context, letta_context, behavior_rules, proactive_context, task_context, meeting_context)
-            system_prompt = self._add_client_specific_instructions(system_prompt, request.client_type)
+            system_prompt = self._build_system_prompt(
+                memory_context, journal_context, letta_context, behavior_rules, proactive_context,
+                task_context, meeting_context, client_type=request.client_type
+            )
 
             model = request.model or MODEL_ID
             logger.info(f"Streaming with model: {model}, client_type: {request.client_type}")
 
-            # Build messages with smart context management
+            # Build messages: exact token budget, older turns folded into a rolling summary
             # Use MORE history for web chat (multi-turn conversations)
             # Keep limited for Telegram (ad-hoc queries)
             max_history = 50 if request.client_type == "web" else 15
-            messages = []
-            
-            # Smart token estimation for context management
-            # Approximate: 1 token ≈ 4 characters for English text
-            def estimate_tokens(text: str) -> int:
-                return len(text) // 4
-            
-            # Reserve tokens: ~50k for system/tools, ~8k for response, ~140k for conversation
-            MAX_CONTEXT_TOKENS = 140000  # Safe limit below 200k
-            total_tokens = 0
-            truncated_count = 0
-            
-            # Add history from newest to oldest, respecting token limits
-            history_slice = request.conversation_history[-max_history:]
-            for msg in reversed(history_slice):
-                msg_tokens = estimate_tokens(msg.content)
-                if total_tokens + msg_tokens > MAX_CONTEXT_TOKENS:
-                    truncated_count += 1
-                    continue  # Skip older messages if hitting limit
-                messages.insert(0, {"role": msg.role, "content": msg.content})
-                total_tokens += msg_tokens
-            
-            # Always add current message (required)
-            messages.append({"role": "user", "content": request.message})
-            total_tokens += estimate_tokens(request.message)
-            
-            if truncated_count > 0:
-                logger.warning(f"⚠️ Truncated {truncated_count} older messages to stay under {MAX_CONTEXT_TOKENS:,} token limit")
-                # Add notice to system for continuity
-                messages.insert(0, {
-                    "role": "assistant", 
-                    "content": f"[Note: {truncated_count} earlier messages omitted due to context length. Focusing on recent conversation.]"
-                })
-            
-            logger.info(f"Context: {len(messages)} messages (~{total_tokens:,} tokens), history_available={len(request.conversation_history)}")
+            all_tools = get_all_tools()
+            window = await self._window.build(
+                history=request.conversation_history,
+                message=request.message,
+                system_prompt=system_prompt.text,
+                tools=all_tools,
+                model=model,
+                conversation_id=request.conversation_id,
+                max_history=max_history,
+            )
+            system_prompt.session += window.system_block()
+            messages = window.messages
+            usage_recorded = False
 
             tools_used = []
             tool_call_count = 0
@@ -1698,45 +1788,56 @@ a genuine intellectual exchange, not robotic task completion.
             total_cache_read_tokens = 0
 
             # Tool loop with streaming
-            # Get all tools including research tools (if configured)
-            all_tools = get_all_tools()
-            
-            # Enable caching for web chat (multi-turn) - saves ~90% on system prompt + tools
-            # Telegram is ad-hoc, so caching doesn't help much
-            enable_caching = request.client_type == "web"
+            # Prompt caching for every client: tools + stable instructions are shared
+            # by all requests, session context and messages by the turn's tool loop
+            enable_caching = PROMPT_CACHING_ENABLED
             
             # Prepare system prompt and tools with optional caching
             cached_system = _prepare_system_with_cache(system_prompt, enable_caching)
             cached_tools = _prepare_tools_with_cache(all_tools, enable_caching)
             
-            if enable_caching:
-                logger.info(f"🗄️ Prompt caching ENABLED for web chat (saves ~90% on {len(system_prompt)} chars system + {len(all_tools)} tools)")
-            
             while tool_call_count < MAX_TOOL_CALLS:
+                if await client_gone():
+                    logger.info("Client disconnected before Claude call, stopping stream")
+                    return
+
                 # Log the request parameters for debugging
-                logger.info(f"Calling Anthropic streaming API:")
+                logger.info("Calling Anthropic streaming API:")
                 logger.info(f"  Model: {model}")
-                logger.info(f"  Max tokens: 8000")
+                logger.info("  Max tokens: 8000")
                 logger.info(f"  Messages count: {len(messages)}")
                 logger.info(f"  Tools count: {len(cached_tools)}")
                 logger.info(f"  Caching: {enable_caching}")
 
                 # Use Anthropic's streaming API
                 try:
-                    with self.client.messages.stream(
+                    async with self.client.messages.stream(
                         model=model,
                         max_tokens=8000,
                         system=cached_system,
                         tools=cached_tools,
-                        messages=messages
+                        messages=_prepare_messages_with_cache(messages, enable_caching)
                     ) as stream:
                         # Stream text chunks in real-time
-                        for text in stream.text_stream:
+                        last_check = time.monotonic()
+                        async for text in stream.text_stream:
                             yield {"type": "content", "text": text}
+                            # Polling per chunk is wasteful; twice a second is plenty
+                            if time.monotonic() - last_check >= DISCONNECT_CHECK_INTERVAL:
+                                last_check = time.monotonic()
+                                if await client_gone():
+                                    # Leaving the context manager closes the Claude stream
+                                    logger.info("Client disconnected mid-stream, cancelling generation")
+                                    return
 
                         # Get the final message after streaming completes
-                        response = stream.get_final_message()
+                        response = await stream.get_final_message()
                         
+                        # Calibrate token counts against the first call (prompt = window)
+                        if not usage_recorded:
+                            record_usage(model, window.local_tokens, response.usage)
+                            usage_recorded = True
+
                         # Track usage from this API call
                         total_input_tokens += response.usage.input_tokens
                         total_output_tokens += response.usage.output_tokens
@@ -1749,12 +1850,14 @@ a genuine intellectual exchange, not robotic task completion.
                     
                     # Handle specific error types gracefully
                     if "prompt is too long" in error_msg.lower() or "context_length" in error_msg.lower():
-                        # Context too long - try again with fewer messages
-                        logger.warning("⚠️ Context too long, attempting recovery by truncating history")
-                        if len(messages) > 5:
-                            # Keep only last 3 messages + current
-                            messages = messages[-4:]
-                            yield {"type": "content", "text": "\n\n⚠️ _Context too long, summarizing recent conversation..._\n\n"}
+                        # Context too long (tool results grew the prompt past the window
+                        # estimate) - estimate more conservatively from now on and retry
+                        # without the oldest turns (whole turns, so no tool_result is orphaned)
+                        record_overflow(model)
+                        messages, dropped = trim_history(messages)
+                        if dropped:
+                            logger.warning(f"⚠️ Context too long, dropped {dropped} older messages and retrying")
+                            yield {"type": "content", "text": "\n\n⚠️ _Context too long, dropping older messages..._\n\n"}
                             continue  # Retry with fewer messages
                         else:
                             yield {"type": "error", "message": "The conversation is too long to process. Please start a new conversation."}
@@ -1782,32 +1885,42 @@ a genuine intellectual exchange, not robotic task completion.
                     tool_call_count += 1
 
                     assistant_content = response.content
-                    tool_results = []
-
-                    for block in assistant_content:
-                        if block.type == "tool_use":
-                            tool_name = block.name
-                            tool_input = block.input
-                            tool_id = block.id
-
-                            logger.info(f"🔧 Tool invoked: {tool_name}")
-                            tools_used.append(tool_name)
+                    tool_blocks = [block for block in assistant_content if block.type == "tool_use"]
 
-                            # Notify client about tool use
-                            yield {"type": "tool_use", "tool": tool_name, "input": tool_input}
+                    for block in tool_blocks:
+                        logger.info(f"🔧 Tool invoked: {block.name}")
+                        tools_used.append(block.name)
 
-                            # Execute tool
-                            result = execute_tool(tool_name, tool_input, last_user_message=request.message)
-                            logger.info(f"   Result: {json.dumps(result, indent=2)[:500]}")
+                        # Notify client about tool use
+                        yield {"type": "tool_use", "tool": block.name, "input": block.input}
 
-                            # Notify client about tool result
-                            yield {"type": "tool_result", "tool": tool_name, "output": result}
+                    if await client_gone():
+                        logger.info("Client disconnected, skipping tool calls")
+                        return
 
-                            tool_results.append({
-                                "type": "tool_result",
-                                "tool_use_id": tool_id,
-                                "content": json.dumps(result)
-                            })
+                    # Run this turn's tools concurrently (writes serialized),
+                    # reporting each result as soon as it is ready
+                    results = [None] * len(tool_blocks)
+                    async for index, result in iter_tool_results(
+                        [(block.name, block.input) for block in tool_blocks],
+                        last_user_message=request.message,
+                        prefetch=prefetch
+                    ):
+                        results[index] = result
+                        logger.info(f"   Result [{tool_blocks[index].name}]: {json.dumps(result, indent=2)[:500]}")
+
+                        # Notify client about tool result
+                        yield {"type": "tool_result", "tool": tool_blocks[index].name, "output": result}
+
+                    # Results go back in the same order as the tool_use blocks
+                    tool_results = [
+                        {
+                            "type": "tool_result",
+                            "tool_use_id": block.id,
+                            "content": json.dumps(result)
+                        }
+                        for block, result in zip(tool_blocks, results)
+                    ]
 
                     # Add to messages for next iteration
                     messages.append({"role": "assistant", "content": assistant_content})
@@ -1834,7 +1947,7 @@ a genuine intellectual exchange, not robotic task completion.
             
             # Log cost
             if total_cache_read_tokens > 0:
-                logger.info(f"💵 Streaming cost: ${cost_info['total_cost']:.4f} ({total_input_tokens} in / {total_output_tokens} out) | 🗄️ Cache: {total_cache_read_tokens} read, saved ${cost_info['savings']:.4f}")
+                logger.info(f"💵 Streaming cost: ${cost_info['total_cost']:.4f} ({total_input_tokens} in / {total_output_tokens} out) | 🗄️ Cache: {total_cache_read_tokens} read ({cost_info['cache_hit_ratio']:.0%} hit), saved ${cost_info['savings']:.4f}")
             else:
                 logger.info(f"💵 Streaming cost: ${cost_info['total_cost']:.4f} ({total_input_tokens} in / {total_output_tokens} out)")
 
@@ -1867,18 +1980,27 @@ a genuine intellectual exchange, not robotic task completion.
                     "cache_read_tokens": total_cache_read_tokens,
                     "cost_usd": round(cost_info["total_cost"], 6),
                     "savings_usd": round(cost_info["savings"], 6),
+                    "cache_hit_ratio": cost_info["cache_hit_ratio"],
                 }
             }
 
+        except asyncio.CancelledError:
+            # Starlette cancels the response task when the client disconnects
+            logger.info("Stream cancelled")
+            raise
         except Exception as e:
             logger.exception("Streaming error")
             yield {"type": "error", "message": str(e)}
+        finally:
+            prefetch.close()
 
     async def process_message(self, request: ChatRequest) -> ChatResponse:
         """Process a user message and return a response."""
-        import asyncio
-        import time
         
+        # Likely first tool calls ("what's on today" -> calendar) start now and
+        # run alongside context gathering and the first Claude call
+        prefetch = start_tool_prefetch(request.message)
+
         try:
             start_time = time.time()
             
@@ -1888,25 +2010,21 @@ a genuine intellectual exchange, not robotic task completion.
                 self._get_memory_context(request.message, conversation_id=request.conversation_id)
             )
             letta_task = asyncio.create_task(self._get_letta_context())
-            behavior_task = asyncio.create_task(self._get_behavior_rules())
             proactive_task = asyncio.create_task(self._get_proactive_outreach_context())
             
-            # Journal + task + meeting context are sync/fast, run directly
-            journal_context = self._get_recent_journals_context(limit=3)
-            task_context = self._get_task_context()
-            meeting_context = self._get_recent_meetings_context(limit=3)
+            # Journal, task, meeting and behavior-rule blocks are precomputed (context_snapshot)
+            snapshot_task = asyncio.create_task(self._get_snapshot_context())
 
             # Wait for async tasks (in parallel) with timeout
             try:
-                memory_context, letta_context, behavior_rules, proactive_context = await asyncio.wait_for(
-                    asyncio.gather(memory_task, letta_task, behavior_task, proactive_task, return_exceptions=True),
+                memory_context, letta_context, proactive_context = await asyncio.wait_for(
+                    asyncio.gather(memory_task, letta_task, proactive_task, return_exceptions=True),
                     timeout=2.0  # 2 second max for context gathering
                 )
             except asyncio.TimeoutError:
                 logger.warning("Context gathering timed out after 2s, proceeding without")
                 memory_context = ""
                 letta_context = ""
-                behavior_rules = ""
                 proactive_context = ""
 
             # Handle exceptions from gather
@@ -1916,60 +2034,41 @@ a genuine intellectual exchange, not robotic task completion.
             if isinstance(letta_context, Exception):
                 logger.warning(f"Letta context failed: {letta_context}")
                 letta_context = ""
-            if isinstance(behavior_rules, Exception):
-                logger.warning(f"Behavior rules failed: {behavior_rules}")
-                behavior_rules = ""
             if isinstance(proactive_context, Exception):
                 logger.warning(f"Proactive context failed: {proactive_context}")
                 proactive_context = ""
 
+            journal_context, task_context, meeting_context, behavior_rules = await snapshot_task
+
             context_time = time.time() - start_time
             logger.info(f"Context gathered in {context_time:.2f}s (parallel)")
 
-            # Build dynamic system prompt with current context, journals, Letta, behavior rules, proactive context, tasks, and memory
-            system_prompt = self._build_system_prompt(memory_context, journal_context, letta_context, behavior_rules, proactive_context, task_context, meeting_context)
-
-            # Add client-specific response style instructions (telegram vs web)
-            system_prompt = self._add_client_specific_instructions(system_prompt, request.client_type)
+            # Build segmented system prompt: stable instructions + client style,
+            # session context (journals, Letta, behavior rules, tasks, memory), volatile date/time
+            system_prompt = self._build_system_prompt(
+                memory_context, journal_context, letta_context, behavior_rules, proactive_context,
+                task_context, meeting_context, client_type=request.client_type
+            )
 
             # Use specified model or default
             model = request.model or MODEL_ID
             logger.info(f"Using model: {model}, client_type: {request.client_type}")
             
-            # Build messages with smart context management (same logic as streaming)
+            # Build messages (same logic as streaming)
             max_history = 50 if request.client_type == "web" else 15
-            messages = []
-            
-            # Smart token estimation for context management
-            def estimate_tokens(text: str) -> int:
-                return len(text) // 4
-            
-            MAX_CONTEXT_TOKENS = 140000
-            total_tokens = 0
-            truncated_count = 0
-            
-            # Add history from newest to oldest, respecting token limits
-            history_slice = request.conversation_history[-max_history:]
-            for msg in reversed(history_slice):
-                msg_tokens = estimate_tokens(msg.content)
-                if total_tokens + msg_tokens > MAX_CONTEXT_TOKENS:
-                    truncated_count += 1
-                    continue
-                messages.insert(0, {"role": msg.role, "content": msg.content})
-                total_tokens += msg_tokens
-            
-            # Always add current message
-            messages.append({"role": "user", "content": request.message})
-            total_tokens += estimate_tokens(request.message)
-            
-            if truncated_count > 0:
-                logger.warning(f"⚠️ Truncated {truncated_count} older messages to stay under {MAX_CONTEXT_TOKENS:,} token limit")
-                messages.insert(0, {
-                    "role": "assistant", 
-                    "content": f"[Note: {truncated_count} earlier messages omitted due to context length.]"
-                })
-            
-            logger.info(f"Context: {len(messages)} messages (~{total_tokens:,} tokens)")
+            all_tools = get_all_tools()
+            window = await self._window.build(
+                history=request.conversation_history,
+                message=request.message,
+                system_prompt=system_prompt.text,
+                tools=all_tools,
+                model=model,
+                conversation_id=request.conversation_id,
+                max_history=max_history,
+            )
+            system_prompt.session += window.system_block()
+            messages = window.messages
+            usage_recorded = False
             
             # Call Claude with tools
             tools_used = []
@@ -1987,20 +2086,14 @@ a genuine intellectual exchange, not robotic task completion.
             total_cache_creation_tokens = 0
             total_cache_read_tokens = 0
 
-            # Get all tools including research tools
-            all_tools = get_all_tools()
-            
-            # Enable caching for web chat (multi-turn) - saves ~90% on system prompt + tools
-            # Telegram is typically ad-hoc single requests, but can still benefit from tool caching
-            enable_caching = request.client_type == "web"
+            # Prompt caching for every client (see PROMPT CACHING): tools + stable
+            # instructions are shared by all requests of this client type
+            enable_caching = PROMPT_CACHING_ENABLED
             
             # Prepare system prompt and tools with optional caching
             cached_system = _prepare_system_with_cache(system_prompt, enable_caching)
             cached_tools = _prepare_tools_with_cache(all_tools, enable_caching)
             
-            if enable_caching:
-                logger.info(f"🗄️ Prompt caching ENABLED for web chat")
-            
             while tool_call_count < MAX_TOOL_CALLS:
                 # Retry logic for overloaded API (transient errors)
                 max_retries = 3
@@ -2008,13 +2101,13 @@ a genuine intellectual exchange, not robotic task completion.
                 
                 for attempt in range(max_retries):
                     try:
-                        response = self.client.messages.create(
+                        response = await self.client.messages.create(
                             model=model,  # Use selected model
                             max_tokens=8000,  # Increased for web chat detailed responses
                             temperature=0.1,  # LOW temperature to reduce hallucination - factual tasks need precision
-                            system=cached_system,  # Use dynamic prompt with date/time/location and client-specific style
+                            system=cached_system,  # Segmented prompt: cached instructions/context + current date/time
                             tools=cached_tools,
-                            messages=messages
+                            messages=_prepare_messages_with_cache(messages, enable_caching)
                         )
                         break  # Success - exit retry loop
                     except anthropic.APIError as e:
@@ -2029,6 +2122,11 @@ a genuine intellectual exchange, not robotic task completion.
                             # Not an overload or last attempt - re-raise
                             raise
 
+                # Calibrate token counts against the first call (prompt = window)
+                if not usage_recorded:
+                    record_usage(model, window.local_tokens, response.usage)
+                    usage_recorded = True
+
                 # Accumulate usage from this API call
                 total_input_tokens += response.usage.input_tokens
                 total_output_tokens += response.usage.output_tokens
@@ -2041,46 +2139,55 @@ a genuine intellectual exchange, not robotic task completion.
                     
                     # Process tool calls
                     assistant_content = response.content
-                    tool_results = []
+                    tool_blocks = [block for block in assistant_content if block.type == "tool_use"]
+                    results = [None] * len(tool_blocks)
+                    to_run = []  # Indexes of blocks that actually execute
                     
-                    for block in assistant_content:
-                        if block.type == "tool_use":
-                            tool_name = block.name
-                            tool_input = block.input
-                            tool_id = block.id
-                            
-                            logger.info(f"🔧 Tool invoked: {tool_name}")
-                            logger.info(f"   Input: {json.dumps(tool_input, indent=2)[:500]}")
-                            tools_used.append(tool_name)
-                            
-                            # DUPLICATE CHECK for send_beeper_message
-                            if tool_name == "send_beeper_message":
-                                chat_id = tool_input.get("beeper_chat_id", "")
-                                content_hash = hash(tool_input.get("content", "")[:50])
-                                dedup_key = f"{chat_id}:{content_hash}"
-                                
-                                if dedup_key in sent_messages_this_request:
-                                    logger.warning(f"⚠️ DUPLICATE BLOCKED: Already sent to {chat_id} in this request")
-                                    result = {"error": "Already sent this message in this request. Cannot send duplicate."}
-                                else:
-                                    sent_messages_this_request.add(dedup_key)
-                                    result = execute_tool(tool_name, tool_input, last_user_message=request.message)
-                            else:
-                                # Execute the tool - pass last user message for send_beeper_message confirmation check
-                                result = execute_tool(tool_name, tool_input, last_user_message=request.message)
-                            
-                            logger.info(f"   Result: {json.dumps(result, indent=2)[:500]}")
-                            
-                            # Capture key findings for conversation history
-                            finding = self._extract_key_finding(tool_name, tool_input, result)
-                            if finding:
-                                key_tool_findings.append(finding)
+                    for i, block in enumerate(tool_blocks):
+                        tool_name = block.name
+                        tool_input = block.input
+                        
+                        logger.info(f"🔧 Tool invoked: {tool_name}")
+                        logger.info(f"   Input: {json.dumps(tool_input, indent=2)[:500]}")
+                        tools_used.append(tool_name)
+                        
+                        # DUPLICATE CHECK for send_beeper_message
+                        if tool_name == "send_beeper_message":
+                            chat_id = tool_input.get("beeper_chat_id", "")
+                            content_hash = hash(tool_input.get("content", "")[:50])
+                            dedup_key = f"{chat_id}:{content_hash}"
                             
-                            tool_results.append({
-                                "type": "tool_result",
-                                "tool_use_id": tool_id,
-                                "content": json.dumps(result)
-                            })
+                            if dedup_key in sent_messages_this_request:
+                                logger.warning(f"⚠️ DUPLICATE BLOCKED: Already sent to {chat_id} in this request")
+                                results[i] = {"error": "Already sent this message in this request. Cannot send duplicate."}
+                                continue
+                            sent_messages_this_request.add(dedup_key)
+                        to_run.append(i)
+                    
+                    # Execute concurrently (writes serialized) - pass last user message
+                    # for send_beeper_message confirmation check
+                    executed = await execute_tool_calls(
+                        [(tool_blocks[i].name, tool_blocks[i].input) for i in to_run],
+                        last_user_message=request.message,
+                        prefetch=prefetch
+                    )
+                    for i, result in zip(to_run, executed):
+                        results[i] = result
+                    
+                    tool_results = []
+                    for block, result in zip(tool_blocks, results):
+                        logger.info(f"   Result [{block.name}]: {json.dumps(result, indent=2)[:500]}")
+                        
+                        # Capture key findings for conversation history
+                        finding = self._extract_key_finding(block.name, block.input, result)
+                        if finding:
+                            key_tool_findings.append(finding)
+                        
+                        tool_results.append({
+                            "type": "tool_result",
+                            "tool_use_id": block.id,
+                            "content": json.dumps(result)
+                        })
                     
                     # Add assistant message and tool results to conversation
                     messages.append({
@@ -2102,11 +2209,8 @@ a genuine intellectual exchange, not robotic task completion.
                     logger.info(f"💬 Final response (no more tools): {final_response[:200]}")
                     
                     # Save memories from this conversation (Mem0 - cheap, selective)
-                    # Only extracts if user shared meaningful content
-                    try:
-                        await self._save_memory_from_conversation(request.message, final_response)
-                    except Exception as e:
-                        logger.warning(f"Failed to save conversation memory: {e}")
+                    # Only queued if user shared meaningful content; extracted in the background
+                    self._queue_memory_extraction(request.message, request.conversation_id)
                     
                     # Calculate and log cost using CUMULATIVE totals across all API calls
                     # (includes intermediate tool-calling iterations, not just the final response)
@@ -2120,7 +2224,7 @@ a genuine intellectual exchange, not robotic task completion.
                     total_cost = cost_info["total_cost"]
 
                     if total_cache_read_tokens > 0:
-                        logger.info(f"💵 Cost: ${total_cost:.4f} ({total_input_tokens} in / {total_output_tokens} out) | 🗄️ Cache: {total_cache_read_tokens} read, saved ${cost_info['savings']:.4f} | Model: {model}")
+                        logger.info(f"💵 Cost: ${total_cost:.4f} ({total_input_tokens} in / {total_output_tokens} out) | 🗄️ Cache: {total_cache_read_tokens} read ({cost_info['cache_hit_ratio']:.0%} hit), saved ${cost_info['savings']:.4f} | Model: {model}")
                     elif total_cache_creation_tokens > 0:
                         logger.info(f"💵 Cost: ${total_cost:.4f} ({total_input_tokens} in / {total_output_tokens} out) | 🗄️ Cache: {total_cache_creation_tokens} written | Model: {model}")
                     else:
@@ -2144,6 +2248,7 @@ a genuine intellectual exchange, not robotic task completion.
                     )
                     
                     # Store raw message exchange in Supabase (for audit trail + Letta batch)
+                    # Buffered and bulk-inserted in the background; doesn't delay the reply.
                     # This is processed by Letta in batch later (hourly/daily), not per-message
                     try:
                         storage = get_chat_storage()
@@ -2159,6 +2264,7 @@ a genuine intellectual exchange, not robotic task completion.
                                 "cache_read_tokens": total_cache_read_tokens,
                                 "cost_usd": round(total_cost, 6),
                                 "savings_usd": round(cost_info["savings"], 6),
+                                "cache_hit_ratio": cost_info["cache_hit_ratio"],
                                 "model": model,
                                 "client_type": request.client_type,
                             }
@@ -2204,6 +2310,8 @@ a genuine intellectual exchange, not robotic task completion.
                 response="Something went wrong. Please try again.",
                 error=str(e)
             )
+        finally:
+            prefetch.close()
 
 
 # Singleton instance
@@ -5,6 +5,12 @@ Stores every chat message in Supabase for:
 1. Complete audit trail
 2. Letta processing queue
 3. Historical analysis
+
+Messages (and the usage metadata stored with assistant messages) are
+written behind: store_message() buffers the row and returns its id at
+once, and a background task bulk-inserts buffered rows every few seconds
+(see app.features.database.write_behind). Reads of raw messages flush the
+buffer first, so they see everything stored by this process.
 """
 
 import logging
@@ -13,6 +19,7 @@ from datetime import datetime, timezone, timedelta
 import uuid
 
 from app.api.dependencies import get_database
+from app.features.database import execute_async, get_write_queue
 from app.core.logging_utils import sanitize_log_message
 
 logger = logging.getLogger("Jarvis.Intelligence.ChatStorage")
@@ -29,6 +36,8 @@ class ChatMessageStorage:
     def __init__(self):
         self._current_session_id: Optional[str] = None
         self._session_start: Optional[datetime] = None
+        # ids are generated here so buffered rows can be upserted idempotently
+        self._queue = get_write_queue("chat_messages", on_conflict="id")
         
     def _get_or_create_session(self) -> str:
         """
@@ -59,7 +68,7 @@ class ChatMessageStorage:
         tools_used: Optional[List[str]] = None
     ) -> Optional[str]:
         """
-        Store a single message.
+        Store a single message (buffered, written in the background).
         
         Args:
             role: 'user', 'assistant', or 'system'
@@ -73,10 +82,11 @@ class ChatMessageStorage:
             Message ID if successful
         """
         try:
-            db = get_database()
             session_id = self._get_or_create_session()
+            msg_id = str(uuid.uuid4())
             
             record = {
+                "id": msg_id,
                 "session_id": session_id,
                 "role": role,
                 "content": content,
@@ -92,19 +102,24 @@ class ChatMessageStorage:
             if tools_used:
                 record["tools_used"] = tools_used
             
-            result = db.client.table("chat_messages").insert(record).execute()
+            self._queue.enqueue(record)
             
-            if result.data:
-                msg_id = result.data[0].get("id")
-                # Sanitize content before logging to avoid PII leakage
-                safe_content = sanitize_log_message(content[:50])
-                logger.debug(f"Stored {role} message: {safe_content}...")
-                return msg_id
-            return None
+            # Sanitize content before logging to avoid PII leakage
+            safe_content = sanitize_log_message(content[:50])
+            logger.debug(f"Queued {role} message: {safe_content}...")
+            return msg_id
             
         except Exception as e:
             logger.error(f"Failed to store chat message: {e}")
             return None
+
+    async def flush(self) -> int:
+        """Write buffered messages now. Returns the number still buffered."""
+        try:
+            return await self._queue.flush()
+        except Exception as e:
+            logger.warning(f"Chat message flush failed: {e}")
+            return -1
     
     async def store_exchange(
         self,
@@ -151,6 +166,7 @@ class ChatMessageStorage:
         Used by daily Letta consolidation job.
         """
         try:
+            await self.flush()
             db = get_database()
             
             start = date.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -165,7 +181,7 @@ class ChatMessageStorage:
             if not include_processed:
                 query = query.eq("letta_processed", False)
                 
-            result = query.execute()
+            result = await execute_async(query)
             return result.data or []
             
         except Exception as e:
@@ -179,6 +195,7 @@ class ChatMessageStorage:
     ) -> List[Dict[str, Any]]:
         """Get recent messages, optionally filtered by session."""
         try:
+            await self.flush()
             db = get_database()
             
             query = db.client.table("chat_messages")\
@@ -189,7 +206,7 @@ class ChatMessageStorage:
             if session_id:
                 query = query.eq("session_id", session_id)
                 
-            result = query.execute()
+            result = await execute_async(query)
             return list(reversed(result.data or []))  # Chronological order
             
         except Exception as e:
@@ -213,17 +230,18 @@ class ChatMessageStorage:
             Most recent proactive outreach message with metadata, or None
         """
         try:
+            # No flush: this runs on every chat turn, and outreach is stored
+            # well before the user can reply to it
             db = get_database()
             
             cutoff = datetime.now(timezone.utc) - timedelta(minutes=minutes)
             
-            result = db.client.table("chat_messages")\
-                .select("*")\
-                .eq("source", "proactive_outreach")\
-                .gte("created_at", cutoff.isoformat())\
-                .order("created_at", desc=True)\
-                .limit(1)\
-                .execute()
+            result = await execute_async(db.client.table("chat_messages")
+                .select("*")
+                .eq("source", "proactive_outreach")
+                .gte("created_at", cutoff.isoformat())
+                .order("created_at", desc=True)
+                .limit(1))
             
             if result.data:
                 return result.data[0]
@@ -243,15 +261,15 @@ class ChatMessageStorage:
         Returns count of updated records.
         """
         try:
+            await self.flush()
             db = get_database()
             
-            result = db.client.table("chat_messages")\
+            result = await execute_async(db.client.table("chat_messages")
                 .update({
                     "letta_processed": True,
                     "letta_processed_at": datetime.now(timezone.utc).isoformat()
-                })\
-                .in_("id", message_ids)\
-                .execute()
+                })
+                .in_("id", message_ids))
             
             count = len(result.data or [])
             logger.info(f"Marked {count} messages as Letta-processed")
@@ -264,12 +282,12 @@ class ChatMessageStorage:
     async def get_unprocessed_count(self) -> int:
         """Get count of messages not yet processed by Letta."""
         try:
+            await self.flush()
             db = get_database()
             
-            result = db.client.table("chat_messages")\
-                .select("id", count="exact")\
-                .eq("letta_processed", False)\
-                .execute()
+            result = await execute_async(db.client.table("chat_messages")
+                .select("id", count="exact")
+                .eq("letta_processed", False))
             
             return result.count or 0
             
@@ -293,14 +311,14 @@ class ChatMessageStorage:
             List of message dicts with id, role, content, created_at
         """
         try:
+            await self.flush()
             db = get_database()
             
-            result = db.client.table("chat_messages")\
-                .select("id,role,content,created_at,user_id")\
-                .eq("letta_processed", False)\
-                .order("created_at", desc=False)\
-                .limit(limit)\
-                .execute()
+            result = await execute_async(db.client.table("chat_messages")
+                .select("id,role,content,created_at,user_id")
+                .eq("letta_processed", False)
+                .order("created_at", desc=False)
+                .limit(limit))
             
             # Filter by content length in Python (more flexible than SQL)
             messages = [
@@ -326,15 +344,15 @@ class ChatMessageStorage:
         Uses PostgreSQL full-text search if available.
         """
         try:
+            await self.flush()
             db = get_database()
             
             # Simple ILIKE search (works without FTS setup)
-            result = db.client.table("chat_messages")\
-                .select("*")\
-                .ilike("content", f"%{query}%")\
-                .order("created_at", desc=True)\
-                .limit(limit)\
-                .execute()
+            result = await execute_async(db.client.table("chat_messages")
+                .select("*")
+                .ilike("content", f"%{query}%")
+                .order("created_at", desc=True)
+                .limit(limit))
             
             return result.data or []
             
@@ -342,6 +360,62 @@ class ChatMessageStorage:
             logger.error(f"Failed to search messages: {e}")
             return []
     
+    async def get_conversation_summary(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the rolling summary of a conversation's folded turns.
+
+        Returns:
+            chat_conversation_summaries row, or None if nothing was folded yet
+        """
+        try:
+            db = get_database()
+            result = await execute_async(db.client.table("chat_conversation_summaries")
+                .select("summary, boundary_hash, folded_messages, summary_tokens")
+                .eq("conversation_id", conversation_id)
+                .limit(1))
+            return result.data[0] if result.data else None
+            
+        except Exception as e:
+            logger.error(f"Failed to get conversation summary: {e}")
+            return None
+    
+    async def save_conversation_summary(
+        self,
+        conversation_id: str,
+        summary: str,
+        boundary_hash: str,
+        folded_messages: int,
+        summary_tokens: int,
+        model: Optional[str] = None
+    ) -> bool:
+        """
+        Store (replace) the rolling summary of a conversation.
+        
+        Args:
+            conversation_id: Client conversation ID
+            summary: Summary of every folded turn so far
+            boundary_hash: Hash identifying the last folded messages
+            folded_messages: Total number of messages folded into the summary
+            summary_tokens: Token count of summary
+            model: Model that wrote the summary
+        """
+        try:
+            db = get_database()
+            await execute_async(db.client.table("chat_conversation_summaries").upsert({
+                "conversation_id": conversation_id,
+                "summary": summary,
+                "boundary_hash": boundary_hash,
+                "folded_messages": folded_messages,
+                "summary_tokens": summary_tokens,
+                "model": model,
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            }))
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to save conversation summary: {e}")
+            return False
+    
     async def get_usage_stats(
         self,
         days: int = 30
@@ -356,15 +430,15 @@ class ChatMessageStorage:
             Dict with message counts, token usage, costs
         """
         try:
+            await self.flush()
             db = get_database()
             
             cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
             
             # Get all assistant messages with metadata (costs are stored there)
-            result = db.client.table("chat_messages")\
-                .select("role,metadata,created_at")\
-                .gte("created_at", cutoff)\
-                .execute()
+            result = await execute_async(db.client.table("chat_messages")
+                .select("role,metadata,created_at")
+                .gte("created_at", cutoff))
             
             messages = result.data or []
             
@@ -377,6 +451,8 @@ class ChatMessageStorage:
             total_cost = 0.0
             total_input_tokens = 0
             total_output_tokens = 0
+            total_cache_creation_tokens = 0
+            total_cache_read_tokens = 0
             messages_with_cost = 0
             
             daily_costs = {}  # date -> cost
@@ -389,6 +465,8 @@ class ChatMessageStorage:
                         total_cost += cost
                         total_input_tokens += meta.get("input_tokens", 0)
                         total_output_tokens += meta.get("output_tokens", 0)
+                        total_cache_creation_tokens += meta.get("cache_creation_tokens", 0) or 0
+                        total_cache_read_tokens += meta.get("cache_read_tokens", 0) or 0
                         messages_with_cost += 1
                         
                         # Track daily costs
@@ -403,6 +481,10 @@ class ChatMessageStorage:
             avg_daily_cost = total_cost / days_with_data if days_with_data > 0 else 0
             estimated_monthly = avg_daily_cost * 30
             
+            # Share of prompt tokens served from the prompt cache
+            prompt_tokens = total_input_tokens + total_cache_creation_tokens + total_cache_read_tokens
+            cache_hit_ratio = total_cache_read_tokens / prompt_tokens if prompt_tokens else 0.0
+            
             return {
                 "period_days": days,
                 "total_messages": total_messages,
@@ -412,6 +494,9 @@ class ChatMessageStorage:
                 "tokens": {
                     "total_input": total_input_tokens,
                     "total_output": total_output_tokens,
+                    "total_cache_creation": total_cache_creation_tokens,
+                    "total_cache_read": total_cache_read_tokens,
+                    "cache_hit_ratio": round(cache_hit_ratio, 4),
                 },
                 "costs": {
                     "total_usd": round(total_cost, 4),
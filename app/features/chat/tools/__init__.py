@@ -5,7 +5,9 @@ This package provides all tools available to the Claude chat interface.
 Tools are organized by domain into separate modules for maintainability.
 
 Usage:
-    from app.features.chat.tools import TOOLS, execute_tool, get_all_tools
+    from app.features.chat.tools import TOOLS, execute_tool, execute_tool_async, execute_tool_calls, get_all_tools
+    results = await execute_tool_calls([(name, input), ...])  # One Claude turn, concurrently
+    prefetch = start_tool_prefetch(message)  # Likely first calls, before Claude asks
 
 Modules:
     - database_tools: SQL queries, writes, schema management, backups
@@ -19,8 +21,12 @@ Modules:
     - knowledge_tools: Knowledge base, semantic search, documents
     - memory_tools: Memory management (facts, behaviors)
     - misc_tools: Location, books, transcripts, applications, LinkedIn posts
+    - registry: Tool name -> sync/async implementation dispatch table
+    - scheduler: Concurrent execution of one turn's tool calls (writes serialized)
+    - prefetch: Keyword intent classifier + speculative read-only tool calls
 """
 
+import functools
 import logging
 from typing import Dict, List, Any
 
@@ -28,16 +34,39 @@ from typing import Dict, List, Any
 from .base import (
     USE_MCP_DELEGATION,
     MCP_DELEGATED_TOOLS,
-    _get_mcp_client,
     _get_identity_token,
     _get_sync_service_headers,
     _get_sync_service_url,
     _sanitize_ilike,
-    _run_async,
     _handle_research_tool,
     logger,
 )
 
+# Name -> implementation dispatch
+from .registry import (
+    TOOL_REGISTRY,
+    register_tool,
+    get_tool_spec,
+    dispatch_tool,
+    dispatch_tool_sync,
+)
+
+# Concurrent execution of multiple tool calls
+from .scheduler import (
+    WRITE_TOOLS,
+    is_write_tool,
+    iter_tool_results,
+    execute_tool_calls,
+)
+
+# Speculative read-only calls started from the user's message
+from .prefetch import (
+    ToolPrefetch,
+    classify_intent,
+    start_tool_prefetch,
+    get_prefetch_stats,
+)
+
 # Tool definitions from each module
 from .database_tools import DATABASE_TOOLS
 from .calendar_tools import CALENDAR_TOOLS
@@ -142,8 +171,155 @@ def get_all_tools() -> List[Dict[str, Any]]:
 # TOOL EXECUTION
 # =============================================================================
 
+def _send_beeper_message_tool(tool_input: Dict[str, Any]) -> Dict[str, Any]:
+    logger.info(f"SEND_BEEPER_MESSAGE called with: {tool_input}")
+    result = _send_beeper_message(tool_input)
+    logger.info(f"SEND_BEEPER_MESSAGE result: {result}")
+    return result
+
+
+# Sync tools: blocking Supabase / Google / Beeper calls, run on the tool executor
+_SYNC_TOOLS = {
+    # Database tools
+    "execute_sql_write": _execute_sql_write,
+    "update_record": _update_record,
+    "query_database": lambda i: _query_database(i.get("sql", "")),
+    "list_database_tables": _list_database_tables,
+    "create_database_table": _create_database_table,
+    "add_column_to_table": _add_column_to_table,
+    "update_data_batch": _update_data_batch,
+    "insert_data_batch": _insert_data_batch,
+    "get_database_backup_status": _get_database_backup_status,
+    "backup_table": _backup_table,
+
+    # Knowledge tools
+    "get_reflections": _get_reflections,
+    "create_reflection": _create_reflection,
+    "get_journals": _get_journals,
+
+    # Contact tools
+    "search_contacts": lambda i: _search_contacts(i.get("query", ""), i.get("limit", 5)),
+    "get_contact_history": lambda i: _get_contact_history(i.get("contact_name", "")),
+    "create_contact": _create_contact,
+    "update_contact": _update_contact,
+    "add_contact_note": _add_contact_note,
+    "who_to_contact": _who_to_contact,
+
+    # Task tools
+    "get_tasks": lambda i: _get_tasks(i.get("status", "pending"), i.get("limit", 100)),
+    "create_task": _create_task,
+    "update_task": _update_task,
+    "complete_task": _complete_task,
+    "delete_task": _delete_task,
+
+    # Meeting tools
+    "search_meetings": _search_meetings,
+    "create_meeting": _create_meeting,
+
+    # Calendar tools
+    "get_upcoming_events": lambda i: _get_upcoming_events(i.get("days", 7)),
+    "create_calendar_event": _create_calendar_event,
+    "update_calendar_event": _update_calendar_event,
+    "decline_calendar_event": _decline_calendar_event,
+
+    # Email tools
+    "get_recent_emails": _get_recent_emails,
+    "get_email_by_id": _get_email_by_id,
+    "search_emails_live": _search_emails_live,
+    "create_email_draft": _create_email_draft,
+    "list_email_drafts": _list_email_drafts,
+    "get_email_draft": _get_email_draft,
+    "send_email_draft": _send_email_draft,
+    "delete_email_draft": _delete_email_draft,
+
+    # Messaging tools (Beeper)
+    "get_beeper_inbox": _get_beeper_inbox,
+    "get_beeper_chat_messages": _get_beeper_chat_messages,
+    "search_beeper_messages": _search_beeper_messages,
+    "get_beeper_contact_messages": _get_beeper_contact_messages,
+    "archive_beeper_chat": _archive_beeper_chat,
+    "unarchive_beeper_chat": _unarchive_beeper_chat,
+    "mark_beeper_read": _mark_beeper_read,
+    "get_beeper_status": _get_beeper_status,
+
+    # Sync tools
+    "quick_sync": _quick_sync,
+
+    # Misc tools - Location & Timezone
+    "set_user_location": _set_user_location,
+    "get_user_location": lambda i: _get_user_location(),
+    "get_current_time": lambda i: _get_current_time(),
+
+    # Misc tools - Books & Highlights
+    "get_books": _get_books,
+    "get_highlights": _get_highlights,
+    "search_reading_notes": _search_reading_notes,
+
+    # Misc tools - Transcripts
+    "search_transcripts": _search_transcripts,
+    "get_full_transcript": _get_full_transcript,
+    "get_recent_voice_memo": _get_recent_voice_memo,
+
+    # Misc tools - Activity
+    "summarize_activity": lambda i: _summarize_activity(i.get("period", "today")),
+
+    # Misc tools - Applications
+    "get_applications": _get_applications,
+    "search_applications": _search_applications,
+    "get_application_content": _get_application_content,
+    "update_application": _update_application,
+
+    # Misc tools - LinkedIn Posts
+    "get_linkedin_posts": _get_linkedin_posts,
+    "search_linkedin_posts": _search_linkedin_posts,
+    "get_linkedin_post_content": _get_linkedin_post_content,
+
+    # Books pipeline tools
+    "create_summary_book": _create_summary_book,
+    "get_summary_book_status": _get_summary_book_status,
+    "list_summary_book_projects": _list_summary_book_projects,
+}
+
+# Async tools: awaited on the event loop with the shared HTTP/DB pools
+_ASYNC_TOOLS = {
+    # Knowledge tools
+    "query_knowledge": lambda i: _query_knowledge(
+        i.get("query", ""), i.get("content_types"), i.get("limit", 10)
+    ),
+    "search_documents": _search_documents,
+    "get_document_content": _get_document_content,
+    "search_conversations": _search_conversations,
+
+    # Memory tools (MemoryService is async; Mem0 runs on its own pool)
+    "remember_fact": _remember_fact,
+    "remember_behavior": _remember_behavior,
+    "search_memories": _search_memories,
+    "correct_memory": _correct_memory,
+    "forget_memory": _forget_memory,
+}
+
+# Research tools (LinkedIn via Bright Data, Web Search via Brave)
+_RESEARCH_TOOL_NAMES = (
+    "linkedin_get_profiles", "linkedin_search_people",
+    "linkedin_get_company", "linkedin_get_company_employees",
+    "linkedin_get_company_jobs", "web_search", "web_search_news",
+    "get_research_status",
+)
+
+for _name, _handler in _SYNC_TOOLS.items():
+    register_tool(_name, _handler, is_async=False)
+for _name, _handler in _ASYNC_TOOLS.items():
+    register_tool(_name, _handler, is_async=True)
+for _name in _RESEARCH_TOOL_NAMES:
+    # Providers use the main loop's pooled HTTP client
+    register_tool(_name, functools.partial(_handle_research_tool, _name), is_async=True, loop_bound=True)
+register_tool("send_beeper_message", _send_beeper_message_tool, is_async=False, pass_user_message=True)
+
+
 def execute_tool(tool_name: str, tool_input: Dict[str, Any], last_user_message: str = "") -> Dict[str, Any]:
-    """Execute a tool and return the result.
+    """Execute a tool from synchronous code and return the result.
+
+    Async code (the chat loop) should use execute_tool_async instead.
 
     Args:
         tool_name: Name of the tool to execute
@@ -154,249 +330,16 @@ def execute_tool(tool_name: str, tool_input: Dict[str, Any], last_user_message:
         When USE_MCP_DELEGATION=true, mapped tools delegate to jarvis-mcp-server.
         Falls back to local implementation if MCP call fails.
     """
-    import asyncio
-    import concurrent.futures
-
-    # Try MCP delegation first if enabled
-    if USE_MCP_DELEGATION and tool_name in MCP_DELEGATED_TOOLS:
-        mcp = _get_mcp_client()
-        if mcp:
-            mcp_tool = MCP_DELEGATED_TOOLS[tool_name]
-            try:
-                # Run async MCP call in sync context
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    with concurrent.futures.ThreadPoolExecutor() as pool:
-                        result = pool.submit(
-                            asyncio.run,
-                            mcp.execute_tool(mcp_tool, tool_input)
-                        ).result(timeout=30)
-                else:
-                    result = asyncio.run(mcp.execute_tool(mcp_tool, tool_input))
-
-                if result.get("ok"):
-                    logger.debug(f"Tool {tool_name} delegated to MCP successfully")
-                    return {
-                        "success": True,
-                        "data": result.get("data"),
-                        "source": "mcp",
-                    }
-                else:
-                    logger.warning(f"MCP tool {tool_name} failed, falling back to local: {result.get('error')}")
-            except Exception as e:
-                logger.warning(f"MCP delegation failed for {tool_name}, falling back to local: {e}")
-
-    # Local implementation (fallback or non-delegated tools)
-    try:
-        # Database tools
-        if tool_name == "execute_sql_write":
-            return _execute_sql_write(tool_input)
-        elif tool_name == "update_record":
-            return _update_record(tool_input)
-        elif tool_name == "query_database":
-            return _query_database(tool_input.get("sql", ""))
-        elif tool_name == "list_database_tables":
-            return _list_database_tables(tool_input)
-        elif tool_name == "create_database_table":
-            return _create_database_table(tool_input)
-        elif tool_name == "add_column_to_table":
-            return _add_column_to_table(tool_input)
-        elif tool_name == "update_data_batch":
-            return _update_data_batch(tool_input)
-        elif tool_name == "insert_data_batch":
-            return _insert_data_batch(tool_input)
-        elif tool_name == "get_database_backup_status":
-            return _get_database_backup_status(tool_input)
-        elif tool_name == "backup_table":
-            return _backup_table(tool_input)
-
-        # Knowledge tools
-        elif tool_name == "query_knowledge":
-            return _query_knowledge(
-                tool_input.get("query", ""),
-                tool_input.get("content_types"),
-                tool_input.get("limit", 10)
-            )
-        elif tool_name == "search_documents":
-            return _run_async(_search_documents(tool_input))
-        elif tool_name == "get_document_content":
-            return _run_async(_get_document_content(tool_input))
-        elif tool_name == "search_conversations":
-            return _run_async(_search_conversations(tool_input))
-        elif tool_name == "get_reflections":
-            return _get_reflections(tool_input)
-        elif tool_name == "create_reflection":
-            return _create_reflection(tool_input)
-        elif tool_name == "get_journals":
-            return _get_journals(tool_input)
-
-        # Contact tools
-        elif tool_name == "search_contacts":
-            return _search_contacts(tool_input.get("query", ""), tool_input.get("limit", 5))
-        elif tool_name == "get_contact_history":
-            return _get_contact_history(tool_input.get("contact_name", ""))
-        elif tool_name == "create_contact":
-            return _create_contact(tool_input)
-        elif tool_name == "update_contact":
-            return _update_contact(tool_input)
-        elif tool_name == "add_contact_note":
-            return _add_contact_note(tool_input)
-        elif tool_name == "who_to_contact":
-            return _who_to_contact(tool_input)
-
-        # Task tools
-        elif tool_name == "get_tasks":
-            return _get_tasks(tool_input.get("status", "pending"), tool_input.get("limit", 100))
-        elif tool_name == "create_task":
-            return _create_task(tool_input)
-        elif tool_name == "update_task":
-            return _update_task(tool_input)
-        elif tool_name == "complete_task":
-            return _complete_task(tool_input)
-        elif tool_name == "delete_task":
-            return _delete_task(tool_input)
-
-        # Meeting tools
-        elif tool_name == "search_meetings":
-            return _search_meetings(tool_input)
-        elif tool_name == "create_meeting":
-            return _create_meeting(tool_input)
-
-        # Calendar tools
-        elif tool_name == "get_upcoming_events":
-            return _get_upcoming_events(tool_input.get("days", 7))
-        elif tool_name == "create_calendar_event":
-            return _create_calendar_event(tool_input)
-        elif tool_name == "update_calendar_event":
-            return _update_calendar_event(tool_input)
-        elif tool_name == "decline_calendar_event":
-            return _decline_calendar_event(tool_input)
-
-        # Email tools
-        elif tool_name == "get_recent_emails":
-            return _get_recent_emails(tool_input)
-        elif tool_name == "get_email_by_id":
-            return _get_email_by_id(tool_input)
-        elif tool_name == "search_emails_live":
-            return _search_emails_live(tool_input)
-        elif tool_name == "create_email_draft":
-            return _create_email_draft(tool_input)
-        elif tool_name == "list_email_drafts":
-            return _list_email_drafts(tool_input)
-        elif tool_name == "get_email_draft":
-            return _get_email_draft(tool_input)
-        elif tool_name == "send_email_draft":
-            return _send_email_draft(tool_input)
-        elif tool_name == "delete_email_draft":
-            return _delete_email_draft(tool_input)
-
-        # Messaging tools (Beeper)
-        elif tool_name == "get_beeper_inbox":
-            return _get_beeper_inbox(tool_input)
-        elif tool_name == "get_beeper_chat_messages":
-            return _get_beeper_chat_messages(tool_input)
-        elif tool_name == "search_beeper_messages":
-            return _search_beeper_messages(tool_input)
-        elif tool_name == "get_beeper_contact_messages":
-            return _get_beeper_contact_messages(tool_input)
-        elif tool_name == "archive_beeper_chat":
-            return _archive_beeper_chat(tool_input)
-        elif tool_name == "unarchive_beeper_chat":
-            return _unarchive_beeper_chat(tool_input)
-        elif tool_name == "send_beeper_message":
-            logger.info(f"SEND_BEEPER_MESSAGE called with: {tool_input}")
-            tool_input["_last_user_message"] = last_user_message
-            result = _send_beeper_message(tool_input)
-            logger.info(f"SEND_BEEPER_MESSAGE result: {result}")
-            return result
-        elif tool_name == "mark_beeper_read":
-            return _mark_beeper_read(tool_input)
-        elif tool_name == "get_beeper_status":
-            return _get_beeper_status(tool_input)
-
-        # Memory tools
-        elif tool_name == "remember_fact":
-            return _remember_fact(tool_input)
-        elif tool_name == "remember_behavior":
-            return _remember_behavior(tool_input)
-        elif tool_name == "search_memories":
-            return _search_memories(tool_input)
-        elif tool_name == "correct_memory":
-            return _correct_memory(tool_input)
-        elif tool_name == "forget_memory":
-            return _forget_memory(tool_input)
-
-        # Sync tools
-        elif tool_name == "quick_sync":
-            return _quick_sync(tool_input)
-
-        # Misc tools - Location & Timezone
-        elif tool_name == "set_user_location":
-            return _set_user_location(tool_input)
-        elif tool_name == "get_user_location":
-            return _get_user_location()
-        elif tool_name == "get_current_time":
-            return _get_current_time()
-
-        # Misc tools - Books & Highlights
-        elif tool_name == "get_books":
-            return _get_books(tool_input)
-        elif tool_name == "get_highlights":
-            return _get_highlights(tool_input)
-        elif tool_name == "search_reading_notes":
-            return _search_reading_notes(tool_input)
-
-        # Misc tools - Transcripts
-        elif tool_name == "search_transcripts":
-            return _search_transcripts(tool_input)
-        elif tool_name == "get_full_transcript":
-            return _get_full_transcript(tool_input)
-        elif tool_name == "get_recent_voice_memo":
-            return _get_recent_voice_memo(tool_input)
-
-        # Misc tools - Activity
-        elif tool_name == "summarize_activity":
-            return _summarize_activity(tool_input.get("period", "today"))
-
-        # Misc tools - Applications
-        elif tool_name == "get_applications":
-            return _get_applications(tool_input)
-        elif tool_name == "search_applications":
-            return _search_applications(tool_input)
-        elif tool_name == "get_application_content":
-            return _get_application_content(tool_input)
-        elif tool_name == "update_application":
-            return _update_application(tool_input)
-
-        # Misc tools - LinkedIn Posts
-        elif tool_name == "get_linkedin_posts":
-            return _get_linkedin_posts(tool_input)
-        elif tool_name == "search_linkedin_posts":
-            return _search_linkedin_posts(tool_input)
-        elif tool_name == "get_linkedin_post_content":
-            return _get_linkedin_post_content(tool_input)
-
-        # Books pipeline tools
-        elif tool_name == "create_summary_book":
-            return _create_summary_book(tool_input)
-        elif tool_name == "get_summary_book_status":
-            return _get_summary_book_status(tool_input)
-        elif tool_name == "list_summary_book_projects":
-            return _list_summary_book_projects(tool_input)
-
-        # Research tools (LinkedIn via Bright Data, Web Search via Brave)
-        elif tool_name in ("linkedin_get_profiles", "linkedin_search_people",
-                          "linkedin_get_company", "linkedin_get_company_employees",
-                          "linkedin_get_company_jobs", "web_search", "web_search_news",
-                          "get_research_status"):
-            return _run_async(_handle_research_tool(tool_name, tool_input))
-
-        else:
-            return {"error": f"Unknown tool: {tool_name}"}
-
-    except Exception as e:
-        logger.error(f"Tool execution error [{tool_name}]: {e}")
-        return {"error": str(e)}
+    return dispatch_tool_sync(tool_name, tool_input, last_user_message)
+
+
+async def execute_tool_async(tool_name: str, tool_input: Dict[str, Any], last_user_message: str = "") -> Dict[str, Any]:
+    """Execute a tool without blocking the event loop.
+
+    Looks the tool up in the registry: async tools are awaited on the
+    running loop, sync tools run on the shared tool executor.
+    """
+    return await dispatch_tool(tool_name, tool_input, last_user_message)
 
 
 # =============================================================================
@@ -407,8 +350,24 @@ __all__ = [
     # Main exports
     "TOOLS",
     "execute_tool",
+    "execute_tool_async",
+    "execute_tool_calls",
+    "iter_tool_results",
+    "is_write_tool",
+    "WRITE_TOOLS",
     "get_all_tools",
 
+    # Prefetch
+    "ToolPrefetch",
+    "classify_intent",
+    "start_tool_prefetch",
+    "get_prefetch_stats",
+
+    # Registry
+    "TOOL_REGISTRY",
+    "register_tool",
+    "get_tool_spec",
+
     # Base utilities (for advanced usage)
     "USE_MCP_DELEGATION",
     "MCP_DELEGATED_TOOLS",
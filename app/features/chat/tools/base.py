@@ -189,6 +189,10 @@ def _run_async(coro):
 
     Solution: Create a new event loop, run the coroutine, and let it complete
     fully (including cleanup) before closing.
+
+    The chat loop no longer goes through here: async tools are awaited on
+    the main loop (see registry.py). What remains is sync callers
+    (scripts, dispatch_tool_sync) running an async tool to completion.
     """
     def run_in_new_loop(coro):
         """Run coroutine in a new event loop, ensuring proper cleanup."""
@@ -223,6 +227,24 @@ def _run_async(coro):
         return run_in_new_loop(coro)
 
 
+# Tool implementations are blocking (Supabase, Google APIs, Beeper), so the
+# async chat loop runs them on this pool instead of the event loop
+TOOL_EXECUTOR_WORKERS = int(os.getenv("TOOL_EXECUTOR_WORKERS", "16"))
+
+_tool_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+
+def _get_tool_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Lazy-create the shared thread pool for tool execution."""
+    global _tool_executor
+    if _tool_executor is None:
+        _tool_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=TOOL_EXECUTOR_WORKERS,
+            thread_name_prefix="jarvis-tool"
+        )
+    return _tool_executor
+
+
 # =============================================================================
 # RESEARCH TOOLS HANDLER (Lazy import)
 # =============================================================================
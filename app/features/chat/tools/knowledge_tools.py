@@ -9,7 +9,7 @@ import logging
 from typing import Dict, List, Any, Optional
 
 from app.core.database import supabase
-from .base import _run_async, _sanitize_ilike, logger
+from .base import _sanitize_ilike, logger
 
 
 # =============================================================================
@@ -233,7 +233,7 @@ _PLURAL_TO_SINGULAR = {
 }
 
 
-def _query_knowledge(
+async def _query_knowledge(
     query: str,
     content_types: Optional[List[str]] = None,
     limit: int = 10
@@ -258,12 +258,12 @@ def _query_knowledge(
 
         db = _DB(supabase)
 
-        results = _run_async(hybrid_search(
+        results = await hybrid_search(
             query=query,
             db=db,
             source_types=content_types,
             limit=limit
-        ))
+        )
 
         if not results:
             return {
@@ -291,8 +291,9 @@ def _query_knowledge(
         }
     except Exception as e:
         logger.error(f"Knowledge search error: {e}", exc_info=True)
-        # Fallback to basic text search if semantic search fails
-        return _fallback_text_search(query, content_types, limit)
+        # Fallback to basic text search if semantic search fails (blocking ILIKE queries)
+        from app.features.database import get_async_database
+        return await get_async_database().run(_fallback_text_search, query, content_types, limit)
 
 
 def _fallback_text_search(
@@ -8,7 +8,7 @@ behaviors, searching memories, and forgetting/correcting memories.
 import logging
 from typing import Dict, Any
 
-from .base import _run_async, logger
+from .base import logger
 
 
 # =============================================================================
@@ -138,7 +138,7 @@ You must provide at least one of memory_id or query.""",
 # TOOL IMPLEMENTATIONS
 # =============================================================================
 
-def _remember_fact(tool_input: Dict[str, Any]) -> Dict[str, Any]:
+async def _remember_fact(tool_input: Dict[str, Any]) -> Dict[str, Any]:
     """Remember a fact or piece of information."""
     from app.features.memory import get_memory_service, MemoryType
 
@@ -152,15 +152,13 @@ def _remember_fact(tool_input: Dict[str, Any]) -> Dict[str, Any]:
         memory_service = get_memory_service()
 
         # Add the memory
-        result = _run_async(
-            memory_service.add(
-                content=fact,
-                memory_type=MemoryType.FACT,
-                metadata={
-                    "source": "chat_remember",
-                    "context": context or None
-                }
-            )
+        result = await memory_service.add(
+            content=fact,
+            memory_type=MemoryType.FACT,
+            metadata={
+                "source": "chat_remember",
+                "context": context or None
+            }
         )
 
         # Handle different result types
@@ -213,7 +211,7 @@ def _remember_fact(tool_input: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 
-def _remember_behavior(tool_input: Dict[str, Any]) -> Dict[str, Any]:
+async def _remember_behavior(tool_input: Dict[str, Any]) -> Dict[str, Any]:
     """Learn a new behavior rule or preference."""
     from app.features.memory import get_memory_service, MemoryType
 
@@ -226,15 +224,13 @@ def _remember_behavior(tool_input: Dict[str, Any]) -> Dict[str, Any]:
     try:
         memory_service = get_memory_service()
 
-        result = _run_async(
-            memory_service.add(
-                content=behavior,
-                memory_type=MemoryType.BEHAVIOR,
-                metadata={
-                    "source": "chat_learn_behavior",
-                    "context": context or None
-                }
-            )
+        result = await memory_service.add(
+            content=behavior,
+            memory_type=MemoryType.BEHAVIOR,
+            metadata={
+                "source": "chat_learn_behavior",
+                "context": context or None
+            }
         )
 
         # Handle different result types
@@ -287,7 +283,7 @@ def _remember_behavior(tool_input: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 
-def _correct_memory(tool_input: Dict[str, Any]) -> Dict[str, Any]:
+async def _correct_memory(tool_input: Dict[str, Any]) -> Dict[str, Any]:
     """Correct an existing memory by deleting old and adding new."""
     from app.features.memory import get_memory_service, MemoryType
 
@@ -301,16 +297,14 @@ def _correct_memory(tool_input: Dict[str, Any]) -> Dict[str, Any]:
         memory_service = get_memory_service()
 
         # Search for memories matching the incorrect info
-        memories = _run_async(memory_service.search(incorrect_info, limit=5))
+        memories = await memory_service.search(incorrect_info, limit=5)
 
         if not memories:
             # No existing memory found, just add the correct one
-            result = _run_async(
-                memory_service.add(
-                    content=correct_info,
-                    memory_type=MemoryType.FACT,
-                    metadata={"source": "chat_correction", "corrected_from": incorrect_info}
-                )
+            result = await memory_service.add(
+                content=correct_info,
+                memory_type=MemoryType.FACT,
+                metadata={"source": "chat_correction", "corrected_from": incorrect_info}
             )
             if isinstance(result, dict):
                 memory_id = result.get("id") or result.get("memory_id") or str(result)
@@ -329,18 +323,16 @@ def _correct_memory(tool_input: Dict[str, Any]) -> Dict[str, Any]:
             mem_id = mem.get("id")
             mem_text = mem.get("memory", "") or mem.get("data", "")
             if mem_id and incorrect_info.lower() in mem_text.lower():
-                success = _run_async(memory_service.delete(mem_id))
+                success = await memory_service.delete(mem_id)
                 if success:
                     deleted_count += 1
                     deleted_items.append({"id": mem_id, "content": mem_text[:80]})
 
         # Add the correct memory
-        new_result = _run_async(
-            memory_service.add(
-                content=correct_info,
-                memory_type=MemoryType.FACT,
-                metadata={"source": "chat_correction", "corrected_from": incorrect_info}
-            )
+        new_result = await memory_service.add(
+            content=correct_info,
+            memory_type=MemoryType.FACT,
+            metadata={"source": "chat_correction", "corrected_from": incorrect_info}
         )
         if isinstance(new_result, dict):
             new_id = new_result.get("id") or new_result.get("memory_id") or str(new_result)
@@ -361,7 +353,7 @@ def _correct_memory(tool_input: Dict[str, Any]) -> Dict[str, Any]:
         return {"error": f"Failed to correct: {str(e)}"}
 
 
-def _search_memories(tool_input: Dict[str, Any]) -> Dict[str, Any]:
+async def _search_memories(tool_input: Dict[str, Any]) -> Dict[str, Any]:
     """Search stored memories."""
     from app.features.memory import get_memory_service
 
@@ -376,7 +368,7 @@ def _search_memories(tool_input: Dict[str, Any]) -> Dict[str, Any]:
         memory_service = get_memory_service()
 
         search_limit = limit * 3 if memory_type else limit
-        memories = _run_async(memory_service.search(query, limit=search_limit))
+        memories = await memory_service.search(query, limit=search_limit)
 
         if not memories:
             return {
@@ -425,7 +417,7 @@ def _search_memories(tool_input: Dict[str, Any]) -> Dict[str, Any]:
         return {"error": f"Failed to search: {str(e)}"}
 
 
-def _forget_memory(tool_input: Dict[str, Any]) -> Dict[str, Any]:
+async def _forget_memory(tool_input: Dict[str, Any]) -> Dict[str, Any]:
     """Delete a memory by ID or search query."""
     from app.features.memory import get_memory_service
 
@@ -440,7 +432,7 @@ def _forget_memory(tool_input: Dict[str, Any]) -> Dict[str, Any]:
 
         # If specific ID provided, delete directly
         if memory_id:
-            success = _run_async(memory_service.delete(memory_id))
+            success = await memory_service.delete(memory_id)
             if success:
                 return {
                     "status": "deleted",
@@ -455,7 +447,7 @@ def _forget_memory(tool_input: Dict[str, Any]) -> Dict[str, Any]:
                 }
 
         # Otherwise search and delete matching memories
-        memories = _run_async(memory_service.search(query, limit=10))
+        memories = await memory_service.search(query, limit=10)
 
         if not memories:
             return {
@@ -473,7 +465,7 @@ def _forget_memory(tool_input: Dict[str, Any]) -> Dict[str, Any]:
             mem_id = mem.get("id")
             mem_text = mem.get("memory", "") or mem.get("data", "")
             if mem_id:
-                success = _run_async(memory_service.delete(mem_id))
+                success = await memory_service.delete(mem_id)
                 if success:
                     deleted_items.append({
                         "id": mem_id,
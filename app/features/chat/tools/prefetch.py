@@ -0,0 +1,212 @@
+"""
+Speculative tool prefetch - start the obvious first tool call before Claude asks.
+
+Many messages lead to the same first tool call every time ("what's on
+today" -> get_upcoming_events, "any unread messages" -> get_beeper_inbox,
+"tasks due" -> get_tasks). That call normally only starts after a full
+Claude round trip. classify_intent() matches the message against keyword
+rules (no LLM call) and ToolPrefetch starts those read-only tools while
+the context is gathered and the first model call runs.
+
+Rules:
+- Only read-only tools are prefetched, with the input Claude would most
+  likely send (schema defaults); a prefetched result is used only when
+  Claude's input matches it after applying the same defaults
+- Results are scoped to one turn and dropped as soon as the turn runs a
+  write tool, so a later read sees the write
+- Unused prefetches are cancelled when the turn ends
+
+Usage:
+    from app.features.chat.tools import start_tool_prefetch
+
+    prefetch = start_tool_prefetch(request.message)
+    try:
+        ...
+        results = await execute_tool_calls(calls, prefetch=prefetch)
+    finally:
+        prefetch.close()
+"""
+
+import os
+import re
+import json
+import asyncio
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+from .base import logger
+
+ToolCall = Tuple[str, Dict[str, Any]]  # (tool_name, tool_input)
+
+PREFETCH_ENABLED = os.getenv("CHAT_TOOL_PREFETCH", "true").lower() == "true"
+# Never start more than this many speculative calls per message
+PREFETCH_MAX_TOOLS = int(os.getenv("CHAT_TOOL_PREFETCH_MAX", "3"))
+
+
+class IntentRule:
+    """Message pattern -> tool call to prefetch."""
+
+    __slots__ = ("tool_name", "tool_input", "pattern", "unless")
+
+    def __init__(
+        self,
+        tool_name: str,
+        pattern: str,
+        tool_input: Optional[Dict[str, Any]] = None,
+        unless: Optional[str] = None
+    ):
+        self.tool_name = tool_name
+        self.tool_input = tool_input or {}
+        self.pattern: Pattern = re.compile(pattern, re.IGNORECASE)
+        self.unless: Optional[Pattern] = re.compile(unless, re.IGNORECASE) if unless else None
+
+    def matches(self, message: str) -> bool:
+        if not self.pattern.search(message):
+            return False
+        return self.unless is None or not self.unless.search(message)
+
+
+# Messages asking to create/change something lead to a write tool, not a read
+_WRITE_INTENT = r"\b(create|add|book|move|reschedule|cancel|delete|remove|mark|complete|send|reply to|draft|remind me)\b"
+
+INTENT_RULES: List[IntentRule] = [
+    IntentRule(
+        "get_upcoming_events",
+        r"\b(calendar|agenda|schedule|what'?s on|am i (free|busy)|free (time|slot)s?|"
+        r"meetings? (today|tomorrow|this week|next week)|(today|tomorrow)'?s? (meetings?|events?))\b",
+        unless=_WRITE_INTENT,
+    ),
+    IntentRule(
+        "get_beeper_inbox",
+        r"\b((any|new|unread|my) (messages?|dms?|chats?)|who (do|should) i (need to )?(reply|respond)|"
+        r"need(s)? (a )?(reply|response)|whatsapp|telegram|beeper|linkedin messages?)\b",
+        unless=r"\b(send|reply to|archive|mark)\b",
+    ),
+    IntentRule(
+        "get_tasks",
+        r"\b(tasks?|to-?dos?|overdue|due (today|tomorrow|this week)|what('?s| is) due)\b",
+        unless=_WRITE_INTENT,
+    ),
+    IntentRule(
+        "get_recent_emails",
+        r"\b(e-?mails?|gmail|mail ?box|new mail)\b",
+        unless=r"\b(send|draft|write|reply|forward|delete)\b",
+    ),
+]
+
+
+def classify_intent(message: str) -> List[ToolCall]:
+    """
+    Tool calls the message will most likely start with.
+
+    Args:
+        message: The user's message
+
+    Returns:
+        (tool_name, tool_input) pairs, at most PREFETCH_MAX_TOOLS
+    """
+    if not message:
+        return []
+    calls = [(rule.tool_name, dict(rule.tool_input)) for rule in INTENT_RULES if rule.matches(message)]
+    return calls[:PREFETCH_MAX_TOOLS]
+
+
+_schema_defaults: Optional[Dict[str, Dict[str, Any]]] = None
+
+
+def _defaults_for(tool_name: str) -> Dict[str, Any]:
+    """Default values from the tool's input_schema."""
+    global _schema_defaults
+    if _schema_defaults is None:
+        from . import TOOLS
+        _schema_defaults = {
+            tool["name"]: {
+                prop: spec["default"]
+                for prop, spec in tool.get("input_schema", {}).get("properties", {}).items()
+                if "default" in spec
+            }
+            for tool in TOOLS
+        }
+    return _schema_defaults.get(tool_name, {})
+
+
+def _call_key(tool_name: str, tool_input: Dict[str, Any]) -> str:
+    """Canonical key for a call: input with schema defaults filled in."""
+    full = {**_defaults_for(tool_name), **(tool_input or {})}
+    return tool_name + ":" + json.dumps(full, sort_keys=True, default=str)
+
+
+# Process-wide counters for /chat/health
+_stats = {"started": 0, "hits": 0, "unused": 0}
+
+
+class ToolPrefetch:
+    """Speculative read-only tool calls for one chat turn."""
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._used: set = set()
+
+    def start(self, calls: List[ToolCall]) -> None:
+        """Start calls in the background (read-only tools only)."""
+        from .scheduler import is_write_tool, _run_one
+
+        for tool_name, tool_input in calls:
+            if is_write_tool(tool_name):
+                continue
+            key = _call_key(tool_name, tool_input)
+            if key in self._tasks:
+                continue
+            self._tasks[key] = asyncio.create_task(_run_one(tool_name, tool_input, ""))
+            _stats["started"] += 1
+        if self._tasks:
+            logger.info(f"Prefetching {[key.split(':', 1)[0] for key in self._tasks]}")
+
+    def take(self, tool_name: str, tool_input: Dict[str, Any]) -> Optional[asyncio.Task]:
+        """The prefetched task for this exact call, or None."""
+        key = _call_key(tool_name, tool_input)
+        task = self._tasks.get(key)
+        if task is None or task.cancelled():
+            return None
+        if key not in self._used:
+            self._used.add(key)
+            _stats["hits"] += 1
+        return task
+
+    def discard(self) -> None:
+        """Drop every prefetched result (a write ran, they may be stale)."""
+        if self._tasks:
+            self._cancel_unused()
+            self._tasks.clear()
+
+    def close(self) -> None:
+        """End of turn: cancel prefetches Claude never asked for."""
+        self.discard()
+
+    def _cancel_unused(self) -> None:
+        for key, task in self._tasks.items():
+            if key in self._used:
+                continue
+            _stats["unused"] += 1
+            if not task.done():
+                task.cancel()
+
+
+def start_tool_prefetch(message: str) -> ToolPrefetch:
+    """Classify message and start its likely tool calls. Always returns a ToolPrefetch."""
+    prefetch = ToolPrefetch()
+    if PREFETCH_ENABLED:
+        try:
+            prefetch.start(classify_intent(message))
+        except Exception as e:
+            logger.warning(f"Tool prefetch failed to start: {e}")
+    return prefetch
+
+
+def get_prefetch_stats() -> Dict[str, Any]:
+    """Started / hit / unused counts since process start."""
+    started = _stats["started"]
+    return {
+        "enabled": PREFETCH_ENABLED,
+        **_stats,
+        "hit_rate": round(_stats["hits"] / started, 3) if started else 0.0,
+    }
@@ -0,0 +1,182 @@
+"""
+Tool registry - O(1) dispatch from tool name to implementation.
+
+Every tool is registered once with whether it is async or sync:
+- async tools are awaited directly on the running event loop, so they
+  share the pooled httpx client (http_client_manager) and the DB facade
+- sync tools (blocking Supabase, Google API and Beeper calls) run on the
+  long-lived bounded tool executor (base._get_tool_executor)
+
+Loop-bound tools (research providers using http_client_manager.scoped_client)
+only work on the main event loop and are refused by dispatch_tool_sync.
+
+MCP-delegated tools (USE_MCP_DELEGATION) are tried against
+jarvis-mcp-server first, on the same loop, then fall back to the local
+implementation.
+
+Successful write tools (scheduler.WRITE_TOOLS) invalidate the chat context
+snapshot blocks built from the tables they touch.
+
+Usage:
+    register_tool("get_tasks", _get_tasks_handler, is_async=False)
+    result = await dispatch_tool("get_tasks", {"status": "pending"})
+"""
+
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from .base import (
+    USE_MCP_DELEGATION,
+    MCP_DELEGATED_TOOLS,
+    _get_mcp_client,
+    _get_tool_executor,
+    _run_async,
+    logger,
+)
+
+ToolResult = Dict[str, Any]
+ToolHandler = Callable[[Dict[str, Any]], Union[ToolResult, Awaitable[ToolResult]]]
+
+MCP_TIMEOUT_SECONDS = 30.0
+
+
+class ToolSpec:
+    """One registered tool: its handler and how to run it."""
+
+    __slots__ = ("name", "handler", "is_async", "pass_user_message", "loop_bound")
+
+    def __init__(
+        self,
+        name: str,
+        handler: ToolHandler,
+        is_async: bool,
+        pass_user_message: bool = False,
+        loop_bound: bool = False
+    ):
+        self.name = name
+        self.handler = handler
+        self.is_async = is_async
+        # Handler receives the triggering user message as tool_input["_last_user_message"]
+        self.pass_user_message = pass_user_message
+        # Handler uses clients owned by the main event loop
+        self.loop_bound = loop_bound
+
+    def prepare_input(self, tool_input: Dict[str, Any], last_user_message: str) -> Dict[str, Any]:
+        if self.pass_user_message:
+            return {**tool_input, "_last_user_message": last_user_message}
+        return tool_input
+
+
+TOOL_REGISTRY: Dict[str, ToolSpec] = {}
+
+
+def register_tool(
+    name: str,
+    handler: ToolHandler,
+    is_async: bool,
+    pass_user_message: bool = False,
+    loop_bound: bool = False
+) -> None:
+    """
+    Register a tool implementation.
+
+    Args:
+        name: Tool name as exposed to Claude
+        handler: Callable taking tool_input; a coroutine function if is_async
+        is_async: Run on the event loop (True) or the tool executor (False)
+        pass_user_message: Add the last user message to tool_input (send confirmations)
+        loop_bound: Handler needs the main event loop's clients (not callable from sync code)
+    """
+    TOOL_REGISTRY[name] = ToolSpec(name, handler, is_async, pass_user_message, loop_bound)
+
+
+def get_tool_spec(name: str) -> Optional[ToolSpec]:
+    """Look up a registered tool."""
+    return TOOL_REGISTRY.get(name)
+
+
+async def _try_mcp(tool_name: str, tool_input: Dict[str, Any]) -> Optional[ToolResult]:
+    """Delegate to jarvis-mcp-server; None means use the local implementation."""
+    mcp = _get_mcp_client()
+    if not mcp:
+        return None
+    try:
+        result = await asyncio.wait_for(
+            mcp.execute_tool(MCP_DELEGATED_TOOLS[tool_name], tool_input),
+            timeout=MCP_TIMEOUT_SECONDS
+        )
+        if result.get("ok"):
+            logger.debug(f"Tool {tool_name} delegated to MCP successfully")
+            return {
+                "success": True,
+                "data": result.get("data"),
+                "source": "mcp",
+            }
+        logger.warning(f"MCP tool {tool_name} failed, falling back to local: {result.get('error')}")
+    except Exception as e:
+        logger.warning(f"MCP delegation failed for {tool_name}, falling back to local: {e}")
+    return None
+
+
+def _after_write(tool_name: str, tool_input: Dict[str, Any], result: ToolResult) -> ToolResult:
+    """Invalidate cached chat context the tool may have changed."""
+    from .scheduler import is_write_tool
+
+    if is_write_tool(tool_name) and isinstance(result, dict) and not result.get("error"):
+        try:
+            from app.features.chat.context_snapshot import get_context_snapshot
+            get_context_snapshot().invalidate_for_tool(tool_name, tool_input)
+        except Exception as e:
+            logger.warning(f"Context snapshot invalidation failed after {tool_name}: {e}")
+    return result
+
+
+async def dispatch_tool(tool_name: str, tool_input: Dict[str, Any], last_user_message: str = "") -> ToolResult:
+    """
+    Execute a tool from async code.
+
+    Never raises for tool failures; errors come back as {"error": ...}.
+    """
+    if USE_MCP_DELEGATION and tool_name in MCP_DELEGATED_TOOLS:
+        result = await _try_mcp(tool_name, tool_input)
+        if result is not None:
+            return _after_write(tool_name, tool_input, result)
+
+    spec = TOOL_REGISTRY.get(tool_name)
+    if spec is None:
+        return {"error": f"Unknown tool: {tool_name}"}
+
+    prepared = spec.prepare_input(tool_input, last_user_message)
+    try:
+        if spec.is_async:
+            result = await spec.handler(prepared)
+        else:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(_get_tool_executor(), functools.partial(spec.handler, prepared))
+    except Exception as e:
+        logger.error(f"Tool execution error [{tool_name}]: {e}")
+        return {"error": str(e)}
+    return _after_write(tool_name, tool_input, result)
+
+
+def dispatch_tool_sync(tool_name: str, tool_input: Dict[str, Any], last_user_message: str = "") -> ToolResult:
+    """
+    Execute a tool from synchronous code (scripts, legacy callers).
+
+    Sync tools are called directly; async and MCP-delegated tools go
+    through the _run_async bridge, which is only needed on this path.
+    Loop-bound tools can't run on the bridge's private loop and are refused.
+    """
+    spec = TOOL_REGISTRY.get(tool_name)
+    if spec is not None and spec.loop_bound:
+        return {"error": f"Tool {tool_name} can only run from the async chat loop (use execute_tool_async)"}
+    if spec is None or spec.is_async or (USE_MCP_DELEGATION and tool_name in MCP_DELEGATED_TOOLS):
+        return _run_async(dispatch_tool(tool_name, tool_input, last_user_message))
+
+    try:
+        result = spec.handler(spec.prepare_input(tool_input, last_user_message))
+    except Exception as e:
+        logger.error(f"Tool execution error [{tool_name}]: {e}")
+        return {"error": str(e)}
+    return _after_write(tool_name, tool_input, result)
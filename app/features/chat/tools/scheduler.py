@@ -0,0 +1,246 @@
+"""
+Tool call scheduler - run the tool_use blocks of one Claude turn concurrently.
+
+When Claude asks for several tools in one response (search_contacts +
+get_tasks + query_knowledge), running them one after another makes the
+turn take the SUM of their latencies. The scheduler starts every read-only
+tool at once, so the turn takes roughly the slowest one.
+
+Rules:
+- Read-only tools run concurrently
+- Write / side-effecting tools (WRITE_TOOLS) run one at a time, in the
+  order Claude requested them, alongside the reads
+- Every call has a timeout (TOOL_TIMEOUTS, else TOOL_TIMEOUT_SECONDS); a
+  timed-out call returns an error result instead of stalling the turn.
+  Long-polling research tools have no timeout (the provider bounds them)
+- A write that times out keeps running (a sync handler can't be stopped on
+  its executor thread), and the next write waits until it has really
+  finished, not just until its timeout error was returned
+- Results come back in request order, matching the tool_use blocks
+- A call already started speculatively for this turn (prefetch.py) is
+  awaited instead of run again; any write drops those prefetched results
+
+Usage:
+    from app.features.chat.tools import execute_tool_calls, iter_tool_results
+
+    results = await execute_tool_calls([(block.name, block.input) for block in blocks])
+
+    # Or stream results as they finish (index = position in calls)
+    async for index, result in iter_tool_results(calls):
+        ...
+"""
+
+import os
+import time
+import asyncio
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from .base import logger
+
+if TYPE_CHECKING:
+    from .prefetch import ToolPrefetch
+
+ToolCall = Tuple[str, Dict[str, Any]]  # (tool_name, tool_input)
+
+TOOL_TIMEOUT_SECONDS = float(os.getenv("TOOL_TIMEOUT_SECONDS", "30"))
+
+# Slow tools get more time than the default; each is at least the budget
+# of the client call behind it. None = no timeout: the LinkedIn tools poll
+# BrightData snapshots for ~5 minutes (LinkedInProvider._poll_snapshot) and
+# report their own timeout as a failed result.
+TOOL_TIMEOUTS: Dict[str, Optional[float]] = {
+    "quick_sync": 120.0,  # httpx 60s
+    "create_summary_book": 180.0,  # httpx 120s
+    "backup_table": 120.0,
+    "search_emails_live": 60.0,  # httpx 30s
+    "summarize_activity": 60.0,
+    "linkedin_get_profiles": None,
+    "linkedin_search_people": None,
+    "linkedin_get_company": None,
+    "linkedin_get_company_employees": None,
+    "linkedin_get_company_jobs": None,
+    "web_search": 60.0,  # httpx 30s
+    "web_search_news": 60.0,
+}
+
+# Tools that change state (database, calendar, email, messages, memory).
+# These never run concurrently with each other.
+WRITE_TOOLS = frozenset({
+    # Database
+    "execute_sql_write", "update_record", "create_database_table", "add_column_to_table",
+    "update_data_batch", "insert_data_batch", "backup_table",
+    # Calendar
+    "create_calendar_event", "update_calendar_event", "decline_calendar_event",
+    # Email
+    "create_email_draft", "send_email_draft", "delete_email_draft",
+    # Contacts
+    "create_contact", "update_contact", "add_contact_note",
+    # Meetings, tasks, reflections, applications
+    "create_meeting", "create_task", "update_task", "complete_task", "delete_task",
+    "create_reflection", "update_application",
+    # Messaging
+    "send_beeper_message", "archive_beeper_chat", "unarchive_beeper_chat", "mark_beeper_read",
+    # Memory
+    "remember_fact", "remember_behavior", "correct_memory", "forget_memory",
+    # Misc
+    "set_user_location", "quick_sync", "create_summary_book",
+})
+
+
+def is_write_tool(tool_name: str) -> bool:
+    """True if the tool has side effects and must be serialized."""
+    return tool_name in WRITE_TOOLS
+
+
+def get_tool_timeout(tool_name: str) -> Optional[float]:
+    """Timeout in seconds for one call of tool_name (None = no timeout)."""
+    return TOOL_TIMEOUTS.get(tool_name, TOOL_TIMEOUT_SECONDS)
+
+
+async def _run_one(
+    tool_name: str,
+    tool_input: Dict[str, Any],
+    last_user_message: str,
+    prefetch: Optional["ToolPrefetch"] = None,
+    finished: Optional[asyncio.Future] = None
+) -> Dict[str, Any]:
+    """
+    Run one tool with its timeout. Never raises (except on cancellation).
+
+    finished (writes only) is resolved once the tool has actually stopped
+    running, which can be after a timeout result was returned.
+    """
+    from . import execute_tool_async
+
+    if prefetch is not None:
+        if is_write_tool(tool_name):
+            prefetch.discard()
+        else:
+            prefetched = prefetch.take(tool_name, tool_input)
+            if prefetched is not None:
+                logger.info(f"Tool {tool_name} served from prefetch")
+                return await prefetched
+
+    timeout = get_tool_timeout(tool_name)
+    work = asyncio.ensure_future(
+        execute_tool_async(tool_name, tool_input, last_user_message=last_user_message)
+    )
+    if finished is not None:
+        work.add_done_callback(lambda _: finished.done() or finished.set_result(None))
+    try:
+        done, _ = await asyncio.wait({work}, timeout=timeout)
+    except asyncio.CancelledError:
+        work.cancel()
+        raise
+
+    if not done:
+        logger.warning(f"Tool {tool_name} timed out after {timeout:.0f}s")
+        error = f"Tool {tool_name} timed out after {timeout:.0f}s"
+        if is_write_tool(tool_name):
+            # Leave it running: cancelling wouldn't stop a sync handler's thread
+            error += " - the action may still complete, check before retrying"
+        else:
+            work.cancel()
+        return {"error": error}
+
+    try:
+        return work.result()
+    except Exception as e:
+        logger.error(f"Tool execution error [{tool_name}]: {e}")
+        return {"error": str(e)}
+
+
+async def _run_after(
+    previous: Optional[asyncio.Future],
+    finished: asyncio.Future,
+    tool_name: str,
+    tool_input: Dict[str, Any],
+    last_user_message: str,
+    prefetch: Optional["ToolPrefetch"] = None
+) -> Dict[str, Any]:
+    """Run a write tool once the previous write has stopped running."""
+    try:
+        if previous is not None:
+            await asyncio.wait([previous])
+    except asyncio.CancelledError:
+        if not finished.done():
+            finished.set_result(None)
+        raise
+    return await _run_one(tool_name, tool_input, last_user_message, prefetch, finished)
+
+
+def _start(
+    calls: List[ToolCall],
+    last_user_message: str,
+    prefetch: Optional["ToolPrefetch"] = None
+) -> List[asyncio.Task]:
+    """Schedule all calls: reads immediately, writes chained in order."""
+    loop = asyncio.get_running_loop()
+    tasks: List[Optional[asyncio.Task]] = [None] * len(calls)
+    previous_write: Optional[asyncio.Future] = None  # Resolves when the last write stops running
+    for i, (tool_name, tool_input) in enumerate(calls):
+        if is_write_tool(tool_name):
+            finished = loop.create_future()
+            tasks[i] = asyncio.create_task(
+                _run_after(previous_write, finished, tool_name, tool_input, last_user_message, prefetch)
+            )
+            previous_write = finished
+        else:
+            tasks[i] = asyncio.create_task(_run_one(tool_name, tool_input, last_user_message, prefetch))
+    return tasks
+
+
+async def iter_tool_results(
+    calls: List[ToolCall],
+    last_user_message: str = "",
+    prefetch: Optional["ToolPrefetch"] = None
+) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Run tool calls and yield (index, result) as each one finishes.
+
+    If the consumer stops early (e.g. the client disconnected), calls that
+    haven't finished are cancelled.
+    """
+    if not calls:
+        return
+
+    start = time.monotonic()
+    tasks = _start(calls, last_user_message, prefetch)
+    index_of = {task: i for i, task in enumerate(tasks)}
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=index_of.__getitem__):
+                yield index_of[task], task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+    if len(calls) > 1:
+        writes = sum(1 for name, _ in calls if is_write_tool(name))
+        logger.info(
+            f"Ran {len(calls)} tools ({writes} serialized writes) in {time.monotonic() - start:.2f}s"
+        )
+
+
+async def execute_tool_calls(
+    calls: List[ToolCall],
+    last_user_message: str = "",
+    prefetch: Optional["ToolPrefetch"] = None
+) -> List[Dict[str, Any]]:
+    """
+    Run tool calls concurrently (writes serialized) and return results in call order.
+
+    Args:
+        calls: (tool_name, tool_input) pairs, in the order Claude requested them
+        last_user_message: Passed through to execute_tool (send confirmation checks)
+        prefetch: This turn's speculative calls (start_tool_prefetch), if any
+
+    Returns:
+        One result dict per call, same order as calls
+    """
+    results: List[Dict[str, Any]] = [{} for _ in calls]
+    async for index, result in iter_tool_results(calls, last_user_message, prefetch):
+        results[index] = result
+    return results
@@ -22,6 +22,8 @@ import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timezone
 
+from app.features.database import execute_async, get_async_database
+
 logger = logging.getLogger("Jarvis.Clarification")
 
 
@@ -172,7 +174,7 @@ async def try_resolve_from_knowledge(
         # Extract potential name from context
         if context:
             # Try to find contacts matching context
-            contacts = db.search_contacts_simple(context[:100])
+            contacts = await get_async_database().run(db.search_contacts_simple, context[:100])
             if contacts:
                 # Return the most likely match
                 best = contacts[0]
@@ -216,7 +218,7 @@ async def store_pending_clarification(
     Returns the clarification ID if successful, None otherwise.
     """
     try:
-        result = db.client.table("pending_clarifications").insert({
+        result = await execute_async(db.client.table("pending_clarifications").insert({
             "user_id": user_id,
             "chat_id": chat_id,
             "item": item,
@@ -226,7 +228,7 @@ async def store_pending_clarification(
             "record_id": record_id,
             "source_transcript_id": transcript_id,
             "status": "pending"
-        }).execute()
+        }))
         
         if result.data:
             return result.data[0]["id"]
@@ -239,11 +241,11 @@ async def store_pending_clarification(
 async def get_pending_clarifications(user_id: int, db) -> List[Dict[str, Any]]:
     """Get all pending clarifications for a user."""
     try:
-        result = db.client.table("pending_clarifications").select("*").eq(
+        result = await execute_async(db.client.table("pending_clarifications").select("*").eq(
             "user_id", user_id
         ).eq(
             "status", "pending"
-        ).order("created_at", desc=False).execute()
+        ).order("created_at", desc=False))
         
         return result.data if result.data else []
     except Exception as e:
@@ -266,9 +268,9 @@ async def resolve_clarification(
     """
     try:
         # Get the clarification details
-        result = db.client.table("pending_clarifications").select("*").eq(
+        result = await execute_async(db.client.table("pending_clarifications").select("*").eq(
             "id", clarification_id
-        ).execute()
+        ))
         
         if not result.data:
             logger.error(f"Clarification not found: {clarification_id}")
@@ -280,11 +282,11 @@ async def resolve_clarification(
         record_id = clarification.get("record_id")
         
         # 1. Update the clarification record
-        db.client.table("pending_clarifications").update({
+        await execute_async(db.client.table("pending_clarifications").update({
             "status": "resolved",
             "answer": answer,
             "resolved_at": datetime.now(timezone.utc).isoformat()
-        }).eq("id", clarification_id).execute()
+        }).eq("id", clarification_id))
         
         # 2. Update the original record
         if record_type and record_id:
@@ -340,37 +342,37 @@ async def update_record_with_clarification(
         if record_type == "meeting":
             if "identity" in item_lower or "person" in item_lower:
                 # Try to find and link the contact
-                contacts = db.search_contacts_simple(answer)
+                contacts = await get_async_database().run(db.search_contacts_simple, answer)
                 if contacts:
                     # Link to the contact
                     contact = contacts[0]
-                    db.client.table("meetings").update({
+                    await execute_async(db.client.table("meetings").update({
                         "contact_id": contact["id"],
                         "contact_name": f"{contact.get('first_name', '')} {contact.get('last_name', '')}".strip()
-                    }).eq("id", record_id).execute()
+                    }).eq("id", record_id))
                     logger.info(f"Linked meeting {record_id} to contact {contact['id']}")
                 else:
                     # Just update the name
-                    db.client.table("meetings").update({
+                    await execute_async(db.client.table("meetings").update({
                         "contact_name": answer
-                    }).eq("id", record_id).execute()
+                    }).eq("id", record_id))
             else:
                 # Update notes/summary with the clarification
-                current = db.client.table("meetings").select("notes").eq("id", record_id).execute()
+                current = await execute_async(db.client.table("meetings").select("notes").eq("id", record_id))
                 existing_notes = current.data[0].get("notes", "") if current.data else ""
                 new_notes = f"{existing_notes}\n\n[Clarification: {item}]: {answer}".strip()
-                db.client.table("meetings").update({
+                await execute_async(db.client.table("meetings").update({
                     "notes": new_notes
-                }).eq("id", record_id).execute()
+                }).eq("id", record_id))
         
         elif record_type == "reflection":
             # Add clarification to reflection content
-            current = db.client.table("reflections").select("content").eq("id", record_id).execute()
+            current = await execute_async(db.client.table("reflections").select("content").eq("id", record_id))
             existing = current.data[0].get("content", "") if current.data else ""
             new_content = f"{existing}\n\n---\n[Clarified: {item}]: {answer}"
-            db.client.table("reflections").update({
+            await execute_async(db.client.table("reflections").update({
                 "content": new_content
-            }).eq("id", record_id).execute()
+            }).eq("id", record_id))
         
         logger.info(f"Updated {record_type} {record_id} with clarification: {item}")
         
@@ -15,9 +15,23 @@ Usage:
     
     # Tasks
     tasks = await db.tasks.get_pending()
+
+    # Non-blocking queries from async code
+    adb = get_async_database()
+    result = await adb.execute(adb.table("contacts").select("*").limit(10))
+
+    # Buffered bulk inserts, flushed in the background
+    get_write_queue("chat_messages", on_conflict="id").enqueue(row)
 """
 
 from app.features.database.client import DatabaseClient, get_database_client
+from app.features.database.async_client import AsyncDatabase, get_async_database, execute_async
+from app.features.database.write_behind import (
+    WriteBehindQueue,
+    get_write_queue,
+    close_write_queues,
+    get_write_queue_stats,
+)
 
 # Create singleton alias
 db = get_database_client
@@ -25,5 +39,12 @@ db = get_database_client
 __all__ = [
     "DatabaseClient",
     "get_database_client",
+    "AsyncDatabase",
+    "get_async_database",
+    "execute_async",
+    "WriteBehindQueue",
+    "get_write_queue",
+    "close_write_queues",
+    "get_write_queue_stats",
     "db",
 ]
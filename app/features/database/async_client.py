@@ -0,0 +1,123 @@
+"""
+Async Database Access - Non-blocking wrapper around the Supabase client.
+
+supabase-py's query builders are synchronous: every .execute() is a blocking
+HTTP round trip. Called directly from async code it stalls the event loop, so
+concurrent chat and indexing requests end up serializing behind each other.
+
+This facade runs .execute() (or any other blocking call) on a bounded thread
+pool. Query *building* is pure and stays on the event loop; only the network
+call is offloaded. All queries share the single Supabase client from
+app.core.database, so its underlying HTTP connection pool is reused.
+
+Usage:
+    from app.features.database import get_async_database
+
+    adb = get_async_database()
+    result = await adb.execute(
+        adb.table("knowledge_chunks").select("id").eq("source_id", source_id)
+    )
+    rows = await adb.rpc("match_knowledge_chunks", {...})
+
+    # Or, for an existing builder chain:
+    result = await execute_async(db.client.table("contacts").select("*"))
+
+Configuration:
+    SUPABASE_POOL_SIZE: Max concurrent blocking DB calls (default: 16)
+"""
+
+import os
+import asyncio
+import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger("Jarvis.Database.Async")
+
+SUPABASE_POOL_SIZE = int(os.getenv("SUPABASE_POOL_SIZE", "16"))
+
+
+class AsyncDatabase:
+    """
+    Runs Supabase queries off the event loop on a bounded thread pool.
+
+    The pool size caps how many DB round trips are in flight at once;
+    extra callers wait their turn without blocking the loop.
+    """
+
+    def __init__(self, client=None, max_workers: int = SUPABASE_POOL_SIZE):
+        """
+        Args:
+            client: Supabase client (default: app.core.database.supabase)
+            max_workers: Max concurrent blocking DB calls
+        """
+        if client is None:
+            from app.core.database import supabase
+            client = supabase
+        self._client = client
+        self._max_workers = max(1, max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def client(self):
+        """The underlying (synchronous) Supabase client."""
+        return self._client
+
+    def table(self, name: str):
+        """Start a query builder; pass it to execute() to run it."""
+        return self._client.table(name)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="supabase-db",
+            )
+        return self._executor
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run any blocking callable on the DB thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), functools.partial(fn, *args, **kwargs)
+        )
+
+    async def execute(self, query) -> Any:
+        """
+        Execute a built query builder without blocking the event loop.
+
+        Args:
+            query: Any supabase-py builder (table().select()..., rpc(...))
+
+        Returns:
+            The APIResponse from query.execute()
+        """
+        return await self.run(query.execute)
+
+    async def rpc(self, fn_name: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Call a Postgres function without blocking the event loop."""
+        return await self.execute(self._client.rpc(fn_name, params or {}))
+
+    def shutdown(self) -> None:
+        """Release pool threads (called on application shutdown)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            logger.info("Async database pool shut down")
+
+
+_async_database: Optional[AsyncDatabase] = None
+
+
+def get_async_database() -> AsyncDatabase:
+    """Get the process-wide async database facade."""
+    global _async_database
+    if _async_database is None:
+        _async_database = AsyncDatabase()
+    return _async_database
+
+
+async def execute_async(query) -> Any:
+    """Execute a query builder on the shared async database pool."""
+    return await get_async_database().execute(query)
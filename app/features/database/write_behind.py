@@ -0,0 +1,281 @@
+"""
+Write-behind queues - buffer inserts and flush them in bulk off the request path.
+
+Audit-style rows (chat messages, usage metadata) don't need to be in the
+database before the user gets their answer. Inserting them one by one,
+awaited on the response path, costs a round trip per row and turns every
+database hiccup into a user-facing error.
+
+A WriteBehindQueue buffers rows in memory and a background task writes
+them as one bulk insert per batch:
+- Flushed every WRITE_BEHIND_FLUSH_SECONDS, or as soon as a batch fills
+- Transient failures are retried with exponential backoff; rows stay
+  buffered (up to WRITE_BEHIND_MAX_BUFFER, oldest dropped beyond that)
+- Rows the database rejects (constraint/type errors) are isolated by
+  retrying the batch row by row, so one bad row doesn't block the rest
+- With on_conflict set, batches are upserted ignoring duplicates, so a
+  retry after an ambiguous failure can't insert a row twice
+- close_write_queues() flushes what's left on shutdown (main.py lifespan)
+
+Rows are lost if the process dies before a flush; use a direct insert for
+anything that must be durable before responding.
+
+Usage:
+    from app.features.database import get_write_queue
+
+    queue = get_write_queue("chat_messages", on_conflict="id")
+    queue.enqueue({"id": str(uuid.uuid4()), "content": "..."})
+
+    await queue.flush()           # Read-your-writes before a query
+    await close_write_queues()    # Shutdown
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from app.features.database.async_client import get_async_database
+
+logger = logging.getLogger("Jarvis.Database.WriteBehind")
+
+WRITE_BEHIND_FLUSH_SECONDS = float(os.getenv("WRITE_BEHIND_FLUSH_SECONDS", "2.0"))
+WRITE_BEHIND_BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "100"))
+WRITE_BEHIND_MAX_BUFFER = int(os.getenv("WRITE_BEHIND_MAX_BUFFER", "10000"))
+# Consecutive failures of one batch before it is retried row by row
+WRITE_BEHIND_MAX_RETRIES = int(os.getenv("WRITE_BEHIND_MAX_RETRIES", "5"))
+WRITE_BEHIND_MAX_BACKOFF_SECONDS = float(os.getenv("WRITE_BEHIND_MAX_BACKOFF_SECONDS", "60"))
+WRITE_BEHIND_SHUTDOWN_TIMEOUT = float(os.getenv("WRITE_BEHIND_SHUTDOWN_TIMEOUT", "10"))
+
+# Postgres SQLSTATE classes that won't succeed on retry:
+# 22 data exception, 23 integrity constraint violation, 42 syntax/undefined column
+_PERMANENT_SQLSTATE_CLASSES = ("22", "23", "42")
+
+
+def _is_rejected(error: Exception) -> bool:
+    """True if the database rejected the rows themselves (retrying won't help)."""
+    code = getattr(error, "code", None)
+    return isinstance(code, str) and code[:2] in _PERMANENT_SQLSTATE_CLASSES
+
+
+class WriteBehindQueue:
+    """
+    Buffered bulk inserts into one table.
+
+    enqueue() must be called from the event loop; it never blocks and
+    never raises for database problems.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        on_conflict: Optional[str] = None,
+        flush_interval: float = WRITE_BEHIND_FLUSH_SECONDS,
+        batch_size: int = WRITE_BEHIND_BATCH_SIZE,
+        max_buffer: int = WRITE_BEHIND_MAX_BUFFER
+    ):
+        """
+        Args:
+            table: Table to insert into
+            on_conflict: Unique column(s); if set, batches are upserted
+                ignoring duplicates so retries are idempotent
+            flush_interval: Seconds between background flushes
+            batch_size: Rows per bulk insert; a full batch flushes immediately
+            max_buffer: Max buffered rows; the oldest are dropped beyond this
+        """
+        self.table = table
+        self.on_conflict = on_conflict
+        self.flush_interval = flush_interval
+        self.batch_size = max(1, batch_size)
+        self.max_buffer = max(self.batch_size, max_buffer)
+
+        self._rows: Deque[Dict[str, Any]] = deque()
+        self._worker: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._failures = 0          # Consecutive failures of the head batch
+        self._retry_at = 0.0        # monotonic time before which the worker won't retry
+        self._closed = False
+
+        self._stats = {"enqueued": 0, "written": 0, "batches": 0, "retries": 0, "rejected": 0, "dropped": 0}
+        self._last_error: Optional[str] = None
+
+    # ==================== ENQUEUE ====================
+
+    def enqueue(self, row: Dict[str, Any]) -> None:
+        """Buffer one row for the next bulk insert."""
+        if len(self._rows) >= self.max_buffer:
+            self._rows.popleft()
+            self._stats["dropped"] += 1
+            logger.error(f"{self.table} write buffer full ({self.max_buffer} rows), dropped oldest row")
+        self._rows.append(row)
+        self._stats["enqueued"] += 1
+
+        self._ensure_worker()
+        if len(self._rows) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    def _ensure_worker(self) -> None:
+        if self._closed or (self._worker is not None and not self._worker.done()):
+            return
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        """Background flusher: every flush_interval, or when a batch fills up."""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if time.monotonic() < self._retry_at:
+                continue
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"{self.table} write-behind flush crashed: {e}")
+
+    # ==================== FLUSH ====================
+
+    async def flush(self) -> int:
+        """
+        Write buffered rows now, batch by batch.
+
+        Stops at the first batch that fails transiently (it stays buffered
+        and is retried with backoff).
+
+        Returns:
+            Number of rows still buffered
+        """
+        if self._flush_lock is None:
+            return len(self._rows)
+        async with self._flush_lock:
+            while self._rows:
+                batch = [self._rows.popleft() for _ in range(min(self.batch_size, len(self._rows)))]
+                keep = await self._write(batch)
+                if keep:
+                    self._rows.extendleft(reversed(keep))
+                    break
+        return len(self._rows)
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Write one batch. Returns the rows to keep buffered (transient failure)."""
+        adb = get_async_database()
+        try:
+            await adb.run(self._insert, batch)
+        except Exception as e:
+            self._last_error = str(e)
+            if _is_rejected(e) or self._failures >= WRITE_BEHIND_MAX_RETRIES:
+                return await self._write_rows(batch, e)
+            self._backoff()
+            logger.warning(
+                f"{self.table} bulk insert of {len(batch)} rows failed (attempt {self._failures}), "
+                f"retrying in {self._retry_at - time.monotonic():.0f}s: {e}"
+            )
+            return batch
+
+        self._failures = 0
+        self._retry_at = 0.0
+        self._stats["written"] += len(batch)
+        self._stats["batches"] += 1
+        logger.debug(f"Wrote {len(batch)} rows to {self.table}")
+        return []
+
+    async def _write_rows(self, batch: List[Dict[str, Any]], batch_error: Exception) -> List[Dict[str, Any]]:
+        """Retry a failed batch row by row; drop only the rows that are rejected."""
+        adb = get_async_database()
+        written = 0
+        failed: List[Dict[str, Any]] = []
+        for row in batch:
+            try:
+                await adb.run(self._insert, [row])
+                written += 1
+            except Exception as e:
+                if _is_rejected(e):
+                    self._stats["rejected"] += 1
+                    logger.error(f"{self.table} rejected a buffered row, dropping it: {e}")
+                else:
+                    failed.append(row)
+
+        self._stats["written"] += written
+        if failed:
+            # Not rejected, just not written: the database is struggling, not the rows
+            self._backoff()
+            logger.warning(f"{self.table} unavailable, keeping {len(failed)} rows buffered: {batch_error}")
+            return failed
+
+        self._failures = 0
+        self._retry_at = 0.0
+        self._stats["batches"] += 1
+        return []
+
+    def _backoff(self) -> None:
+        self._failures += 1
+        self._stats["retries"] += 1
+        delay = min(self.flush_interval * (2 ** self._failures), WRITE_BEHIND_MAX_BACKOFF_SECONDS)
+        self._retry_at = time.monotonic() + delay
+
+    def _insert(self, batch: List[Dict[str, Any]]) -> Any:
+        """Blocking bulk insert (runs on the DB thread pool)."""
+        query = get_async_database().table(self.table)
+        if self.on_conflict:
+            return query.upsert(batch, on_conflict=self.on_conflict, ignore_duplicates=True).execute()
+        return query.insert(batch).execute()
+
+    # ==================== LIFECYCLE ====================
+
+    async def close(self, timeout: float = WRITE_BEHIND_SHUTDOWN_TIMEOUT) -> None:
+        """Stop the background flusher and write what's left (app shutdown)."""
+        self._closed = True
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+        # Keep retrying until timeout: a hiccup at shutdown shouldn't lose the buffer
+        deadline = time.monotonic() + timeout
+        while self._rows and time.monotonic() < deadline:
+            try:
+                if not await asyncio.wait_for(self.flush(), timeout=deadline - time.monotonic()):
+                    break
+            except asyncio.TimeoutError:
+                break
+            await asyncio.sleep(min(1.0, max(0.0, deadline - time.monotonic())))
+        if self._rows:
+            logger.error(f"Shutting down with {len(self._rows)} unwritten {self.table} rows")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Buffered rows, totals and the last error."""
+        return {
+            **self._stats,
+            "buffered": len(self._rows),
+            "consecutive_failures": self._failures,
+            "last_error": self._last_error,
+        }
+
+
+_queues: Dict[str, WriteBehindQueue] = {}
+
+
+def get_write_queue(table: str, on_conflict: Optional[str] = None) -> WriteBehindQueue:
+    """Get the process-wide write-behind queue for a table."""
+    queue = _queues.get(table)
+    if queue is None:
+        queue = _queues[table] = WriteBehindQueue(table, on_conflict=on_conflict)
+    return queue
+
+
+async def close_write_queues() -> None:
+    """Flush and stop every write-behind queue (called on application shutdown)."""
+    await asyncio.gather(*(queue.close() for queue in list(_queues.values())), return_exceptions=True)
+
+
+def get_write_queue_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every write-behind queue, by table."""
+    return {table: queue.get_stats() for table, queue in _queues.items()}
@@ -31,15 +31,23 @@ from app.features.knowledge.indexer import (
 )
 from app.features.knowledge.retriever import (
     retrieve_context,
+    retrieve_packed_context,
     semantic_search,
     hybrid_search,
 )
+from app.features.knowledge.context_packer import (
+    PackedContext,
+    pack_context,
+)
 from app.features.knowledge.chunker import (
     chunk_transcript,
     chunk_document,
     chunk_messages,
     chunk_application,
     chunk_contact,
+    iter_transcript_chunks,
+    iter_document_chunks,
+    iter_paragraph_chunks,
 )
 
 __all__ = [
@@ -60,12 +68,19 @@ __all__ = [
     "reindex_all",
     # Retrieval
     "retrieve_context",
+    "retrieve_packed_context",
     "semantic_search",
     "hybrid_search",
+    # Context packing
+    "PackedContext",
+    "pack_context",
     # Chunking
     "chunk_transcript",
     "chunk_document",
     "chunk_messages",
     "chunk_application",
     "chunk_contact",
+    "iter_transcript_chunks",
+    "iter_document_chunks",
+    "iter_paragraph_chunks",
 ]
@@ -5,24 +5,31 @@ The goal of chunking is to:
 1. Keep chunks small enough for good retrieval precision (~500 tokens)
 2. Preserve semantic boundaries (don't cut mid-sentence)
 3. Include relevant metadata for each chunk
+
+Long content (multi-hour transcripts, large PDFs) can be chunked lazily
+with the iter_* generators, which read segments or text incrementally and
+yield one chunk at a time. The list-returning chunk_* functions wrap them.
 """
 
 import re
 import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Union, TextIO
+
+from app.features.knowledge.tokenizer import count_tokens, split_by_tokens
 
 logger = logging.getLogger("Jarvis.Knowledge.Chunker")
 
-# Approximate tokens (1 token ≈ 4 chars for English, 2-3 for German)
+# Token budgets, counted with the embedding model's tokenizer (see tokenizer.py)
 TARGET_CHUNK_TOKENS = 500
 MAX_CHUNK_TOKENS = 800
-CHARS_PER_TOKEN = 4  # Conservative estimate
+
+TextSource = Union[str, TextIO, Iterable[str]]
 
 
 def estimate_tokens(text: str) -> int:
-    """Rough token count estimate."""
-    return len(text) // CHARS_PER_TOKEN
+    """Token count (exact with tiktoken, ~4 chars/token otherwise)."""
+    return count_tokens(text)
 
 
 def content_hash(text: str) -> str:
@@ -30,6 +37,15 @@ def content_hash(text: str) -> str:
     return hashlib.md5(text.encode()).hexdigest()
 
 
+def _make_chunk(content: str, chunk_index: int, metadata: Dict[str, Any] = None) -> Dict[str, Any]:
+    return {
+        "content": content,
+        "content_hash": content_hash(content),
+        "chunk_index": chunk_index,
+        "metadata": metadata if metadata is not None else {}
+    }
+
+
 def chunk_transcript(
     full_text: str,
     segments: List[Dict[str, Any]] = None,
@@ -55,171 +71,200 @@ def chunk_transcript(
     Returns:
         List of chunk dicts with content, metadata, and hash
     """
-    chunks = []
-    
-    if segments and len(segments) > 0:
-        # Use segments for natural chunking
-        chunks = _chunk_by_segments(segments, speaker_info, source_id)
+    chunks = list(iter_transcript_chunks(full_text, segments, source_id, language, speaker_info))
+    logger.info(f"Chunked transcript {source_id} into {len(chunks)} chunks")
+    return chunks
+
+
+def iter_transcript_chunks(
+    full_text: Optional[TextSource] = None,
+    segments: Optional[Iterable[Dict[str, Any]]] = None,
+    source_id: str = None,
+    language: str = "en",
+    speaker_info: Dict[str, str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily chunk a transcript (see chunk_transcript).
+
+    segments may be any iterable (e.g. a generator over a JSON stream);
+    full_text may be a string, a file-like object or an iterable of lines.
+    Only the chunk being built is held in memory.
+    """
+    if segments:
+        chunks = iter_segment_chunks(segments, speaker_info)
     else:
-        # Fall back to paragraph-based chunking
-        chunks = _chunk_by_paragraphs(full_text, source_id)
-    
-    # Add language to all chunks
+        chunks = iter_paragraph_chunks(full_text or "")
+
     for chunk in chunks:
         chunk["metadata"]["language"] = language
-    
-    logger.info(f"Chunked transcript {source_id} into {len(chunks)} chunks")
-    return chunks
+        yield chunk
 
 
-def _chunk_by_segments(
-    segments: List[Dict[str, Any]],
+def iter_segment_chunks(
+    segments: Iterable[Dict[str, Any]],
     speaker_info: Dict[str, str] = None,
-    source_id: str = None
-) -> List[Dict[str, Any]]:
-    """Group segments into chunks of ~500 tokens."""
-    chunks = []
-    current_texts = []
+    start_index: int = 0
+) -> Iterator[Dict[str, Any]]:
+    """Group segments into chunks of at most MAX_CHUNK_TOKENS."""
+    current_texts: List[str] = []
     current_tokens = 0
     current_start = None
-    current_speakers = set()
-    
+    current_speakers: List[str] = []
+    last_end = None
+    chunk_index = start_index
+
     speaker_info = speaker_info or {}
-    
+
+    def build(end_time) -> Dict[str, Any]:
+        return _make_chunk(" ".join(current_texts), chunk_index, {
+            "timestamp_start": current_start,
+            "timestamp_end": end_time,
+            "speakers": list(current_speakers),
+            "segment_count": len(current_texts)
+        })
+
     for seg in segments:
+        last_end = seg.get("end", last_end)
         text = seg.get("text", "").strip()
         if not text:
             continue
-        
-        seg_tokens = estimate_tokens(text)
+
         speaker = seg.get("speaker", "")
         speaker_name = speaker_info.get(speaker, speaker)
-        
+
         # Track first segment's start time
         if current_start is None:
             current_start = seg.get("start", 0)
-        
-        # Check if adding this segment exceeds limit
-        if current_tokens + seg_tokens > MAX_CHUNK_TOKENS and current_texts:
-            # Save current chunk
-            chunk_content = " ".join(current_texts)
-            chunks.append({
-                "content": chunk_content,
-                "content_hash": content_hash(chunk_content),
-                "chunk_index": len(chunks),
-                "metadata": {
-                    "timestamp_start": current_start,
-                    "timestamp_end": seg.get("start", current_start),
-                    "speakers": list(current_speakers),
-                    "segment_count": len(current_texts)
-                }
-            })
-            # Reset
-            current_texts = []
-            current_tokens = 0
-            current_start = seg.get("start", 0)
-            current_speakers = set()
-        
-        # Add segment
-        current_texts.append(text)
-        current_tokens += seg_tokens
-        if speaker_name:
-            current_speakers.add(speaker_name)
-    
+
+        # A single runaway segment is split so no chunk exceeds the budget
+        pieces = [text]
+        if count_tokens(text) > MAX_CHUNK_TOKENS:
+            pieces = list(split_by_tokens(text, MAX_CHUNK_TOKENS))
+
+        for piece in pieces:
+            piece_tokens = count_tokens(piece)
+
+            # Check if adding this piece exceeds limit
+            if current_tokens + piece_tokens > MAX_CHUNK_TOKENS and current_texts:
+                yield build(seg.get("start", current_start))
+                chunk_index += 1
+                current_texts = []
+                current_tokens = 0
+                current_start = seg.get("start", 0)
+                current_speakers = []
+
+            current_texts.append(piece)
+            current_tokens += piece_tokens
+            if speaker_name and speaker_name not in current_speakers:
+                current_speakers.append(speaker_name)
+
     # Don't forget the last chunk
     if current_texts:
-        chunk_content = " ".join(current_texts)
-        chunks.append({
-            "content": chunk_content,
-            "content_hash": content_hash(chunk_content),
-            "chunk_index": len(chunks),
-            "metadata": {
-                "timestamp_start": current_start,
-                "timestamp_end": segments[-1].get("end", current_start) if segments else current_start,
-                "speakers": list(current_speakers),
-                "segment_count": len(current_texts)
-            }
-        })
-    
-    return chunks
+        yield build(last_end if last_end is not None else current_start)
 
 
-def _chunk_by_paragraphs(
-    text: str,
+def _chunk_by_segments(
+    segments: List[Dict[str, Any]],
+    speaker_info: Dict[str, str] = None,
     source_id: str = None
 ) -> List[Dict[str, Any]]:
-    """Fall back: chunk by paragraphs/sentences."""
-    chunks = []
-    
-    # Split by double newlines (paragraphs) or sentences
-    paragraphs = re.split(r'\n\n+', text)
-    
-    current_texts = []
+    """Group segments into chunks of ~500 tokens."""
+    return list(iter_segment_chunks(segments, speaker_info))
+
+
+def _iter_paragraphs(source: TextSource) -> Iterator[str]:
+    """Yield blank-line separated paragraphs from a string or line iterable."""
+    if isinstance(source, str):
+        start = 0
+        for match in re.finditer(r'\n\n+', source):
+            yield source[start:match.start()]
+            start = match.end()
+        yield source[start:]
+        return
+
+    # File-like / line iterable: never hold more than one paragraph
+    lines: List[str] = []
+    for line in source:
+        if line.strip():
+            lines.append(line.rstrip("\n"))
+        elif lines:
+            yield "\n".join(lines)
+            lines = []
+    if lines:
+        yield "\n".join(lines)
+
+
+def _split_long_paragraph(paragraph: str) -> Iterator[str]:
+    """Split an over-budget paragraph by sentence, then by whitespace."""
+    for sent in re.split(r'(?<=[.!?])\s+', paragraph):
+        if count_tokens(sent) > MAX_CHUNK_TOKENS:
+            yield from split_by_tokens(sent, MAX_CHUNK_TOKENS)
+        else:
+            yield sent
+
+
+def iter_paragraph_chunks(
+    source: TextSource,
+    start_index: int = 0
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily chunk text by paragraphs/sentences.
+
+    Args:
+        source: Text, a file-like object, or an iterable of lines
+        start_index: chunk_index of the first yielded chunk
+    """
+    current_texts: List[str] = []
     current_tokens = 0
-    
-    for para in paragraphs:
+    joiner = "\n\n"  # Paragraphs join with blank lines, sentences with spaces
+    chunk_index = start_index
+
+    def flush() -> Dict[str, Any]:
+        nonlocal current_texts, current_tokens, chunk_index
+        chunk = _make_chunk(joiner.join(current_texts), chunk_index)
+        chunk_index += 1
+        current_texts = []
+        current_tokens = 0
+        return chunk
+
+    for para in _iter_paragraphs(source):
         para = para.strip()
         if not para:
             continue
-        
-        para_tokens = estimate_tokens(para)
-        
+
+        para_tokens = count_tokens(para)
+
         # If single paragraph exceeds max, split by sentences
         if para_tokens > MAX_CHUNK_TOKENS:
             # Save current if any
             if current_texts:
-                chunk_content = "\n\n".join(current_texts)
-                chunks.append({
-                    "content": chunk_content,
-                    "content_hash": content_hash(chunk_content),
-                    "chunk_index": len(chunks),
-                    "metadata": {}
-                })
-                current_texts = []
-                current_tokens = 0
-            
-            # Split long paragraph
-            sentences = re.split(r'(?<=[.!?])\s+', para)
-            for sent in sentences:
-                sent_tokens = estimate_tokens(sent)
+                yield flush()
+            joiner = " "
+            for sent in _split_long_paragraph(para):
+                sent_tokens = count_tokens(sent)
                 if current_tokens + sent_tokens > MAX_CHUNK_TOKENS and current_texts:
-                    chunk_content = " ".join(current_texts)
-                    chunks.append({
-                        "content": chunk_content,
-                        "content_hash": content_hash(chunk_content),
-                        "chunk_index": len(chunks),
-                        "metadata": {}
-                    })
-                    current_texts = []
-                    current_tokens = 0
+                    yield flush()
                 current_texts.append(sent)
                 current_tokens += sent_tokens
         else:
-            # Normal paragraph
-            if current_tokens + para_tokens > MAX_CHUNK_TOKENS and current_texts:
-                chunk_content = "\n\n".join(current_texts)
-                chunks.append({
-                    "content": chunk_content,
-                    "content_hash": content_hash(chunk_content),
-                    "chunk_index": len(chunks),
-                    "metadata": {}
-                })
-                current_texts = []
-                current_tokens = 0
+            # Normal paragraph (leftover sentences of a split paragraph stay separate)
+            if current_texts and (joiner != "\n\n" or current_tokens + para_tokens > MAX_CHUNK_TOKENS):
+                yield flush()
+            joiner = "\n\n"
             current_texts.append(para)
             current_tokens += para_tokens
-    
+
     # Last chunk
     if current_texts:
-        chunk_content = "\n\n".join(current_texts)
-        chunks.append({
-            "content": chunk_content,
-            "content_hash": content_hash(chunk_content),
-            "chunk_index": len(chunks),
-            "metadata": {}
-        })
-    
-    return chunks
+        yield flush()
+
+
+def _chunk_by_paragraphs(
+    text: str,
+    source_id: str = None
+) -> List[Dict[str, Any]]:
+    """Fall back: chunk by paragraphs/sentences."""
+    return list(iter_paragraph_chunks(text))
 
 
 def chunk_document(
@@ -236,32 +281,41 @@ def chunk_document(
     For shorter documents (<800 tokens), returns single chunk.
     For longer documents, splits by sections/paragraphs.
     """
-    tokens = estimate_tokens(content)
-    
+    chunks = list(iter_document_chunks(content, source_type, source_id, title, date, tags))
+    if len(chunks) > 1:
+        logger.info(f"Chunked {source_type} {source_id} into {len(chunks)} chunks")
+    return chunks
+
+
+def iter_document_chunks(
+    content: TextSource,
+    source_type: str,
+    source_id: str = None,
+    title: str = None,
+    date: str = None,
+    tags: List[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily chunk a document (see chunk_document).
+
+    content may be a string or a file-like object / line iterable (e.g.
+    text extracted page by page from a large PDF).
+    """
     base_metadata = {
         "title": title,
         "date": date,
         "tags": tags or []
     }
-    
+
     # Short document - single chunk
-    if tokens <= MAX_CHUNK_TOKENS:
-        return [{
-            "content": content,
-            "content_hash": content_hash(content),
-            "chunk_index": 0,
-            "metadata": base_metadata
-        }]
-    
+    if isinstance(content, str) and estimate_tokens(content) <= MAX_CHUNK_TOKENS:
+        yield _make_chunk(content, 0, dict(base_metadata))
+        return
+
     # Longer document - use paragraph chunking
-    chunks = _chunk_by_paragraphs(content, source_id)
-    
-    # Add base metadata to all chunks
-    for chunk in chunks:
+    for chunk in iter_paragraph_chunks(content):
         chunk["metadata"].update(base_metadata)
-    
-    logger.info(f"Chunked {source_type} {source_id} into {len(chunks)} chunks")
-    return chunks
+        yield chunk
 
 
 def chunk_messages(
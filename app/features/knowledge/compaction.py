@@ -0,0 +1,78 @@
+"""
+Knowledge chunk compaction - reclaim space from soft-deleted rows.
+
+Re-indexing soft-deletes stale chunks and, when a run fails part-way,
+leaves staged rows behind (see embeddings.ChunkDiff). Neither is ever
+read again, but both keep their 1536-dim embedding and index entries.
+This job hard-deletes them once they are older than a retention window,
+then refreshes the BM25 corpus statistics.
+
+Runs via the purge_deleted_knowledge_chunks RPC (migration 029), which
+deletes in bounded batches so it doesn't hold long locks.
+
+Usage:
+    from app.features.knowledge.compaction import compact_knowledge_chunks
+    result = await compact_knowledge_chunks(db, older_than_days=7)
+"""
+
+import os
+import time
+import logging
+from typing import Any, Dict
+
+from app.features.database import execute_async
+
+logger = logging.getLogger("Jarvis.Knowledge.Compaction")
+
+COMPACTION_RETENTION_DAYS = int(os.getenv("KNOWLEDGE_COMPACTION_RETENTION_DAYS", "7"))
+COMPACTION_BATCH_SIZE = int(os.getenv("KNOWLEDGE_COMPACTION_BATCH_SIZE", "5000"))
+COMPACTION_MAX_BATCHES = 100
+
+
+async def compact_knowledge_chunks(
+    db,
+    older_than_days: int = COMPACTION_RETENTION_DAYS,
+    batch_size: int = COMPACTION_BATCH_SIZE,
+    max_batches: int = COMPACTION_MAX_BATCHES
+) -> Dict[str, Any]:
+    """
+    Hard-delete soft-deleted and abandoned staged chunks.
+
+    Args:
+        db: Database client
+        older_than_days: Keep deleted rows younger than this (for recovery)
+        batch_size: Rows deleted per statement
+        max_batches: Upper bound on statements per run
+
+    Returns:
+        Dict with purged count, duration and status
+    """
+    start = time.monotonic()
+    try:
+        result = await execute_async(db.client.rpc("purge_deleted_knowledge_chunks", {
+            "older_than": f"{older_than_days} days",
+            "batch_size": batch_size,
+            "max_batches": max_batches,
+        }))
+    except Exception as e:
+        logger.error(f"Knowledge compaction failed: {e}")
+        return {"status": "error", "error": str(e), "purged": 0}
+
+    purged = result.data if isinstance(result.data, int) else 0
+
+    if purged:
+        try:
+            await execute_async(db.client.rpc("refresh_knowledge_fts_stats", {}))
+        except Exception as e:
+            logger.warning(f"Failed to refresh full-text stats: {e}")
+
+    duration = round(time.monotonic() - start, 2)
+    logger.info(f"Knowledge compaction purged {purged} chunks in {duration}s")
+    return {
+        "status": "completed",
+        "purged": purged,
+        "older_than_days": older_than_days,
+        # Hit the batch cap - call again to continue
+        "more": purged >= batch_size * max_batches,
+        "duration_seconds": duration,
+    }
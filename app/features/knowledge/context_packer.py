@@ -0,0 +1,300 @@
+"""
+Context packer - fit retrieved chunks into a token budget.
+
+Search returns chunks, not context. Packing them naively wastes prompt
+tokens: neighbouring chunks of one transcript repeat their citation header,
+near-identical chunks (re-sent emails, overlapping notes) are included
+twice, and one long chunk can crowd out several short relevant ones.
+
+pack_context():
+1. Merges adjacent chunks of the same source (consecutive chunk_index)
+   into one segment with a single citation
+2. Drops near-duplicates, always keeping the more relevant of the pair
+3. Greedily selects segments by MMR (relevance minus redundancy with what
+   is already packed), mildly discounted by length so one long segment
+   doesn't crowd out several short relevant ones
+4. Stops at the exact token budget (see tokenizer.py) and reports every
+   dropped chunk with the reason
+
+Similarity uses the chunk embeddings from the in-memory vector index when
+it is loaded, and word-set Jaccard similarity otherwise.
+
+Usage:
+    packed = pack_context(results, max_tokens=4000)
+    prompt += packed.text
+    packed.report()  # {"tokens": ..., "dropped": [...]}
+"""
+
+import os
+import re
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from app.features.knowledge.tokenizer import count_tokens, split_by_tokens
+
+logger = logging.getLogger("Jarvis.Knowledge.ContextPacker")
+
+SEPARATOR = "\n\n---\n\n"
+
+# Relevance vs. novelty trade-off for MMR (1.0 = relevance only)
+PACK_MMR_LAMBDA = float(os.getenv("CONTEXT_PACK_MMR_LAMBDA", "0.7"))
+# Segments at least this similar to an already packed one are dropped
+PACK_DUPLICATE_THRESHOLD = float(os.getenv("CONTEXT_PACK_DUPLICATE_THRESHOLD", "0.8"))
+# Length discount: value = MMR / (tokens / mean tokens) ** weight
+# (0 = ignore length, 1 = pure value per token)
+PACK_LENGTH_WEIGHT = float(os.getenv("CONTEXT_PACK_LENGTH_WEIGHT", "0.3"))
+# ada-002 puts unrelated text at ~0.7-0.8 cosine; similarity is rescaled
+# from this floor so only genuinely similar chunks are penalized
+EMBEDDING_SIMILARITY_FLOOR = 0.75
+
+_WORD_RE = re.compile(r"\w{3,}")
+
+
+@dataclass
+class PackedContext:
+    """Packed context text plus what went in and what was left out."""
+    text: str = ""
+    tokens: int = 0
+    max_tokens: int = 0
+    included: List[Dict[str, Any]] = field(default_factory=list)
+    dropped: List[Dict[str, Any]] = field(default_factory=list)
+
+    def report(self) -> Dict[str, Any]:
+        """Summary suitable for logs and API responses."""
+        return {
+            "tokens": self.tokens,
+            "max_tokens": self.max_tokens,
+            "segments": len(self.included),
+            "chunks": sum(len(s["chunk_ids"]) for s in self.included),
+            "dropped": self.dropped,
+        }
+
+
+# ==================== SEGMENTS ====================
+
+def _score(result: Dict[str, Any]) -> float:
+    """Ranking score: RRF from hybrid search, else cosine similarity."""
+    score = result.get("rrf_score")
+    if score is None:
+        score = result.get("similarity") or 0.0
+    return float(score)
+
+
+def _citation(source_type: str, metadata: Dict[str, Any]) -> str:
+    """Source header shown above each segment, e.g. [MEETING - 2024-05-01 - Anna]."""
+    source_info = f"[{(source_type or 'unknown').upper()}"
+    if metadata.get("date"):
+        source_info += f" - {str(metadata['date'])[:10]}"
+    if metadata.get("contact_name"):
+        source_info += f" - {metadata['contact_name']}"
+    return source_info + "]"
+
+
+def _strip_overlap(previous: str, following: str, max_chars: int = 400) -> str:
+    """Drop a prefix of following that repeats the end of previous."""
+    limit = min(len(previous), len(following), max_chars)
+    for size in range(limit, 20, -1):
+        if previous.endswith(following[:size]):
+            return following[size:].lstrip()
+    return following
+
+
+def _merge_adjacent(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Group results into segments of consecutive chunks from one source.
+
+    A segment scores as its best chunk and keeps that chunk's metadata.
+    """
+    by_source: Dict[tuple, List[Dict[str, Any]]] = {}
+    for result in results:
+        key = (result.get("source_type"), result.get("source_id"))
+        by_source.setdefault(key, []).append(result)
+
+    segments = []
+    for (source_type, source_id), chunks in by_source.items():
+        chunks.sort(key=lambda c: c.get("chunk_index") or 0)
+        run: List[Dict[str, Any]] = []
+        for chunk in chunks:
+            if run and source_id and (chunk.get("chunk_index") or 0) == (run[-1].get("chunk_index") or 0) + 1:
+                run.append(chunk)
+                continue
+            if run:
+                segments.append(_make_segment(source_type, source_id, run))
+            run = [chunk]
+        if run:
+            segments.append(_make_segment(source_type, source_id, run))
+    return segments
+
+
+def _make_segment(source_type: str, source_id: str, run: List[Dict[str, Any]]) -> Dict[str, Any]:
+    best = max(run, key=_score)
+    content = run[0].get("content") or ""
+    for chunk in run[1:]:
+        content += "\n" + _strip_overlap(content, chunk.get("content") or "")
+    return {
+        "source_type": source_type,
+        "source_id": source_id,
+        "chunk_ids": [c.get("id") for c in run],
+        "chunk_indexes": [c.get("chunk_index") for c in run],
+        "score": _score(best),
+        "metadata": best.get("metadata") or {},
+        "content": content,
+    }
+
+
+# ==================== SIMILARITY ====================
+
+def _attach_vectors(segments: List[Dict[str, Any]]) -> None:
+    """Give each segment the mean of its chunks' embeddings, where known."""
+    try:
+        from app.features.knowledge.vector_index import get_vector_index
+        index = get_vector_index()
+        if not index.loaded:
+            return
+        ids = [cid for s in segments for cid in s["chunk_ids"] if cid]
+        vectors = index.get_vectors(ids)
+    except Exception as e:
+        logger.debug(f"Chunk vectors unavailable for packing: {e}")
+        return
+
+    for segment in segments:
+        found = [vectors[cid] for cid in segment["chunk_ids"] if cid in vectors]
+        if len(found) == len(segment["chunk_ids"]):
+            mean = sum(found) / len(found)
+            norm = float((mean @ mean) ** 0.5)
+            segment["vector"] = mean / norm if norm else None
+
+
+def _similarity(a: Dict[str, Any], b: Dict[str, Any]) -> float:
+    """Similarity in [0, 1]: rescaled cosine if both have vectors, else word Jaccard."""
+    va, vb = a.get("vector"), b.get("vector")
+    if va is not None and vb is not None:
+        cosine = float(va @ vb)
+        return max(0.0, (cosine - EMBEDDING_SIMILARITY_FLOOR) / (1.0 - EMBEDDING_SIMILARITY_FLOOR))
+
+    wa, wb = a["words"], b["words"]
+    if not wa or not wb:
+        return 0.0
+    return len(wa & wb) / len(wa | wb)
+
+
+# ==================== PACKING ====================
+
+def _drop(segment: Dict[str, Any], reason: str, **extra) -> Dict[str, Any]:
+    return {
+        "source_type": segment["source_type"],
+        "source_id": segment["source_id"],
+        "chunk_ids": segment["chunk_ids"],
+        "score": round(segment["score"], 4),
+        "tokens": segment["tokens"],
+        "reason": reason,
+        **extra,
+    }
+
+
+def pack_context(
+    results: List[Dict[str, Any]],
+    max_tokens: int = 4000,
+    mmr_lambda: float = PACK_MMR_LAMBDA,
+    duplicate_threshold: float = PACK_DUPLICATE_THRESHOLD,
+    length_weight: float = PACK_LENGTH_WEIGHT
+) -> PackedContext:
+    """
+    Pack search results into at most max_tokens of prompt context.
+
+    Args:
+        results: Search results (hybrid_search / semantic_search rows)
+        max_tokens: Token budget for the returned text, separators included
+        mmr_lambda: Weight of relevance vs. novelty in MMR
+        duplicate_threshold: Similarity at which a segment counts as a duplicate
+        length_weight: How strongly longer segments are discounted (0-1)
+
+    Returns:
+        PackedContext with the text (most relevant first), the included
+        segments and every dropped chunk with a reason ("duplicate",
+        "budget")
+    """
+    packed = PackedContext(max_tokens=max_tokens)
+    if not results or max_tokens <= 0:
+        return packed
+
+    segments = _merge_adjacent(results)
+    _attach_vectors(segments)
+
+    top_score = max(s["score"] for s in segments) or 1.0
+    separator_tokens = count_tokens(SEPARATOR)
+    for segment in segments:
+        segment["relevance"] = segment["score"] / top_score
+        segment["text"] = f"{_citation(segment['source_type'], segment['metadata'])}\n{segment['content']}"
+        segment["tokens"] = count_tokens(segment["text"])
+        segment["words"] = set(_WORD_RE.findall(segment["content"].lower()))
+
+    # Near-duplicates: walk from most to least relevant so the dropped
+    # member of a pair is always the less relevant one
+    remaining: List[Dict[str, Any]] = []
+    for segment in sorted(segments, key=lambda s: s["relevance"], reverse=True):
+        similarity = max((_similarity(segment, kept) for kept in remaining), default=0.0)
+        if similarity >= duplicate_threshold:
+            packed.dropped.append(_drop(segment, "duplicate", similarity=round(similarity, 3)))
+        else:
+            remaining.append(segment)
+
+    mean_tokens = sum(s["tokens"] for s in remaining) / len(remaining)
+    selected: List[Dict[str, Any]] = []
+    used = 0
+
+    while remaining:
+        best, best_value = None, None
+        for segment in list(remaining):
+            cost = segment["tokens"] + (separator_tokens if selected else 0)
+            if used + cost > max_tokens:
+                remaining.remove(segment)
+                packed.dropped.append(_drop(segment, "budget"))
+                continue
+
+            redundancy = max((_similarity(segment, s) for s in selected), default=0.0)
+            mmr = mmr_lambda * segment["relevance"] - (1 - mmr_lambda) * redundancy
+            length = (max(cost, 1) / mean_tokens) ** length_weight
+            value = mmr / length if mmr > 0 else mmr * length
+            if best_value is None or value > best_value:
+                best, best_value = segment, value
+
+        if best is None:
+            break
+        remaining.remove(best)
+        used += best["tokens"] + (separator_tokens if selected else 0)
+        selected.append(best)
+
+    # Nothing fit at all: keep the head of the most relevant segment
+    if not selected and segments:
+        top = max(segments, key=lambda s: s["score"])
+        text = next(split_by_tokens(top["text"], max_tokens), "")
+        if text:
+            packed.dropped = [d for d in packed.dropped if d["chunk_ids"] != top["chunk_ids"]]
+            top = {**top, "text": text, "tokens": count_tokens(text), "truncated": True}
+            selected.append(top)
+
+    selected.sort(key=lambda s: s["score"], reverse=True)
+    packed.text = SEPARATOR.join(s["text"] for s in selected)
+    packed.tokens = count_tokens(packed.text)
+    packed.included = [
+        {
+            "source_type": s["source_type"],
+            "source_id": s["source_id"],
+            "chunk_ids": s["chunk_ids"],
+            "chunk_indexes": s["chunk_indexes"],
+            "score": round(s["score"], 4),
+            "tokens": s["tokens"],
+            **({"truncated": True} if s.get("truncated") else {}),
+        }
+        for s in selected
+    ]
+
+    if packed.dropped:
+        duplicates = sum(1 for d in packed.dropped if d["reason"] == "duplicate")
+        logger.info(
+            f"Packed {len(results)} chunks into {len(selected)} segments ({packed.tokens}/{max_tokens} tokens); "
+            f"dropped {duplicates} duplicate and {len(packed.dropped) - duplicates} over-budget segments"
+        )
+    return packed
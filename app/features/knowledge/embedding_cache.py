@@ -0,0 +1,225 @@
+"""
+Content-addressed embedding cache.
+
+Embeddings are keyed by (model, content_hash) so identical chunk text is
+never embedded twice. Lookups go through three tiers:
+
+1. In-process LRU (float32 arrays, bounded by EMBEDDING_CACHE_SIZE)
+2. Local on-disk SQLite file (survives restarts on the same instance)
+3. Existing knowledge_chunks rows (live ones preferred, one per hash via
+   get_chunk_embeddings_by_hash, migration 037) - only for the model
+   knowledge_chunks is embedded with
+
+Hits from slower tiers are promoted into the faster ones.
+"""
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+from array import array
+from collections import OrderedDict
+from typing import List, Dict, Optional, Iterable
+
+logger = logging.getLogger("Jarvis.Knowledge.EmbeddingCache")
+
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "5000"))
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "/tmp/jarvis_embedding_cache.sqlite3")
+DB_LOOKUP_BATCH = 100  # content_hash values per knowledge_chunks lookup (URL length)
+DB_FALLBACK_ROWS_PER_HASH = 2  # Row cap per hash when the lookup RPC is missing
+
+
+class EmbeddingCache:
+    """Three-tier (memory -> disk -> knowledge_chunks) embedding cache."""
+
+    def __init__(
+        self,
+        max_size: int = EMBEDDING_CACHE_SIZE,
+        path: Optional[str] = EMBEDDING_CACHE_PATH,
+        db_model: Optional[str] = None
+    ):
+        """
+        Args:
+            max_size: Max vectors held in memory
+            path: SQLite file for the disk tier (None/"" disables it)
+            db_model: Model that knowledge_chunks embeddings were made with;
+                      the DB tier is only consulted for this model
+        """
+        self.max_size = max_size
+        self.db_model = db_model
+        self._memory: "OrderedDict[tuple, array]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk: Optional[sqlite3.Connection] = None
+        self._db_rpc = True  # get_chunk_embeddings_by_hash available (cleared on failure)
+        self.hits = {"memory": 0, "disk": 0, "db": 0}
+        self.misses = 0
+
+        if path:
+            try:
+                self._disk = sqlite3.connect(path, check_same_thread=False)
+                self._disk.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    "model TEXT NOT NULL, content_hash TEXT NOT NULL, vector BLOB NOT NULL, "
+                    "PRIMARY KEY (model, content_hash))"
+                )
+                self._disk.commit()
+            except Exception as e:
+                logger.warning(f"Disk embedding cache unavailable ({path}): {e}")
+                self._disk = None
+
+    # ==================== MEMORY TIER ====================
+
+    def _memory_get(self, key: tuple) -> Optional[array]:
+        with self._lock:
+            vec = self._memory.get(key)
+            if vec is not None:
+                self._memory.move_to_end(key)
+            return vec
+
+    def _memory_put(self, key: tuple, vec: array) -> None:
+        with self._lock:
+            self._memory[key] = vec
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_size:
+                self._memory.popitem(last=False)
+
+    # ==================== DISK TIER ====================
+
+    def _disk_get_many(self, model: str, hashes: List[str]) -> Dict[str, array]:
+        if not self._disk or not hashes:
+            return {}
+        found = {}
+        try:
+            with self._lock:
+                for i in range(0, len(hashes), 500):
+                    part = hashes[i:i + 500]
+                    placeholders = ",".join("?" * len(part))
+                    rows = self._disk.execute(
+                        f"SELECT content_hash, vector FROM embeddings "
+                        f"WHERE model = ? AND content_hash IN ({placeholders})",
+                        [model, *part]
+                    ).fetchall()
+                    for content_hash, blob in rows:
+                        vec = array("f")
+                        vec.frombytes(blob)
+                        found[content_hash] = vec
+        except Exception as e:
+            logger.warning(f"Disk embedding cache read failed: {e}")
+        return found
+
+    def _disk_put_many(self, model: str, items: Dict[str, array]) -> None:
+        if not self._disk or not items:
+            return
+        try:
+            with self._lock:
+                self._disk.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, content_hash, vector) VALUES (?, ?, ?)",
+                    [(model, h, vec.tobytes()) for h, vec in items.items()]
+                )
+                self._disk.commit()
+        except Exception as e:
+            logger.warning(f"Disk embedding cache write failed: {e}")
+
+    # ==================== DB TIER ====================
+
+    def _db_get_many(self, db, hashes: List[str]) -> Dict[str, array]:
+        """Reuse vectors already stored in knowledge_chunks (one row per hash)."""
+        found = {}
+        for i in range(0, len(hashes), DB_LOOKUP_BATCH):
+            part = hashes[i:i + DB_LOOKUP_BATCH]
+            rows = self._db_lookup(db, part)
+            for row in rows:
+                content_hash = row.get("content_hash")
+                embedding = row.get("embedding")
+                if not content_hash or not embedding or content_hash in found:
+                    continue
+                # pgvector may come back as a JSON string
+                if isinstance(embedding, str):
+                    embedding = json.loads(embedding)
+                found[content_hash] = array("f", embedding)
+        return found
+
+    def _db_lookup(self, db, part: List[str]) -> List[dict]:
+        if self._db_rpc:
+            try:
+                result = db.client.rpc("get_chunk_embeddings_by_hash", {"p_hashes": part}).execute()
+                return result.data or []
+            except Exception as e:
+                logger.warning(f"Embedding lookup RPC unavailable (migration 037?), using live rows only: {e}")
+                self._db_rpc = False
+        # Fallback: live rows only, bounded (duplicates beyond the limit are re-embedded)
+        try:
+            result = db.client.table("knowledge_chunks").select(
+                "content_hash, embedding"
+            ).in_("content_hash", part).is_("deleted_at", "null").not_.is_(
+                "embedding", "null"
+            ).limit(len(part) * DB_FALLBACK_ROWS_PER_HASH).execute()
+            return result.data or []
+        except Exception as e:
+            logger.warning(f"knowledge_chunks embedding lookup failed: {e}")
+            return []
+
+    # ==================== PUBLIC API ====================
+
+    def get_many(self, model: str, hashes: Iterable[str], db=None) -> Dict[str, List[float]]:
+        """
+        Look up embeddings for content hashes.
+
+        Returns:
+            Dict of content_hash -> embedding for every hash that was found
+        """
+        wanted = list(dict.fromkeys(h for h in hashes if h))
+        found: Dict[str, array] = {}
+
+        for content_hash in wanted:
+            vec = self._memory_get((model, content_hash))
+            if vec is not None:
+                found[content_hash] = vec
+        self.hits["memory"] += len(found)
+
+        missing = [h for h in wanted if h not in found]
+        from_disk = self._disk_get_many(model, missing)
+        self.hits["disk"] += len(from_disk)
+        for content_hash, vec in from_disk.items():
+            self._memory_put((model, content_hash), vec)
+        found.update(from_disk)
+
+        missing = [h for h in wanted if h not in found]
+        if missing and db is not None and model == self.db_model:
+            from_db = self._db_get_many(db, missing)
+            self.hits["db"] += len(from_db)
+            for content_hash, vec in from_db.items():
+                self._memory_put((model, content_hash), vec)
+            self._disk_put_many(model, from_db)
+            found.update(from_db)
+
+        self.misses += len(wanted) - len(found)
+        return {h: vec.tolist() for h, vec in found.items()}
+
+    def put_many(self, model: str, items: Dict[str, List[float]]) -> None:
+        """Store freshly generated embeddings in the memory and disk tiers."""
+        packed = {h: array("f", vec) for h, vec in items.items() if h and vec}
+        for content_hash, vec in packed.items():
+            self._memory_put((model, content_hash), vec)
+        self._disk_put_many(model, packed)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters plus current memory tier size."""
+        return {
+            **{f"hits_{tier}": count for tier, count in self.hits.items()},
+            "misses": self.misses,
+            "memory_size": len(self._memory),
+        }
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the process-wide embedding cache."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        from app.features.knowledge.embeddings import EMBEDDING_MODEL
+        _embedding_cache = EmbeddingCache(db_model=EMBEDDING_MODEL)
+    return _embedding_cache
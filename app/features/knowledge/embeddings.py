@@ -0,0 +1,434 @@
+"""
+Embedding pipeline - batched OpenAI embeddings with bulk inserts.
+
+Instead of one embeddings.create call and one insert per chunk, chunks are
+collected into multi-input requests (bounded by item and token limits) and
+written to knowledge_chunks with a single bulk insert per batch.
+
+Before calling OpenAI, the batcher consults the content-hash embedding
+cache (see embedding_cache.py) so unchanged text is never re-embedded.
+
+Usage:
+    batcher = EmbeddingBatcher(db)
+    await batcher.add_many(rows)   # rows without "embedding"
+    await batcher.flush()          # embeds + inserts whatever is pending
+"""
+
+import time
+import random
+import asyncio
+import logging
+from typing import List, Dict, Any, Optional
+
+from app.features.knowledge.chunker import estimate_tokens, content_hash
+from app.features.database import execute_async, get_async_database
+
+logger = logging.getLogger("Jarvis.Knowledge.Embeddings")
+
+EMBEDDING_MODEL = "text-embedding-ada-002"  # 1536 dims, matches knowledge_chunks.embedding
+MAX_INPUT_CHARS = 8000      # Per-input truncation (ada-002 accepts 8191 tokens)
+MAX_BATCH_ITEMS = 256       # OpenAI allows 2048 inputs; keep request bodies reasonable
+MAX_BATCH_TOKENS = 100_000  # OpenAI caps one request at 300K tokens; stay well below
+MAX_RATE_LIMIT_RETRIES = 6
+BASE_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+
+
+_openai_client = None
+
+
+def _get_openai_client():
+    """Reuse a single AsyncOpenAI client across all embedding calls."""
+    global _openai_client
+    if _openai_client is None:
+        import openai
+        import os
+        _openai_client = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _openai_client
+
+
+# Shared cooldown: when any caller hits a 429, every concurrent caller
+# (e.g. all IndexingScheduler workers) waits until this monotonic time.
+_rate_limited_until = 0.0
+
+
+def _retry_after_seconds(error: Exception, attempt: int) -> float:
+    """Backoff delay, honouring the Retry-After header when OpenAI sends one."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        retry_after = float(headers.get("retry-after"))
+        if retry_after > 0:
+            return min(retry_after, MAX_BACKOFF_SECONDS)
+    except (TypeError, ValueError):
+        pass
+    delay = BASE_BACKOFF_SECONDS * (2 ** attempt)
+    return min(delay, MAX_BACKOFF_SECONDS) * (0.5 + random.random() / 2)
+
+
+async def _create_embeddings(input):
+    """Call embeddings.create with rate-limit-aware retries."""
+    import openai
+    global _rate_limited_until
+
+    client = _get_openai_client()
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        wait = _rate_limited_until - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        try:
+            return await client.embeddings.create(model=EMBEDDING_MODEL, input=input)
+        except openai.RateLimitError as e:
+            if attempt == MAX_RATE_LIMIT_RETRIES:
+                raise
+            delay = _retry_after_seconds(e, attempt)
+            _rate_limited_until = max(_rate_limited_until, time.monotonic() + delay)
+            logger.warning(f"Embedding rate limit hit, backing off {delay:.1f}s (attempt {attempt + 1})")
+
+
+async def get_embedding(text: str) -> List[float]:
+    """Generate embedding for text using OpenAI ada-002 (1536-dim)."""
+    response = await _create_embeddings(text[:MAX_INPUT_CHARS])
+    return response.data[0].embedding
+
+
+def _split_batches(
+    texts: List[str],
+    max_items: int = MAX_BATCH_ITEMS,
+    max_tokens: int = MAX_BATCH_TOKENS
+) -> List[List[str]]:
+    """Split texts into request-sized batches respecting item and token limits."""
+    batches: List[List[str]] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for text in texts:
+        tokens = max(1, estimate_tokens(text))
+        if current and (len(current) >= max_items or current_tokens + tokens > max_tokens):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(text)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def get_embeddings(texts: List[str]) -> List[List[float]]:
+    """
+    Generate embeddings for many texts with as few API calls as possible.
+
+    Returns embeddings in the same order as the input texts.
+    """
+    if not texts:
+        return []
+
+    truncated = [(t or " ")[:MAX_INPUT_CHARS] for t in texts]
+
+    embeddings: List[List[float]] = []
+    for batch in _split_batches(truncated):
+        response = await _create_embeddings(batch)
+        # The API returns one item per input with its position in "index"
+        ordered = sorted(response.data, key=lambda d: d.index)
+        embeddings.extend(d.embedding for d in ordered)
+
+    return embeddings
+
+
+# Staged rows are written with this deleted_at so `deleted_at IS NULL`
+# filters hide them until commit_knowledge_chunk_diff publishes them
+STAGED_DELETED_AT = "1970-01-01T00:00:00+00:00"
+
+
+class ChunkDiff:
+    """
+    The delta for re-indexing one source, applied in one transaction.
+
+    New/changed rows are inserted as staged (hidden) rows by the batcher;
+    once every one of them is written and the diff is closed, the batcher
+    publishes them, retires stale chunks and applies metadata updates via
+    the commit_knowledge_chunk_diff RPC (migration 029). If any staged row
+    fails, nothing is committed and the previous chunks stay live.
+    """
+
+    def __init__(self, source_type: str, source_id: str):
+        self.source_type = source_type
+        self.source_id = source_id
+        self.staged_ids: List[str] = []
+        self.stale_ids: List[str] = []
+        self.metadata_updates: List[Dict[str, Any]] = []
+        self.pending = 0       # Rows queued but not yet written
+        self.closed = False    # No more rows will be added
+        self.failed = False
+        self.committed = False
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.staged_ids or self.stale_ids or self.metadata_updates or self.pending)
+
+
+class EmbeddingBatcher:
+    """
+    Collects knowledge_chunks rows and flushes them in batches.
+
+    Each flush makes one multi-input embeddings.create call per request-sized
+    batch and one bulk insert. A single batcher can be shared across many
+    sources (e.g. during reindex_all) so small records are embedded together.
+
+    Rows are dicts shaped like knowledge_chunks inserts, minus "embedding".
+    Rows added with a ChunkDiff are staged and only become searchable when
+    the diff is committed (see close()).
+    """
+
+    def __init__(
+        self,
+        db,
+        max_items: int = MAX_BATCH_ITEMS,
+        max_tokens: int = MAX_BATCH_TOKENS
+    ):
+        self.db = db
+        self.max_items = max_items
+        self.max_tokens = max_tokens
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_diffs: List[Optional[ChunkDiff]] = []
+        self._pending_tokens = 0
+        # source_type -> {"indexed": N, "errors": N}
+        self.stats: Dict[str, Dict[str, int]] = {}
+        # Rows whose embedding came from the cache instead of OpenAI
+        self.reused = 0
+
+    @property
+    def stored(self) -> int:
+        """Total rows successfully written (and committed) by this batcher."""
+        return sum(s["indexed"] for s in self.stats.values())
+
+    @property
+    def pending(self) -> int:
+        """Rows waiting for the next flush."""
+        return len(self._pending)
+
+    def _record(self, rows: List[Dict[str, Any]], key: str) -> None:
+        for row in rows:
+            self._record_count(row.get("source_type", "unknown"), key, 1)
+
+    def _record_count(self, source_type: str, key: str, count: int) -> None:
+        stats = self.stats.setdefault(source_type, {"indexed": 0, "errors": 0})
+        stats[key] += count
+
+    async def add(self, row: Dict[str, Any], diff: Optional[ChunkDiff] = None) -> None:
+        """Queue one row; flushes automatically when the batch is full."""
+        if diff is not None:
+            row["deleted_at"] = STAGED_DELETED_AT
+            diff.pending += 1
+        self._pending.append(row)
+        self._pending_diffs.append(diff)
+        self._pending_tokens += estimate_tokens(row.get("content", "")[:MAX_INPUT_CHARS])
+        if len(self._pending) >= self.max_items or self._pending_tokens >= self.max_tokens:
+            await self.flush()
+
+    async def add_many(self, rows: List[Dict[str, Any]], diff: Optional[ChunkDiff] = None) -> None:
+        """Queue several rows."""
+        for row in rows:
+            await self.add(row, diff)
+
+    async def flush(self) -> int:
+        """
+        Embed and insert all pending rows, then commit any diffs they completed.
+
+        Returns:
+            Number of rows written in this flush
+        """
+        if not self._pending:
+            return 0
+
+        rows = self._pending
+        diffs = self._pending_diffs
+        self._pending = []
+        self._pending_diffs = []
+        self._pending_tokens = 0
+
+        try:
+            await self._attach_embeddings(rows)
+        except Exception as e:
+            logger.error(f"Failed to embed batch of {len(rows)} chunks: {e}")
+            for row, diff in zip(rows, diffs):
+                self._row_done(row, diff, None)
+            await self._commit_ready(diffs)
+            return 0
+
+        written = await self._insert(rows, diffs)
+        await self._commit_ready(diffs)
+        return written
+
+    async def close(self, diff: ChunkDiff) -> None:
+        """
+        Mark a diff complete. It commits now if all its rows are written,
+        otherwise right after the flush that writes its last row.
+        """
+        diff.closed = True
+        await self._commit_ready([diff])
+
+    # ==================== DIFF COMMIT ====================
+
+    def _row_done(self, row: Dict[str, Any], diff: Optional[ChunkDiff], stored: Optional[Dict[str, Any]]) -> None:
+        """Account for one row after its insert attempt (stored is None on failure)."""
+        if diff is None:
+            self._record([row], "indexed" if stored is not None else "errors")
+            return
+        diff.pending -= 1
+        if stored is not None and stored.get("id"):
+            diff.staged_ids.append(stored["id"])
+        else:
+            diff.failed = True
+
+    async def _commit_ready(self, diffs: List[Optional[ChunkDiff]]) -> None:
+        seen = set()
+        for diff in diffs:
+            if diff is None or id(diff) in seen:
+                continue
+            seen.add(id(diff))
+            if diff.closed and diff.pending == 0 and not diff.committed:
+                await self._commit(diff)
+
+    async def _commit(self, diff: ChunkDiff) -> None:
+        """Apply a finished diff atomically (or abandon it if a row failed)."""
+        from app.features.knowledge.vector_index import get_vector_index
+
+        diff.committed = True
+        if diff.failed:
+            # Staged rows stay hidden and are purged by compaction
+            logger.error(
+                f"Not committing {diff.source_type} {diff.source_id}: some chunks failed; "
+                f"previous chunks remain live"
+            )
+            self._record_count(diff.source_type, "errors", len(diff.staged_ids) or 1)
+            return
+        if diff.is_empty:
+            return
+
+        try:
+            await execute_async(self.db.client.rpc("commit_knowledge_chunk_diff", {
+                "p_staged_ids": diff.staged_ids,
+                "p_stale_ids": diff.stale_ids,
+                "p_metadata_updates": diff.metadata_updates,
+            }))
+        except Exception as e:
+            logger.warning(f"Diff commit RPC failed for {diff.source_id}, applying step by step: {e}")
+            try:
+                await self._commit_without_rpc(diff)
+            except Exception as e:
+                logger.error(f"Failed to commit chunks for {diff.source_type} {diff.source_id}: {e}")
+                self._record_count(diff.source_type, "errors", len(diff.staged_ids) or 1)
+                return
+
+        self._record_count(diff.source_type, "indexed", len(diff.staged_ids))
+
+        index = get_vector_index()
+        index.remove(diff.stale_ids)
+        for update in diff.metadata_updates:
+            index.update_metadata(update["id"], update["metadata"])
+        if diff.staged_ids:
+            index.request_refresh()
+
+    async def _commit_without_rpc(self, diff: ChunkDiff) -> None:
+        """Fallback when migration 029 isn't applied: publish first, then retire."""
+        from datetime import datetime, timezone
+
+        table = lambda: self.db.client.table("knowledge_chunks")
+        if diff.staged_ids:
+            await execute_async(table().update({"deleted_at": None}).in_("id", diff.staged_ids))
+        if diff.stale_ids:
+            await execute_async(table().update({
+                "deleted_at": datetime.now(timezone.utc).isoformat()
+            }).in_("id", diff.stale_ids))
+        for update in diff.metadata_updates:
+            await execute_async(table().update({"metadata": update["metadata"]}).eq("id", update["id"]))
+
+    # ==================== EMBED + INSERT ====================
+
+    async def _attach_embeddings(self, rows: List[Dict[str, Any]]) -> None:
+        """Fill row["embedding"] from the cache, embedding only unseen content."""
+        from app.features.knowledge.embedding_cache import get_embedding_cache
+
+        cache = get_embedding_cache()
+        for row in rows:
+            if not row.get("content_hash"):
+                row["content_hash"] = content_hash(row["content"])
+
+        # Cache lookups may hit SQLite and knowledge_chunks; keep them off the loop
+        cached = await get_async_database().run(
+            cache.get_many, EMBEDDING_MODEL, [r["content_hash"] for r in rows], db=self.db
+        )
+
+        # Embed each distinct unseen text once, even if it repeats in the batch
+        to_embed: Dict[str, str] = {}
+        for row in rows:
+            if row["content_hash"] not in cached:
+                to_embed.setdefault(row["content_hash"], row["content"])
+
+        fresh: Dict[str, List[float]] = {}
+        if to_embed:
+            vectors = await get_embeddings(list(to_embed.values()))
+            fresh = dict(zip(to_embed.keys(), vectors))
+            await get_async_database().run(cache.put_many, EMBEDDING_MODEL, fresh)
+
+        for row in rows:
+            row["embedding"] = cached.get(row["content_hash"]) or fresh[row["content_hash"]]
+
+        reused = len(rows) - len(to_embed)
+        self.reused += reused
+        if reused:
+            logger.info(f"Embedding cache: reused {reused}/{len(rows)} vectors, embedded {len(to_embed)}")
+
+    def _publish(self, rows: List[Dict[str, Any]], inserted: List[Dict[str, Any]]) -> None:
+        """Push freshly inserted (non-staged) chunks into the local vector index."""
+        from app.features.knowledge.vector_index import get_vector_index
+
+        get_vector_index().add([
+            {**row, "id": stored.get("id"), "updated_at": stored.get("updated_at")}
+            for row, stored in zip(rows, inserted)
+        ])
+
+    async def _insert(self, rows: List[Dict[str, Any]], diffs: List[Optional[ChunkDiff]]) -> int:
+        """Bulk insert rows, falling back to per-row inserts if the batch fails."""
+        try:
+            result = await execute_async(self.db.client.table("knowledge_chunks").insert(rows))
+        except Exception as e:
+            logger.warning(f"Bulk insert of {len(rows)} chunks failed, retrying per row: {e}")
+            return await self._insert_each(rows, diffs)
+
+        inserted = result.data or []
+        if len(inserted) != len(rows):
+            # Some rows may have landed; re-inserting would duplicate them, so
+            # fail the batch (staged rows stay hidden until compaction)
+            logger.error(f"Bulk insert returned {len(inserted)} rows for {len(rows)} chunks; marking batch failed")
+            for row, diff in zip(rows, diffs):
+                self._row_done(row, diff, None)
+            return 0
+
+        for row, diff, stored in zip(rows, diffs, inserted):
+            self._row_done(row, diff, stored)
+        self._publish(
+            [r for r, d in zip(rows, diffs) if d is None],
+            [st for st, d in zip(inserted, diffs) if d is None]
+        )
+        logger.info(f"Stored {len(rows)} chunks in one batch")
+        return len(rows)
+
+    async def _insert_each(self, rows: List[Dict[str, Any]], diffs: List[Optional[ChunkDiff]]) -> int:
+        written = 0
+        for row, diff in zip(rows, diffs):
+            try:
+                result = await execute_async(self.db.client.table("knowledge_chunks").insert(row))
+                stored = (result.data or [None])[0]
+            except Exception as e:
+                logger.error(f"Failed to index chunk {row.get('chunk_index')} of {row.get('source_id')}: {e}")
+                stored = None
+            self._row_done(row, diff, stored)
+            if stored is not None:
+                written += 1
+                if diff is None:
+                    self._publish([row], [stored])
+        return written
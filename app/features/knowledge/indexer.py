@@ -5,12 +5,13 @@ This is the "write" side of RAG - called when new content is created.
 """
 
 import logging
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Iterable, Tuple, Union
+
+from app.features.database import execute_async
 
 from app.features.knowledge.chunker import (
-    chunk_transcript,
-    chunk_document,
+    iter_transcript_chunks,
+    iter_document_chunks,
     chunk_messages,
     chunk_contact,
     chunk_task,
@@ -21,41 +22,147 @@ from app.features.knowledge.chunker import (
     chunk_highlight,
     chunk_email,
     chunk_beeper_message,
+    content_hash,
 )
 
+from app.features.knowledge.embeddings import ChunkDiff, EmbeddingBatcher
+
 logger = logging.getLogger("Jarvis.Knowledge.Indexer")
 
 
-_openai_client = None
+def _build_row(
+    source_type: str,
+    source_id: str,
+    chunk: Dict[str, Any],
+    metadata: Dict[str, Any] = None
+) -> Dict[str, Any]:
+    """Build a knowledge_chunks row (without embedding) from a chunk dict."""
+    return {
+        "source_type": source_type,
+        "source_id": source_id,
+        "chunk_index": chunk.get("chunk_index", 0),
+        "content": chunk["content"],
+        "content_hash": chunk.get("content_hash"),
+        "metadata": {**(metadata or {}), **chunk.get("metadata", {})}
+    }
+
+
+async def _load_live_chunks(
+    source_id: str,
+    db
+) -> Tuple[Optional[Dict[tuple, Dict[str, Any]]], List[str]]:
+    """
+    Load the live chunks for a source, keyed by (source_type, chunk_index, content_hash).
 
+    Returns:
+        (live chunks by key or None if the lookup failed, ids of duplicates)
+    """
+    try:
+        existing = await execute_async(db.client.table("knowledge_chunks").select(
+            "id, source_type, chunk_index, content_hash, metadata"
+        ).eq("source_id", source_id).is_("deleted_at", "null"))
+    except Exception as e:
+        logger.warning(f"Failed to load existing chunks for {source_id}: {e}")
+        return None, []
 
-def _get_openai_client():
-    """Reuse a single AsyncOpenAI client across all embedding calls."""
-    global _openai_client
-    if _openai_client is None:
-        import openai
-        import os
-        _openai_client = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    return _openai_client
+    live = {}
+    duplicate_ids = []
+    for chunk in existing.data or []:
+        key = (chunk.get("source_type"), chunk.get("chunk_index"), chunk.get("content_hash"))
+        if key in live:
+            duplicate_ids.append(chunk["id"])  # Duplicate from an older reindex
+        else:
+            live[key] = chunk
+    return live, duplicate_ids
 
 
-async def get_embedding(text: str) -> List[float]:
-    """Generate embedding for text using OpenAI ada-002 (1536-dim)."""
-    client = _get_openai_client()
-    response = await client.embeddings.create(
-        model="text-embedding-ada-002",
-        input=text[:8000]
-    )
-    return response.data[0].embedding
+async def _store_chunks(
+    source_type: str,
+    source_id: str,
+    chunks: Iterable[Dict[str, Any]],
+    db,
+    metadata: Dict[str, Any] = None,
+    batcher: Optional[EmbeddingBatcher] = None
+) -> int:
+    """
+    Embed and store chunks for one source.
+
+    chunks may be a lazy iterator (see chunker.iter_*): each chunk is diffed
+    against the live chunks and handed to the batcher as it is produced, so
+    memory stays flat for very long transcripts and documents.
+
+    Chunks whose (chunk_index, content_hash) is unchanged are kept as-is
+    (metadata refreshed if it changed), so re-indexing an unchanged source
+    costs one select and no embeddings. Changed chunks reuse cached vectors
+    where possible (see embedding_cache.py).
+
+    The changes are applied as one ChunkDiff: new rows are written staged
+    (hidden from search) and, once all of them are stored, published
+    together with the stale-chunk deletes and metadata updates in a single
+    transaction. If anything fails (including loading the live chunks),
+    the source keeps its previous chunks.
+
+    With a shared batcher (reindex_all), rows are queued and the diff
+    commits after the flush that writes its last row - the return value is
+    the number of rows queued. Without one, a local batcher is flushed here.
+
+    Returns:
+        Number of chunks created (unchanged chunks are not counted)
+    """
+    live, duplicate_ids = await _load_live_chunks(source_id, db)
+    if live is None:
+        # Without the live set nothing could be retired, so re-indexing would
+        # leave every old chunk searchable next to the new ones
+        logger.error(f"Skipping {source_type} {source_id}: could not load its live chunks")
+        return 0
+
+    target = batcher if batcher is not None else EmbeddingBatcher(db)
+    diff = ChunkDiff(source_type, source_id)
+    diff.stale_ids.extend(duplicate_ids)
+    queued = 0
+    unchanged = 0
+
+    for chunk in chunks:
+        row = _build_row(source_type, source_id, chunk, metadata)
+        if not row["content_hash"]:
+            row["content_hash"] = content_hash(row["content"])
+
+        match = live.pop((source_type, row["chunk_index"], row["content_hash"]), None)
+        if match is None:
+            await target.add(row, diff)
+            queued += 1
+            continue
+
+        unchanged += 1
+        if match.get("metadata") != row["metadata"]:
+            diff.metadata_updates.append({"id": match["id"], "metadata": row["metadata"]})
+
+    if live:
+        diff.stale_ids.extend(chunk["id"] for chunk in live.values())
+
+    if unchanged or diff.stale_ids:
+        logger.info(
+            f"Diff {source_type} {source_id}: {unchanged} unchanged, "
+            f"{queued} new/changed, {len(diff.stale_ids)} removed"
+        )
+
+    if batcher is not None:
+        await target.close(diff)
+        return queued
+
+    await target.flush()
+    await target.close(diff)
+    return target.stored
 
 
 async def index_content(
     source_type: str,
     source_id: str,
-    content: str,
+    content: Union[str, Iterable[str]],
     db,
     metadata: Dict[str, Any] = None,
-    segments: List[Dict] = None
+    segments: Iterable[Dict] = None,
+    batcher: Optional[EmbeddingBatcher] = None
 ) -> int:
     """
     Index any content into the knowledge store.
@@ -66,34 +173,30 @@ async def index_content(
         source_type: 'transcript', 'meeting', 'journal', 'reflection', 
                      'message', 'contact', 'task', 'calendar'
         source_id: UUID of the source record
-        content: The text content to index
+        content: The text content to index. Transcripts and documents also
+                 accept a file-like object / iterable of lines.
         db: Database client
         metadata: Additional metadata to include
-        segments: For transcripts, the WhisperX segments
+        segments: For transcripts, the WhisperX segments (any iterable)
+        batcher: Optional shared EmbeddingBatcher (chunks are queued, not flushed)
     
     Returns:
-        Number of chunks created
+        Number of chunks created (or queued, when a batcher is passed).
+        Chunks whose content hash is unchanged are kept and not counted.
     """
     metadata = metadata or {}
     
-    # Soft-delete existing chunks for this source (re-indexing)
-    try:
-        db.client.table("knowledge_chunks").update({
-            "deleted_at": datetime.now(timezone.utc).isoformat()
-        }).eq("source_id", source_id).is_("deleted_at", "null").execute()
-    except Exception as e:
-        logger.warning(f"Failed to soft-delete existing chunks: {e}")
-    
-    # Chunk based on content type
+    # Chunk based on content type. Long-form types are chunked lazily and
+    # streamed into the batcher so the full chunk list is never built.
     if source_type == "transcript":
-        chunks = chunk_transcript(
+        chunks = iter_transcript_chunks(
             full_text=content,
             segments=segments,
             source_id=source_id,
             language=metadata.get("language", "en")
         )
     elif source_type in ("journal", "reflection"):
-        chunks = chunk_document(
+        chunks = iter_document_chunks(
             content=content,
             source_type=source_type,
             source_id=source_id,
@@ -103,7 +206,7 @@ async def index_content(
         )
     elif source_type == "meeting":
         # Meetings are usually summaries, embed as single chunk
-        chunks = chunk_document(
+        chunks = iter_document_chunks(
             content=content,
             source_type=source_type,
             source_id=source_id,
@@ -135,7 +238,7 @@ async def index_content(
         chunks = [chunk]
     elif source_type == "document":
         # Documents (CV, profiles) - chunk if long
-        chunks = chunk_document(
+        chunks = iter_document_chunks(
             content=content,
             source_type=source_type,
             source_id=source_id,
@@ -144,42 +247,28 @@ async def index_content(
         )
     else:
         # Default: paragraph-based chunking
-        chunks = chunk_document(content, source_type, source_id)
+        chunks = iter_document_chunks(content, source_type, source_id)
     
-    # Generate embeddings and store
-    created_count = 0
-    for chunk in chunks:
-        try:
-            # Generate embedding
-            embedding = await get_embedding(chunk["content"])
-            
-            # Merge metadata
-            chunk_metadata = {**metadata, **chunk.get("metadata", {})}
-            
-            # Insert into database
-            db.client.table("knowledge_chunks").insert({
-                "source_type": source_type,
-                "source_id": source_id,
-                "chunk_index": chunk.get("chunk_index", 0),
-                "content": chunk["content"],
-                "content_hash": chunk.get("content_hash"),
-                "embedding": embedding,
-                "metadata": chunk_metadata
-            }).execute()
-            
-            created_count += 1
-            
-        except Exception as e:
-            logger.error(f"Failed to index chunk {chunk.get('chunk_index')}: {e}")
+    total = 0
+
+    def counted(items):
+        nonlocal total
+        for item in items:
+            total += 1
+            yield item
+
+    # Diff against existing chunks, then embed (batched, cached) and bulk insert
+    created_count = await _store_chunks(source_type, source_id, counted(chunks), db, metadata, batcher)
     
-    logger.info(f"Indexed {source_type} {source_id}: {created_count}/{len(chunks)} chunks")
+    logger.info(f"Indexed {source_type} {source_id}: {created_count}/{total} chunks")
     return created_count
 
 
 async def index_transcript(
     transcript_id: str,
     db,
-    force: bool = False
+    force: bool = False,
+    batcher: Optional[EmbeddingBatcher] = None
 ) -> int:
     """
     Index a transcript from the database.
@@ -188,21 +277,22 @@ async def index_transcript(
         transcript_id: UUID of the transcript
         db: Database client
         force: Re-index even if already indexed
+        batcher: Optional shared EmbeddingBatcher
     """
     # Check if already indexed
     if not force:
-        existing = db.client.table("knowledge_chunks").select("id").eq(
+        existing = await execute_async(db.client.table("knowledge_chunks").select("id").eq(
             "source_id", transcript_id
-        ).eq("source_type", "transcript").limit(1).execute()
+        ).eq("source_type", "transcript").is_("deleted_at", "null").limit(1))
         
         if existing.data:
             logger.info(f"Transcript {transcript_id} already indexed, skipping")
             return 0
     
     # Fetch transcript
-    result = db.client.table("transcripts").select("*").eq(
+    result = await execute_async(db.client.table("transcripts").select("*").eq(
         "id", transcript_id
-    ).execute()
+    ))
     
     if not result.data:
         logger.error(f"Transcript not found: {transcript_id}")
@@ -220,20 +310,21 @@ async def index_transcript(
             "source_file": transcript.get("source_file"),
             "date": transcript.get("created_at")
         },
-        segments=transcript.get("segments")
+        segments=transcript.get("segments"),
+        batcher=batcher
     )
 
 
-async def index_meeting(meeting_id: str, db, force: bool = False) -> int:
+async def index_meeting(meeting_id: str, db, force: bool = False, batcher: Optional[EmbeddingBatcher] = None) -> int:
     """Index a meeting record."""
     if not force:
-        existing = db.client.table("knowledge_chunks").select("id").eq(
+        existing = await execute_async(db.client.table("knowledge_chunks").select("id").eq(
             "source_id", meeting_id
-        ).eq("source_type", "meeting").limit(1).execute()
+        ).eq("source_type", "meeting").is_("deleted_at", "null").limit(1))
         if existing.data:
             return 0
     
-    result = db.client.table("meetings").select("*").eq("id", meeting_id).execute()
+    result = await execute_async(db.client.table("meetings").select("*").eq("id", meeting_id))
     if not result.data:
         return 0
     
@@ -281,7 +372,8 @@ async def index_meeting(meeting_id: str, db, force: bool = False) -> int:
             "date": meeting.get("date"),
             "contact_id": meeting.get("contact_id"),
             "contact_name": meeting.get("contact_name")
-        }
+        },
+        batcher=batcher
     )
 
 
@@ -292,7 +384,8 @@ async def index_message(
     platform: str = None,
     contact_id: str = None,
     contact_name: str = None,
-    force: bool = False
+    force: bool = False,
+    batcher: Optional[EmbeddingBatcher] = None
 ) -> int:
     """
     Index a batch of messages from a chat.
@@ -307,9 +400,9 @@ async def index_message(
         force: Re-index even if already indexed
     """
     if not force:
-        existing = db.client.table("knowledge_chunks").select("id").eq(
+        existing = await execute_async(db.client.table("knowledge_chunks").select("id").eq(
             "source_id", chat_id
-        ).eq("source_type", "message").limit(1).execute()
+        ).eq("source_type", "message").is_("deleted_at", "null").limit(1))
         if existing.data:
             return 0
     
@@ -322,109 +415,57 @@ async def index_message(
         contact_name=contact_name
     )
     
-    created_count = 0
-    for chunk in chunks:
-        try:
-            embedding = await get_embedding(chunk["content"])
-            
-            db.client.table("knowledge_chunks").insert({
-                "source_type": "message",
-                "source_id": chat_id,
-                "chunk_index": chunk.get("chunk_index", 0),
-                "content": chunk["content"],
-                "content_hash": chunk.get("content_hash"),
-                "embedding": embedding,
-                "metadata": chunk.get("metadata", {})
-            }).execute()
-            
-            created_count += 1
-        except Exception as e:
-            logger.error(f"Failed to index message chunk: {e}")
-    
-    return created_count
+    return await _store_chunks("message", chat_id, chunks, db, batcher=batcher)
 
 
-async def index_contact(contact_id: str, db, force: bool = False) -> int:
+async def index_contact(contact_id: str, db, force: bool = False, batcher: Optional[EmbeddingBatcher] = None) -> int:
     """Index a contact profile."""
     if not force:
-        existing = db.client.table("knowledge_chunks").select("id").eq(
+        existing = await execute_async(db.client.table("knowledge_chunks").select("id").eq(
             "source_id", contact_id
-        ).eq("source_type", "contact").limit(1).execute()
+        ).eq("source_type", "contact").is_("deleted_at", "null").limit(1))
         if existing.data:
             return 0
     
-    result = db.client.table("contacts").select("*").eq("id", contact_id).execute()
+    result = await execute_async(db.client.table("contacts").select("*").eq("id", contact_id))
     if not result.data:
         return 0
     
     contact = result.data[0]
     chunk = chunk_contact(contact)
     
-    try:
-        embedding = await get_embedding(chunk["content"])
-        
-        db.client.table("knowledge_chunks").insert({
-            "source_type": "contact",
-            "source_id": contact_id,
-            "chunk_index": 0,
-            "content": chunk["content"],
-            "content_hash": chunk.get("content_hash"),
-            "embedding": embedding,
-            "metadata": chunk.get("metadata", {})
-        }).execute()
-        
-        return 1
-    except Exception as e:
-        logger.error(f"Failed to index contact: {e}")
-        return 0
+    return await _store_chunks("contact", contact_id, [chunk], db, batcher=batcher)
 
 
-async def index_application(app_id: str, db, force: bool = False) -> int:
+async def index_application(app_id: str, db, force: bool = False, batcher: Optional[EmbeddingBatcher] = None) -> int:
     """Index an application record."""
     if not force:
-        existing = db.client.table("knowledge_chunks").select("id").eq(
+        existing = await execute_async(db.client.table("knowledge_chunks").select("id").eq(
             "source_id", app_id
-        ).eq("source_type", "application").limit(1).execute()
+        ).eq("source_type", "application").is_("deleted_at", "null").limit(1))
         if existing.data:
             return 0
     
-    result = db.client.table("applications").select("*").eq("id", app_id).execute()
+    result = await execute_async(db.client.table("applications").select("*").eq("id", app_id))
     if not result.data:
         return 0
     
     app = result.data[0]
     chunks = chunk_application(app)
     
-    created_count = 0
-    for chunk in chunks:
-        try:
-            embedding = await get_embedding(chunk["content"])
-            db.client.table("knowledge_chunks").insert({
-                "source_type": "application",
-                "source_id": app_id,
-                "chunk_index": chunk.get("chunk_index", 0),
-                "content": chunk["content"],
-                "content_hash": chunk.get("content_hash"),
-                "embedding": embedding,
-                "metadata": chunk.get("metadata", {})
-            }).execute()
-            created_count += 1
-        except Exception as e:
-            logger.error(f"Failed to index application chunk: {e}")
-    
-    return created_count
+    return await _store_chunks("application", app_id, chunks, db, batcher=batcher)
 
 
-async def index_document(doc_id: str, db, force: bool = False) -> int:
+async def index_document(doc_id: str, db, force: bool = False, batcher: Optional[EmbeddingBatcher] = None) -> int:
     """Index a document (CV, profile, etc.)."""
     if not force:
-        existing = db.client.table("knowledge_chunks").select("id").eq(
+        existing = await execute_async(db.client.table("knowledge_chunks").select("id").eq(
             "source_id", doc_id
-        ).eq("source_type", "document").limit(1).execute()
+        ).eq("source_type", "document").is_("deleted_at", "null").limit(1))
         if existing.data:
             return 0
     
-    result = db.client.table("documents").select("*").eq("id", doc_id).execute()
+    result = await execute_async(db.client.table("documents").select("*").eq("id", doc_id))
     if not result.data:
         return 0
     
@@ -444,53 +485,40 @@ async def index_document(doc_id: str, db, force: bool = False) -> int:
             "title": doc.get("title"),
             "type": doc.get("type"),
             "tags": doc.get("tags", [])
-        }
+        },
+        batcher=batcher
     )
 
 
-async def index_calendar_event(event_id: str, db, force: bool = False) -> int:
+async def index_calendar_event(event_id: str, db, force: bool = False, batcher: Optional[EmbeddingBatcher] = None) -> int:
     """Index a calendar event."""
     if not force:
-        existing = db.client.table("knowledge_chunks").select("id").eq(
+        existing = await execute_async(db.client.table("knowledge_chunks").select("id").eq(
             "source_id", event_id
-        ).eq("source_type", "calendar").limit(1).execute()
+        ).eq("source_type", "calendar").is_("deleted_at", "null").limit(1))
         if existing.data:
             return 0
     
-    result = db.client.table("calendar_events").select("*").eq("id", event_id).execute()
+    result = await execute_async(db.client.table("calendar_events").select("*").eq("id", event_id))
     if not result.data:
         return 0
     
     event = result.data[0]
     chunk = chunk_calendar_event(event)
     
-    try:
-        embedding = await get_embedding(chunk["content"])
-        db.client.table("knowledge_chunks").insert({
-            "source_type": "calendar",
-            "source_id": event_id,
-            "chunk_index": 0,
-            "content": chunk["content"],
-            "content_hash": chunk.get("content_hash"),
-            "embedding": embedding,
-            "metadata": chunk.get("metadata", {})
-        }).execute()
-        return 1
-    except Exception as e:
-        logger.error(f"Failed to index calendar event: {e}")
-        return 0
+    return await _store_chunks("calendar", event_id, [chunk], db, batcher=batcher)
 
 
-async def index_task(task_id: str, db, force: bool = False) -> int:
+async def index_task(task_id: str, db, force: bool = False, batcher: Optional[EmbeddingBatcher] = None) -> int:
     """Index a task."""
     if not force:
-        existing = db.client.table("knowledge_chunks").select("id").eq(
+        existing = await execute_async(db.client.table("knowledge_chunks").select("id").eq(
             "source_id", task_id
-        ).eq("source_type", "task").limit(1).execute()
+        ).eq("source_type", "task").is_("deleted_at", "null").limit(1))
         if existing.data:
             return 0
 
-    result = db.client.table("tasks").select("*").eq("id", task_id).execute()
+    result = await execute_async(db.client.table("tasks").select("*").eq("id", task_id))
     if not result.data:
         return 0
 
@@ -506,33 +534,19 @@ async def index_task(task_id: str, db, force: bool = False) -> int:
     if len(chunk["content"]) < 15:
         return 0
 
-    try:
-        embedding = await get_embedding(chunk["content"])
-        db.client.table("knowledge_chunks").insert({
-            "source_type": "task",
-            "source_id": task_id,
-            "chunk_index": 0,
-            "content": chunk["content"],
-            "content_hash": chunk.get("content_hash"),
-            "embedding": embedding,
-            "metadata": chunk.get("metadata", {}),
-        }).execute()
-        return 1
-    except Exception as e:
-        logger.error(f"Failed to index task: {e}")
-        return 0
+    return await _store_chunks("task", task_id, [chunk], db, batcher=batcher)
 
 
-async def index_journal(journal_id: str, db, force: bool = False) -> int:
+async def index_journal(journal_id: str, db, force: bool = False, batcher: Optional[EmbeddingBatcher] = None) -> int:
     """Index a journal entry."""
     if not force:
-        existing = db.client.table("knowledge_chunks").select("id").eq(
+        existing = await execute_async(db.client.table("knowledge_chunks").select("id").eq(
             "source_id", journal_id
-        ).eq("source_type", "journal").limit(1).execute()
+        ).eq("source_type", "journal").is_("deleted_at", "null").limit(1))
         if existing.data:
             return 0
     
-    result = db.client.table("journals").select("*").eq("id", journal_id).execute()
+    result = await execute_async(db.client.table("journals").select("*").eq("id", journal_id))
     if not result.data:
         return 0
     
@@ -567,20 +581,21 @@ async def index_journal(journal_id: str, db, force: bool = False) -> int:
             "date": str(journal.get("date")),
             "mood": journal.get("mood"),
             "energy": journal.get("energy")
-        }
+        },
+        batcher=batcher
     )
 
 
-async def index_reflection(reflection_id: str, db, force: bool = False) -> int:
+async def index_reflection(reflection_id: str, db, force: bool = False, batcher: Optional[EmbeddingBatcher] = None) -> int:
     """Index a reflection."""
     if not force:
-        existing = db.client.table("knowledge_chunks").select("id").eq(
+        existing = await execute_async(db.client.table("knowledge_chunks").select("id").eq(
             "source_id", reflection_id
-        ).eq("source_type", "reflection").limit(1).execute()
+        ).eq("source_type", "reflection").is_("deleted_at", "null").limit(1))
         if existing.data:
             return 0
     
-    result = db.client.table("reflections").select("*").eq("id", reflection_id).execute()
+    result = await execute_async(db.client.table("reflections").select("*").eq("id", reflection_id))
     if not result.data:
         return 0
     
@@ -603,24 +618,25 @@ async def index_reflection(reflection_id: str, db, force: bool = False) -> int:
             "tags": reflection.get("tags", []),
             "mood": reflection.get("mood"),
             "people_mentioned": reflection.get("people_mentioned", [])
-        }
+        },
+        batcher=batcher
     )
 
 
-async def index_email(email_id: str, db, force: bool = False) -> int:
+async def index_email(email_id: str, db, force: bool = False, batcher: Optional[EmbeddingBatcher] = None) -> int:
     """
     Index an email.
     
     Emails contain valuable knowledge about communications and decisions.
     """
     if not force:
-        existing = db.client.table("knowledge_chunks").select("id").eq(
+        existing = await execute_async(db.client.table("knowledge_chunks").select("id").eq(
             "source_id", email_id
-        ).eq("source_type", "email").limit(1).execute()
+        ).eq("source_type", "email").is_("deleted_at", "null").limit(1))
         if existing.data:
             return 0
     
-    result = db.client.table("emails").select("*").eq("id", email_id).execute()
+    result = await execute_async(db.client.table("emails").select("*").eq("id", email_id))
     if not result.data:
         return 0
     
@@ -631,66 +647,38 @@ async def index_email(email_id: str, db, force: bool = False) -> int:
     if len(chunk["content"]) < 50:
         return 0
     
-    try:
-        embedding = await get_embedding(chunk["content"])
-        db.client.table("knowledge_chunks").insert({
-            "source_type": "email",
-            "source_id": email_id,
-            "chunk_index": 0,
-            "content": chunk["content"],
-            "content_hash": chunk.get("content_hash"),
-            "embedding": embedding,
-            "metadata": chunk.get("metadata", {})
-        }).execute()
-        return 1
-    except Exception as e:
-        logger.error(f"Failed to index email: {e}")
-        return 0
+    return await _store_chunks("email", email_id, [chunk], db, batcher=batcher)
 
 
-async def index_book(book_id: str, db, force: bool = False) -> int:
+async def index_book(book_id: str, db, force: bool = False, batcher: Optional[EmbeddingBatcher] = None) -> int:
     """Index a book record."""
     if not force:
-        existing = db.client.table("knowledge_chunks").select("id").eq(
+        existing = await execute_async(db.client.table("knowledge_chunks").select("id").eq(
             "source_id", book_id
-        ).eq("source_type", "book").limit(1).execute()
+        ).eq("source_type", "book").is_("deleted_at", "null").limit(1))
         if existing.data:
             return 0
     
-    result = db.client.table("books").select("*").eq("id", book_id).execute()
+    result = await execute_async(db.client.table("books").select("*").eq("id", book_id))
     if not result.data:
         return 0
     
     book = result.data[0]
     chunk = chunk_book(book)
     
-    try:
-        embedding = await get_embedding(chunk["content"])
-        db.client.table("knowledge_chunks").insert({
-            "source_type": "book",
-            "source_id": book_id,
-            "chunk_index": 0,
-            "content": chunk["content"],
-            "content_hash": chunk.get("content_hash"),
-            "embedding": embedding,
-            "metadata": chunk.get("metadata", {})
-        }).execute()
-        return 1
-    except Exception as e:
-        logger.error(f"Failed to index book: {e}")
-        return 0
+    return await _store_chunks("book", book_id, [chunk], db, batcher=batcher)
 
 
-async def index_highlight(highlight_id: str, db, force: bool = False) -> int:
+async def index_highlight(highlight_id: str, db, force: bool = False, batcher: Optional[EmbeddingBatcher] = None) -> int:
     """Index a book highlight."""
     if not force:
-        existing = db.client.table("knowledge_chunks").select("id").eq(
+        existing = await execute_async(db.client.table("knowledge_chunks").select("id").eq(
             "source_id", highlight_id
-        ).eq("source_type", "highlight").limit(1).execute()
+        ).eq("source_type", "highlight").is_("deleted_at", "null").limit(1))
         if existing.data:
             return 0
     
-    result = db.client.table("highlights").select("*, books(title)").eq("id", highlight_id).execute()
+    result = await execute_async(db.client.table("highlights").select("*, books(title)").eq("id", highlight_id))
     if not result.data:
         return 0
     
@@ -702,57 +690,29 @@ async def index_highlight(highlight_id: str, db, force: bool = False) -> int:
     if len(chunk["content"]) < 30:
         return 0
     
-    try:
-        embedding = await get_embedding(chunk["content"])
-        db.client.table("knowledge_chunks").insert({
-            "source_type": "highlight",
-            "source_id": highlight_id,
-            "chunk_index": 0,
-            "content": chunk["content"],
-            "content_hash": chunk.get("content_hash"),
-            "embedding": embedding,
-            "metadata": chunk.get("metadata", {})
-        }).execute()
-        return 1
-    except Exception as e:
-        logger.error(f"Failed to index highlight: {e}")
-        return 0
+    return await _store_chunks("highlight", highlight_id, [chunk], db, batcher=batcher)
 
 
-async def index_linkedin_post(post_id: str, db, force: bool = False) -> int:
+async def index_linkedin_post(post_id: str, db, force: bool = False, batcher: Optional[EmbeddingBatcher] = None) -> int:
     """Index a LinkedIn post."""
     if not force:
-        existing = db.client.table("knowledge_chunks").select("id").eq(
+        existing = await execute_async(db.client.table("knowledge_chunks").select("id").eq(
             "source_id", post_id
-        ).eq("source_type", "linkedin_post").limit(1).execute()
+        ).eq("source_type", "linkedin_post").is_("deleted_at", "null").limit(1))
         if existing.data:
             return 0
     
-    result = db.client.table("linkedin_posts").select("*").eq("id", post_id).execute()
+    result = await execute_async(db.client.table("linkedin_posts").select("*").eq("id", post_id))
     if not result.data:
         return 0
     
     post = result.data[0]
     chunk = chunk_linkedin_post(post)
     
-    try:
-        embedding = await get_embedding(chunk["content"])
-        db.client.table("knowledge_chunks").insert({
-            "source_type": "linkedin_post",
-            "source_id": post_id,
-            "chunk_index": 0,
-            "content": chunk["content"],
-            "content_hash": chunk.get("content_hash"),
-            "embedding": embedding,
-            "metadata": chunk.get("metadata", {})
-        }).execute()
-        return 1
-    except Exception as e:
-        logger.error(f"Failed to index linkedin post: {e}")
-        return 0
+    return await _store_chunks("linkedin_post", post_id, [chunk], db, batcher=batcher)
 
 
-async def index_beeper_message(message_id: str, db, force: bool = False) -> int:
+async def index_beeper_message(message_id: str, db, force: bool = False, batcher: Optional[EmbeddingBatcher] = None) -> int:
     """
     Index a Beeper chat message.
     
@@ -760,13 +720,13 @@ async def index_beeper_message(message_id: str, db, force: bool = False) -> int:
     Groups messages by conversation for better semantic retrieval.
     """
     if not force:
-        existing = db.client.table("knowledge_chunks").select("id").eq(
+        existing = await execute_async(db.client.table("knowledge_chunks").select("id").eq(
             "source_id", message_id
-        ).eq("source_type", "beeper_message").limit(1).execute()
+        ).eq("source_type", "beeper_message").is_("deleted_at", "null").limit(1))
         if existing.data:
             return 0
     
-    result = db.client.table("beeper_messages").select("*").eq("id", message_id).execute()
+    result = await execute_async(db.client.table("beeper_messages").select("*").eq("id", message_id))
     if not result.data:
         return 0
     
@@ -783,26 +743,12 @@ async def index_beeper_message(message_id: str, db, force: bool = False) -> int:
     
     chunk = chunk_beeper_message(message, chat_name=chat_name, platform=platform)
     
-    try:
-        embedding = await get_embedding(chunk["content"])
-        db.client.table("knowledge_chunks").insert({
-            "source_type": "beeper_message",
-            "source_id": message_id,
-            "chunk_index": 0,
-            "content": chunk["content"],
-            "content_hash": chunk.get("content_hash"),
-            "embedding": embedding,
-            "metadata": {
-                **chunk.get("metadata", {}),
-                "platform": platform,
-                "sender_name": message.get("sender_name"),
-                "beeper_chat_id": message.get("beeper_chat_id")
-            }
-        }).execute()
-        return 1
-    except Exception as e:
-        logger.error(f"Failed to index beeper message: {e}")
-        return 0
+    metadata = {
+        "platform": platform,
+        "sender_name": message.get("sender_name"),
+        "beeper_chat_id": message.get("beeper_chat_id")
+    }
+    return await _store_chunks("beeper_message", message_id, [chunk], db, metadata, batcher)
 
 
 # Table name mapping for reindex_all
@@ -825,41 +771,47 @@ TABLE_NAME_MAP = {
 
 # Indexing function mapping
 INDEX_FUNCTION_MAP = {
-    "transcript": lambda id, db: index_transcript(id, db, force=True),
-    "meeting": lambda id, db: index_meeting(id, db, force=True),
-    "contact": lambda id, db: index_contact(id, db, force=True),
-    "journal": lambda id, db: index_journal(id, db, force=True),
-    "reflection": lambda id, db: index_reflection(id, db, force=True),
-    "task": lambda id, db: index_task(id, db, force=True),
-    "calendar": lambda id, db: index_calendar_event(id, db, force=True),
-    "application": lambda id, db: index_application(id, db, force=True),
-    "document": lambda id, db: index_document(id, db, force=True),
-    "email": lambda id, db: index_email(id, db, force=True),
-    "book": lambda id, db: index_book(id, db, force=True),
-    "highlight": lambda id, db: index_highlight(id, db, force=True),
-    "linkedin_post": lambda id, db: index_linkedin_post(id, db, force=True),
-    "beeper_message": lambda id, db: index_beeper_message(id, db, force=True),
+    "transcript": lambda id, db, batcher=None: index_transcript(id, db, force=True, batcher=batcher),
+    "meeting": lambda id, db, batcher=None: index_meeting(id, db, force=True, batcher=batcher),
+    "contact": lambda id, db, batcher=None: index_contact(id, db, force=True, batcher=batcher),
+    "journal": lambda id, db, batcher=None: index_journal(id, db, force=True, batcher=batcher),
+    "reflection": lambda id, db, batcher=None: index_reflection(id, db, force=True, batcher=batcher),
+    "task": lambda id, db, batcher=None: index_task(id, db, force=True, batcher=batcher),
+    "calendar": lambda id, db, batcher=None: index_calendar_event(id, db, force=True, batcher=batcher),
+    "application": lambda id, db, batcher=None: index_application(id, db, force=True, batcher=batcher),
+    "document": lambda id, db, batcher=None: index_document(id, db, force=True, batcher=batcher),
+    "email": lambda id, db, batcher=None: index_email(id, db, force=True, batcher=batcher),
+    "book": lambda id, db, batcher=None: index_book(id, db, force=True, batcher=batcher),
+    "highlight": lambda id, db, batcher=None: index_highlight(id, db, force=True, batcher=batcher),
+    "linkedin_post": lambda id, db, batcher=None: index_linkedin_post(id, db, force=True, batcher=batcher),
+    "beeper_message": lambda id, db, batcher=None: index_beeper_message(id, db, force=True, batcher=batcher),
 }
 
 
 async def reindex_all(
     source_types: List[str] = None,
     db = None,
-    limit: int = None
+    limit: int = None,
+    concurrency: int = None
 ) -> Dict[str, Dict[str, int]]:
     """
     Reindex all content of specified types.
     
     Use this for initial indexing or after schema changes.
+    Records are indexed by an IndexingScheduler worker pool that shares one
+    EmbeddingBatcher, so chunks from many small records are embedded together.
     
     Args:
         source_types: Which types to reindex (default: all main content)
         db: Database client
         limit: Max records per type (for testing)
+        concurrency: Parallel workers (default: KNOWLEDGE_INDEX_CONCURRENCY)
     
     Returns:
-        Dict mapping source_type to {indexed: N, errors: N}
+        Dict mapping source_type to {indexed: N, errors: N, records: N}
     """
+    from app.features.knowledge.scheduler import IndexingScheduler
+    
     if db is None:
         from app.services.database import SupabaseMultiDatabase
         db = SupabaseMultiDatabase()
@@ -873,14 +825,12 @@ async def reindex_all(
     ]
     
     results = {}
+    scheduler = IndexingScheduler(db, concurrency=concurrency)
     
     for source_type in source_types:
-        logger.info(f"Reindexing {source_type}...")
-        
         table_name = TABLE_NAME_MAP.get(source_type)
-        index_func = INDEX_FUNCTION_MAP.get(source_type)
         
-        if not table_name or not index_func:
+        if not table_name or source_type not in INDEX_FUNCTION_MAP:
             logger.warning(f"No indexer for type: {source_type}")
             results[source_type] = {"indexed": 0, "errors": 1}
             continue
@@ -890,29 +840,26 @@ async def reindex_all(
             query = db.client.table(table_name).select("id")
             if limit:
                 query = query.limit(limit)
-            records = query.execute()
+            records = await execute_async(query)
             
             if not records.data:
                 results[source_type] = {"indexed": 0, "errors": 0}
                 continue
             
-            total_indexed = 0
-            total_errors = 0
-            
-            for record in records.data:
-                try:
-                    count = await index_func(record["id"], db)
-                    total_indexed += count
-                except Exception as e:
-                    logger.error(f"Error indexing {source_type} {record['id']}: {e}")
-                    total_errors += 1
-            
-            results[source_type] = {"indexed": total_indexed, "errors": total_errors}
-            logger.info(f"Indexed {total_indexed} chunks from {len(records.data)} {source_type}s ({total_errors} errors)")
+            scheduler.enqueue(source_type, [record["id"] for record in records.data])
+            logger.info(f"Queued {len(records.data)} {source_type}s for reindexing")
             
         except Exception as e:
             logger.error(f"Failed to reindex {source_type}: {e}")
             results[source_type] = {"indexed": 0, "errors": 1}
     
+    results.update(await scheduler.run())
+    
+    # Refresh BM25 corpus stats for keyword search (migration 028)
+    try:
+        await execute_async(db.client.rpc("refresh_knowledge_fts_stats", {}))
+    except Exception as e:
+        logger.warning(f"Failed to refresh full-text stats: {e}")
+    
     logger.info(f"Reindex complete: {results}")
     return results
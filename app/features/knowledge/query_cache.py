@@ -0,0 +1,150 @@
+"""
+Query embedding cache - avoid re-embedding the same search text.
+
+A single chat turn often embeds the same query several times (hybrid
+search, retrieve_context, tool calls). Query vectors are cached by
+normalized text with a TTL and an LRU bound, and concurrent lookups for
+the same text share one in-flight OpenAI request.
+
+Usage:
+    cache = get_query_embedding_cache()
+    vector = await cache.get(query, get_embedding)
+    cache.stats()  # {"hits": ..., "misses": ..., "coalesced": ...}
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("Jarvis.Knowledge.QueryCache")
+
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1000"))
+QUERY_CACHE_TTL = float(os.getenv("QUERY_EMBEDDING_CACHE_TTL", "3600"))
+
+
+def normalize_query(text: str) -> str:
+    """Cache key: case-folded with whitespace collapsed."""
+    return " ".join((text or "").split()).casefold()
+
+
+def _consume_exception(task: asyncio.Future) -> None:
+    # Every waiter may have been cancelled; don't warn about an unretrieved error
+    if not task.cancelled():
+        task.exception()
+
+
+class QueryEmbeddingCache:
+    """TTL + LRU cache of query embeddings with in-flight coalescing."""
+
+    def __init__(self, max_size: int = QUERY_CACHE_SIZE, ttl: float = QUERY_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, List[float]]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Tool calls may run on their own event loop in another thread
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _lookup(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, vector = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return vector
+
+    def _store(self, key: str, vector: List[float]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def get(
+        self,
+        text: str,
+        embed: Callable[[str], Awaitable[List[float]]]
+    ) -> List[float]:
+        """
+        Return the embedding for text, calling embed() only on a miss.
+
+        Args:
+            text: Query text
+            embed: Coroutine function producing an embedding for a string
+
+        Returns:
+            The embedding vector
+        """
+        key = normalize_query(text)
+
+        vector = self._lookup(key)
+        if vector is not None:
+            self.hits += 1
+            return vector
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            task = self._inflight.get(key)
+            # A future can only be awaited on the loop that created it
+            if task is None or task.get_loop() is not loop:
+                self.misses += 1
+                task = loop.create_task(self._fetch(key, text, embed))
+                task.add_done_callback(_consume_exception)
+                self._inflight[key] = task
+            else:
+                self.coalesced += 1
+
+        # Shielded so one caller being cancelled doesn't fail the others
+        return await asyncio.shield(task)
+
+    async def _fetch(
+        self,
+        key: str,
+        text: str,
+        embed: Callable[[str], Awaitable[List[float]]]
+    ) -> List[float]:
+        try:
+            vector = await embed(text)
+            self._store(key, vector)
+            return vector
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is asyncio.current_task():
+                    del self._inflight[key]
+
+    def clear(self) -> None:
+        """Drop all cached vectors (in-flight requests are unaffected)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/coalesced counters plus current size."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+            "size": len(self._entries),
+        }
+
+
+_query_cache: Optional[QueryEmbeddingCache] = None
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """Get the process-wide query embedding cache."""
+    global _query_cache
+    if _query_cache is None:
+        _query_cache = QueryEmbeddingCache()
+    return _query_cache
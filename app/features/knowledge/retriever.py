@@ -4,17 +4,29 @@ Retrieval service - semantic search across all knowledge.
 This is the "read" side of RAG - called when answering questions.
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 from datetime import datetime, timedelta
 
+from app.features.database import execute_async
+
+if TYPE_CHECKING:
+    from app.features.knowledge.context_packer import PackedContext
+
 logger = logging.getLogger("Jarvis.Knowledge.Retriever")
 
 
 async def get_query_embedding(query: str) -> List[float]:
-    """Generate embedding for a search query."""
-    from app.features.knowledge.indexer import get_embedding
-    return await get_embedding(query)
+    """
+    Generate embedding for a search query.
+
+    Served from the shared query cache (see query_cache.py); concurrent
+    identical queries share one OpenAI call.
+    """
+    from app.features.knowledge.embeddings import get_embedding
+    from app.features.knowledge.query_cache import get_query_embedding_cache
+    return await get_query_embedding_cache().get(query, get_embedding)
 
 
 async def semantic_search(
@@ -69,28 +81,27 @@ async def semantic_search(
     # Use RPC function for vector search
     # This assumes we have a match_knowledge_chunks function
     try:
-        result = db.client.rpc("match_knowledge_chunks", {
+        result = await execute_async(db.client.rpc("match_knowledge_chunks", {
             "query_embedding": query_embedding,
             "match_threshold": similarity_threshold,
             "match_count": limit,
             "filter_source_types": source_types,
             "filter_contact_id": contact_id
-        }).execute()
-        
-        if result.data:
-            return result.data
+        }))
     except Exception as e:
         logger.warning(f"RPC search failed, falling back to manual: {e}")
-    
-    # Fallback: Manual search (less efficient but works without RPC)
-    return await _manual_semantic_search(
-        query_embedding=query_embedding,
-        db=db,
-        source_types=source_types,
-        contact_id=contact_id,
-        limit=limit,
-        threshold=similarity_threshold
-    )
+        # Fallback: Manual search (less efficient but works without RPC)
+        return await _manual_semantic_search(
+            query_embedding=query_embedding,
+            db=db,
+            source_types=source_types,
+            contact_id=contact_id,
+            limit=limit,
+            threshold=similarity_threshold
+        )
+
+    # No rows above the threshold is a valid answer, not an RPC failure
+    return result.data or []
 
 
 async def _manual_semantic_search(
@@ -103,65 +114,53 @@ async def _manual_semantic_search(
 ) -> List[Dict[str, Any]]:
     """
     Fallback semantic search without RPC.
-    
-    Less efficient but works on any Supabase setup.
-    """
-    import json
-    import numpy as np
 
-    # Fetch chunks (with filters)
-    query = db.client.table("knowledge_chunks").select(
-        "id, source_type, source_id, chunk_index, content, metadata, embedding"
-    ).is_("deleted_at", "null")
-
-    if source_types:
-        query = query.in_("source_type", source_types)
+    Searches the in-memory vector index (see vector_index.py), which is
+    built from knowledge_chunks on first use and kept fresh by the indexer.
+    """
+    from app.features.knowledge.vector_index import get_vector_index
 
-    if contact_id:
-        query = query.eq("metadata->>contact_id", contact_id)
+    index = get_vector_index()
+    await index.ensure_loaded(db)
 
-    # Limit to reasonable number for in-memory processing
-    query = query.limit(1000)
+    return index.search(
+        query_embedding,
+        source_types=source_types,
+        contact_id=contact_id,
+        limit=limit,
+        threshold=threshold
+    )
 
-    result = query.execute()
 
-    if not result.data:
-        return []
+RRF_K = 60  # Reciprocal rank fusion constant (Cormack et al.)
 
-    # Calculate similarities
-    query_vec = np.array(query_embedding, dtype=np.float32)
-    results = []
 
-    for chunk in result.data:
-        if not chunk.get("embedding"):
-            continue
+def _reciprocal_rank_fusion(
+    result_lists: Dict[str, List[Dict[str, Any]]],
+    k: int = RRF_K
+) -> List[Dict[str, Any]]:
+    """
+    Merge ranked lists by summing 1 / (k + rank) per list.
 
-        # pgvector may return embeddings as JSON strings - parse to float array
-        chunk_embedding = chunk["embedding"]
-        if isinstance(chunk_embedding, str):
-            chunk_embedding = json.loads(chunk_embedding)
-        chunk_vec = np.array(chunk_embedding, dtype=np.float32)
-        
-        # Cosine similarity
-        similarity = np.dot(query_vec, chunk_vec) / (
-            np.linalg.norm(query_vec) * np.linalg.norm(chunk_vec)
-        )
-        
-        if similarity >= threshold:
-            results.append({
-                "id": chunk["id"],
-                "source_type": chunk["source_type"],
-                "source_id": chunk["source_id"],
-                "chunk_index": chunk["chunk_index"],
-                "content": chunk["content"],
-                "metadata": chunk["metadata"],
-                "similarity": float(similarity)
-            })
-    
-    # Sort by similarity descending
-    results.sort(key=lambda x: x["similarity"], reverse=True)
-    
-    return results[:limit]
+    Rank-based, so semantic similarities and BM25 scores never need to be
+    put on the same scale. Chunks found by several searches rise to the top.
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    for match_type, results in result_lists.items():
+        for rank, result in enumerate(results, start=1):
+            entry = fused.get(result["id"])
+            if entry is None:
+                entry = fused[result["id"]] = {**result, "rrf_score": 0.0, "match_types": []}
+            else:
+                entry.update({key: value for key, value in result.items() if key not in entry})
+            entry["rrf_score"] += 1.0 / (k + rank)
+            entry["match_types"].append(match_type)
+
+    merged = sorted(fused.values(), key=lambda x: x["rrf_score"], reverse=True)
+    for entry in merged:
+        types = entry.pop("match_types")
+        entry["match_type"] = types[0] if len(types) == 1 else "both"
+    return merged
 
 
 async def hybrid_search(
@@ -175,48 +174,51 @@ async def hybrid_search(
     """
     Hybrid search combining semantic + keyword matching.
 
-    Better for queries with specific names or terms.
+    Both searches run concurrently and are merged with reciprocal rank
+    fusion. Better for queries with specific names or terms.
+
+    Each result keeps "similarity" (the semantic score, or the normalized
+    BM25 score for keyword-only hits) and gains "rrf_score" and
+    "match_type" ("semantic", "keyword" or "both").
     """
-    # Semantic search
-    semantic_results = await semantic_search(
-        query=query,
-        db=db,
-        source_types=source_types,
-        contact_id=contact_id,
-        limit=limit * 2,  # Get more for re-ranking
-        similarity_threshold=threshold
-    )
-    
-    # Keyword search
-    keyword_results = await _keyword_search(
-        query=query,
-        db=db,
-        source_types=source_types,
-        limit=limit
+    semantic_results, keyword_results = await asyncio.gather(
+        semantic_search(
+            query=query,
+            db=db,
+            source_types=source_types,
+            contact_id=contact_id,
+            limit=limit * 2,  # Get more for re-ranking
+            similarity_threshold=threshold
+        ),
+        _keyword_search(
+            query=query,
+            db=db,
+            source_types=source_types,
+            contact_id=contact_id,
+            limit=limit * 2
+        ),
+        return_exceptions=True
     )
-    
-    # Merge and deduplicate
-    seen_ids = set()
-    merged = []
-    
-    # Semantic results first (usually better quality)
-    for result in semantic_results:
-        if result["id"] not in seen_ids:
-            seen_ids.add(result["id"])
-            result["match_type"] = "semantic"
-            merged.append(result)
-    
-    # Add keyword results that weren't in semantic
-    for result in keyword_results:
-        if result["id"] not in seen_ids:
-            seen_ids.add(result["id"])
-            result["match_type"] = "keyword"
-            result["similarity"] = 0.5  # Default score for keyword matches
-            merged.append(result)
-    
-    # Re-sort by similarity
-    merged.sort(key=lambda x: x.get("similarity", 0), reverse=True)
-    
+
+    if isinstance(semantic_results, Exception):
+        logger.warning(f"Semantic search failed in hybrid search: {semantic_results}")
+        semantic_results = []
+    if isinstance(keyword_results, Exception):
+        logger.warning(f"Keyword search failed in hybrid search: {keyword_results}")
+        keyword_results = []
+
+    merged = _reciprocal_rank_fusion({
+        "semantic": semantic_results,
+        "keyword": keyword_results,
+    })
+
+    # Keyword-only hits have no cosine similarity; expose BM25 relative to the best hit
+    top_keyword = max((r.get("keyword_score") or 0 for r in keyword_results), default=0)
+    for result in merged:
+        if "similarity" not in result:
+            score = result.get("keyword_score") or 0
+            result["similarity"] = round(score / top_keyword, 4) if top_keyword else 0.0
+
     return merged[:limit]
 
 
@@ -224,13 +226,32 @@ async def _keyword_search(
     query: str,
     db,
     source_types: List[str] = None,
+    contact_id: str = None,
     limit: int = 10
 ) -> List[Dict[str, Any]]:
-    """Simple keyword/text search as fallback."""
+    """
+    BM25-ranked full-text search (search_knowledge_chunks_bm25, migration 028).
+
+    Falls back to a trigram-indexed ILIKE match if the RPC isn't available.
+    Results carry "keyword_score" (higher is better).
+    """
+    try:
+        result = await execute_async(db.client.rpc("search_knowledge_chunks_bm25", {
+            "query_text": query,
+            "match_count": limit,
+            "filter_source_types": source_types,
+            "filter_contact_id": contact_id
+        }))
+        return [
+            {**{key: value for key, value in row.items() if key != "score"}, "keyword_score": row.get("score")}
+            for row in (result.data or [])
+        ]
+    except Exception as e:
+        logger.warning(f"BM25 keyword search failed, falling back to ILIKE: {e}")
+
     # Sanitize query for ILIKE pattern - escape special PostgreSQL LIKE chars
     sanitized = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
-    # Use Postgres full-text search or ILIKE
     base_query = db.client.table("knowledge_chunks").select(
         "id, source_type, source_id, chunk_index, content, metadata"
     ).is_("deleted_at", "null")
@@ -238,12 +259,48 @@ async def _keyword_search(
     if source_types:
         base_query = base_query.in_("source_type", source_types)
 
+    if contact_id:
+        base_query = base_query.eq("metadata->>contact_id", contact_id)
+
     # Use ILIKE for simple matching with sanitized input
     base_query = base_query.ilike("content", f"%{sanitized}%")
 
-    result = base_query.limit(limit).execute()
+    result = await execute_async(base_query.limit(limit))
+
+    # No relevance signal from ILIKE; rank in returned order
+    rows = result.data or []
+    return [{**row, "keyword_score": 1.0 / (i + 1)} for i, row in enumerate(rows)]
 
-    return result.data if result.data else []
+
+async def retrieve_packed_context(
+    query: str,
+    db,
+    source_types: List[str] = None,
+    contact_id: str = None,
+    limit: int = 10,
+    max_tokens: int = 4000
+) -> "PackedContext":
+    """
+    Retrieve context and pack it into the token budget.
+
+    Like retrieve_context, but returns the PackedContext so callers can
+    see token usage and which chunks were dropped (see context_packer.py).
+    """
+    from app.features.knowledge.context_packer import PackedContext, pack_context
+
+    # Use hybrid search for best results
+    results = await hybrid_search(
+        query=query,
+        db=db,
+        source_types=source_types,
+        contact_id=contact_id,
+        limit=limit
+    )
+
+    if not results:
+        return PackedContext(max_tokens=max_tokens)
+
+    return pack_context(results, max_tokens=max_tokens)
 
 
 async def retrieve_context(
@@ -258,7 +315,8 @@ async def retrieve_context(
     Retrieve and format context for LLM consumption.
     
     This is the main function for RAG - returns formatted text
-    ready to inject into a prompt.
+    ready to inject into a prompt. Adjacent chunks are merged,
+    near-duplicates dropped and the result fits max_tokens exactly.
     
     Args:
         query: The user's question
@@ -266,52 +324,20 @@ async def retrieve_context(
         source_types: Filter by content types
         contact_id: Filter by related contact
         limit: Max chunks to retrieve
-        max_tokens: Approximate token limit for context
+        max_tokens: Token limit for context
     
     Returns:
         Formatted context string for LLM prompt
     """
-    # Use hybrid search for best results
-    results = await hybrid_search(
+    packed = await retrieve_packed_context(
         query=query,
         db=db,
         source_types=source_types,
         contact_id=contact_id,
-        limit=limit
+        limit=limit,
+        max_tokens=max_tokens
     )
-    
-    if not results:
-        return ""
-    
-    # Format results as context
-    context_parts = []
-    total_chars = 0
-    max_chars = max_tokens * 4  # Rough conversion
-    
-    for result in results:
-        # Format each chunk with source info
-        source_type = result.get("source_type", "unknown")
-        content = result.get("content", "")
-        metadata = result.get("metadata", {})
-        
-        # Build source citation
-        source_info = f"[{source_type.upper()}"
-        if metadata.get("date"):
-            source_info += f" - {metadata['date'][:10]}"
-        if metadata.get("contact_name"):
-            source_info += f" - {metadata['contact_name']}"
-        source_info += "]"
-        
-        chunk_text = f"{source_info}\n{content}"
-        
-        # Check token limit
-        if total_chars + len(chunk_text) > max_chars:
-            break
-        
-        context_parts.append(chunk_text)
-        total_chars += len(chunk_text)
-    
-    return "\n\n---\n\n".join(context_parts)
+    return packed.text
 
 
 async def get_contact_context(
@@ -327,11 +353,11 @@ async def get_contact_context(
     semantic search, since there is no meaningful query to embed.
     """
     try:
-        result = db.client.table("knowledge_chunks").select(
+        result = await execute_async(db.client.table("knowledge_chunks").select(
             "id, source_type, source_id, chunk_index, content, metadata, created_at"
         ).is_("deleted_at", "null").eq(
             "metadata->>contact_id", contact_id
-        ).order("created_at", desc=True).limit(limit).execute()
+        ).order("created_at", desc=True).limit(limit))
 
         results = []
         for chunk in (result.data or []):
@@ -411,6 +437,6 @@ async def get_recent_context(
     
     query = query.order("created_at", desc=True).limit(limit)
     
-    result = query.execute()
+    result = await execute_async(query)
     
     return result.data if result.data else []
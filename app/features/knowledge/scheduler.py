@@ -0,0 +1,164 @@
+"""
+Indexing scheduler - bounded-parallel worker pool for (re)indexing.
+
+Records are queued per source type and drained by a fixed number of
+workers that round-robin across the queues, so one large table (e.g.
+beeper_messages) doesn't starve the others. Embedding rate limits are
+handled centrally in embeddings.py (shared cooldown + backoff), so
+workers simply pause together instead of hammering the API.
+
+Usage:
+    scheduler = IndexingScheduler(db, concurrency=8)
+    scheduler.enqueue("meeting", meeting_ids)
+    scheduler.enqueue("email", email_ids)
+    results = await scheduler.run()
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Dict, List, Any, Optional, Callable, Deque
+
+from app.features.knowledge.embeddings import EmbeddingBatcher
+
+logger = logging.getLogger("Jarvis.Knowledge.Scheduler")
+
+INDEX_CONCURRENCY = int(os.getenv("KNOWLEDGE_INDEX_CONCURRENCY", "8"))
+PROGRESS_LOG_INTERVAL = 10.0  # Seconds between progress log lines
+
+
+class IndexingScheduler:
+    """Runs index functions over many records with bounded concurrency."""
+
+    def __init__(
+        self,
+        db,
+        concurrency: Optional[int] = None,
+        batcher: Optional[EmbeddingBatcher] = None,
+        index_functions: Optional[Dict[str, Callable]] = None
+    ):
+        """
+        Args:
+            db: Database client passed to every index function
+            concurrency: Number of workers (default: KNOWLEDGE_INDEX_CONCURRENCY)
+            batcher: Shared EmbeddingBatcher (default: a new one for this run)
+            index_functions: source_type -> fn(id, db, batcher=...) (default: INDEX_FUNCTION_MAP)
+        """
+        if index_functions is None:
+            from app.features.knowledge.indexer import INDEX_FUNCTION_MAP
+            index_functions = INDEX_FUNCTION_MAP
+
+        self.db = db
+        self.concurrency = max(1, concurrency or INDEX_CONCURRENCY)
+        self.batcher = batcher or EmbeddingBatcher(db)
+        self.index_functions = index_functions
+        self._queues: Dict[str, Deque[str]] = {}
+        self._order: List[str] = []
+        self._cursor = 0
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._started_at: Optional[float] = None
+        self._last_log = 0.0
+
+    def enqueue(self, source_type: str, record_ids: List[str]) -> int:
+        """Queue records of one source type. Returns the number queued."""
+        if source_type not in self.index_functions:
+            logger.warning(f"No indexer for type: {source_type}")
+            return 0
+        if source_type not in self._queues:
+            self._queues[source_type] = deque()
+            self._order.append(source_type)
+            self._counts[source_type] = {"records": 0, "done": 0, "errors": 0}
+        self._queues[source_type].extend(record_ids)
+        self._counts[source_type]["records"] += len(record_ids)
+        return len(record_ids)
+
+    def _next_job(self) -> Optional[tuple]:
+        """Pop the next record, round-robin across source-type queues."""
+        for _ in range(len(self._order)):
+            source_type = self._order[self._cursor % len(self._order)]
+            self._cursor += 1
+            queue = self._queues[source_type]
+            if queue:
+                return source_type, queue.popleft()
+        return None
+
+    # ==================== PROGRESS ====================
+
+    def progress(self) -> Dict[str, Any]:
+        """Snapshot of progress with a throughput-based ETA."""
+        total = sum(c["records"] for c in self._counts.values())
+        done = sum(c["done"] + c["errors"] for c in self._counts.values())
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / rate if rate > 0 else None
+        return {
+            "total": total,
+            "done": done,
+            "errors": sum(c["errors"] for c in self._counts.values()),
+            "elapsed_seconds": round(elapsed, 1),
+            "records_per_second": round(rate, 2),
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+            "by_type": {t: dict(c) for t, c in self._counts.items()},
+        }
+
+    def _maybe_log_progress(self) -> None:
+        now = time.monotonic()
+        if now - self._last_log < PROGRESS_LOG_INTERVAL:
+            return
+        self._last_log = now
+        p = self.progress()
+        eta = f"{p['eta_seconds']:.0f}s" if p["eta_seconds"] is not None else "?"
+        logger.info(
+            f"Indexing progress: {p['done']}/{p['total']} records "
+            f"({p['records_per_second']}/s, {p['errors']} errors, ETA {eta})"
+        )
+
+    # ==================== EXECUTION ====================
+
+    async def _worker(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            source_type, record_id = job
+            try:
+                await self.index_functions[source_type](record_id, self.db, batcher=self.batcher)
+                self._counts[source_type]["done"] += 1
+            except Exception as e:
+                logger.error(f"Error indexing {source_type} {record_id}: {e}")
+                self._counts[source_type]["errors"] += 1
+            self._maybe_log_progress()
+
+    async def run(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Drain all queues and flush the batcher.
+
+        Returns:
+            Dict mapping source_type to {indexed, errors, records}
+        """
+        self._started_at = time.monotonic()
+        self._last_log = self._started_at
+        total = sum(c["records"] for c in self._counts.values())
+        workers = min(self.concurrency, total) or 1
+        logger.info(f"Indexing {total} records across {len(self._order)} types with {workers} workers")
+
+        await asyncio.gather(*(self._worker() for _ in range(workers)))
+        await self.batcher.flush()
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for source_type, counts in self._counts.items():
+            stats = self.batcher.stats.get(source_type, {"indexed": 0, "errors": 0})
+            results[source_type] = {
+                "indexed": stats["indexed"],
+                "errors": counts["errors"] + stats["errors"],
+                "records": counts["records"],
+            }
+
+        p = self.progress()
+        logger.info(
+            f"Indexing finished: {p['done']} records in {p['elapsed_seconds']}s "
+            f"({p['records_per_second']}/s, {self.batcher.reused} embeddings reused)"
+        )
+        return results
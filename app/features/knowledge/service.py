@@ -9,6 +9,8 @@ import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+from app.features.database import execute_async
+
 logger = logging.getLogger("Jarvis.Knowledge.Service")
 
 # Singleton instance
@@ -152,7 +154,7 @@ class KnowledgeService:
             query: The user's question
             source_types: Optional content type filter
             contact_id: Optional contact filter
-            max_tokens: Approximate token budget
+            max_tokens: Token budget
         
         Returns:
             Formatted context string
@@ -167,6 +169,27 @@ class KnowledgeService:
             max_tokens=max_tokens
         )
     
+    async def get_packed_context_for_query(
+        self,
+        query: str,
+        source_types: List[str] = None,
+        contact_id: str = None,
+        max_tokens: int = 4000
+    ):
+        """
+        Like get_context_for_query, but returns the PackedContext
+        (text, token count and the chunks dropped to fit the budget).
+        """
+        from app.features.knowledge.retriever import retrieve_packed_context
+        
+        return await retrieve_packed_context(
+            query=query,
+            db=self.db,
+            source_types=source_types,
+            contact_id=contact_id,
+            max_tokens=max_tokens
+        )
+    
     async def get_contact_context(
         self,
         contact_id: str,
@@ -327,7 +350,8 @@ class KnowledgeService:
     async def reindex_all(
         self,
         content_types: List[str] = None,
-        limit: int = None
+        limit: int = None,
+        concurrency: int = None
     ) -> Dict[str, Any]:
         """
         Reindex all content.
@@ -337,6 +361,7 @@ class KnowledgeService:
         Args:
             content_types: Which types to reindex (default: all)
             limit: Max records per type (for testing)
+            concurrency: Parallel indexing workers (default: KNOWLEDGE_INDEX_CONCURRENCY)
         
         Returns:
             Dict mapping source_type to {indexed: N, errors: N}
@@ -346,7 +371,8 @@ class KnowledgeService:
         return await reindex_all(
             source_types=content_types,
             db=self.db,
-            limit=limit
+            limit=limit,
+            concurrency=concurrency
         )
     
     async def delete_chunks_for_source(
@@ -360,24 +386,42 @@ class KnowledgeService:
         Call this when a source record is deleted.
         """
         try:
-            result = self.db.client.table("knowledge_chunks").update({
+            result = await execute_async(self.db.client.table("knowledge_chunks").update({
                 "deleted_at": datetime.now().isoformat()
-            }).eq("source_type", source_type).eq("source_id", source_id).execute()
-            
+            }).eq("source_type", source_type).eq("source_id", source_id))
+
+            from app.features.knowledge.vector_index import get_vector_index
+            get_vector_index().remove_source(source_type, source_id)
+
             return len(result.data) if result.data else 0
         except Exception as e:
             logger.error(f"Failed to delete chunks: {e}")
             return 0
     
+    async def compact(self, older_than_days: int = None) -> Dict[str, Any]:
+        """
+        Hard-delete soft-deleted chunks older than the retention window.
+
+        Meant to run on a schedule (see POST /knowledge/compact).
+        """
+        from app.features.knowledge.compaction import (
+            compact_knowledge_chunks, COMPACTION_RETENTION_DAYS,
+        )
+
+        return await compact_knowledge_chunks(
+            self.db,
+            older_than_days=older_than_days or COMPACTION_RETENTION_DAYS
+        )
+    
     # ==================== STATS & HEALTH ====================
     
     async def get_stats(self) -> Dict[str, int]:
         """Get knowledge base statistics by source type."""
         try:
             # Get counts grouped by source_type
-            result = self.db.client.table("knowledge_chunks").select(
+            result = await execute_async(self.db.client.table("knowledge_chunks").select(
                 "source_type"
-            ).is_("deleted_at", "null").execute()
+            ).is_("deleted_at", "null"))
             
             # Count by type
             counts = {}
@@ -399,9 +443,9 @@ class KnowledgeService:
         
         # Check Supabase connection
         try:
-            result = self.db.client.table("knowledge_chunks").select(
+            result = await execute_async(self.db.client.table("knowledge_chunks").select(
                 "id", count="exact"
-            ).is_("deleted_at", "null").limit(1).execute()
+            ).is_("deleted_at", "null").limit(1))
             supabase_ok = True
             total_chunks = result.count if hasattr(result, 'count') else 0
         except Exception as e:
@@ -411,10 +455,13 @@ class KnowledgeService:
         import os
         openai_ok = bool(os.getenv("OPENAI_API_KEY"))
         
+        from app.features.knowledge.query_cache import get_query_embedding_cache
+
         return {
             "supabase_connected": supabase_ok,
             "openai_configured": openai_ok,
             "total_chunks": total_chunks,
+            "query_embedding_cache": get_query_embedding_cache().stats(),
             "status": "healthy" if (supabase_ok and openai_ok) else "unhealthy"
         }
 
@@ -0,0 +1,78 @@
+"""
+Token counting for chunking and embedding budgets.
+
+Uses tiktoken's cl100k_base encoding (what text-embedding-ada-002 uses)
+when tiktoken is installed. Without it, falls back to the old
+characters-per-token heuristic so nothing breaks, just less precisely.
+"""
+
+import logging
+from functools import lru_cache
+from typing import Iterator, List, Optional
+
+logger = logging.getLogger("Jarvis.Knowledge.Tokenizer")
+
+TOKENIZER_ENCODING = "cl100k_base"
+CHARS_PER_TOKEN = 4  # Heuristic fallback (English ~4, German 2-3)
+
+_encoding = None
+_encoding_loaded = False
+
+
+def _get_encoding():
+    """Load the tiktoken encoding once; None if tiktoken is unavailable."""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding(TOKENIZER_ENCODING)
+        except Exception as e:
+            logger.info(f"tiktoken unavailable, using {CHARS_PER_TOKEN} chars/token estimate: {e}")
+            _encoding = None
+    return _encoding
+
+
+def has_exact_tokenizer() -> bool:
+    """True if counts come from tiktoken rather than the heuristic."""
+    return _get_encoding() is not None
+
+
+@lru_cache(maxsize=4096)
+def _count_cached(text: str) -> int:
+    return len(_get_encoding().encode(text, disallowed_special=()))
+
+
+def count_tokens(text: Optional[str]) -> int:
+    """Count tokens in text (exact with tiktoken, estimated otherwise)."""
+    if not text:
+        return 0
+    if _get_encoding() is None:
+        return -(-len(text) // CHARS_PER_TOKEN)  # Round up so summed pieces stay within budget
+    # Short strings (segments, sentences, messages) repeat a lot; long ones don't
+    if len(text) <= 2000:
+        return _count_cached(text)
+    return len(_get_encoding().encode(text, disallowed_special=()))
+
+
+def split_by_tokens(text: str, max_tokens: int) -> Iterator[str]:
+    """
+    Split text into pieces of at most max_tokens, breaking on whitespace.
+
+    Used for runs of text with no sentence boundaries (e.g. unpunctuated
+    transcript segments) that would otherwise become oversized chunks.
+    """
+    words = text.split()
+    current: List[str] = []
+    current_tokens = 0
+    for word in words:
+        # Leading space matches how the word tokenizes mid-sentence
+        word_tokens = max(1, count_tokens(" " + word))
+        if current and current_tokens + word_tokens > max_tokens:
+            yield " ".join(current)
+            current = []
+            current_tokens = 0
+        current.append(word)
+        current_tokens += word_tokens
+    if current:
+        yield " ".join(current)
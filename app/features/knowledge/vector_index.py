@@ -0,0 +1,351 @@
+"""
+In-memory vector index - local fallback for semantic search.
+
+Used when the match_knowledge_chunks RPC is unavailable. All live chunk
+embeddings are held in one pre-normalized float32 matrix, so a query is a
+single matrix-vector product plus boolean filter masks instead of a
+per-row Python loop over a capped HTTP fetch.
+
+Freshness:
+- First use loads every live chunk from knowledge_chunks (keyset-paginated)
+- The indexer pushes inserts, metadata refreshes and soft-deletes as they
+  happen (see EmbeddingBatcher._insert and EmbeddingBatcher._commit)
+- Changes made by other processes - inserts, staged rows published by a
+  diff commit, metadata refreshes and soft-deletes - are picked up
+  incrementally (by updated_at, which the table trigger bumps on every
+  update) every VECTOR_INDEX_REFRESH_SECONDS or on request_refresh(); a full
+  rebuild every VECTOR_INDEX_REBUILD_SECONDS reclaims dead slots
+
+Memory: ~6 KB per chunk (1536 x float32) plus content/metadata.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("Jarvis.Knowledge.VectorIndex")
+
+EMBEDDING_DIM = 1536
+LOAD_PAGE_SIZE = 1000
+VECTOR_INDEX_REFRESH_SECONDS = float(os.getenv("VECTOR_INDEX_REFRESH_SECONDS", "300"))
+VECTOR_INDEX_REBUILD_SECONDS = float(os.getenv("VECTOR_INDEX_REBUILD_SECONDS", "3600"))
+
+_SELECT_COLUMNS = "id, source_type, source_id, chunk_index, content, metadata, embedding, updated_at, deleted_at"
+
+
+def _parse_embedding(embedding) -> Optional[np.ndarray]:
+    """Parse a pgvector value (JSON string or list) into a float32 vector."""
+    if embedding is None:
+        return None
+    if isinstance(embedding, str):
+        vec = np.fromstring(embedding.strip("[]"), sep=",", dtype=np.float32)
+    else:
+        vec = np.asarray(embedding, dtype=np.float32)
+    return vec if vec.shape == (EMBEDDING_DIM,) else None
+
+
+class VectorIndex:
+    """
+    Brute-force cosine index over normalized float32 rows.
+
+    Rows are appended into a growable matrix; deletes clear an alive bit
+    and the slot is reclaimed on the next rebuild. source_type and
+    contact_id are stored as integer codes so filters are vector ops.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+        self._lock = threading.Lock()
+        self._load_lock: Optional[asyncio.Lock] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._matrix = np.zeros((0, self.dim), dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._type_codes = np.zeros(0, dtype=np.int32)
+        self._contact_codes = np.zeros(0, dtype=np.int32)
+        self._size = 0
+        self._payload: List[Dict[str, Any]] = []
+        self._row_by_id: Dict[str, int] = {}
+        self._type_ids: Dict[str, int] = {}
+        self._contact_ids: Dict[str, int] = {}
+        self._watermark: Optional[str] = None  # Max updated_at seen
+        self._loaded_at = 0.0
+        self._built_at = 0.0
+        self.loaded = False
+
+    @property
+    def size(self) -> int:
+        """Number of live rows."""
+        return int(self._alive[:self._size].sum())
+
+    # ==================== MUTATION ====================
+
+    def _code(self, table: Dict[str, int], value: Optional[str]) -> int:
+        if not value:
+            return -1
+        if value not in table:
+            table[value] = len(table)
+        return table[value]
+
+    def _grow(self, needed: int) -> None:
+        capacity = self._matrix.shape[0]
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, 1024)
+        matrix = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        matrix[:self._size] = self._matrix[:self._size]
+        self._matrix = matrix
+        for name in ("_alive", "_type_codes", "_contact_codes"):
+            old = getattr(self, name)
+            new = np.zeros(new_capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def _add_locked(self, rows: List[Dict[str, Any]]) -> int:
+        """Apply rows: append new live ones, refresh or drop ones already indexed."""
+        changed = 0
+        parsed: List[Tuple[Dict[str, Any], np.ndarray]] = []
+        for row in rows:
+            chunk_id = row.get("id")
+            if not chunk_id:
+                continue
+            updated_at = row.get("updated_at")
+            if updated_at and (self._watermark is None or updated_at > self._watermark):
+                self._watermark = updated_at
+
+            i = self._row_by_id.get(chunk_id)
+            if row.get("deleted_at") is not None:
+                # Soft-deleted (or still staged) - drop it if we hold it
+                if i is not None:
+                    del self._row_by_id[chunk_id]
+                    if self._alive[i]:
+                        self._alive[i] = False
+                        changed += 1
+                continue
+            if i is not None:
+                # Chunk ids are immutable (changed text gets a new chunk), so
+                # only metadata can differ for a row that is already indexed
+                metadata = row.get("metadata") or {}
+                self._payload[i]["metadata"] = metadata
+                self._contact_codes[i] = self._code(self._contact_ids, metadata.get("contact_id"))
+                changed += 1
+                continue
+
+            vec = _parse_embedding(row.get("embedding"))
+            if vec is None:
+                continue
+            norm = float(np.linalg.norm(vec))
+            if norm == 0.0:
+                continue
+            parsed.append((row, vec / norm))
+
+        self._grow(self._size + len(parsed))
+        for row, vec in parsed:
+            if row["id"] in self._row_by_id:
+                continue  # Duplicate within this batch
+            i = self._size
+            self._matrix[i] = vec
+            self._alive[i] = True
+            self._type_codes[i] = self._code(self._type_ids, row.get("source_type"))
+            metadata = row.get("metadata") or {}
+            self._contact_codes[i] = self._code(self._contact_ids, metadata.get("contact_id"))
+            self._payload.append({
+                "id": row["id"],
+                "source_type": row.get("source_type"),
+                "source_id": row.get("source_id"),
+                "chunk_index": row.get("chunk_index"),
+                "content": row.get("content"),
+                "metadata": metadata,
+            })
+            self._row_by_id[row["id"]] = i
+            self._size += 1
+            changed += 1
+        return changed
+
+    def add(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Add rows (knowledge_chunks dicts with id and embedding).
+
+        No-op until the index has been loaded; the initial load will pick
+        the rows up from the database instead.
+        """
+        if not self.loaded or not rows:
+            return 0
+        with self._lock:
+            return self._add_locked(rows)
+
+    def remove(self, chunk_ids: List[str]) -> int:
+        """Drop rows by chunk id (soft-deleted chunks)."""
+        removed = 0
+        with self._lock:
+            for chunk_id in chunk_ids:
+                i = self._row_by_id.pop(chunk_id, None)
+                if i is not None and self._alive[i]:
+                    self._alive[i] = False
+                    removed += 1
+        return removed
+
+    def remove_source(self, source_type: str, source_id: str) -> int:
+        """Drop every row belonging to one source record."""
+        with self._lock:
+            ids = [
+                p["id"] for i, p in enumerate(self._payload)
+                if self._alive[i] and p["source_id"] == source_id and p["source_type"] == source_type
+            ]
+        return self.remove(ids)
+
+    def update_metadata(self, chunk_id: str, metadata: Dict[str, Any]) -> None:
+        """Refresh metadata (and the contact filter code) for one row."""
+        with self._lock:
+            i = self._row_by_id.get(chunk_id)
+            if i is None:
+                return
+            self._payload[i]["metadata"] = metadata or {}
+            self._contact_codes[i] = self._code(self._contact_ids, (metadata or {}).get("contact_id"))
+
+    def get_vectors(self, chunk_ids: List[str]) -> Dict[str, np.ndarray]:
+        """Normalized embeddings for the given chunk ids that are in the index."""
+        with self._lock:
+            return {
+                chunk_id: self._matrix[i].copy()
+                for chunk_id in chunk_ids
+                if (i := self._row_by_id.get(chunk_id)) is not None and self._alive[i]
+            }
+
+    def request_refresh(self) -> None:
+        """Make the next ensure_loaded() fetch new rows instead of waiting out the interval."""
+        self._loaded_at = 0.0
+
+    # ==================== LOADING ====================
+
+    @staticmethod
+    def _fetch_page(db, after_id: Optional[str], since: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        One blocking page fetch (runs on the DB thread pool).
+
+        The full load only needs live rows; an incremental refresh also
+        returns soft-deleted ones so _add_locked can drop them.
+        """
+        query = db.client.table("knowledge_chunks").select(_SELECT_COLUMNS)
+        if since:
+            query = query.gte("updated_at", since)
+        else:
+            query = query.is_("deleted_at", "null").not_.is_("embedding", "null")
+        if after_id:
+            query = query.gt("id", after_id)
+        return query.order("id").limit(LOAD_PAGE_SIZE).execute().data or []
+
+    async def _load(self, db, since: Optional[str]) -> int:
+        from app.features.database import get_async_database
+
+        adb = get_async_database()
+        added = 0
+        after_id = None
+        while True:
+            page = await adb.run(self._fetch_page, db, after_id, since)
+            if not page:
+                break
+            with self._lock:
+                added += self._add_locked(page)
+            after_id = page[-1]["id"]
+            if len(page) < LOAD_PAGE_SIZE:
+                break
+        return added
+
+    async def ensure_loaded(self, db) -> None:
+        """Load on first use, then refresh incrementally / rebuild periodically."""
+        if self._load_lock is None:
+            self._load_lock = asyncio.Lock()
+
+        async with self._load_lock:
+            now = time.monotonic()
+            if self.loaded and now - self._built_at >= VECTOR_INDEX_REBUILD_SECONDS:
+                with self._lock:
+                    self._reset()
+
+            if not self.loaded:
+                start = time.monotonic()
+                # Mark loaded first so concurrent indexer pushes aren't dropped
+                self.loaded = True
+                try:
+                    added = await self._load(db, since=None)
+                except Exception:
+                    with self._lock:
+                        self._reset()
+                    raise
+                self._built_at = self._loaded_at = time.monotonic()
+                logger.info(
+                    f"Vector index built: {added} chunks in {time.monotonic() - start:.1f}s"
+                )
+            elif now - self._loaded_at >= VECTOR_INDEX_REFRESH_SECONDS:
+                added = await self._load(db, since=self._watermark)
+                self._loaded_at = time.monotonic()
+                if added:
+                    logger.debug(f"Vector index refreshed: {added} chunks added/updated/removed")
+
+    # ==================== SEARCH ====================
+
+    def search(
+        self,
+        query_embedding: List[float],
+        source_types: List[str] = None,
+        contact_id: str = None,
+        limit: int = 10,
+        threshold: float = 0.7
+    ) -> List[Dict[str, Any]]:
+        """
+        Cosine similarity search with optional filters.
+
+        Returns:
+            Matching chunks (same shape as match_knowledge_chunks rows),
+            best first
+        """
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if norm == 0.0 or limit <= 0:
+            return []
+        query = query / norm
+
+        with self._lock:
+            n = self._size
+            if n == 0:
+                return []
+            mask = self._alive[:n].copy()
+            if source_types:
+                codes = [self._type_ids[t] for t in source_types if t in self._type_ids]
+                mask &= np.isin(self._type_codes[:n], codes)
+            if contact_id:
+                code = self._contact_ids.get(contact_id, -2)
+                mask &= self._contact_codes[:n] == code
+
+            scores = self._matrix[:n] @ query
+            scores[~mask] = -np.inf
+
+            k = min(limit, n)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+
+            results = []
+            for i in top:
+                score = float(scores[i])
+                if score < threshold:
+                    break
+                results.append({**self._payload[i], "similarity": score})
+        return results
+
+
+_vector_index: Optional[VectorIndex] = None
+
+
+def get_vector_index() -> VectorIndex:
+    """Get the process-wide vector index."""
+    global _vector_index
+    if _vector_index is None:
+        _vector_index = VectorIndex()
+    return _vector_index
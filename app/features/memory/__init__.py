@@ -27,6 +27,9 @@ Usage:
     
     # Get context for prompts
     context = await mem.get_context("meeting with John")
+
+    # Extract memories in the background (batched per conversation)
+    get_memory_extraction_queue().submit("User said: ...", group=conversation_id)
 """
 
 # Use Mem0-based implementation (smart deduplication, semantic search)
@@ -34,10 +37,18 @@ from app.features.memory.service import (
     MemoryService,
     get_memory_service,
     MemoryType,
+    add_memory_write_listener,
+)
+from app.features.memory.extraction_queue import (
+    MemoryExtractionQueue,
+    get_memory_extraction_queue,
 )
 
 __all__ = [
     "MemoryService",
     "get_memory_service", 
     "MemoryType",
+    "add_memory_write_listener",
+    "MemoryExtractionQueue",
+    "get_memory_extraction_queue",
 ]
@@ -26,24 +26,121 @@ SCHEDULING:
 - Lightweight (hourly): Chat messages → Letta archival
 - Comprehensive (2x daily): All sources → Mem0 extraction
 - Daily summary: Letta memory block updates
+
+PIPELINE:
+=========
+- Sources (and Letta) are processed concurrently; at most
+  CONSOLIDATION_MAX_CONCURRENT_CALLS Claude calls run at once overall
+- Records are packed into prompts of up to CONSOLIDATION_BATCH_TOKENS
+  (transcripts: CONSOLIDATION_TRANSCRIPT_BATCH_TOKENS) instead of one
+  call per record
+- Each source keeps a watermark (memory_consolidation_watermarks,
+  migration 034): a run continues after the last record the previous
+  run extracted, at most SOURCES[name].max_records per run. hours_back
+  only bounds a source's first run (or every run with use_watermarks=False)
+- Chat and Beeper messages are watermarked on ingested_at (migration 036),
+  set by the database on insert, so late-synced messages and delayed
+  write-behind flushes still land after the watermark. Records younger
+  than _SETTLE_DELAY wait for the next run, so rows from transactions
+  still committing aren't skipped
+- The watermark only advances when every extraction batch succeeded
 """
 
+import os
 import logging
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import asyncio
 
+from app.features.database import execute_async
+
 logger = logging.getLogger("Jarvis.Memory.Consolidation")
 
+WATERMARKS_TABLE = "memory_consolidation_watermarks"
+
+# Claude calls in flight across all sources of one run
+CONSOLIDATION_MAX_CONCURRENT_CALLS = int(os.getenv("CONSOLIDATION_MAX_CONCURRENT_CALLS", "4"))
+# Prompt budget for packed records (extract_from_text)
+CONSOLIDATION_BATCH_TOKENS = int(os.getenv("CONSOLIDATION_BATCH_TOKENS", "3000"))
+# Prompt budget for packed transcripts (seed_from_raw_transcripts)
+CONSOLIDATION_TRANSCRIPT_BATCH_TOKENS = int(os.getenv("CONSOLIDATION_TRANSCRIPT_BATCH_TOKENS", "4000"))
+_TRANSCRIPT_MAX_CHARS = 6000
+_CHARS_PER_TOKEN = 4
+_SETTLE_DELAY = timedelta(minutes=2)
+
+
+@dataclass(frozen=True)
+class _Source:
+    """A table consolidation reads, in (ts_column, id) order (ts_column must only grow on insert)."""
+    table: str
+    columns: str
+    ts_column: str
+    max_records: int            # Per run; the rest waits for the next run
+    user_only: bool = False     # chat_messages: only role=user
+
+
+SOURCES: Dict[str, _Source] = {
+    "chat_messages": _Source(
+        "chat_messages", "id, content, created_at, ingested_at", "ingested_at", 200, user_only=True
+    ),
+    "beeper_messages": _Source(
+        "beeper_messages", "id, content, is_outgoing, timestamp, beeper_chat_id, ingested_at", "ingested_at", 500
+    ),
+    "transcripts": _Source("transcripts", "id, full_text, source_file, created_at", "created_at", 40),
+    # Use only columns that definitely exist in the database
+    # (action_items, wins, challenges, energy may not exist in all deployments)
+    "meetings": _Source(
+        "meetings", "id, title, summary, topics_discussed, people_mentioned, contact_name, date, created_at",
+        "created_at", 50
+    ),
+    "journals": _Source(
+        "journals", "id, date, title, content, mood, tomorrow_focus, gratitude, created_at", "created_at", 30
+    ),
+}
+
+# Memory "source" recorded for each consolidation source
+_EXTRACTION_SOURCE = {
+    "chat_messages": "chat_batch",
+    "beeper_messages": "beeper_batch",
+    "meetings": "meeting",
+    "journals": "journal",
+}
+
+# (text, source_id) - one extraction input
+_Doc = Tuple[str, Optional[str]]
+
+
+def _estimate_tokens(text: str) -> int:
+    from app.features.knowledge.chunker import estimate_tokens
+    return estimate_tokens(text)
+
+
+def _pack(docs: List[_Doc], budget_tokens: int) -> List[List[_Doc]]:
+    """Greedily pack docs into batches of at most budget_tokens (oversized docs are truncated)."""
+    batches: List[List[_Doc]] = []
+    used = 0
+    for text, source_id in docs:
+        tokens = _estimate_tokens(text)
+        if tokens > budget_tokens:
+            text = text[:budget_tokens * _CHARS_PER_TOKEN]
+            tokens = budget_tokens
+        if not batches or used + tokens > budget_tokens:
+            batches.append([])
+            used = 0
+        batches[-1].append((text, source_id))
+        used += tokens
+    return batches
+
 
 class MemoryConsolidationService:
     """
     Unified memory extraction from all data sources.
     
     This service ensures:
-    1. No data slips through the cracks
+    1. No data slips through the cracks (per-source watermarks)
     2. Both Mem0 and Letta are kept in sync
-    3. Cost-effective batch processing
+    3. Cost-effective batch processing (token-budgeted prompts)
     """
     
     def __init__(self):
@@ -71,17 +168,21 @@ class MemoryConsolidationService:
         self,
         hours_back: int = 24,
         include_letta: bool = True,
-        include_mem0: bool = True
+        include_mem0: bool = True,
+        use_watermarks: bool = True
     ) -> Dict[str, Any]:
         """
         Run comprehensive memory consolidation across all sources.
         
         Call this 2x daily (morning + evening) for complete coverage.
+        Sources run concurrently; each continues from its watermark.
         
         Args:
-            hours_back: How far back to look for new data
+            hours_back: Look-back for sources without a watermark (first run)
             include_letta: Whether to process chat_messages → Letta
             include_mem0: Whether to extract Mem0 memories from all sources
+            use_watermarks: If False, process the hours_back window and
+                leave watermarks untouched
         
         Returns:
             Summary of what was processed
@@ -94,56 +195,36 @@ class MemoryConsolidationService:
             "sources": {}
         }
         
-        # 1. Letta: Process chat messages to archival
-        if include_letta:
+        async def _letta() -> None:
             try:
-                letta_result = await self._letta.process_unprocessed_messages(mode="lightweight")
-                results["sources"]["letta_chat"] = letta_result
+                results["sources"]["letta_chat"] = await self._letta.process_unprocessed_messages(mode="lightweight")
             except Exception as e:
                 logger.error(f"Letta consolidation failed: {e}")
                 results["sources"]["letta_chat"] = {"error": str(e)}
         
-        # 2. Mem0: Extract from all sources
-        if include_mem0:
+        async def _mem0() -> None:
+            watermarks = await self._load_watermarks() if use_watermarks else None
+            calls = asyncio.Semaphore(max(1, CONSOLIDATION_MAX_CONCURRENT_CALLS))
+            names = list(SOURCES)
+            outcomes = await asyncio.gather(*(
+                self._consolidate_source(name, hours_back, watermarks, calls) for name in names
+            ), return_exceptions=True)
             mem0_results = {}
-            
-            # Chat messages (that might have been missed by real-time extraction)
-            try:
-                chat_count = await self._extract_from_chat_messages(hours_back)
-                mem0_results["chat_messages"] = {"extracted": chat_count}
-            except Exception as e:
-                mem0_results["chat_messages"] = {"error": str(e)}
-            
-            # Beeper messages
-            try:
-                beeper_count = await self._extract_from_beeper(hours_back)
-                mem0_results["beeper_messages"] = {"extracted": beeper_count}
-            except Exception as e:
-                mem0_results["beeper_messages"] = {"error": str(e)}
-            
-            # Transcripts (voice memos)
-            try:
-                transcript_count = await self._extract_from_transcripts(hours_back)
-                mem0_results["transcripts"] = {"extracted": transcript_count}
-            except Exception as e:
-                mem0_results["transcripts"] = {"error": str(e)}
-            
-            # Meetings
-            try:
-                meeting_count = await self._extract_from_meetings(hours_back)
-                mem0_results["meetings"] = {"extracted": meeting_count}
-            except Exception as e:
-                mem0_results["meetings"] = {"error": str(e)}
-            
-            # Journals
-            try:
-                journal_count = await self._extract_from_journals(hours_back)
-                mem0_results["journals"] = {"extracted": journal_count}
-            except Exception as e:
-                mem0_results["journals"] = {"error": str(e)}
-            
+            for name, outcome in zip(names, outcomes):
+                if isinstance(outcome, Exception):
+                    logger.error(f"Memory consolidation of {name} failed: {outcome}")
+                    mem0_results[name] = {"error": str(outcome)}
+                else:
+                    mem0_results[name] = outcome
             results["sources"]["mem0"] = mem0_results
         
+        tasks = []
+        if include_letta:
+            tasks.append(_letta())
+        if include_mem0:
+            tasks.append(_mem0())
+        await asyncio.gather(*tasks)
+        
         results["completed_at"] = datetime.now(timezone.utc).isoformat()
         
         # Log summary
@@ -156,6 +237,22 @@ class MemoryConsolidationService:
         
         return results
     
+    async def consolidate_source(
+        self,
+        source: str,
+        hours_back: int = 24,
+        use_watermarks: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Consolidate a single source (e.g. "beeper_messages").
+        
+        Same watermark rules as consolidate_all.
+        """
+        self._ensure_services()
+        watermarks = await self._load_watermarks() if use_watermarks else None
+        calls = asyncio.Semaphore(max(1, CONSOLIDATION_MAX_CONCURRENT_CALLS))
+        return await self._consolidate_source(source, hours_back, watermarks, calls)
+    
     async def consolidate_lightweight(self) -> Dict[str, Any]:
         """
         Lightweight hourly consolidation.
@@ -177,82 +274,179 @@ class MemoryConsolidationService:
             return {"status": "error", "error": str(e)}
     
     # =========================================================================
-    # SOURCE-SPECIFIC EXTRACTION
+    # PIPELINE
+    # =========================================================================
+    
+    async def _consolidate_source(
+        self,
+        name: str,
+        hours_back: int,
+        watermarks: Optional[Dict[str, Dict[str, str]]],
+        calls: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        """
+        Fetch a source's new records, extract them in packed batches and
+        advance its watermark.
+        
+        Args:
+            watermarks: Stored watermarks by source; None = ignore/keep them
+            calls: Shared limit on concurrent Claude calls
+        """
+        source = SOURCES[name]
+        watermark = (watermarks or {}).get(name)
+        records = await self._fetch_new(source, hours_back, watermark)
+        if not records:
+            return {"extracted": 0, "records": 0, "batches": 0}
+        
+        if name == "transcripts":
+            docs = [
+                (r.get("full_text") or "", r.get("source_file") or "transcript")
+                for r in records if len(r.get("full_text") or "") > 100
+            ]
+            batches = _pack(
+                [(text[:_TRANSCRIPT_MAX_CHARS], source_file) for text, source_file in docs],
+                CONSOLIDATION_TRANSCRIPT_BATCH_TOKENS
+            )
+        else:
+            docs = await self._build_docs(name, records)
+            batches = _pack(docs, CONSOLIDATION_BATCH_TOKENS)
+        
+        async def extract(batch: List[_Doc]) -> int:
+            async with calls:
+                if name == "transcripts":
+                    # Use the more comprehensive transcript extraction
+                    return await self._mem0.seed_from_raw_transcripts(
+                        batch, max_chars_each=_TRANSCRIPT_MAX_CHARS, raise_errors=True
+                    )
+                text = "\n\n---\n\n".join(text for text, _ in batch)
+                return await self._mem0.extract_from_text(
+                    text=text,
+                    source=_EXTRACTION_SOURCE[name],
+                    source_id=batch[0][1] if len(batch) == 1 else None,
+                    max_memories=min(5 + 2 * (len(batch) - 1), 20),
+                    max_chars=len(text),
+                    raise_errors=True,
+                )
+        
+        outcomes = await asyncio.gather(*(extract(batch) for batch in batches), return_exceptions=True)
+        failed = [o for o in outcomes if isinstance(o, Exception)]
+        extracted = sum(o for o in outcomes if not isinstance(o, Exception))
+        
+        result = {"extracted": extracted, "records": len(records), "batches": len(batches)}
+        if failed:
+            # Keep the watermark: the next run retries this window (Mem0 deduplicates)
+            logger.warning(f"{len(failed)}/{len(batches)} {name} extraction batches failed: {failed[0]}")
+            result["failed_batches"] = len(failed)
+        elif watermarks is not None:
+            last = records[-1]
+            result["watermark"] = last[source.ts_column]
+            await self._save_watermark(name, last[source.ts_column], str(last["id"]), len(records))
+        
+        logger.info(f"Consolidated {name}: {len(records)} records in {len(batches)} batches, {extracted} memories")
+        return result
+    
+    async def _fetch_new(
+        self,
+        source: _Source,
+        hours_back: int,
+        watermark: Optional[Dict[str, str]]
+    ) -> List[Dict[str, Any]]:
+        """Records after the watermark (or within hours_back), oldest first."""
+        col = source.ts_column
+        settled = datetime.now(timezone.utc) - _SETTLE_DELAY
+        query = self._db.table(source.table).select(source.columns).lte(col, settled.isoformat())
+        if source.user_only:
+            # Assistant messages don't contain user facts
+            query = query.eq("role", "user")
+        if watermark:
+            ts, last_id = watermark["ts"], watermark["id"]
+            query = query.or_(f'{col}.gt."{ts}",and({col}.eq."{ts}",id.gt.{last_id})')
+        else:
+            since = datetime.now(timezone.utc) - timedelta(hours=hours_back)
+            query = query.gte(col, since.isoformat())
+        result = await execute_async(query.order(col).order("id").limit(source.max_records))
+        return result.data or []
+    
+    async def _build_docs(self, name: str, records: List[Dict[str, Any]]) -> List[_Doc]:
+        """Extraction texts for a source's records."""
+        if name == "chat_messages":
+            return self._chat_docs(records)
+        if name == "beeper_messages":
+            return await self._beeper_docs(records)
+        if name == "meetings":
+            return [doc for doc in (self._meeting_doc(m) for m in records) if doc]
+        if name == "journals":
+            return [doc for doc in (self._journal_doc(j) for j in records) if doc]
+        raise ValueError(f"Unknown consolidation source: {name}")
+    
+    # =========================================================================
+    # WATERMARKS
     # =========================================================================
     
-    async def _extract_from_chat_messages(self, hours_back: int = 24) -> int:
+    async def _load_watermarks(self) -> Optional[Dict[str, Dict[str, str]]]:
+        """Watermarks by source; None if the table is unavailable (window-only runs)."""
+        try:
+            result = await execute_async(self._db.table(WATERMARKS_TABLE).select("source, watermark_ts, watermark_id"))
+        except Exception as e:
+            logger.warning(f"Could not load consolidation watermarks, using hours_back windows: {e}")
+            return None
+        return {
+            row["source"]: {"ts": row["watermark_ts"], "id": row["watermark_id"]}
+            for row in (result.data or [])
+        }
+    
+    async def _save_watermark(self, name: str, ts: str, last_id: str, records: int) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        try:
+            await execute_async(self._db.table(WATERMARKS_TABLE).upsert({
+                "source": name,
+                "watermark_ts": ts,
+                "watermark_id": last_id,
+                "last_run_records": records,
+                "last_run_at": now,
+                "updated_at": now,
+            }, on_conflict="source"))
+        except Exception as e:
+            logger.warning(f"Could not save {name} consolidation watermark: {e}")
+    
+    # =========================================================================
+    # SOURCE-SPECIFIC DOCUMENTS
+    # =========================================================================
+    
+    def _chat_docs(self, messages: List[Dict[str, Any]]) -> List[_Doc]:
         """
-        Extract Mem0 memories from chat_messages that weren't processed in real-time.
+        chat_messages that weren't processed in real-time, as conversations.
         
         This catches messages where:
         - Real-time extraction failed
         - Message didn't match keyword heuristics but contains valuable info
         """
-        since = datetime.now(timezone.utc) - timedelta(hours=hours_back)
-        
-        # Get user messages (assistant messages don't contain user facts)
-        result = self._db.table("chat_messages").select(
-            "id, content, created_at"
-        ).eq("role", "user").gte(
-            "created_at", since.isoformat()
-        ).order("created_at", desc=True).limit(100).execute()
-        
-        messages = result.data or []
-        if not messages:
-            return 0
-        
         # Batch into conversations (group by 10-minute windows)
-        batches = self._batch_messages_by_time(messages, window_minutes=10)
-        
-        count = 0
-        for batch in batches:
+        docs = []
+        for batch in self._batch_messages_by_time(messages, window_minutes=10):
             text = "\n".join([f"User: {m['content']}" for m in batch])
             if len(text) > 50:  # Skip very short batches
-                extracted = await self._mem0.extract_from_text(
-                    text=text,
-                    source="chat_batch",
-                )
-                count += extracted
-        
-        return count
+                docs.append((text, None))
+        return docs
     
-    async def _extract_from_beeper(self, hours_back: int = 24) -> int:
+    async def _beeper_docs(self, messages: List[Dict[str, Any]]) -> List[_Doc]:
         """
-        Extract memories from Beeper messages (WhatsApp, LinkedIn, Slack).
-        
-        BATCHED: All conversations from all chats are combined into a single
-        Claude call to minimize API costs. The model extracts memories from
-        the combined context.
+        Beeper messages (WhatsApp, LinkedIn, Slack), one document per chat.
         
         This is RICH data - people share lots of info in casual messages.
+        Conversations are packed several per Claude call.
         """
-        since = datetime.now(timezone.utc) - timedelta(hours=hours_back)
-        
-        # Get recent messages with chat context
-        result = self._db.table("beeper_messages").select(
-            "id, content, is_outgoing, timestamp, beeper_chat_id"
-        ).gte(
-            "timestamp", since.isoformat()
-        ).order("timestamp", desc=True).limit(500).execute()
-        
-        messages = result.data or []
-        if not messages:
-            return 0
-        
         # Group by chat for context
-        chats = {}
+        chats: Dict[str, List[Dict[str, Any]]] = {}
         for msg in messages:
-            chat_id = msg.get("beeper_chat_id", "unknown")
-            if chat_id not in chats:
-                chats[chat_id] = []
-            chats[chat_id].append(msg)
+            chats.setdefault(msg.get("beeper_chat_id", "unknown"), []).append(msg)
         
         # Also get chat names for context
         chat_names = {}
         try:
-            chat_result = self._db.table("beeper_chats").select(
+            chat_result = await execute_async(self._db.table("beeper_chats").select(
                 "beeper_chat_id, chat_name, platform"
-            ).in_("beeper_chat_id", list(chats.keys())).execute()
+            ).in_("beeper_chat_id", list(chats.keys())))
             for chat in (chat_result.data or []):
                 chat_names[chat["beeper_chat_id"]] = {
                     "name": chat.get("chat_name", "Unknown"),
@@ -261,8 +455,7 @@ class MemoryConsolidationService:
         except Exception as e:
             logger.warning(f"Could not fetch chat names: {e}")
         
-        # BATCHED: Build ALL conversations into one text block
-        all_conversations = []
+        docs = []
         for chat_id, chat_msgs in chats.items():
             chat_info = chat_names.get(chat_id, {"name": "Unknown", "platform": "unknown"})
             contact_name = chat_info["name"]
@@ -281,120 +474,45 @@ class MemoryConsolidationService:
                     conversation_lines.append(f"{speaker}: {content}")
             
             if len(conversation_lines) >= 2:  # Skip single-message "conversations"
-                all_conversations.append(
+                docs.append((
                     f"=== {platform.upper()} conversation with {contact_name} ===\n"
-                    f"⚠️ Remember: Only Aaron's statements are facts about Aaron!\n" + 
-                    "\n".join(conversation_lines)
-                )
-        
-        if not all_conversations:
-            return 0
-        
-        # SINGLE Claude call for all conversations
-        combined_text = "\n\n".join(all_conversations)
-        
-        # Truncate if extremely long (shouldn't happen with 500 msg limit)
-        if len(combined_text) > 50000:
-            combined_text = combined_text[:50000] + "\n\n[... truncated ...]"
+                    f"⚠️ Remember: Only Aaron's statements are facts about Aaron!\n" +
+                    "\n".join(conversation_lines),
+                    chat_id,
+                ))
         
-        logger.info(f"Batched {len(all_conversations)} conversations ({len(messages)} messages) for memory extraction")
-        
-        extracted = await self._mem0.extract_from_text(
-            text=combined_text,
-            source="beeper_batch",
-        )
-        
-        return extracted
+        logger.info(f"Prepared {len(docs)} conversations ({len(messages)} messages) for memory extraction")
+        return docs
     
-    async def _extract_from_transcripts(self, hours_back: int = 24) -> int:
-        """
-        Extract memories from voice memo transcripts.
-        
-        Transcripts are already analyzed during processing, but this catches
-        any that were missed or re-extracts with improved prompts.
+    def _meeting_doc(self, m: Dict[str, Any]) -> Optional[_Doc]:
         """
-        since = datetime.now(timezone.utc) - timedelta(hours=hours_back)
-        
-        result = self._db.table("transcripts").select(
-            "id, full_text, source_file, created_at"
-        ).gte("created_at", since.isoformat()).limit(20).execute()
-        
-        transcripts = result.data or []
-        if not transcripts:
-            return 0
-        
-        count = 0
-        for t in transcripts:
-            text = t.get("full_text", "")
-            source = t.get("source_file", "transcript")
-            
-            if text and len(text) > 100:
-                # Use the more comprehensive transcript extraction
-                extracted = await self._mem0.seed_from_raw_transcript(
-                    transcript_text=text,
-                    source_file=source
-                )
-                count += extracted
-        
-        return count
-    
-    async def _extract_from_meetings(self, hours_back: int = 24) -> int:
-        """
-        Extract memories from meeting records.
+        A meeting record as text.
         
         Meetings have structured data (summary, topics, action items)
         that can yield high-quality memories.
         """
-        since = datetime.now(timezone.utc) - timedelta(hours=hours_back)
-        
-        # Use only columns that definitely exist in the database
-        # Avoid action_items as it may not exist in all deployments
-        try:
-            result = self._db.table("meetings").select(
-                "id, title, summary, topics_discussed, people_mentioned, contact_name, date"
-            ).gte("created_at", since.isoformat()).limit(20).execute()
-        except Exception as e:
-            logger.warning(f"Could not query meetings: {e}")
-            return 0
-        
-        meetings = result.data or []
-        if not meetings:
-            return 0
-        
-        count = 0
-        for m in meetings:
-            # Build a text summary of the meeting
-            parts = []
-            if m.get("title"):
-                parts.append(f"Meeting: {m['title']}")
-            if m.get("contact_name"):
-                parts.append(f"With: {m['contact_name']}")
-            if m.get("date"):
-                parts.append(f"Date: {m['date']}")
-            if m.get("summary"):
-                parts.append(f"Summary: {m['summary']}")
-            if m.get("topics_discussed"):
-                topics = m["topics_discussed"]
-                if isinstance(topics, list):
-                    parts.append(f"Topics: {', '.join(str(t) for t in topics)}")
-            if m.get("people_mentioned"):
-                parts.append(f"People mentioned: {', '.join(m['people_mentioned'])}")
-            
-            text = "\n".join(parts)
-            
-            if len(text) > 50:
-                extracted = await self._mem0.extract_from_text(
-                    text=text,
-                    source="meeting",
-                    source_id=m.get("id")
-                )
-                count += extracted
-        
-        return count
+        parts = []
+        if m.get("title"):
+            parts.append(f"Meeting: {m['title']}")
+        if m.get("contact_name"):
+            parts.append(f"With: {m['contact_name']}")
+        if m.get("date"):
+            parts.append(f"Date: {m['date']}")
+        if m.get("summary"):
+            parts.append(f"Summary: {m['summary']}")
+        if m.get("topics_discussed"):
+            topics = m["topics_discussed"]
+            if isinstance(topics, list):
+                parts.append(f"Topics: {', '.join(str(t) for t in topics)}")
+        if m.get("people_mentioned"):
+            parts.append(f"People mentioned: {', '.join(m['people_mentioned'])}")
+        
+        text = "\n".join(parts)
+        return (text, m.get("id")) if len(text) > 50 else None
     
-    async def _extract_from_journals(self, hours_back: int = 24) -> int:
+    def _journal_doc(self, j: Dict[str, Any]) -> Optional[_Doc]:
         """
-        Extract memories from journal entries.
+        A journal entry as text.
         
         Journals contain introspective content about:
         - Current state (mood, energy)
@@ -402,50 +520,22 @@ class MemoryConsolidationService:
         - Struggles (challenges)
         - Plans (tomorrow_focus)
         """
-        since = datetime.now(timezone.utc) - timedelta(hours=hours_back)
-        
-        # Use only columns that definitely exist in the database
-        # Note: wins, challenges, energy may not exist in all deployments
-        try:
-            result = self._db.table("journals").select(
-                "id, date, title, content, mood, tomorrow_focus, gratitude"
-            ).gte("created_at", since.isoformat()).limit(10).execute()
-        except Exception as e:
-            logger.warning(f"Could not query journals: {e}")
-            return 0
-        
-        journals = result.data or []
-        if not journals:
-            return 0
-        
-        count = 0
-        for j in journals:
-            # Build comprehensive text from journal
-            parts = []
-            if j.get("date"):
-                parts.append(f"Journal entry for {j['date']}")
-            if j.get("mood"):
-                parts.append(f"Mood: {j['mood']}")
-            if j.get("content"):
-                parts.append(f"Content: {j['content'][:500]}")  # Truncate long content
-            if j.get("tomorrow_focus"):
-                focus = j["tomorrow_focus"] if isinstance(j["tomorrow_focus"], list) else [j["tomorrow_focus"]]
-                parts.append(f"Tomorrow's focus: {', '.join(str(f) for f in focus)}")
-            if j.get("gratitude"):
-                gratitude = j["gratitude"] if isinstance(j["gratitude"], list) else [j["gratitude"]]
-                parts.append(f"Gratitude: {', '.join(str(g) for g in gratitude)}")
-            
-            text = "\n".join(parts)
-            
-            if len(text) > 50:
-                extracted = await self._mem0.extract_from_text(
-                    text=text,
-                    source="journal",
-                    source_id=j.get("id")
-                )
-                count += extracted
-        
-        return count
+        parts = []
+        if j.get("date"):
+            parts.append(f"Journal entry for {j['date']}")
+        if j.get("mood"):
+            parts.append(f"Mood: {j['mood']}")
+        if j.get("content"):
+            parts.append(f"Content: {j['content'][:500]}")  # Truncate long content
+        if j.get("tomorrow_focus"):
+            focus = j["tomorrow_focus"] if isinstance(j["tomorrow_focus"], list) else [j["tomorrow_focus"]]
+            parts.append(f"Tomorrow's focus: {', '.join(str(f) for f in focus)}")
+        if j.get("gratitude"):
+            gratitude = j["gratitude"] if isinstance(j["gratitude"], list) else [j["gratitude"]]
+            parts.append(f"Gratitude: {', '.join(str(g) for g in gratitude)}")
+        
+        text = "\n".join(parts)
+        return (text, j.get("id")) if len(text) > 50 else None
     
     # =========================================================================
     # UTILITIES
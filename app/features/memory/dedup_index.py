@@ -0,0 +1,191 @@
+"""
+Memory Dedup Index - in-memory near-duplicate detection for memories.
+
+Checking every new memory against the database (an ILIKE search plus a
+word-overlap test on a few candidates) costs a round trip per memory and
+misses reworded duplicates whose first words differ.
+
+The index keeps a MinHash signature of every stored memory and finds
+candidates with locality-sensitive hashing (LSH), so a lookup is a few
+dict probes instead of a query:
+- Texts are normalized (lowercase, punctuation, possessives and stopwords
+  removed) into a set of words, so reordered or lightly reworded
+  memories still match
+- Signatures are split into DEDUP_LSH_BANDS bands; memories sharing any
+  band are candidates
+- Candidates are confirmed with the exact Jaccard similarity of their
+  word sets (>= DEDUP_THRESHOLD), so LSH only decides what gets compared
+
+Loaded once from the memories table, then kept in sync by the memory
+service on insert, update and delete, plus a periodic updated_at-based
+refresh for changes made by other instances. Pure Python, no embedding calls.
+
+Usage:
+    index = MemoryDedupIndex()
+    index.add(memory_id, "Aaron prefers morning meetings")
+    duplicate_id = index.find_duplicate("aaron prefers meetings in the morning")
+    index.remove(memory_id)
+
+    index.add_many([(memory_id, text), ...])  # Bulk load (CPU-bound, run off the loop)
+"""
+
+import os
+import re
+import hashlib
+import logging
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+logger = logging.getLogger("Jarvis.Memory.DedupIndex")
+
+# Jaccard similarity of word sets at which two memories are duplicates
+DEDUP_THRESHOLD = float(os.getenv("MEMORY_DEDUP_THRESHOLD", "0.75"))
+# bands * rows = signature length; more bands -> more candidates (fewer misses)
+DEDUP_LSH_BANDS = int(os.getenv("MEMORY_DEDUP_LSH_BANDS", "16"))
+DEDUP_LSH_ROWS = int(os.getenv("MEMORY_DEDUP_LSH_ROWS", "3"))
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_STOPWORDS = frozenset(
+    "a an the and or but of to in on at for with by from as is are was were be been being "
+    "has have had do does did that this these those it its his her their he she they "
+    "very really also just".split()
+)
+
+
+def shingles(text: str) -> FrozenSet[str]:
+    """Normalized word set of a text."""
+    words = (w.removesuffix("'s") for w in _WORD_RE.findall((text or "").lower()))
+    return frozenset(w for w in words if w not in _STOPWORDS)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=4).digest(), "little")
+
+
+class MemoryDedupIndex:
+    """MinHash/LSH index over memory texts, keyed by memory id."""
+
+    def __init__(
+        self,
+        threshold: float = DEDUP_THRESHOLD,
+        bands: int = DEDUP_LSH_BANDS,
+        rows: int = DEDUP_LSH_ROWS
+    ):
+        self.threshold = threshold
+        self.bands = max(1, bands)
+        self.rows = max(1, rows)
+
+        # Fixed seed: signatures must be comparable across the process lifetime
+        num_perm = self.bands * self.rows
+        seed = hashlib.sha256(b"jarvis-memory-dedup").digest()
+        self._perms: List[Tuple[int, int]] = []
+        for i in range(num_perm):
+            block = hashlib.sha256(seed + i.to_bytes(4, "little")).digest()
+            a = int.from_bytes(block[:8], "little") % _MERSENNE_PRIME or 1
+            b = int.from_bytes(block[8:16], "little") % _MERSENNE_PRIME
+            self._perms.append((a, b))
+
+        self._shingles: Dict[str, FrozenSet[str]] = {}
+        self._band_keys: Dict[str, List[Tuple[int, Tuple[int, ...]]]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = {}
+        self.loaded = False
+
+        self._stats = {"lookups": 0, "duplicates": 0, "candidates_checked": 0}
+
+    # ==================== SIGNATURES ====================
+
+    def _signature(self, items: FrozenSet[str]) -> List[int]:
+        hashes = [_hash(s) for s in items]
+        return [
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._perms
+        ]
+
+    def _bands_of(self, items: FrozenSet[str]) -> List[Tuple[int, Tuple[int, ...]]]:
+        signature = self._signature(items)
+        return [
+            (band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+
+    # ==================== LOOKUP ====================
+
+    def find_duplicate(self, text: str) -> Optional[str]:
+        """
+        Id of an indexed memory that duplicates text, or None.
+
+        The most similar candidate at or above the threshold wins.
+        """
+        self._stats["lookups"] += 1
+        items = shingles(text)
+        if not items:
+            return None
+
+        candidates: Set[str] = set()
+        for key in self._bands_of(items):
+            candidates.update(self._buckets.get(key, ()))
+
+        best_id, best_score = None, self.threshold
+        for memory_id in candidates:
+            self._stats["candidates_checked"] += 1
+            score = jaccard(items, self._shingles[memory_id])
+            if score >= best_score:
+                best_id, best_score = memory_id, score
+        if best_id is not None:
+            self._stats["duplicates"] += 1
+        return best_id
+
+    # ==================== SYNC ====================
+
+    def add(self, memory_id: str, text: str) -> None:
+        """Index (or re-index) a memory."""
+        self.remove(memory_id)
+        items = shingles(text)
+        if not items:
+            return
+        keys = self._bands_of(items)
+        self._shingles[memory_id] = items
+        self._band_keys[memory_id] = keys
+        for key in keys:
+            self._buckets.setdefault(key, set()).add(memory_id)
+
+    def add_many(self, memories: List[Tuple[str, str]]) -> None:
+        """Index (memory_id, text) pairs, e.g. when loading from the database."""
+        for memory_id, text in memories:
+            self.add(memory_id, text)
+
+    def remove(self, memory_id: str) -> None:
+        """Drop a memory from the index (no-op if it isn't indexed)."""
+        self._shingles.pop(memory_id, None)
+        for key in self._band_keys.pop(memory_id, ()):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(memory_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def clear(self) -> None:
+        self._shingles.clear()
+        self._band_keys.clear()
+        self._buckets.clear()
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._shingles)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "loaded": self.loaded,
+            "memories": len(self._shingles),
+            "buckets": len(self._buckets),
+            "threshold": self.threshold,
+        }
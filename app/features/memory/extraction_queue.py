@@ -0,0 +1,246 @@
+"""
+Memory Extraction Queue - background, batched memory extraction.
+
+Extracting memories from a chat exchange is an LLM call plus Mem0 writes.
+Doing it while handling the message adds seconds to the reply, and doing
+it once per message pays for one extraction call per exchange.
+
+The queue takes extraction off the response path:
+- submit() only buffers the text; it never waits and never raises
+- Identical texts submitted within MEMORY_EXTRACTION_DEDUP_SECONDS are
+  ignored (client retries, repeated messages)
+- Items are batched per group (conversation): a group is extracted in one
+  call once it has MEMORY_EXTRACTION_BATCH_SIZE items, would exceed
+  MEMORY_EXTRACTION_MAX_CHARS, or its oldest item has waited
+  MEMORY_EXTRACTION_BATCH_WINDOW_SECONDS
+- At most MEMORY_EXTRACTION_CONCURRENCY batches are extracted at once
+- Backpressure: beyond MEMORY_EXTRACTION_MAX_PENDING buffered items new
+  submissions are dropped (and counted) instead of growing without bound
+- close() extracts whatever is left (main.py lifespan shutdown)
+
+Usage:
+    from app.features.memory import get_memory_extraction_queue
+
+    queue = get_memory_extraction_queue()
+    queue.submit("User said: I moved to Berlin", group="conversation-123")
+"""
+
+import os
+import time
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.services.cache import LRUTTLCache
+
+logger = logging.getLogger("Jarvis.Memory.ExtractionQueue")
+
+MEMORY_EXTRACTION_BATCH_SIZE = int(os.getenv("MEMORY_EXTRACTION_BATCH_SIZE", "5"))
+MEMORY_EXTRACTION_BATCH_WINDOW_SECONDS = float(os.getenv("MEMORY_EXTRACTION_BATCH_WINDOW_SECONDS", "120"))
+# extract_from_text reads at most 3000 chars
+MEMORY_EXTRACTION_MAX_CHARS = int(os.getenv("MEMORY_EXTRACTION_MAX_CHARS", "3000"))
+MEMORY_EXTRACTION_CONCURRENCY = int(os.getenv("MEMORY_EXTRACTION_CONCURRENCY", "2"))
+MEMORY_EXTRACTION_MAX_PENDING = int(os.getenv("MEMORY_EXTRACTION_MAX_PENDING", "500"))
+MEMORY_EXTRACTION_DEDUP_SECONDS = float(os.getenv("MEMORY_EXTRACTION_DEDUP_SECONDS", "3600"))
+MEMORY_EXTRACTION_SHUTDOWN_TIMEOUT = float(os.getenv("MEMORY_EXTRACTION_SHUTDOWN_TIMEOUT", "20"))
+# Memories one extraction call may return: grows with the batch, capped
+_MAX_MEMORIES_PER_CALL = 10
+
+
+@dataclass
+class _Group:
+    """Pending items of one conversation."""
+    source: str
+    texts: List[str] = field(default_factory=list)
+    chars: int = 0
+    first_at: float = 0.0
+
+
+class MemoryExtractionQueue:
+    """
+    Batches texts per conversation and extracts memories in the background.
+
+    submit() must be called from the event loop.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = MEMORY_EXTRACTION_BATCH_SIZE,
+        batch_window: float = MEMORY_EXTRACTION_BATCH_WINDOW_SECONDS,
+        max_chars: int = MEMORY_EXTRACTION_MAX_CHARS,
+        concurrency: int = MEMORY_EXTRACTION_CONCURRENCY,
+        max_pending: int = MEMORY_EXTRACTION_MAX_PENDING
+    ):
+        self.batch_size = max(1, batch_size)
+        self.batch_window = batch_window
+        self.max_chars = max_chars
+        self.max_pending = max_pending
+        self._concurrency = max(1, concurrency)
+
+        self._groups: Dict[str, _Group] = {}
+        self._ready: List[_Group] = []
+        self._pending = 0
+        self._seen = LRUTTLCache(maxsize=2048, ttl=MEMORY_EXTRACTION_DEDUP_SECONDS)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._running: set = set()
+        self._closed = False
+
+        self._stats = {
+            "submitted": 0, "duplicates": 0, "rejected": 0,
+            "batches": 0, "items_extracted": 0, "memories": 0, "errors": 0,
+        }
+
+    # ==================== SUBMIT ====================
+
+    def submit(self, text: str, group: str = "default", source: str = "chat") -> bool:
+        """
+        Queue text for memory extraction.
+
+        Args:
+            text: Text to extract from (e.g. "User said: ...")
+            group: Batching key; texts of one conversation share a call
+            source: Source recorded on the extracted memories
+
+        Returns:
+            True if queued, False if it was a duplicate or the queue is full
+        """
+        text = (text or "").strip()
+        if not text or self._closed:
+            return False
+
+        digest = hashlib.sha1(" ".join(text.lower().split()).encode()).hexdigest()
+        if self._seen.get(digest):
+            self._stats["duplicates"] += 1
+            return False
+        if self._pending >= self.max_pending:
+            self._stats["rejected"] += 1
+            logger.warning(f"Memory extraction queue full ({self._pending} pending), dropping item")
+            return False
+        self._seen.set(digest, True)
+
+        text = text[:self.max_chars]
+        key = f"{source}:{group}"
+        pending = self._groups.get(key)
+        if pending is not None and pending.chars + len(text) > self.max_chars:
+            self._ready.append(self._groups.pop(key))
+            pending = None
+        if pending is None:
+            pending = self._groups[key] = _Group(source=source, first_at=time.monotonic())
+        pending.texts.append(text)
+        pending.chars += len(text) + 2
+        self._pending += 1
+        self._stats["submitted"] += 1
+
+        if len(pending.texts) >= self.batch_size:
+            self._ready.append(self._groups.pop(key))
+
+        self._ensure_worker()
+        if self._ready:
+            self._wakeup.set()
+        return True
+
+    # ==================== WORKER ====================
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and not self._worker.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self._concurrency)
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        """Move due groups to ready and start their extraction, bounded by the semaphore."""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(1.0, self.batch_window / 4))
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            self._collect_due()
+            while self._ready:
+                await self._semaphore.acquire()
+                self._start(self._ready.pop(0))
+
+    def _start(self, group: _Group) -> None:
+        task = asyncio.create_task(self._extract(group))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    def _collect_due(self, force: bool = False) -> None:
+        now = time.monotonic()
+        for key in [k for k, g in self._groups.items() if force or now - g.first_at >= self.batch_window]:
+            self._ready.append(self._groups.pop(key))
+
+    async def _extract(self, group: _Group) -> None:
+        """One extraction call for a batch. Never raises."""
+        try:
+            from app.features.memory import get_memory_service
+
+            count = await get_memory_service().extract_from_text(
+                text="\n\n".join(group.texts),
+                source=group.source,
+                max_memories=min(_MAX_MEMORIES_PER_CALL, 4 + len(group.texts)),
+            )
+            self._stats["batches"] += 1
+            self._stats["items_extracted"] += len(group.texts)
+            self._stats["memories"] += count
+            logger.info(f"Extracted {count} memories from {len(group.texts)} queued {group.source} items")
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"Background memory extraction failed: {e}")
+        finally:
+            self._pending -= len(group.texts)
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    # ==================== LIFECYCLE ====================
+
+    async def close(self, timeout: float = MEMORY_EXTRACTION_SHUTDOWN_TIMEOUT) -> None:
+        """Extract everything still queued, then stop (app shutdown)."""
+        self._closed = True
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        await asyncio.gather(self._worker, return_exceptions=True)
+        self._worker = None
+
+        self._collect_due(force=True)
+
+        async def drain() -> None:
+            while self._ready:
+                await self._semaphore.acquire()
+                self._start(self._ready.pop(0))
+            await asyncio.gather(*list(self._running), return_exceptions=True)
+
+        try:
+            await asyncio.wait_for(drain(), timeout=timeout)
+        except asyncio.TimeoutError:
+            unfinished = len(self._running) + len(self._ready)
+            for task in list(self._running):
+                task.cancel()
+            logger.warning(f"Shutting down with {unfinished} memory extraction batches unfinished")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and totals."""
+        return {
+            **self._stats,
+            "pending": self._pending,
+            "groups": len(self._groups),
+            "ready": len(self._ready),
+            "running": len(self._running),
+        }
+
+
+_extraction_queue: Optional[MemoryExtractionQueue] = None
+
+
+def get_memory_extraction_queue() -> MemoryExtractionQueue:
+    """Get the process-wide memory extraction queue."""
+    global _extraction_queue
+    if _extraction_queue is None:
+        _extraction_queue = MemoryExtractionQueue()
+    return _extraction_queue
@@ -0,0 +1,178 @@
+"""
+Mem0 Adapter - non-blocking access to the synchronous Mem0 client.
+
+mem0's Memory.search/add/get_all are blocking: each call embeds the text
+with OpenAI and queries pgvector. Called from async code they stall the
+event loop, so one memory search delays every concurrent request (and
+the chat context budget times out on memory).
+
+The adapter runs every Mem0 call on a dedicated, bounded thread pool
+(MEM0_POOL_SIZE threads; Mem0's pgvector store gets a connection pool of
+the same size, see MemoryService) and:
+- Coalesces identical concurrent searches into one Mem0 call
+- Writes batches with one Mem0 add() per chunk of messages that share
+  metadata (add_batch), so seeding and consolidation pay one extraction
+  and dedup pass per chunk instead of per memory
+
+Usage:
+    adapter = Mem0Adapter(memory)
+    result = await adapter.search(query="...", user_id="aaron", limit=5)
+    results = await adapter.add_batch([(content, metadata), ...], user_id="aaron")
+
+    await run_in_mem0_executor(Memory.from_config, config)
+"""
+
+import os
+import json
+import asyncio
+import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("Jarvis.Memory.Mem0Adapter")
+
+# Threads for blocking Mem0 calls (and pgvector connections)
+MEM0_POOL_SIZE = int(os.getenv("MEM0_POOL_SIZE", "4"))
+# Messages per Mem0 add() when writing a batch
+MEM0_ADD_BATCH_SIZE = int(os.getenv("MEM0_ADD_BATCH_SIZE", "10"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=max(1, MEM0_POOL_SIZE), thread_name_prefix="mem0")
+    return _executor
+
+
+async def run_in_mem0_executor(fn: Callable, *args, **kwargs) -> Any:
+    """Run a blocking Mem0 call on the Mem0 thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(fn, *args, **kwargs))
+
+
+def shutdown_mem0_executor() -> None:
+    """Release Mem0 pool threads (called on application shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+        logger.info("Mem0 executor shut down")
+
+
+class Mem0Adapter:
+    """Async wrapper around a mem0 Memory instance."""
+
+    def __init__(self, memory: Any):
+        self._memory = memory
+        self._inflight: Dict[Tuple, asyncio.Future] = {}  # Searches in progress
+        self._stats = {"searches": 0, "coalesced_searches": 0, "adds": 0, "batched_messages": 0}
+
+    # ==================== READ ====================
+
+    async def search(self, query: str, user_id: str, limit: int = 5) -> Dict[str, Any]:
+        """Semantic search; concurrent identical searches share one Mem0 call."""
+        key = (user_id, query, limit)
+        task = self._inflight.get(key)
+        if task is None:
+            self._stats["searches"] += 1
+            task = asyncio.ensure_future(
+                run_in_mem0_executor(self._memory.search, query=query, user_id=user_id, limit=limit)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._search_done, key))
+        else:
+            self._stats["coalesced_searches"] += 1
+        # Shielded: a caller that gives up (timeout) doesn't cancel the others
+        return await asyncio.shield(task)
+
+    def _search_done(self, key: Tuple, task: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # Retrieved here in case every caller gave up
+
+    async def get_all(self, user_id: str, limit: int = 100) -> Dict[str, Any]:
+        return await run_in_mem0_executor(self._memory.get_all, user_id=user_id, limit=limit)
+
+    # ==================== WRITE ====================
+
+    async def add(
+        self,
+        messages: List[Dict[str, str]],
+        user_id: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        infer: bool = True
+    ) -> Dict[str, Any]:
+        self._stats["adds"] += 1
+        return await run_in_mem0_executor(
+            self._memory.add, messages=messages, user_id=user_id, metadata=metadata, infer=infer
+        )
+
+    async def add_batch(
+        self,
+        items: List[Tuple[str, Dict[str, Any]]],
+        user_id: str,
+        infer: bool = True,
+        raise_errors: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Write many memories with as few Mem0 calls as possible.
+
+        Items with identical metadata are sent together, MEM0_ADD_BATCH_SIZE
+        messages per add(); chunks run concurrently on the Mem0 pool.
+
+        Args:
+            items: (content, metadata) pairs
+            user_id: Mem0 user id
+            infer: Let Mem0 extract/deduplicate (one pass per chunk)
+            raise_errors: Raise if any chunk failed (after the others are written)
+
+        Returns:
+            Mem0 add() results, one per chunk (failed chunks are skipped)
+        """
+        groups: Dict[str, Tuple[Dict[str, Any], List[str]]] = {}
+        for content, metadata in items:
+            key = json.dumps({k: v for k, v in metadata.items() if k != "added_at"}, sort_keys=True, default=str)
+            groups.setdefault(key, (metadata, []))[1].append(content)
+
+        chunks = [
+            (metadata, contents[i:i + MEM0_ADD_BATCH_SIZE])
+            for metadata, contents in groups.values()
+            for i in range(0, len(contents), max(1, MEM0_ADD_BATCH_SIZE))
+        ]
+        results = await asyncio.gather(
+            *(
+                self.add(
+                    messages=[{"role": "user", "content": content} for content in contents],
+                    user_id=user_id,
+                    metadata=dict(metadata),
+                    infer=infer,
+                )
+                for metadata, contents in chunks
+            ),
+            return_exceptions=True,
+        )
+        self._stats["batched_messages"] += len(items)
+
+        ok = []
+        errors = []
+        for (metadata, contents), result in zip(chunks, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Mem0 batch add of {len(contents)} [{metadata.get('type')}] memories failed: {result}")
+                errors.append(result)
+            elif result:
+                ok.append(result)
+        if errors and raise_errors:
+            raise RuntimeError(f"{len(errors)} of {len(chunks)} Mem0 batch chunks failed") from errors[0]
+        return ok
+
+    async def update(self, memory_id: str, data: str) -> Any:
+        return await run_in_mem0_executor(self._memory.update, memory_id=memory_id, data=data)
+
+    async def delete(self, memory_id: str) -> Any:
+        return await run_in_mem0_executor(self._memory.delete, memory_id=memory_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "pool_size": MEM0_POOL_SIZE, "inflight_searches": len(self._inflight)}
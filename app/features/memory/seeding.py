@@ -0,0 +1,623 @@
+"""
+Memory Seeding Jobs - resumable, concurrent seeding from existing data.
+
+/memory/seed/* used to fetch everything up front and then await one
+memory write or one Claude extraction at a time inside a BackgroundTasks
+closure: no progress reporting, no concurrency, and a restart lost the
+run. Seeding a year of history took hours and rarely finished.
+
+A seeding job is a row in memory_seeding_jobs (migration 033) with one
+stage per source (contacts, meetings, transcripts, beeper):
+- Stages run concurrently; each pages through its table newest-first
+  with a keyset cursor, bounded by a time window fixed when the job is
+  created, and prefetches the next page while processing the current one
+- After every page the stage cursor and counters are checkpointed, so a
+  resumed job redoes at most one page (Mem0 deduplicates the repeats)
+- A page with failed writes or extractions is retried with backoff; if it
+  still fails, the stage fails without advancing its cursor, so the job
+  ends "failed" and resume_job redoes that page
+- Contacts and meetings are written with one Mem0 batch per page;
+  transcripts are packed several per Claude call (up to
+  SEED_EXTRACTION_BATCH_CHARS) and beeper chats are extracted per chat,
+  with at most SEED_TRANSCRIPT_CONCURRENCY / SEED_BEEPER_CONCURRENCY
+  extraction calls in flight per stage
+- The owning instance refreshes heartbeat_at; every instance polls for
+  running jobs with a stale (or released) heartbeat and claims them, so
+  a job survives restarts and redeploys
+
+Usage:
+    from app.features.memory.seeding import get_seeding_runner
+
+    runner = get_seeding_runner()
+    job = await runner.create_job("all", {"since": cutoff, "contacts_limit": 50, ...})
+    job = await runner.get_job(job["id"])
+
+    runner.start()        # main.py lifespan: resume orphaned jobs
+    await runner.close()  # Shutdown: release running jobs to other instances
+"""
+
+import os
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from app.features.database import get_async_database
+
+logger = logging.getLogger("Jarvis.Memory.Seeding")
+
+JOBS_TABLE = "memory_seeding_jobs"
+
+SEED_PAGE_SIZE = int(os.getenv("MEMORY_SEED_PAGE_SIZE", "50"))
+SEED_TRANSCRIPT_CONCURRENCY = int(os.getenv("MEMORY_SEED_TRANSCRIPT_CONCURRENCY", "4"))
+SEED_BEEPER_CONCURRENCY = int(os.getenv("MEMORY_SEED_BEEPER_CONCURRENCY", "4"))
+# Transcript characters per batched extraction call, and per transcript
+SEED_EXTRACTION_BATCH_CHARS = int(os.getenv("MEMORY_SEED_EXTRACTION_BATCH_CHARS", "12000"))
+SEED_TRANSCRIPT_MAX_CHARS = 6000
+SEED_TRANSCRIPTS_PER_CALL = int(os.getenv("MEMORY_SEED_TRANSCRIPTS_PER_CALL", "4"))
+# extract_from_text reads at most 3000 chars; longer chats are split
+SEED_CHAT_CHUNK_CHARS = 3000
+SEED_HEARTBEAT_SECONDS = float(os.getenv("MEMORY_SEED_HEARTBEAT_SECONDS", "30"))
+SEED_STALE_SECONDS = float(os.getenv("MEMORY_SEED_STALE_SECONDS", "120"))
+SEED_POLL_SECONDS = float(os.getenv("MEMORY_SEED_POLL_SECONDS", "60"))
+SEED_PAGE_RETRIES = 3
+SEED_PAGE_RETRY_SECONDS = 5.0  # Backoff before reprocessing a page with failures, doubling
+
+
+@dataclass(frozen=True)
+class _Stage:
+    """Where a stage reads from and which job params bound it."""
+    table: str
+    columns: str
+    order_column: str
+    limit_param: str
+    since_param: Optional[str] = None
+    not_null: Optional[str] = None
+    concurrency: int = 1
+
+
+STAGES: Dict[str, _Stage] = {
+    "contacts": _Stage(
+        "contacts", "id, first_name, last_name, company, job_title, notes, updated_at",
+        "updated_at", "contacts_limit",
+    ),
+    "meetings": _Stage(
+        "meetings", "id, title, summary, contact_name, date",
+        "date", "meetings_limit", since_param="since", not_null="summary",
+    ),
+    "transcripts": _Stage(
+        "transcripts", "id, full_text, source_file, created_at",
+        "created_at", "transcripts_limit", since_param="since", not_null="full_text",
+        concurrency=SEED_TRANSCRIPT_CONCURRENCY,
+    ),
+    "beeper": _Stage(
+        "beeper_messages", "id, content, is_outgoing, timestamp, beeper_chat_id",
+        "timestamp", "beeper_limit", since_param="beeper_since",
+        concurrency=SEED_BEEPER_CONCURRENCY,
+    ),
+}
+
+# Stages each /memory/seed/* endpoint runs
+SOURCE_STAGES: Dict[str, List[str]] = {
+    "contacts": ["contacts"],
+    "meetings": ["meetings"],
+    "transcripts": ["transcripts"],
+    "beeper": ["beeper"],
+    "all": ["contacts", "meetings", "transcripts"],
+}
+
+
+class _JobLost(Exception):
+    """The job was cancelled or claimed by another instance."""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class SeedingJobRunner:
+    """Creates, runs, checkpoints and resumes memory seeding jobs."""
+
+    def __init__(self):
+        self.worker_id = uuid4().hex[:12]
+        self._jobs: Dict[str, Dict[str, Any]] = {}      # Jobs running here, by id
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}       # Serializes checkpoints per job
+        self._poller: Optional[asyncio.Task] = None
+        self._llm = None
+
+    # ==================== JOBS ====================
+
+    async def create_job(self, source: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Persist a new job and start running it here.
+
+        Args:
+            source: Key of SOURCE_STAGES (contacts, meetings, transcripts, beeper, all)
+            params: Limits (<stage>_limit) and window starts (since, beeper_since);
+                "until" (now) is added so later data doesn't shift the cursors
+        """
+        adb = get_async_database()
+        now = _now()
+        job = {
+            "id": str(uuid4()),
+            "source": source,
+            "status": "running",
+            "params": {**params, "until": now},
+            "stages": {
+                name: {"status": "pending", "cursor": None, "processed": 0, "memories_added": 0, "errors": 0}
+                for name in SOURCE_STAGES[source]
+            },
+            "memories_added": 0,
+            "worker_id": self.worker_id,
+            "heartbeat_at": now,
+        }
+        await adb.execute(adb.table(JOBS_TABLE).insert(job))
+        self._start_job(job)
+        logger.info(f"Started memory seeding job {job['id']} ({source})")
+        return job
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        adb = get_async_database()
+        result = await adb.execute(adb.table(JOBS_TABLE).select("*").eq("id", job_id).limit(1))
+        return (result.data or [None])[0]
+
+    async def list_jobs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        adb = get_async_database()
+        result = await adb.execute(
+            adb.table(JOBS_TABLE).select("*").order("created_at", desc=True).limit(limit)
+        )
+        return result.data or []
+
+    async def cancel_job(self, job_id: str) -> bool:
+        """Stop a running job (wherever it runs; its owner notices at the next checkpoint)."""
+        adb = get_async_database()
+        result = await adb.execute(
+            adb.table(JOBS_TABLE)
+            .update({"status": "cancelled", "finished_at": _now(), "updated_at": _now()})
+            .eq("id", job_id)
+            .eq("status", "running")
+        )
+        task = self._tasks.get(job_id)
+        if task is not None:
+            task.cancel()
+        return bool(result.data)
+
+    async def resume_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Restart a failed or cancelled job from its checkpoints."""
+        job = await self.get_job(job_id)
+        if job is None or job["status"] not in ("failed", "cancelled"):
+            return None
+        for state in job["stages"].values():
+            if state["status"] != "completed":
+                state["status"] = "pending"
+        adb = get_async_database()
+        result = await adb.execute(
+            adb.table(JOBS_TABLE)
+            .update({
+                "status": "running", "error": None, "finished_at": None, "stages": job["stages"],
+                "worker_id": self.worker_id, "heartbeat_at": _now(), "updated_at": _now(),
+            })
+            .eq("id", job_id)
+            .eq("status", job["status"])
+        )
+        if not result.data:
+            return None
+        job = result.data[0]
+        self._start_job(job)
+        logger.info(f"Resumed memory seeding job {job_id}")
+        return job
+
+    # ==================== RUN ====================
+
+    def _start_job(self, job: Dict[str, Any]) -> None:
+        self._jobs[job["id"]] = job
+        self._locks[job["id"]] = asyncio.Lock()
+        self._tasks[job["id"]] = asyncio.create_task(self._run_job(job))
+
+    async def _run_job(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            names = [name for name, state in job["stages"].items() if state["status"] != "completed"]
+            results = await asyncio.gather(*(self._run_stage(job, name) for name in names), return_exceptions=True)
+            if any(isinstance(result, _JobLost) for result in results):
+                logger.info(f"Seeding job {job_id} was cancelled or taken over, stopping")
+                return
+            failures = [f"{name}: {result}" for name, result in zip(names, results) if isinstance(result, Exception)]
+            await self._finish(job, "failed" if failures else "completed", "; ".join(failures) or None)
+        except _JobLost:
+            logger.info(f"Seeding job {job_id} was cancelled or taken over, stopping")
+        except Exception as e:
+            logger.exception(f"Seeding job {job_id} crashed")
+            await self._finish(job, "failed", str(e))
+        finally:
+            heartbeat.cancel()
+            self._tasks.pop(job_id, None)
+            self._jobs.pop(job_id, None)
+            self._locks.pop(job_id, None)
+
+    async def _run_stage(self, job: Dict[str, Any], name: str) -> None:
+        """Page through one source, checkpointing after every page."""
+        stage = STAGES[name]
+        state = job["stages"][name]
+        limit = int(job["params"].get(stage.limit_param) or 0)
+        state["status"] = "running"
+
+        next_page: Optional[asyncio.Task] = None
+        try:
+            if state["processed"] < limit:
+                next_page = asyncio.create_task(self._fetch_page(job, name, state["cursor"]))
+            while next_page is not None:
+                rows = (await next_page)[:max(0, limit - state["processed"])]
+                if not rows:
+                    break
+                cursor = {"ts": rows[-1][stage.order_column], "id": rows[-1]["id"]}
+                more = len(rows) == SEED_PAGE_SIZE and state["processed"] + len(rows) < limit
+                next_page = asyncio.create_task(self._fetch_page(job, name, cursor)) if more else None
+
+                added, errors = await self._process_page(job, name, rows)
+                state["processed"] += len(rows)
+                state["memories_added"] += added
+                state["errors"] += errors
+                state["cursor"] = cursor
+                await self._checkpoint(job)
+        except _JobLost:
+            raise
+        except Exception as e:
+            state["status"] = "failed"
+            state["error"] = str(e)
+            logger.error(f"Seeding stage {name} of job {job['id']} failed: {e}")
+            raise
+        finally:
+            if next_page is not None and not next_page.done():
+                next_page.cancel()
+
+        state["status"] = "completed"
+        state.pop("error", None)
+        await self._checkpoint(job)
+        logger.info(
+            f"Seeding job {job['id']}: {name} done, {state['processed']} records, "
+            f"{state['memories_added']} memories"
+        )
+
+    async def _fetch_page(self, job: Dict[str, Any], name: str, cursor: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Next page of a stage, newest first, within the job's time window."""
+        stage = STAGES[name]
+        params = job["params"]
+        col = stage.order_column
+        adb = get_async_database()
+
+        query = adb.table(stage.table).select(stage.columns).lte(col, params["until"])
+        since = params.get(stage.since_param) if stage.since_param else None
+        if since:
+            query = query.gte(col, since)
+        if stage.not_null:
+            query = query.not_.is_(stage.not_null, "null")
+        if cursor:
+            query = query.or_(f'{col}.lt."{cursor["ts"]}",and({col}.eq."{cursor["ts"]}",id.lt.{cursor["id"]})')
+        query = query.order(col, desc=True).order("id", desc=True).limit(SEED_PAGE_SIZE)
+
+        for attempt in range(SEED_PAGE_RETRIES + 1):
+            try:
+                result = await adb.execute(query)
+                return result.data or []
+            except Exception as e:
+                if attempt == SEED_PAGE_RETRIES:
+                    raise
+                logger.warning(f"Seeding page fetch from {stage.table} failed (attempt {attempt + 1}): {e}")
+                await asyncio.sleep(2 ** attempt)
+        return []
+
+    async def _process_page(self, job: Dict[str, Any], name: str, rows: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """
+        Process one page, reprocessing it while records fail.
+
+        Raises if records still fail after SEED_PAGE_RETRIES retries, so the
+        caller never checkpoints a cursor past records that weren't seeded.
+        """
+        added = 0
+        for attempt in range(SEED_PAGE_RETRIES + 1):
+            page_added, errors = await self._process(name, rows, job)
+            added += page_added
+            if not errors:
+                return added, 0
+            if attempt == SEED_PAGE_RETRIES:
+                break
+            delay = SEED_PAGE_RETRY_SECONDS * 2 ** attempt
+            logger.warning(
+                f"Seeding job {job['id']}: {errors}/{len(rows)} {name} records failed "
+                f"(attempt {attempt + 1}), retrying page in {delay:.0f}s"
+            )
+            await asyncio.sleep(delay)
+        state = job["stages"][name]
+        state["memories_added"] += added
+        state["errors"] += errors
+        raise RuntimeError(
+            f"{errors}/{len(rows)} records failed after {SEED_PAGE_RETRIES + 1} attempts; "
+            f"cursor kept before this page"
+        )
+
+    # ==================== STAGES ====================
+
+    async def _process(self, name: str, rows: List[Dict[str, Any]], job: Dict[str, Any]) -> Tuple[int, int]:
+        """Write memories for one page. Returns (memories added, failed records)."""
+        from app.features.memory import get_memory_service
+
+        memory = get_memory_service()
+        if name == "contacts":
+            return await _add_items(memory, _contact_items(rows), len(rows))
+        if name == "meetings":
+            source = "initial_seed" if job["source"] == "all" else "meeting_seed"
+            return await _add_items(memory, _meeting_items(rows, source), len(rows))
+        if name == "transcripts":
+            return await self._extract_transcripts(rows)
+        if name == "beeper":
+            return await self._extract_chats(rows)
+        raise ValueError(f"Unknown seeding stage: {name}")
+
+    async def _extract_transcripts(self, rows: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Pack transcripts into as few Claude calls as fit the batch budget, run concurrently."""
+        from app.features.memory import get_memory_service
+
+        batches: List[List[Tuple[str, str]]] = []
+        chars = 0
+        for row in rows:
+            text = row.get("full_text") or ""
+            if len(text) < 100:
+                continue
+            size = min(len(text), SEED_TRANSCRIPT_MAX_CHARS)
+            if not batches or len(batches[-1]) >= SEED_TRANSCRIPTS_PER_CALL or chars + size > SEED_EXTRACTION_BATCH_CHARS:
+                batches.append([])
+                chars = 0
+            batches[-1].append((text, row.get("source_file") or "unknown"))
+            chars += size
+
+        memory = get_memory_service()
+        llm = self._get_llm()
+        semaphore = asyncio.Semaphore(max(1, STAGES["transcripts"].concurrency))
+
+        async def extract(batch: List[Tuple[str, str]]) -> int:
+            async with semaphore:
+                return await memory.seed_from_raw_transcripts(
+                    batch, llm_client=llm, max_chars_each=SEED_TRANSCRIPT_MAX_CHARS, raise_errors=True
+                )
+
+        results = await asyncio.gather(*(extract(batch) for batch in batches), return_exceptions=True)
+        return _tally(results, batches)
+
+    async def _extract_chats(self, rows: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Extract each chat's messages of this page, SEED_CHAT_CHUNK_CHARS at a time."""
+        from app.features.memory import get_memory_service
+
+        chats: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            chats.setdefault(row.get("beeper_chat_id") or "unknown", []).append(row)
+
+        chunks: List[Tuple[str, str]] = []
+        for chat_id, messages in chats.items():
+            lines = [
+                f"{'Aaron' if m.get('is_outgoing') else 'Contact'}: {m['content']}"
+                for m in sorted(messages, key=lambda m: m.get("timestamp") or "")
+                if m.get("content")
+            ]
+            current: List[str] = []
+            for line in lines:
+                if current and sum(len(l) + 1 for l in current) + len(line) > SEED_CHAT_CHUNK_CHARS:
+                    chunks.append((chat_id, "\n".join(current)))
+                    current = []
+                current.append(line)
+            if current:
+                chunks.append((chat_id, "\n".join(current)))
+
+        memory = get_memory_service()
+        semaphore = asyncio.Semaphore(max(1, STAGES["beeper"].concurrency))
+
+        async def extract(chat_id: str, text: str) -> int:
+            async with semaphore:
+                return await memory.extract_from_text(
+                    text=text, source="beeper", source_id=chat_id, raise_errors=True
+                )
+
+        results = await asyncio.gather(*(extract(chat_id, text) for chat_id, text in chunks), return_exceptions=True)
+        return _tally(results, [[chunk] for chunk in chunks])
+
+    def _get_llm(self):
+        if self._llm is None:
+            from app.services.llm import ClaudeMultiAnalyzer
+            self._llm = ClaudeMultiAnalyzer()
+        return self._llm
+
+    # ==================== STATE ====================
+
+    async def _checkpoint(self, job: Dict[str, Any], release: bool = False) -> None:
+        """Persist progress (and refresh the heartbeat). Raises _JobLost if we no longer own the job."""
+        job["memories_added"] = sum(state["memories_added"] for state in job["stages"].values())
+        changes = {
+            "stages": job["stages"],
+            "memories_added": job["memories_added"],
+            "updated_at": _now(),
+            "heartbeat_at": None if release else _now(),
+        }
+        if release:
+            changes["worker_id"] = None
+        adb = get_async_database()
+        async with self._locks.get(job["id"]) or asyncio.Lock():
+            result = await adb.execute(
+                adb.table(JOBS_TABLE).update(changes)
+                .eq("id", job["id"])
+                .eq("worker_id", self.worker_id)
+                .eq("status", "running")
+            )
+        if not result.data:
+            raise _JobLost(job["id"])
+
+    async def _finish(self, job: Dict[str, Any], status: str, error: Optional[str]) -> None:
+        job["memories_added"] = sum(state["memories_added"] for state in job["stages"].values())
+        adb = get_async_database()
+        try:
+            await adb.execute(
+                adb.table(JOBS_TABLE).update({
+                    "status": status, "error": error, "stages": job["stages"],
+                    "memories_added": job["memories_added"],
+                    "finished_at": _now(), "updated_at": _now(), "heartbeat_at": None,
+                })
+                .eq("id", job["id"])
+                .eq("worker_id", self.worker_id)
+                .eq("status", "running")
+            )
+        except Exception as e:
+            logger.error(f"Failed to record end of seeding job {job['id']}: {e}")
+        log = logger.info if status == "completed" else logger.error
+        log(f"Seeding job {job['id']} {status}: {job['memories_added']} memories" + (f" ({error})" if error else ""))
+
+    async def _heartbeat(self, job: Dict[str, Any]) -> None:
+        """Keep ownership fresh between checkpoints; stop the job if it was lost."""
+        while True:
+            await asyncio.sleep(SEED_HEARTBEAT_SECONDS)
+            try:
+                await self._checkpoint(job)
+            except _JobLost:
+                task = self._tasks.get(job["id"])
+                if task is not None:
+                    task.cancel()
+                return
+            except Exception as e:
+                logger.warning(f"Seeding job {job['id']} heartbeat failed: {e}")
+
+    # ==================== LIFECYCLE ====================
+
+    def start(self) -> None:
+        """Start polling for orphaned jobs (app startup)."""
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll())
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                await self._claim_stale()
+            except Exception as e:
+                logger.warning(f"Seeding job poll failed: {e}")
+            await asyncio.sleep(SEED_POLL_SECONDS)
+
+    async def _claim_stale(self) -> None:
+        """Take over running jobs whose owner stopped heartbeating."""
+        adb = get_async_database()
+        stale = (datetime.now(timezone.utc) - timedelta(seconds=SEED_STALE_SECONDS)).isoformat()
+        orphaned = f'heartbeat_at.is.null,heartbeat_at.lt."{stale}"'
+        result = await adb.execute(
+            adb.table(JOBS_TABLE).select("id").eq("status", "running").or_(orphaned).limit(10)
+        )
+        for row in result.data or []:
+            if row["id"] in self._tasks:
+                continue
+            claimed = await adb.execute(
+                adb.table(JOBS_TABLE)
+                .update({"worker_id": self.worker_id, "heartbeat_at": _now()})
+                .eq("id", row["id"])
+                .eq("status", "running")
+                .or_(orphaned)
+            )
+            if claimed.data:
+                logger.info(f"Resuming memory seeding job {row['id']}")
+                self._start_job(claimed.data[0])
+
+    async def close(self) -> None:
+        """Stop local jobs and release them at their last checkpoint (app shutdown)."""
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+        jobs = list(self._jobs.values())
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in jobs:
+            try:
+                await self._checkpoint(job, release=True)
+                logger.info(f"Released memory seeding job {job['id']} for resumption")
+            except Exception as e:
+                logger.warning(f"Failed to release seeding job {job['id']}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"worker_id": self.worker_id, "running_jobs": list(self._tasks)}
+
+
+# ==================== MEMORY ITEMS ====================
+
+def _contact_items(contacts: List[Dict[str, Any]]) -> List[Any]:
+    """Relationship memories from contacts (skips nameless contacts and junk notes)."""
+    from app.features.memory.service import _relationship_item
+
+    items = []
+    for contact in contacts:
+        name = f"{contact.get('first_name') or ''} {contact.get('last_name') or ''}".strip()
+        if not name or len(name) < 2:
+            continue
+
+        job_title = contact.get("job_title") or ""
+        company = contact.get("company") or ""
+        if job_title and company:
+            items.append(_relationship_item(f"{name} is {job_title} at {company}", name))
+        elif job_title:
+            items.append(_relationship_item(f"{name} is {job_title}", name))
+        elif company:
+            items.append(_relationship_item(f"{name} works at {company}", name))
+
+        # Only meaningful notes: no system IDs or "Created from Beeper"
+        notes = contact.get("notes") or ""
+        if notes and len(notes) > 10:
+            if not notes.isdigit() and not notes.strip().startswith("1") or len(notes) > 20:
+                if "created from" not in notes.lower():
+                    items.append(_relationship_item(f"About {name}: {notes[:300]}", name))
+    return items
+
+
+def _meeting_items(meetings: List[Dict[str, Any]], source: str) -> List[Any]:
+    """Interaction memories from meetings that have a summary and a contact."""
+    from app.features.memory.service import _interaction_item
+
+    return [
+        _interaction_item(
+            f"Meeting '{meeting.get('title') or ''}': {meeting['summary'][:200]}",
+            contact_name=meeting["contact_name"],
+            interaction_date=meeting.get("date"),
+            source=source,
+        )
+        for meeting in meetings
+        if meeting.get("summary") and meeting.get("contact_name")
+    ]
+
+
+async def _add_items(memory: Any, items: List[Any], records: int) -> Tuple[int, int]:
+    """(memories added, failed records) for one page written with add_batch."""
+    try:
+        return await memory.add_batch(items, raise_errors=True), 0
+    except Exception as e:
+        logger.warning(f"Seeding batch write failed: {e}")
+        return 0, records
+
+
+def _tally(results: List[Any], batches: List[List[Any]]) -> Tuple[int, int]:
+    """(memories added, records in failed calls) from gathered extraction results."""
+    added = errors = 0
+    for result, batch in zip(results, batches):
+        if isinstance(result, BaseException):
+            errors += len(batch)
+            logger.warning(f"Seeding extraction failed: {result}")
+        else:
+            added += result
+    return added, errors
+
+
+_runner: Optional[SeedingJobRunner] = None
+
+
+def get_seeding_runner() -> SeedingJobRunner:
+    """Get the process-wide seeding job runner."""
+    global _runner
+    if _runner is None:
+        _runner = SeedingJobRunner()
+    return _runner
@@ -9,6 +9,8 @@ This service provides persistent memory that's accessible across ALL features:
 
 Architecture:
 - Uses Mem0 with Qdrant vector store for semantic search
+- Mem0 calls are blocking; they run on a dedicated thread pool via
+  Mem0Adapter (mem0_adapter.py) so they never stall the event loop
 - Mem0's built-in conflict resolution handles duplicates and updates
 - Falls back to in-memory store if Qdrant unavailable
 - Integrates with Claude for memory extraction
@@ -60,18 +62,46 @@ def _patch_mem0_anthropic():
 _patch_mem0_anthropic()
 # =============================================================================
 import os
-import time
 from datetime import datetime, timezone
 from enum import Enum
 from functools import lru_cache
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.services.cache import get_cache
+from app.features.memory.mem0_adapter import (
+    MEM0_POOL_SIZE,
+    Mem0Adapter,
+    run_in_mem0_executor,
+)
 
 logger = logging.getLogger("Jarvis.Memory")
 
-# Simple TTL cache for memory searches to reduce embedding API calls
-_search_cache: Dict[str, Tuple[float, List[Dict]]] = {}
-_SEARCH_CACHE_TTL = 60.0  # 60 seconds - same message within 1 min uses cache
-_SEARCH_CACHE_MAX_SIZE = 50
+# TTL cache for memory searches to reduce embedding API calls (shared across
+# instances when CACHE_SHARED_BACKEND is set, cleared on every memory write)
+SEARCH_CACHE_NAMESPACE = "memory_search"
+_SEARCH_CACHE_TTL = float(os.getenv("MEMORY_SEARCH_CACHE_TTL_SECONDS", "60"))
+_SEARCH_CACHE_MAX_SIZE = int(os.getenv("MEMORY_SEARCH_CACHE_MAX_SIZE", "256"))
+
+# Called after every successful add/update/delete with (operation, memory_type);
+# memory_type is None for update/delete
+MemoryWriteListener = Callable[[str, Optional["MemoryType"]], Awaitable[None]]
+_write_listeners: List[MemoryWriteListener] = []
+
+
+def _get_search_cache():
+    return get_cache(SEARCH_CACHE_NAMESPACE, maxsize=_SEARCH_CACHE_MAX_SIZE, ttl=_SEARCH_CACHE_TTL)
+
+
+def add_memory_write_listener(listener: MemoryWriteListener) -> None:
+    """
+    Register a coroutine to run after memory writes (cache invalidation).
+
+    Args:
+        listener: async fn(operation, memory_type) with operation one of
+            "add", "update", "delete"
+    """
+    if listener not in _write_listeners:
+        _write_listeners.append(listener)
 
 
 class MemoryType(Enum):
@@ -84,6 +114,32 @@ class MemoryType(Enum):
     BEHAVIOR = "behavior"  # How Jarvis should behave: "Don't make unnecessary tool calls"
 
 
+# (content, memory_type, metadata) - one memory for MemoryService.add_batch
+MemoryItem = Tuple[str, MemoryType, Dict[str, Any]]
+
+
+def _fact_item(fact: str, source: Optional[str] = None) -> MemoryItem:
+    return (fact, MemoryType.FACT, {"source": source} if source else {})
+
+
+def _interaction_item(
+    summary: str,
+    contact_name: Optional[str] = None,
+    interaction_date: Optional[str] = None,
+    source: Optional[str] = None,
+) -> MemoryItem:
+    metadata = {
+        "contact": contact_name,
+        "date": interaction_date,
+        "source": source,
+    }
+    return (summary, MemoryType.INTERACTION, {k: v for k, v in metadata.items() if v})
+
+
+def _relationship_item(relationship_info: str, contact_name: str) -> MemoryItem:
+    return (relationship_info, MemoryType.RELATIONSHIP, {"contact": contact_name})
+
+
 class MemoryService:
     """
     Centralized memory service using Mem0.
@@ -99,6 +155,7 @@ class MemoryService:
         """Initialize memory service with Mem0."""
         self.user_id = os.getenv("JARVIS_USER_ID", "aaron")
         self._memory = None
+        self._adapter: Optional[Mem0Adapter] = None
         self._fallback_memories: List[Dict] = []  # In-memory fallback
         self._use_fallback = False
         
@@ -169,6 +226,9 @@ class MemoryService:
                             "embedding_model_dims": 1536,  # text-embedding-3-small
                             "hnsw": True,
                             "diskann": False,
+                            # One connection per Mem0 pool thread
+                            "minconn": 1,
+                            "maxconn": MEM0_POOL_SIZE,
                         }
                     }
                     logger.info(f"Mem0 configured with Supabase pgvector via Session Pooler (project: {project_ref})")
@@ -190,6 +250,7 @@ class MemoryService:
                 logger.warning("Mem0 using in-memory vector store (no SUPABASE_DB_PASSWORD or QDRANT_URL)")
             
             self._memory = Memory.from_config(config)
+            self._adapter = Mem0Adapter(self._memory)
             self._initialized = True
             logger.info("Memory service initialized successfully")
             
@@ -205,6 +266,11 @@ class MemoryService:
             self._use_fallback = True
             self._memory = None
             self._initialized = True
+
+    async def _ensure_initialized_async(self) -> None:
+        """Initialize on the Mem0 pool (from_config connects to pgvector)."""
+        if not self._initialized:
+            await run_in_mem0_executor(self._ensure_initialized)
     
     # =========================================================================
     # CORE MEMORY OPERATIONS
@@ -235,7 +301,7 @@ class MemoryService:
         Returns:
             Memory ID if successful, None otherwise
         """
-        self._ensure_initialized()
+        await self._ensure_initialized_async()
         
         meta = metadata or {}
         meta["type"] = memory_type.value
@@ -250,6 +316,7 @@ class MemoryService:
                     "metadata": meta,
                 })
                 logger.debug(f"Added fallback memory: {content[:50]}...")
+                await self._after_write("add", memory_type)
                 return mem_id
             
             # Add via Mem0 with inference enabled for automatic deduplication
@@ -257,7 +324,7 @@ class MemoryService:
             # - Skip true duplicates
             # - Update existing memories with new info
             # - Resolve contradictions (new info wins)
-            result = self._memory.add(
+            result = await self._adapter.add(
                 messages=[{"role": "user", "content": content}],
                 user_id=self.user_id,
                 metadata=meta,
@@ -272,6 +339,7 @@ class MemoryService:
                     mem_id = result["results"][0].get("id")
                     event = result["results"][0].get("event", "ADD")
                     logger.info(f"Memory [{event}] [{memory_type.value}]: {content[:50]}...")
+                    await self._after_write("add", memory_type)
                     return {"id": mem_id, "event": event, "status": "success"}
                 else:
                     # Empty results = memory was deduplicated/already exists
@@ -283,6 +351,64 @@ class MemoryService:
         except Exception as e:
             logger.error(f"Failed to add memory: {e}")
             return None
+
+    async def add_batch(self, items: List[MemoryItem], infer: bool = True, raise_errors: bool = False) -> int:
+        """
+        Add many memories with as few Mem0 calls as possible.
+
+        Memories with the same type and metadata are sent to Mem0 together
+        (one extraction + dedup pass per chunk, chunks in parallel on the
+        Mem0 pool). Use this for seeding and consolidation; add() for
+        single writes.
+
+        Args:
+            items: (content, memory_type, metadata) tuples
+            infer: If True (default), Mem0 handles deduplication automatically
+            raise_errors: Raise instead of returning 0 if any part of the batch
+                failed (seeding and consolidation must not checkpoint past it)
+
+        Returns:
+            Number of memories Mem0 added or updated
+        """
+        if not items:
+            return 0
+        await self._ensure_initialized_async()
+
+        added_at = datetime.now(timezone.utc).isoformat()
+        prepared = []
+        for content, memory_type, metadata in items:
+            meta = dict(metadata or {})
+            meta["type"] = memory_type.value
+            meta["added_at"] = added_at
+            prepared.append((content, meta))
+        # Listeners only distinguish behavior rules from other additions
+        types = {memory_type for _, memory_type, _ in items}
+        notify_type = MemoryType.BEHAVIOR if MemoryType.BEHAVIOR in types else next(iter(types))
+
+        try:
+            if self._use_fallback:
+                for content, meta in prepared:
+                    self._fallback_memories.append({
+                        "id": f"mem_{len(self._fallback_memories)}",
+                        "content": content,
+                        "metadata": meta,
+                    })
+                changed = len(prepared)
+            else:
+                results = await self._adapter.add_batch(
+                    prepared, user_id=self.user_id, infer=infer, raise_errors=raise_errors
+                )
+                changed = sum(len(result.get("results") or []) for result in results)
+        except Exception as e:
+            logger.error(f"Failed to add memory batch: {e}")
+            if raise_errors:
+                raise
+            return 0
+
+        logger.info(f"Memory batch: {len(items)} submitted, {changed} added/updated")
+        if changed:
+            await self._after_write("add", notify_type)
+        return changed
     
     async def search(
         self,
@@ -301,20 +427,16 @@ class MemoryService:
         Returns:
             List of matching memories with scores
         """
-        global _search_cache
-        
-        self._ensure_initialized()
+        await self._ensure_initialized_async()
         
         try:
             # Check TTL cache first (saves ~200-400ms embedding call)
-            cache_key = f"{query[:100]}:{limit}:{memory_type}"
-            now = time.time()
-            
-            if cache_key in _search_cache:
-                cached_time, cached_results = _search_cache[cache_key]
-                if now - cached_time < _SEARCH_CACHE_TTL:
-                    logger.debug(f"Memory cache hit for: {query[:30]}... (age: {now - cached_time:.1f}s)")
-                    return cached_results
+            cache = _get_search_cache()
+            cache_key = f"{self.user_id}:{query[:100]}:{limit}:{memory_type}"
+            cached_results = await cache.get(cache_key)
+            if cached_results is not None:
+                logger.debug(f"Memory cache hit for: {query[:30]}...")
+                return cached_results
             
             if self._use_fallback:
                 # Simple keyword search for fallback
@@ -335,7 +457,7 @@ class MemoryService:
             if memory_type:
                 filters["type"] = memory_type.value
             
-            result = self._memory.search(
+            result = await self._adapter.search(
                 query=query,
                 user_id=self.user_id,
                 limit=limit,
@@ -344,15 +466,8 @@ class MemoryService:
             memories = result.get("results", []) if result else []
             logger.debug(f"Found {len(memories)} memories for query: {query[:30]}...")
             
-            # Cache the result
-            _search_cache[cache_key] = (now, memories)
-            
-            # Prune old cache entries if too large
-            if len(_search_cache) > _SEARCH_CACHE_MAX_SIZE:
-                # Remove oldest entries
-                sorted_keys = sorted(_search_cache.keys(), key=lambda k: _search_cache[k][0])
-                for old_key in sorted_keys[:len(sorted_keys) // 2]:
-                    del _search_cache[old_key]
+            # Cache the result (bounded LRU, oldest evicted in O(1))
+            await cache.set(cache_key, memories)
             
             return memories
             
@@ -373,7 +488,7 @@ class MemoryService:
         Returns:
             True if successful
         """
-        self._ensure_initialized()
+        await self._ensure_initialized_async()
         
         try:
             if self._use_fallback:
@@ -381,12 +496,14 @@ class MemoryService:
                     if mem["id"] == memory_id:
                         mem["content"] = new_content
                         mem["metadata"]["updated_at"] = datetime.now(timezone.utc).isoformat()
+                        await self._after_write("update")
                         return True
                 return False
             
             # Use Mem0's native update
-            self._memory.update(memory_id=memory_id, data=new_content)
+            await self._adapter.update(memory_id=memory_id, data=new_content)
             logger.info(f"Updated memory {memory_id}: {new_content[:50]}...")
+            await self._after_write("update")
             return True
             
         except Exception as e:
@@ -395,13 +512,13 @@ class MemoryService:
     
     async def get_all(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get all memories for the user."""
-        self._ensure_initialized()
+        await self._ensure_initialized_async()
         
         try:
             if self._use_fallback:
                 return self._fallback_memories[:limit]
             
-            result = self._memory.get_all(user_id=self.user_id, limit=limit)
+            result = await self._adapter.get_all(user_id=self.user_id, limit=limit)
             return result.get("results", []) if result else []
             
         except Exception as e:
@@ -410,23 +527,37 @@ class MemoryService:
     
     async def delete(self, memory_id: str) -> bool:
         """Delete a specific memory."""
-        self._ensure_initialized()
+        await self._ensure_initialized_async()
         
         try:
             if self._use_fallback:
                 self._fallback_memories = [
                     m for m in self._fallback_memories if m["id"] != memory_id
                 ]
+                await self._after_write("delete")
                 return True
             
-            self._memory.delete(memory_id=memory_id)
+            await self._adapter.delete(memory_id=memory_id)
             logger.info(f"Deleted memory: {memory_id}")
+            await self._after_write("delete")
             return True
             
         except Exception as e:
             logger.error(f"Failed to delete memory {memory_id}: {e}")
             return False
     
+    async def _after_write(self, operation: str, memory_type: Optional[MemoryType] = None) -> None:
+        """Invalidate cached searches and notify write listeners. Never raises."""
+        try:
+            await _get_search_cache().clear()
+        except Exception as e:
+            logger.warning(f"Memory search cache invalidation failed: {e}")
+        for listener in list(_write_listeners):
+            try:
+                await listener(operation, memory_type)
+            except Exception as e:
+                logger.warning(f"Memory write listener failed: {e}")
+    
     # =========================================================================
     # HIGH-LEVEL MEMORY METHODS (Used by Features)
     # =========================================================================
@@ -440,8 +571,7 @@ class MemoryService:
             - "User works in biotech"
             - "User is moving to Singapore"
         """
-        metadata = {"source": source} if source else {}
-        return await self.add(fact, MemoryType.FACT, metadata)
+        return await self.add(*_fact_item(fact, source))
     
     async def remember_interaction(
         self,
@@ -457,12 +587,7 @@ class MemoryService:
             - "Met with John Smith about Algenie funding - discussed Series A timeline"
             - "Call with recruiter about Singapore opportunities"
         """
-        metadata = {
-            "contact": contact_name,
-            "date": interaction_date,
-            "source": source,
-        }
-        return await self.add(summary, MemoryType.INTERACTION, {k: v for k, v in metadata.items() if v})
+        return await self.add(*_interaction_item(summary, contact_name, interaction_date, source))
     
     async def remember_preference(
         self,
@@ -491,11 +616,7 @@ class MemoryService:
             - "John is CTO at Algenie, known since 2023"
             - "Sarah is career coach, meets monthly"
         """
-        return await self.add(
-            relationship_info,
-            MemoryType.RELATIONSHIP,
-            {"contact": contact_name},
-        )
+        return await self.add(*_relationship_item(relationship_info, contact_name))
     
     async def get_context(
         self,
@@ -582,6 +703,7 @@ class MemoryService:
             Number of memories added
         """
         count = 0
+        items: List[MemoryItem] = []
         
         # Extract from meetings - key relationship touchpoints
         for meeting in analysis.get("meetings", []):
@@ -591,20 +713,20 @@ class MemoryService:
             topics = meeting.get("topics_discussed", [])
             
             if summary and contact:
-                await self.remember_interaction(
+                items.append(_interaction_item(
                     f"Meeting with {contact}: {title} - {summary[:200]}",
                     contact_name=contact,
                     source=source_file,
-                )
+                ))
                 count += 1
                 
                 # Also remember topics discussed with this person
                 if topics and isinstance(topics, list):
                     topic_str = ", ".join(topics[:5])
-                    await self.remember_relationship(
+                    items.append(_relationship_item(
                         f"Discussed with {contact}: {topic_str}",
                         contact_name=contact,
-                    )
+                    ))
                     count += 1
         
         # Extract from CRM updates (relationship facts)
@@ -614,10 +736,10 @@ class MemoryService:
             
             for field, value in updates.items():
                 if value and field in ["company", "position", "notes", "job_title"]:
-                    await self.remember_relationship(
+                    items.append(_relationship_item(
                         f"{contact_name}: {field} is {value}",
                         contact_name=contact_name,
-                    )
+                    ))
                     count += 1
         
         # Extract from journals - daily insights and patterns
@@ -630,20 +752,20 @@ class MemoryService:
             # Store notable achievements
             if wins and isinstance(wins, list):
                 for win in wins[:2]:  # Top 2 wins
-                    await self.remember_fact(
+                    items.append(_fact_item(
                         f"Achievement: {win}",
                         source=source_file,
-                    )
+                    ))
                     count += 1
             
             # Store recurring challenges (insights)
             if challenges and isinstance(challenges, list):
                 for challenge in challenges[:1]:
-                    await self.add(
+                    items.append((
                         f"Challenge noted: {challenge}",
                         MemoryType.INSIGHT,
-                        metadata={"source": source_file}
-                    )
+                        {"source": source_file}
+                    ))
                     count += 1
         
         # Extract key facts from reflections
@@ -654,11 +776,11 @@ class MemoryService:
             
             # Store reflection insights
             if title and content:
-                await self.add(
+                items.append((
                     f"Reflection on {title}: {content}",
                     MemoryType.INSIGHT,
-                    metadata={"source": source_file, "tags": tags}
-                )
+                    {"source": source_file, "tags": tags}
+                ))
                 count += 1
         
         # Extract tasks as potential commitments/plans
@@ -668,12 +790,14 @@ class MemoryService:
             
             # Only remember high-priority commitments
             if title and priority == "high":
-                await self.remember_fact(
+                items.append(_fact_item(
                     f"Committed to: {title}",
                     source=source_file,
-                )
+                ))
                 count += 1
         
+        # One batched write instead of one Mem0 round trip per memory
+        await self.add_batch(items)
         logger.info(f"Seeded {count} memories from transcript analysis ({source_file})")
         return count
     
@@ -699,6 +823,7 @@ class MemoryService:
             Number of memories added
         """
         count = 0
+        items: List[MemoryItem] = []
         
         # Seed from contacts (relationships) - filter for quality
         for contact in contacts[:50]:  # Limit to avoid overload
@@ -714,25 +839,25 @@ class MemoryService:
             # Build a comprehensive relationship description
             if position and company:
                 info = f"{name} is {position} at {company}"
-                await self.remember_relationship(info, name)
+                items.append(_relationship_item(info, name))
                 count += 1
             elif position:
                 info = f"{name} is {position}"
-                await self.remember_relationship(info, name)
+                items.append(_relationship_item(info, name))
                 count += 1
             elif company:
                 info = f"{name} works at {company}"
-                await self.remember_relationship(info, name)
+                items.append(_relationship_item(info, name))
                 count += 1
             
             # Only add notes if they're meaningful text (not just IDs or short strings)
             if notes and len(notes) > 10 and not notes.isdigit():
                 # Filter out notes that look like system IDs
                 if not any(c.isdigit() for c in notes[:5]) or len(notes) > 20:
-                    await self.remember_relationship(
+                    items.append(_relationship_item(
                         f"About {name}: {notes[:200]}",
                         name,
-                    )
+                    ))
                     count += 1
         
         # Seed from recent meetings (interactions) - with quality filter
@@ -750,31 +875,32 @@ class MemoryService:
             # Build comprehensive meeting memory
             if contact:
                 meeting_mem = f"Meeting '{title}' with {contact}: {summary[:200]}"
-                await self.remember_interaction(
+                items.append(_interaction_item(
                     meeting_mem,
                     contact_name=contact,
                     interaction_date=date,
                     source="historical_data",
-                )
+                ))
                 count += 1
                 
                 # Also store topics discussed with this person
                 if topics and isinstance(topics, list) and len(topics) > 0:
                     topic_str = ", ".join(str(t) for t in topics[:5] if t)
                     if topic_str:
-                        await self.remember_relationship(
+                        items.append(_relationship_item(
                             f"Discussed with {contact}: {topic_str}",
                             contact_name=contact,
-                        )
+                        ))
                         count += 1
             else:
                 # Meeting without specific contact
-                await self.remember_interaction(
+                items.append(_interaction_item(
                     f"Meeting '{title}': {summary[:200]}",
                     source="historical_data",
-                )
+                ))
                 count += 1
         
+        await self.add_batch(items)
         logger.info(f"Bulk seeded {count} memories from existing data")
         return count
     
@@ -799,8 +925,37 @@ class MemoryService:
         Returns:
             Number of memories added
         """
-        if not transcript_text or len(transcript_text) < 100:
+        return await self.seed_from_raw_transcripts([(transcript_text, source_file)], llm_client)
+
+    async def seed_from_raw_transcripts(
+        self,
+        transcripts: List[Tuple[str, str]],
+        llm_client=None,
+        max_chars_each: int = 6000,
+        raise_errors: bool = False,
+    ) -> int:
+        """
+        Extract memories from several transcripts with one Claude call.
+        
+        Short transcripts are cheap to analyze together: one prompt and one
+        Mem0 batch instead of one of each per transcript. Every memory is
+        tagged with the transcript it came from, so each keeps its own
+        source. Used by seeding jobs (seeding.py).
+        
+        Args:
+            transcripts: (transcript_text, source_file) pairs
+            llm_client: Optional Claude client (will create one if not provided)
+            max_chars_each: Characters of each transcript sent to Claude
+            raise_errors: Raise instead of returning 0 when extraction or
+                storage fails (callers that checkpoint progress need to know)
+            
+        Returns:
+            Number of memories added
+        """
+        transcripts = [(text, source) for text, source in transcripts if text and len(text) >= 100]
+        if not transcripts:
             return 0
+        sources = ", ".join(source for _, source in transcripts)
         
         try:
             # Create LLM client if not provided
@@ -808,9 +963,23 @@ class MemoryService:
                 from app.services.llm import ClaudeMultiAnalyzer
                 llm_client = ClaudeMultiAnalyzer()
             
+            if len(transcripts) > 1:
+                intro = f"Analyze these {len(transcripts)} voice memo transcripts."
+                tag = ', "transcript": 1'
+                numbering = "\nInclude the number of the transcript each memory comes from."
+                text = "\n\n".join(
+                    f"TRANSCRIPT {i}:\n{transcript_text[:max_chars_each]}"
+                    for i, (transcript_text, _) in enumerate(transcripts, 1)
+                )
+            else:
+                intro = "Analyze this voice memo transcript."
+                tag = numbering = ""
+                text = f"TRANSCRIPT:\n{transcripts[0][0][:max_chars_each]}"
+            max_memories = min(10 * len(transcripts), 30)
+            
             # Ask Claude to extract memorable information - comprehensive prompt
             # CRITICAL: Distinguish Aaron's info vs info about OTHER people
-            prompt = f"""Analyze this voice memo transcript. The speaker is AARON (the user).
+            prompt = f"""{intro} The speaker is AARON (the user).
 
 Extract information that helps personalize Aaron's AI assistant. Be VERY CAREFUL:
 
@@ -852,22 +1021,24 @@ CORRECT examples:
 ✅ "Aaron prefers walkable cities over suburban areas"
 ✅ "Aaron met with Felix to discuss his startup idea"
 
-Return JSON array. Max 10 memories. Only extract SPECIFIC, VALUABLE information.
+Return JSON array. Max {max_memories} memories. Only extract SPECIFIC, VALUABLE information.
 
 [
-  {{"type": "fact", "content": "Aaron is based in Ho Chi Minh City for the next month"}},
-  {{"type": "relationship", "content": "Felix is Aaron's friend who co-founded CORTEXO"}},
-  {{"type": "preference", "content": "Aaron prefers morning meetings before 11am"}}
+  {{"type": "fact", "content": "Aaron is based in Ho Chi Minh City for the next month"{tag}}},
+  {{"type": "relationship", "content": "Felix is Aaron's friend who co-founded CORTEXO"{tag}}},
+  {{"type": "preference", "content": "Aaron prefers morning meetings before 11am"{tag}}}
 ]
 
-Return ONLY the JSON array.
+Return ONLY the JSON array.{numbering}
 
-TRANSCRIPT:
-{transcript_text[:6000]}"""
+{text}"""
             
-            response = llm_client.client.messages.create(
+            # Sync Anthropic client: keep the call off the event loop
+            import asyncio
+            response = await asyncio.to_thread(
+                llm_client.client.messages.create,
                 model="claude-haiku-4-5-20251001",
-                max_tokens=2000,
+                max_tokens=min(2000 + 1000 * (len(transcripts) - 1), 6000),
                 messages=[{"role": "user", "content": prompt}]
             )
             
@@ -885,8 +1056,9 @@ TRANSCRIPT:
                 if start >= 0 and end > start:
                     memories = json.loads(result_text[start:end])
             
-            # Store extracted memories - Mem0 handles deduplication
+            # Store extracted memories in one batch - Mem0 handles deduplication
             count = 0
+            items: List[MemoryItem] = []
             type_mapping = {
                 "fact": MemoryType.FACT,
                 "preference": MemoryType.PREFERENCE,
@@ -897,22 +1069,30 @@ TRANSCRIPT:
             for mem in memories:
                 mem_type = mem.get("type", "fact")
                 content = mem.get("content", "")
+                try:
+                    index = int(mem.get("transcript", 1)) - 1
+                except (TypeError, ValueError):
+                    index = 0
+                source_file = transcripts[index if 0 <= index < len(transcripts) else 0][1]
                 
                 # Quality filter - skip very short or empty content
                 if content and len(content) > 15:
-                    await self.add(
-                        content=content,
-                        memory_type=type_mapping.get(mem_type, MemoryType.FACT),
-                        metadata={"source": source_file, "extracted_from": "transcript"},
-                        infer=True,  # Let Mem0 handle deduplication
-                    )
+                    items.append((
+                        content,
+                        type_mapping.get(mem_type, MemoryType.FACT),
+                        {"source": source_file, "extracted_from": "transcript"},
+                    ))
                     count += 1
             
-            logger.info(f"Extracted {count} memories from transcript: {source_file}")
+            # Let Mem0 handle deduplication
+            await self.add_batch(items, infer=True, raise_errors=raise_errors)
+            logger.info(f"Extracted {count} memories from transcript: {sources}")
             return count
             
         except Exception as e:
-            logger.error(f"Failed to extract memories from transcript {source_file}: {e}")
+            logger.error(f"Failed to extract memories from transcript {sources}: {e}")
+            if raise_errors:
+                raise
             return 0
 
     async def extract_from_text(
@@ -920,6 +1100,9 @@ TRANSCRIPT:
         text: str,
         source: str = "chat",
         source_id: Optional[str] = None,
+        max_memories: int = 5,
+        max_chars: int = 3000,
+        raise_errors: bool = False,
     ) -> int:
         """
         Extract memories from arbitrary text (chat messages, etc.).
@@ -931,6 +1114,9 @@ TRANSCRIPT:
             text: The text to extract from
             source: Source identifier (e.g., "beeper", "chat")
             source_id: Optional ID for tracking (e.g., chat_id)
+            max_memories: Most memories to extract (batched texts allow more)
+            max_chars: Characters of text sent to Claude (batched texts allow more)
+            raise_errors: Raise instead of returning 0 when extraction or storage fails
             
         Returns:
             Number of memories extracted
@@ -959,7 +1145,7 @@ RULES:
 4. Skip greetings, small talk, logistics
 5. Never infer facts about Aaron from what others say about themselves
 
-Return JSON array. Max 5 memories. Only specific, valuable info.
+Return JSON array. Max {max_memories} memories. Only specific, valuable info.
 
 Memory types:
 - "fact": Things about Aaron (from Aaron's own statements only)
@@ -977,11 +1163,14 @@ Examples:
 Return ONLY the JSON array, or [] if nothing valuable.
 
 TEXT:
-{text[:3000]}"""
+{text[:max_chars]}"""
             
-            response = llm.client.messages.create(
+            # Sync Anthropic client: keep the call off the event loop
+            import asyncio
+            response = await asyncio.to_thread(
+                llm.client.messages.create,
                 model="claude-haiku-4-5-20251001",
-                max_tokens=500,
+                max_tokens=100 * max_memories,
                 messages=[{"role": "user", "content": prompt}]
             )
             
@@ -1005,6 +1194,7 @@ TEXT:
             }
             
             count = 0
+            items: List[MemoryItem] = []
             for mem in memories:
                 content = mem.get("content", "")
                 mem_type = mem.get("type", "fact")
@@ -1014,19 +1204,17 @@ TEXT:
                     if source_id:
                         metadata["source_id"] = source_id
                     
-                    await self.add(
-                        content=content,
-                        memory_type=type_mapping.get(mem_type, MemoryType.FACT),
-                        metadata=metadata,
-                        infer=True,
-                    )
+                    items.append((content, type_mapping.get(mem_type, MemoryType.FACT), metadata))
                     count += 1
             
+            await self.add_batch(items, infer=True, raise_errors=raise_errors)
             logger.info(f"Extracted {count} memories from {source}")
             return count
             
         except Exception as e:
             logger.error(f"Failed to extract memories from text: {e}")
+            if raise_errors:
+                raise
             return 0
 
     def is_available(self) -> bool:
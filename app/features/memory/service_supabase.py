@@ -2,24 +2,47 @@
 Memory Service - Supabase-Native Implementation
 
 Simple, persistent memory storage using Supabase:
-- Text-based search (no external embeddings needed)
+- Ranked full-text search, optionally fused with pgvector similarity
+  (search_memories_ranked, migrations 032/035; embeddings via MEMORY_EMBEDDINGS)
+- Near-duplicate detection with an in-memory MinHash index (dedup_index.py)
 - Persists across restarts
 - Single database for everything
-- Optional: pgvector for semantic search later
 
 This replaces the Mem0/Qdrant approach with native Supabase.
 """
 
+import asyncio
 import logging
 import os
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from functools import lru_cache
 from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
+from app.features.database import execute_async
+from app.features.memory.dedup_index import MemoryDedupIndex
+
 logger = logging.getLogger("Jarvis.Memory")
 
+# Rows per page when loading the dedup index, and per bulk insert in add_many
+DEDUP_LOAD_PAGE_SIZE = int(os.getenv("MEMORY_DEDUP_LOAD_PAGE_SIZE", "1000"))
+MEMORY_INSERT_BATCH_SIZE = int(os.getenv("MEMORY_INSERT_BATCH_SIZE", "500"))
+# Pull memories written or deleted by other instances into the dedup index
+# at most this often; re-reads DEDUP_REFRESH_OVERLAP behind the last sync
+# to cover clock skew and transactions that committed late
+DEDUP_REFRESH_SECONDS = float(os.getenv("MEMORY_DEDUP_REFRESH_SECONDS", "60"))
+DEDUP_REFRESH_OVERLAP = timedelta(minutes=2)
+# Embed memories on insert and queries on search (pgvector half of
+# search_memories_ranked); costs an OpenAI call per insert batch and query
+MEMORY_EMBEDDINGS = os.getenv("MEMORY_EMBEDDINGS", "false").lower() == "true"
+
+
+def _vector_literal(embedding: List[float]) -> str:
+    """pgvector text format."""
+    return f"[{','.join(map(str, embedding))}]"
+
 
 class MemoryType(Enum):
     """Types of memories stored."""
@@ -46,6 +69,10 @@ class MemoryService:
         self.user_id = os.getenv("JARVIS_USER_ID", "aaron")
         self._db = None
         self._llm = None
+        self._dedup = MemoryDedupIndex()
+        self._dedup_lock: Optional[asyncio.Lock] = None
+        self._dedup_synced_at: Optional[datetime] = None  # DB changes before this are indexed
+        self._dedup_checked = 0.0  # time.monotonic() of the last load/refresh
     
     def _ensure_db(self):
         """Lazy load database client."""
@@ -61,6 +88,110 @@ class MemoryService:
             self._llm = Anthropic()
         return self._llm
     
+    async def _get_dedup_index(self) -> Optional[MemoryDedupIndex]:
+        """
+        Dedup index of all live memories, loaded on first use and refreshed
+        with other instances' changes every DEDUP_REFRESH_SECONDS.
+
+        Returns None if it couldn't be loaded (retried on the next call).
+        """
+        if self._dedup.loaded and time.monotonic() - self._dedup_checked < DEDUP_REFRESH_SECONDS:
+            return self._dedup
+        if self._dedup_lock is None:
+            self._dedup_lock = asyncio.Lock()
+        async with self._dedup_lock:
+            if not self._dedup.loaded:
+                return await self._load_dedup_index()
+            if time.monotonic() - self._dedup_checked >= DEDUP_REFRESH_SECONDS:
+                await self._refresh_dedup_index()
+        return self._dedup
+
+    async def _load_dedup_index(self) -> Optional[MemoryDedupIndex]:
+        db = self._ensure_db()
+        started = datetime.now(timezone.utc)
+        try:
+            rows: List[Dict[str, Any]] = []
+            while True:
+                result = await execute_async(
+                    db.table("memories").select("id, memory")
+                    .eq("user_id", self.user_id)
+                    .is_("deleted_at", "null")
+                    .order("id")
+                    .range(len(rows), len(rows) + DEDUP_LOAD_PAGE_SIZE - 1)
+                )
+                page = result.data or []
+                rows.extend(page)
+                if len(page) < DEDUP_LOAD_PAGE_SIZE:
+                    break
+            # Hashing thousands of memories is CPU-bound; keep it off the loop
+            self._dedup.clear()
+            await asyncio.to_thread(self._dedup.add_many, [(r["id"], r["memory"]) for r in rows])
+            self._dedup.loaded = True
+            self._dedup_synced_at = started
+            self._dedup_checked = time.monotonic()
+            logger.info(f"Loaded memory dedup index ({len(self._dedup)} memories)")
+        except Exception as e:
+            logger.error(f"Failed to load memory dedup index: {e}")
+            return None
+        return self._dedup
+
+    async def _refresh_dedup_index(self) -> None:
+        """Apply memories inserted, updated or soft-deleted since the last sync."""
+        db = self._ensure_db()
+        started = datetime.now(timezone.utc)
+        since = (self._dedup_synced_at - DEDUP_REFRESH_OVERLAP).isoformat()
+        self._dedup_checked = time.monotonic()  # Failed refreshes wait a full interval too
+        try:
+            rows: List[Dict[str, Any]] = []
+            while True:
+                result = await execute_async(
+                    db.table("memories").select("id, memory, deleted_at")
+                    .eq("user_id", self.user_id)
+                    .gte("updated_at", since)
+                    .order("updated_at")
+                    .order("id")
+                    .range(len(rows), len(rows) + DEDUP_LOAD_PAGE_SIZE - 1)
+                )
+                page = result.data or []
+                rows.extend(page)
+                if len(page) < DEDUP_LOAD_PAGE_SIZE:
+                    break
+        except Exception as e:
+            logger.warning(f"Failed to refresh memory dedup index, using it as is: {e}")
+            return
+
+        # Usually a handful of rows: applied on the loop so lookups never see a half-updated index
+        for row in rows:
+            if row.get("deleted_at"):
+                self._dedup.remove(row["id"])
+            else:
+                self._dedup.add(row["id"], row["memory"])
+        self._dedup_synced_at = started
+        if rows:
+            logger.debug(f"Refreshed memory dedup index ({len(rows)} changed memories)")
+
+    def _record(
+        self,
+        memory: str,
+        memory_type: str = "fact",
+        source: str = "manual",
+        source_id: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Row for the memories table."""
+        now = datetime.now(timezone.utc).isoformat()
+        return {
+            "id": str(uuid4()),
+            "memory": memory,
+            "memory_type": memory_type,
+            "user_id": self.user_id,
+            "source": source,
+            "source_id": source_id,
+            "category": category,
+            "created_at": now,
+            "updated_at": now,
+        }
+
     async def add(
         self,
         memory: str,
@@ -82,39 +213,109 @@ class MemoryService:
             metadata: Extra data (stored in memory text as context)
             
         Returns:
-            Memory ID if successful
+            Memory ID if successful (the existing ID if it's a duplicate)
         """
-        db = self._ensure_db()
-        
-        # Check for duplicate/similar memory
-        existing = await self.search(memory, limit=3)
-        for mem in existing:
-            # Simple similarity check - if very similar, skip
-            if self._is_similar(memory, mem.get("memory", "")):
-                logger.debug(f"Skipping duplicate memory: {memory[:50]}...")
-                return mem.get("id")
-        
-        mem_id = str(uuid4())
-        record = {
-            "id": mem_id,
+        ids = await self.add_many([{
             "memory": memory,
             "memory_type": memory_type,
-            "user_id": self.user_id,
             "source": source,
             "source_id": source_id,
             "category": category,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat(),
-        }
-        
+        }])
+        return ids[0]
+
+    async def add_many(self, memories: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """
+        Add many memories with one dedup pass and bulk inserts.
+
+        Each memory is checked against the dedup index, which includes the
+        memories earlier in the same batch, so duplicates within the batch
+        are dropped too. New memories are inserted MEMORY_INSERT_BATCH_SIZE
+        rows per call.
+
+        Args:
+            memories: Dicts with "memory" and optionally memory_type, source,
+                source_id, category (same meaning as in add())
+
+        Returns:
+            One ID per input: the new ID, the existing ID for a duplicate,
+            or None if it was empty or its insert failed
+        """
+        db = self._ensure_db()
+        index = await self._get_dedup_index()
+
+        ids: List[Optional[str]] = []
+        records: List[Dict[str, Any]] = []
+        for mem in memories:
+            text = (mem.get("memory") or "").strip()
+            if not text:
+                ids.append(None)
+                continue
+            if index is not None:
+                existing_id = index.find_duplicate(text)
+                if existing_id is not None:
+                    logger.debug(f"Skipping duplicate memory: {text[:50]}...")
+                    ids.append(existing_id)
+                    continue
+            else:
+                existing_id = await self._find_similar(text)
+                if existing_id is not None:
+                    ids.append(existing_id)
+                    continue
+
+            record = self._record(
+                memory=text,
+                memory_type=mem.get("memory_type") or "fact",
+                source=mem.get("source") or "manual",
+                source_id=mem.get("source_id"),
+                category=mem.get("category"),
+            )
+            # Indexed before the insert so concurrent adds see it as a duplicate
+            if index is not None:
+                index.add(record["id"], text)
+            records.append(record)
+            ids.append(record["id"])
+
+        if records and MEMORY_EMBEDDINGS:
+            await self._attach_embeddings(records)
+
+        failed: set = set()
+        for i in range(0, len(records), max(1, MEMORY_INSERT_BATCH_SIZE)):
+            chunk = records[i:i + MEMORY_INSERT_BATCH_SIZE]
+            try:
+                await execute_async(db.table("memories").insert(chunk))
+            except Exception as e:
+                logger.error(f"Failed to add {len(chunk)} memories: {e}")
+                for record in chunk:
+                    failed.add(record["id"])
+                    if index is not None:
+                        index.remove(record["id"])
+
+        added = len(records) - len(failed)
+        if added == 1:
+            record = next(r for r in records if r["id"] not in failed)
+            logger.info(f"Added memory [{record['memory_type']}]: {record['memory'][:50]}...")
+        elif added:
+            logger.info(f"Added {added} memories ({len(memories) - len(records)} duplicates/empty skipped)")
+        return [None if mem_id in failed else mem_id for mem_id in ids]
+
+    async def _attach_embeddings(self, records: List[Dict[str, Any]]) -> None:
+        """Embed new memories in one batched call; on failure they're stored without."""
         try:
-            db.table("memories").insert(record).execute()
-            logger.info(f"Added memory [{memory_type}]: {memory[:50]}...")
-            return mem_id
+            from app.features.knowledge.embeddings import get_embeddings
+            embeddings = await get_embeddings([r["memory"] for r in records])
+            for record, embedding in zip(records, embeddings):
+                record["embedding"] = _vector_literal(embedding)
         except Exception as e:
-            logger.error(f"Failed to add memory: {e}")
-            return None
-    
+            logger.warning(f"Memory embedding failed, storing {len(records)} memories without: {e}")
+
+    async def _find_similar(self, memory: str) -> Optional[str]:
+        """Fallback duplicate check against the database (dedup index unavailable)."""
+        for mem in await self.search(memory, limit=3):
+            if self._is_similar(memory, mem.get("memory", "")):
+                return mem.get("id")
+        return None
+
     def _is_similar(self, text1: str, text2: str, threshold: float = 0.85) -> bool:
         """Check if two texts are very similar (simple word overlap)."""
         words1 = set(text1.lower().split())
@@ -130,16 +331,66 @@ class MemoryService:
         limit: int = 10,
         memory_type: Optional[str] = None,
         source: Optional[str] = None,
+        offset: int = 0,
     ) -> List[Dict[str, Any]]:
         """
-        Search memories by text.
+        Search memories by relevance.
         
-        Uses PostgreSQL full-text search for relevance ranking.
+        Uses search_memories_ranked (migrations 032, 035): memories
+        containing every query word rank first, then those containing some,
+        fused with vector similarity when MEMORY_EMBEDDINGS is on. Falls back to ILIKE matching if the RPC isn't available.
+        
+        Args:
+            query: Search text
+            limit: Page size
+            memory_type: Only this type
+            source: Only this source
+            offset: Results to skip (page * limit)
+            
+        Returns:
+            Memories, best first, with "score"
         """
+        if not query or not query.strip():
+            return await self.get_all(limit=limit, memory_type=memory_type, offset=offset)
+        
+        db = self._ensure_db()
+        
+        query_embedding = None
+        if MEMORY_EMBEDDINGS:
+            try:
+                from app.features.knowledge.retriever import get_query_embedding
+                query_embedding = _vector_literal(await get_query_embedding(query))
+            except Exception as e:
+                logger.warning(f"Memory query embedding failed, using full-text only: {e}")
+        
+        try:
+            result = await execute_async(db.rpc("search_memories_ranked", {
+                "query_text": query,
+                "query_embedding": query_embedding,
+                "match_count": limit,
+                "match_offset": offset,
+                "filter_user_id": self.user_id,
+                "filter_memory_type": memory_type,
+                "filter_source": source,
+            }))
+            return result.data or []
+        except Exception as e:
+            logger.warning(f"Ranked memory search failed, falling back to ILIKE: {e}")
+        
+        return await self._search_ilike(query, limit, memory_type, source, offset)
+    
+    async def _search_ilike(
+        self,
+        query: str,
+        limit: int,
+        memory_type: Optional[str],
+        source: Optional[str],
+        offset: int,
+    ) -> List[Dict[str, Any]]:
+        """Unranked substring search (used when search_memories_ranked is missing)."""
         db = self._ensure_db()
         
         try:
-            # Build query with filters
             q = db.table("memories").select("*").is_("deleted_at", "null")
             
             if memory_type:
@@ -147,13 +398,12 @@ class MemoryService:
             if source:
                 q = q.eq("source", source)
             
-            # Text search using ILIKE (simple but effective)
-            # For better results, use the search_memories_text function
             words = query.lower().split()
             for word in words[:3]:  # Limit to first 3 words for performance
-                q = q.ilike("memory", f"%{word}%")
+                sanitized = word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                q = q.ilike("memory", f"%{sanitized}%")
             
-            result = q.order("created_at", desc=True).limit(limit).execute()
+            result = await execute_async(q.order("created_at", desc=True).range(offset, offset + limit - 1))
             return result.data or []
             
         except Exception as e:
@@ -164,6 +414,7 @@ class MemoryService:
         self,
         limit: int = 100,
         memory_type: Optional[str] = None,
+        offset: int = 0,
     ) -> List[Dict[str, Any]]:
         """Get all memories."""
         db = self._ensure_db()
@@ -174,7 +425,7 @@ class MemoryService:
             if memory_type:
                 q = q.eq("memory_type", memory_type)
             
-            result = q.order("created_at", desc=True).limit(limit).execute()
+            result = await execute_async(q.order("created_at", desc=True).range(offset, offset + limit - 1))
             return result.data or []
             
         except Exception as e:
@@ -186,9 +437,11 @@ class MemoryService:
         db = self._ensure_db()
         
         try:
-            db.table("memories").update({
+            await execute_async(db.table("memories").update({
                 "deleted_at": datetime.now(timezone.utc).isoformat()
-            }).eq("id", memory_id).execute()
+            }).eq("id", memory_id))
+            if self._dedup.loaded:
+                self._dedup.remove(memory_id)
             logger.info(f"Deleted memory: {memory_id}")
             return True
         except Exception as e:
@@ -200,10 +453,15 @@ class MemoryService:
         db = self._ensure_db()
         
         try:
-            db.table("memories").update({
+            changes = {
                 "memory": new_memory,
                 "updated_at": datetime.now(timezone.utc).isoformat()
-            }).eq("id", memory_id).execute()
+            }
+            if MEMORY_EMBEDDINGS:
+                await self._attach_embeddings([changes])
+            await execute_async(db.table("memories").update(changes).eq("id", memory_id))
+            if self._dedup.loaded:
+                self._dedup.add(memory_id, new_memory)
             logger.info(f"Updated memory: {memory_id}")
             return True
         except Exception as e:
@@ -267,20 +525,16 @@ Output ONLY the JSON array, nothing else."""
                     result_text = result_text[4:]
             
             memories = json.loads(result_text)
-            count = 0
-            
-            for mem in memories:
-                mem_type = mem.get("type", "fact")
-                mem_text = mem.get("memory", "")
-                
-                if mem_text:
-                    await self.add(
-                        memory=mem_text,
-                        memory_type=mem_type,
-                        source=source,
-                        source_id=source_id,
-                    )
-                    count += 1
+            ids = await self.add_many([
+                {
+                    "memory": mem.get("memory", ""),
+                    "memory_type": mem.get("type", "fact"),
+                    "source": source,
+                    "source_id": source_id,
+                }
+                for mem in memories
+            ])
+            count = sum(1 for mem_id in ids if mem_id)
             
             logger.info(f"Extracted {count} memories from {source}")
             return count
@@ -316,7 +570,7 @@ Output ONLY the JSON array, nothing else."""
         """Get total memory count."""
         db = self._ensure_db()
         try:
-            result = db.table("memories").select("id", count="exact").is_("deleted_at", "null").execute()
+            result = await execute_async(db.table("memories").select("id", count="exact").is_("deleted_at", "null"))
             return result.count or 0
         except:
             return 0
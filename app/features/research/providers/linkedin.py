@@ -26,7 +26,7 @@ from datetime import datetime, timezone
 from urllib.parse import quote
 
 from .base import BaseProvider, ProviderResult, ProviderStatus
-from app.services.http_client import http_client_manager
+from app.services.http_client import ScopedClient, http_client_manager
 
 logger = logging.getLogger("Jarvis.Research.LinkedIn")
 
@@ -84,8 +84,6 @@ class LinkedInProvider(BaseProvider):
     
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or BRIGHTDATA_API_KEY
-        # Note: Don't cache httpx.AsyncClient - it's tied to an event loop
-        # and causes "Event loop is closed" errors when used across threads
     
     @property
     def name(self) -> str:
@@ -96,9 +94,9 @@ class LinkedInProvider(BaseProvider):
         """Check if API key is configured."""
         return bool(self.api_key)
     
-    def _create_client(self) -> httpx.AsyncClient:
-        """Create a new HTTP client (fresh for each request, shared pool limits)."""
-        return http_client_manager.create_client(
+    def _create_client(self) -> ScopedClient:
+        """API headers/timeout over the shared pooled client (tools run on the main loop)."""
+        return http_client_manager.scoped_client(
             timeout=60.0,
             headers={
                 "Authorization": f"Bearer {self.api_key}",
@@ -493,7 +491,7 @@ class LinkedInProvider(BaseProvider):
             _brave_last_request = time.time()
         
         try:
-            client = http_client_manager.create_client(
+            client = http_client_manager.scoped_client(
                 timeout=30.0,
                 headers={
                     "Accept": "application/json",
@@ -18,7 +18,7 @@ import httpx
 from typing import Any, Dict, List, Optional
 
 from .base import BaseProvider, ProviderResult, ProviderStatus
-from app.services.http_client import http_client_manager
+from app.services.http_client import ScopedClient, http_client_manager
 
 logger = logging.getLogger("Jarvis.Research.WebSearch")
 
@@ -56,8 +56,6 @@ class WebSearchProvider(BaseProvider):
     
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or BRAVE_API_KEY
-        # Note: Don't cache httpx.AsyncClient - it's tied to an event loop
-        # and causes "Event loop is closed" errors when used across threads
     
     @property
     def name(self) -> str:
@@ -78,9 +76,9 @@ class WebSearchProvider(BaseProvider):
                 await asyncio.sleep(1.0 - elapsed)
             _last_request_time = time.time()
     
-    def _create_client(self) -> httpx.AsyncClient:
-        """Create a new HTTP client (fresh for each request, shared pool limits)."""
-        return http_client_manager.create_client(
+    def _create_client(self) -> ScopedClient:
+        """API headers/timeout over the shared pooled client (tools run on the main loop)."""
+        return http_client_manager.scoped_client(
             timeout=30.0,
             headers={
                 "X-Subscription-Token": self.api_key,
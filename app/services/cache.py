@@ -0,0 +1,398 @@
+"""
+Cache - bounded LRU+TTL in-process cache with an optional shared tier.
+
+Two tiers per namespace:
+1. Local: an O(1) LRU with per-entry TTL (OrderedDict). Always on.
+2. Shared (optional, CACHE_SHARED_BACKEND): visible to every worker and
+   instance, so a memory search done by one Cloud Run instance is a hit on
+   the others.
+   - "supabase": the cache_entries table (migration 030)
+   - "redis": any Redis-compatible server at CACHE_REDIS_URL (needs the
+     redis package; falls back to local-only without it)
+
+Reads check local first, then shared (filling local on a hit). Writes go to
+both; the shared write is not awaited. Shared-tier errors and timeouts are
+logged and treated as misses - the cache never fails a request.
+
+Invalidation:
+- delete(key) removes one key from both tiers
+- clear() bumps the namespace generation in the shared tier (shared keys
+  embed it, so old entries are never read again) and clears the local tier.
+  Other instances notice the new generation within
+  CACHE_GENERATION_POLL_SECONDS and drop their local entries.
+
+Usage:
+    from app.services.cache import get_cache
+
+    cache = get_cache("memory_search", maxsize=256, ttl=60)
+    hit = await cache.get(key)
+    if hit is None:
+        hit = await expensive()
+        await cache.set(key, hit)
+
+    await cache.clear()  # e.g. after a memory write
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Hashable, Optional, Set
+
+logger = logging.getLogger("Jarvis.Services.Cache")
+
+CACHE_SHARED_BACKEND = os.getenv("CACHE_SHARED_BACKEND", "").lower()  # "", "supabase" or "redis"
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+CACHE_SHARED_TIMEOUT_SECONDS = float(os.getenv("CACHE_SHARED_TIMEOUT_SECONDS", "0.5"))
+CACHE_GENERATION_POLL_SECONDS = float(os.getenv("CACHE_GENERATION_POLL_SECONDS", "5"))
+CACHE_KEY_PREFIX = "jarvis"
+
+_MISSING = object()
+
+
+# ==================== LOCAL TIER ====================
+
+class LRUTTLCache:
+    """
+    Thread-safe LRU cache with a per-entry TTL.
+
+    get/set/delete are O(1): entries live in an OrderedDict in recency
+    order, so eviction pops the oldest and expired entries are dropped
+    lazily when read.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry[0] <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / total, 3) if total else None,
+        }
+
+
+# ==================== SHARED TIER ====================
+
+class SharedCacheBackend:
+    """
+    Blocking key/value store shared across processes.
+
+    Values are JSON strings. Methods are called on the DB thread pool and
+    may raise; TieredCache handles errors.
+    """
+
+    name = "none"
+
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def incr(self, key: str) -> int:
+        """Atomically increment a counter (namespace generations) and return it."""
+        raise NotImplementedError
+
+    def get_counter(self, key: str) -> int:
+        value = self.get(key)
+        return int(value) if value else 0
+
+    def purge_expired(self) -> int:
+        """Delete expired entries (backends without native expiry)."""
+        return 0
+
+
+class SupabaseCacheBackend(SharedCacheBackend):
+    """cache_entries table (migration 030)."""
+
+    name = "supabase"
+    TABLE = "cache_entries"
+
+    def __init__(self):
+        from app.core.database import supabase
+        self.client = supabase
+
+    def get(self, key: str) -> Optional[str]:
+        now = datetime.now(timezone.utc).isoformat()
+        result = self.client.table(self.TABLE).select("value").eq("key", key).gt(
+            "expires_at", now
+        ).limit(1).execute()
+        if not result.data:
+            return None
+        return json.dumps(result.data[0]["value"])
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        expires_at = (datetime.now(timezone.utc) + timedelta(seconds=ttl)).isoformat()
+        self.client.table(self.TABLE).upsert({
+            "key": key,
+            "value": json.loads(value),
+            "expires_at": expires_at,
+        }).execute()
+
+    def delete(self, key: str) -> None:
+        self.client.table(self.TABLE).delete().eq("key", key).execute()
+
+    def incr(self, key: str) -> int:
+        result = self.client.rpc("cache_incr", {"p_key": key}).execute()
+        return int(result.data)
+
+    def purge_expired(self) -> int:
+        result = self.client.rpc("purge_expired_cache_entries", {}).execute()
+        return int(result.data or 0)
+
+
+class RedisCacheBackend(SharedCacheBackend):
+    """Redis-compatible server (Redis, Valkey, Dragonfly, Memorystore)."""
+
+    name = "redis"
+
+    def __init__(self, url: str):
+        import redis
+        self.client = redis.Redis.from_url(url, socket_timeout=CACHE_SHARED_TIMEOUT_SECONDS)
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(key)
+        return value.decode() if value is not None else None
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        self.client.set(key, value, px=max(int(ttl * 1000), 1))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(key)
+
+    def incr(self, key: str) -> int:
+        return int(self.client.incr(key))
+
+
+_shared_backend: Optional[SharedCacheBackend] = None
+_shared_backend_loaded = False
+
+
+def get_shared_backend() -> Optional[SharedCacheBackend]:
+    """The configured shared tier, or None for local-only caching."""
+    global _shared_backend, _shared_backend_loaded
+    if not _shared_backend_loaded:
+        _shared_backend_loaded = True
+        try:
+            if CACHE_SHARED_BACKEND == "supabase":
+                _shared_backend = SupabaseCacheBackend()
+            elif CACHE_SHARED_BACKEND == "redis":
+                _shared_backend = RedisCacheBackend(CACHE_REDIS_URL)
+            elif CACHE_SHARED_BACKEND:
+                logger.warning(f"Unknown CACHE_SHARED_BACKEND '{CACHE_SHARED_BACKEND}', caching locally only")
+        except Exception as e:
+            logger.warning(f"Shared cache backend '{CACHE_SHARED_BACKEND}' unavailable, caching locally only: {e}")
+            _shared_backend = None
+        if _shared_backend:
+            logger.info(f"Shared cache tier: {_shared_backend.name}")
+    return _shared_backend
+
+
+# ==================== TIERED CACHE ====================
+
+class TieredCache:
+    """One cache namespace: local LRU+TTL in front of the optional shared tier."""
+
+    def __init__(self, namespace: str, maxsize: int, ttl: float, shared: bool = True):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.local = LRUTTLCache(maxsize=maxsize, ttl=ttl)
+        self._use_shared = shared
+        self._generation = 0
+        self._generation_checked_at = 0.0
+        self._pending_writes: Set[asyncio.Task] = set()
+        self.shared_hits = 0
+        self.shared_errors = 0
+
+    @property
+    def shared(self) -> Optional[SharedCacheBackend]:
+        return get_shared_backend() if self._use_shared else None
+
+    def _shared_key(self, key: str) -> str:
+        return f"{CACHE_KEY_PREFIX}:{self.namespace}:{self._generation}:{key}"
+
+    def _generation_key(self) -> str:
+        return f"{CACHE_KEY_PREFIX}:{self.namespace}:generation"
+
+    async def _shared_call(self, fn, *args) -> Any:
+        """Run a blocking shared-tier call with a timeout; _MISSING on failure."""
+        from app.features.database import get_async_database
+        try:
+            return await asyncio.wait_for(
+                get_async_database().run(fn, *args),
+                timeout=CACHE_SHARED_TIMEOUT_SECONDS
+            )
+        except Exception as e:
+            self.shared_errors += 1
+            logger.debug(f"Shared cache call failed [{self.namespace}]: {e!r}")
+            return _MISSING
+
+    async def _sync_generation(self, shared: SharedCacheBackend) -> None:
+        """Pick up clear() calls made by other instances."""
+        now = time.monotonic()
+        if now - self._generation_checked_at < CACHE_GENERATION_POLL_SECONDS:
+            return
+        self._generation_checked_at = now
+        generation = await self._shared_call(shared.get_counter, self._generation_key())
+        if generation is not _MISSING and generation != self._generation:
+            self._generation = generation
+            self.local.clear()
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        """Cached value for key, or default on a miss."""
+        shared = self.shared
+        if shared is not None:
+            await self._sync_generation(shared)
+
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if shared is None:
+            return default
+
+        raw = await self._shared_call(shared.get, self._shared_key(key))
+        if raw is _MISSING or raw is None:
+            return default
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            return default
+        self.shared_hits += 1
+        self.local.set(key, value)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value (must be JSON-serializable when a shared tier is configured)."""
+        self.local.set(key, value, ttl)
+        shared = self.shared
+        if shared is None:
+            return
+        try:
+            raw = json.dumps(value, default=str)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Not caching unserializable value in shared tier [{self.namespace}]: {e}")
+            return
+        task = asyncio.create_task(
+            self._shared_call(shared.set, self._shared_key(key), raw, self.ttl if ttl is None else ttl)
+        )
+        self._pending_writes.add(task)
+        task.add_done_callback(self._pending_writes.discard)
+
+    async def delete(self, key: str) -> None:
+        """Remove one key from both tiers."""
+        self.local.delete(key)
+        shared = self.shared
+        if shared is not None:
+            await self._shared_call(shared.delete, self._shared_key(key))
+
+    async def clear(self) -> None:
+        """Invalidate the whole namespace on every instance."""
+        self.local.clear()
+        shared = self.shared
+        if shared is None:
+            return
+        generation = await self._shared_call(shared.incr, self._generation_key())
+        if generation is not _MISSING:
+            self._generation = generation
+            self._generation_checked_at = time.monotonic()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.local.get_stats()
+        stats.update({
+            "shared_backend": self.shared.name if self.shared else None,
+            "shared_hits": self.shared_hits,
+            "shared_errors": self.shared_errors,
+            "generation": self._generation,
+        })
+        return stats
+
+
+async def purge_expired_shared_entries() -> int:
+    """Delete expired shared-tier entries; returns how many were removed."""
+    from app.features.database import get_async_database
+
+    shared = get_shared_backend()
+    if shared is None:
+        return 0
+    return await get_async_database().run(shared.purge_expired)
+
+
+_caches: Dict[str, TieredCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(namespace: str, maxsize: int = 128, ttl: float = 60.0, shared: bool = True) -> TieredCache:
+    """
+    Get (or create) the cache for a namespace.
+
+    Args:
+        namespace: Cache name, also the shared-tier key prefix
+        maxsize: Max entries in the local tier
+        ttl: Default entry lifetime in seconds
+        shared: Use the shared tier when one is configured
+
+    The first call for a namespace fixes its settings.
+    """
+    with _caches_lock:
+        cache = _caches.get(namespace)
+        if cache is None:
+            cache = _caches[namespace] = TieredCache(namespace, maxsize, ttl, shared)
+        return cache
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every cache namespace."""
+    return {name: cache.get_stats() for name, cache in list(_caches.items())}
@@ -22,6 +22,10 @@ Usage:
     async with http_client_manager.get_client_context(timeout=60.0) as client:
         response = await client.get("https://slow-api.example.com")
 
+    # Per-API headers/timeout on top of the shared pool (no new connections)
+    async with http_client_manager.scoped_client(timeout=60.0, headers=auth) as client:
+        response = await client.post(url, json=payload)
+
 Lifecycle:
     # In main.py lifespan
     @asynccontextmanager
@@ -40,6 +44,56 @@ import httpx
 logger = logging.getLogger("Jarvis.HTTP.Client")
 
 
+class ScopedClient:
+    """
+    Default headers/timeout layered over the shared pooled client.
+
+    Quacks like the httpx.AsyncClient request methods, and supports
+    `async with` so it drops into code written for a per-request client,
+    but closing it leaves the shared connections open for reuse.
+    """
+
+    def __init__(
+        self,
+        manager: "HTTPClientManager",
+        timeout: Optional[float] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self._manager = manager
+        self._timeout = httpx.Timeout(timeout) if timeout else None
+        self._headers = headers or {}
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        client = await self._manager.get_client()
+        if self._headers:
+            kwargs["headers"] = {**self._headers, **(kwargs.get("headers") or {})}
+        if self._timeout is not None:
+            kwargs.setdefault("timeout", self._timeout)
+        return await client.request(method, url, **kwargs)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    async def __aenter__(self) -> "ScopedClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        # The pool belongs to the manager
+        return None
+
+
 class HTTPClientManager:
     """
     Manages shared httpx.AsyncClient instances with connection pooling.
@@ -216,6 +270,19 @@ class HTTPClientManager:
 
         return httpx.AsyncClient(**client_kwargs)
 
+    def scoped_client(
+        self,
+        timeout: Optional[float] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> ScopedClient:
+        """
+        Get a view of the shared client with its own headers and timeout.
+
+        Unlike create_client, requests reuse the shared keep-alive pool.
+        Must be used from the event loop that owns the shared client.
+        """
+        return ScopedClient(self, timeout=timeout, headers=headers)
+
     @property
     def is_initialized(self) -> bool:
         """Check if the client manager has been initialized."""
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import uuid
 from contextlib import asynccontextmanager
@@ -118,17 +119,51 @@ async def lifespan(app: FastAPI):
 
     Handles:
     - HTTP client pool initialization and cleanup
+    - Chat context snapshot warm-up (in the background) and cleanup
+    - Flushing write-behind queues (buffered chat messages)
+    - Draining the background memory extraction queue
+    - Resuming orphaned memory seeding jobs, releasing ours on shutdown
+    - Async database and Mem0 thread pool cleanup
     """
     # Startup: Initialize HTTP client pool
     logger.info("Starting HTTP client pool")
     await http_client_manager.startup()
 
+    # Precompute chat context blocks so the first chat turn doesn't build them
+    from app.features.chat.context_snapshot import get_context_snapshot
+    from app.features.chat.service import get_chat_service
+    get_chat_service()
+    snapshot_warmup = asyncio.create_task(get_context_snapshot().warm())
+
+    # Pick up seeding jobs left behind by a restarted instance
+    from app.features.memory.seeding import get_seeding_runner
+    get_seeding_runner().start()
+
     yield
 
+    snapshot_warmup.cancel()
+    await get_context_snapshot().close()
+
+    # Checkpoint running seeding jobs so the next instance resumes them
+    await get_seeding_runner().close()
+
+    # Extract queued memories, then write buffered chat messages, before the DB pool goes away
+    from app.features.memory import get_memory_extraction_queue
+    await get_memory_extraction_queue().close()
+
+    from app.features.database import close_write_queues
+    await close_write_queues()
+
     # Shutdown: Clean up HTTP client pool
     logger.info("Shutting down HTTP client pool")
     await http_client_manager.shutdown()
 
+    from app.features.database import get_async_database
+    get_async_database().shutdown()
+
+    from app.features.memory.mem0_adapter import shutdown_mem0_executor
+    shutdown_mem0_executor()
+
 
 app = FastAPI(
     title="Jarvis Intelligence Service",
@@ -0,0 +1,141 @@
+-- Migration: Full-text + trigram search for knowledge_chunks
+-- Backs the keyword half of hybrid search (retriever.hybrid_search).
+-- Replaces the unindexed ILIKE '%query%' scan with a GIN-indexed tsvector
+-- and BM25 scoring; a trigram index keeps the ILIKE fallback fast.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Generated tsvector column ('english' drops stop words like "what did ... the")
+ALTER TABLE knowledge_chunks
+    ADD COLUMN IF NOT EXISTS content_tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, ''))) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_knowledge_chunks_content_tsv
+    ON knowledge_chunks USING gin (content_tsv)
+    WHERE deleted_at IS NULL;
+
+-- Trigram index for substring / fuzzy name matching (ILIKE fallback)
+CREATE INDEX IF NOT EXISTS idx_knowledge_chunks_content_trgm
+    ON knowledge_chunks USING gin (content gin_trgm_ops)
+    WHERE deleted_at IS NULL;
+
+-- Corpus statistics for BM25 (document count, average length, per-term
+-- document frequency). Refreshed after reindexing via
+-- refresh_knowledge_fts_stats(); slightly stale stats only nudge IDF.
+CREATE MATERIALIZED VIEW IF NOT EXISTS knowledge_fts_stats AS
+SELECT
+    1 AS id,
+    COUNT(*)::float AS total_docs,
+    COALESCE(AVG(length(content_tsv)), 1)::float AS avg_doc_len
+FROM knowledge_chunks
+WHERE deleted_at IS NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_knowledge_fts_stats_id
+    ON knowledge_fts_stats(id);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS knowledge_term_stats AS
+SELECT word, ndoc
+FROM ts_stat('SELECT content_tsv FROM knowledge_chunks WHERE deleted_at IS NULL');
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_knowledge_term_stats_word
+    ON knowledge_term_stats(word);
+
+CREATE OR REPLACE FUNCTION refresh_knowledge_fts_stats()
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    REFRESH MATERIALIZED VIEW CONCURRENTLY knowledge_fts_stats;
+    REFRESH MATERIALIZED VIEW CONCURRENTLY knowledge_term_stats;
+END;
+$$;
+
+COMMENT ON FUNCTION refresh_knowledge_fts_stats IS 'Recompute BM25 corpus statistics for knowledge_chunks';
+
+-- BM25 keyword search.
+-- Query terms are OR-ed (any term can match), candidates are pulled via the
+-- GIN index and pre-ranked with ts_rank_cd, then scored with Okapi BM25:
+--   idf(t) * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len / avg_len))
+-- tf comes from tsvector positions; len is the lexeme count.
+CREATE OR REPLACE FUNCTION search_knowledge_chunks_bm25(
+    query_text text,
+    match_count int DEFAULT 10,
+    filter_source_types text[] DEFAULT NULL,
+    filter_contact_id text DEFAULT NULL,
+    k1 float DEFAULT 1.2,
+    b float DEFAULT 0.75
+)
+RETURNS TABLE (
+    id uuid,
+    source_type text,
+    source_id uuid,
+    chunk_index int,
+    content text,
+    metadata jsonb,
+    score float
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH terms AS (
+        SELECT DISTINCT t.lexeme
+        FROM unnest(to_tsvector('english', query_text)) AS t
+    ),
+    tsq AS (
+        SELECT string_agg(quote_literal(lexeme), ' | ')::tsquery AS query
+        FROM terms
+    ),
+    corpus AS (
+        SELECT
+            COALESCE((SELECT total_docs FROM knowledge_fts_stats), 1) AS total_docs,
+            COALESCE((SELECT avg_doc_len FROM knowledge_fts_stats), 1) AS avg_doc_len
+    ),
+    idf AS (
+        SELECT
+            terms.lexeme,
+            ln(1 + (corpus.total_docs - COALESCE(ts.ndoc, 0) + 0.5) / (COALESCE(ts.ndoc, 0) + 0.5)) AS idf
+        FROM terms
+        CROSS JOIN corpus
+        LEFT JOIN knowledge_term_stats ts ON ts.word = terms.lexeme
+    ),
+    candidates AS (
+        SELECT kc.id, kc.source_type, kc.source_id, kc.chunk_index,
+               kc.content, kc.metadata, kc.content_tsv
+        FROM knowledge_chunks kc, tsq
+        WHERE
+            kc.deleted_at IS NULL
+            AND kc.content_tsv @@ tsq.query
+            AND (filter_source_types IS NULL OR kc.source_type = ANY(filter_source_types))
+            AND (filter_contact_id IS NULL OR kc.metadata->>'contact_id' = filter_contact_id)
+        ORDER BY ts_rank_cd(kc.content_tsv, tsq.query) DESC
+        LIMIT GREATEST(match_count * 10, 100)
+    ),
+    doc_terms AS (
+        SELECT
+            c.id,
+            d.lexeme,
+            COALESCE(array_length(d.positions, 1), 1)::float AS tf,
+            length(c.content_tsv)::float AS doc_len
+        FROM candidates c, unnest(c.content_tsv) AS d
+        WHERE d.lexeme IN (SELECT lexeme FROM terms)
+    ),
+    scored AS (
+        SELECT
+            dt.id,
+            SUM(
+                idf.idf * dt.tf * (k1 + 1)
+                / (dt.tf + k1 * (1 - b + b * dt.doc_len / GREATEST(corpus.avg_doc_len, 1)))
+            ) AS score
+        FROM doc_terms dt
+        JOIN idf ON idf.lexeme = dt.lexeme
+        CROSS JOIN corpus
+        GROUP BY dt.id
+    )
+    SELECT c.id, c.source_type, c.source_id, c.chunk_index, c.content, c.metadata, s.score
+    FROM scored s
+    JOIN candidates c ON c.id = s.id
+    ORDER BY s.score DESC
+    LIMIT match_count;
+$$;
+
+COMMENT ON FUNCTION search_knowledge_chunks_bm25 IS 'BM25-ranked full-text search over knowledge_chunks with filtering';
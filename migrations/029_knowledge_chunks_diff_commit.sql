@@ -0,0 +1,98 @@
+-- Migration: Transactional chunk diffs + compaction for knowledge_chunks
+--
+-- Re-indexing a source stages its new/changed chunks first: they are
+-- inserted with deleted_at = '1970-01-01' (the "staged" sentinel), so every
+-- existing `deleted_at IS NULL` filter already hides them. Once all of a
+-- source's staged rows are embedded and written, one call to
+-- commit_knowledge_chunk_diff() publishes them, retires the stale chunks and
+-- applies metadata changes in a single transaction. A failure mid-way leaves
+-- the previous chunks fully searchable; orphaned staged rows are purged by
+-- purge_deleted_knowledge_chunks().
+
+CREATE OR REPLACE FUNCTION commit_knowledge_chunk_diff(
+    p_staged_ids uuid[] DEFAULT '{}',
+    p_stale_ids uuid[] DEFAULT '{}',
+    p_metadata_updates jsonb DEFAULT '[]'
+)
+RETURNS TABLE (
+    published int,
+    retired int,
+    updated int
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_published int := 0;
+    v_retired int := 0;
+    v_updated int := 0;
+BEGIN
+    UPDATE knowledge_chunks
+    SET deleted_at = NULL
+    WHERE id = ANY(p_staged_ids)
+      AND deleted_at = '1970-01-01T00:00:00Z'::timestamptz;
+    GET DIAGNOSTICS v_published = ROW_COUNT;
+
+    IF v_published <> COALESCE(array_length(p_staged_ids, 1), 0) THEN
+        RAISE EXCEPTION 'Staged chunks missing: expected %, found %',
+            COALESCE(array_length(p_staged_ids, 1), 0), v_published;
+    END IF;
+
+    UPDATE knowledge_chunks
+    SET deleted_at = NOW()
+    WHERE id = ANY(p_stale_ids)
+      AND deleted_at IS NULL;
+    GET DIAGNOSTICS v_retired = ROW_COUNT;
+
+    UPDATE knowledge_chunks kc
+    SET metadata = u.metadata
+    FROM jsonb_to_recordset(p_metadata_updates) AS u(id uuid, metadata jsonb)
+    WHERE kc.id = u.id
+      AND kc.deleted_at IS NULL;
+    GET DIAGNOSTICS v_updated = ROW_COUNT;
+
+    RETURN QUERY SELECT v_published, v_retired, v_updated;
+END;
+$$;
+
+COMMENT ON FUNCTION commit_knowledge_chunk_diff IS 'Atomically publish staged chunks, retire stale ones and update metadata for one source';
+
+-- Hard-delete soft-deleted chunks (and staged rows abandoned by failed runs)
+-- older than the retention window, in batches to keep locks short.
+CREATE OR REPLACE FUNCTION purge_deleted_knowledge_chunks(
+    older_than interval DEFAULT '7 days',
+    batch_size int DEFAULT 5000,
+    max_batches int DEFAULT 100
+)
+RETURNS int
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_total int := 0;
+    v_batch int;
+    v_cutoff timestamptz := NOW() - older_than;
+BEGIN
+    FOR i IN 1..max_batches LOOP
+        DELETE FROM knowledge_chunks
+        WHERE id IN (
+            SELECT id FROM knowledge_chunks
+            WHERE deleted_at IS NOT NULL
+              AND (
+                  (deleted_at <> '1970-01-01T00:00:00Z'::timestamptz AND deleted_at < v_cutoff)
+                  OR (deleted_at = '1970-01-01T00:00:00Z'::timestamptz AND created_at < v_cutoff)
+              )
+            LIMIT batch_size
+        );
+        GET DIAGNOSTICS v_batch = ROW_COUNT;
+        v_total := v_total + v_batch;
+        EXIT WHEN v_batch < batch_size;
+    END LOOP;
+    RETURN v_total;
+END;
+$$;
+
+COMMENT ON FUNCTION purge_deleted_knowledge_chunks IS 'Compaction: hard-delete soft-deleted and abandoned staged knowledge chunks';
+
+-- Supports the purge scan without touching live rows
+CREATE INDEX IF NOT EXISTS idx_knowledge_chunks_deleted_at
+    ON knowledge_chunks(deleted_at)
+    WHERE deleted_at IS NOT NULL;
@@ -0,0 +1,51 @@
+-- Migration: Shared cache tier (app/services/cache.py)
+--
+-- Lets every uvicorn worker / Cloud Run instance share memory-search and
+-- conversation-context cache entries instead of each warming its own.
+-- Keys are "<namespace>:<generation>:<key>"; invalidating a namespace bumps
+-- its generation (cache_incr) so old entries are simply never read again
+-- and expire on their own.
+
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    value JSONB NOT NULL,
+    expires_at TIMESTAMPTZ NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_cache_entries_expires_at ON cache_entries(expires_at);
+
+ALTER TABLE cache_entries ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role has full access to cache_entries"
+    ON cache_entries
+    FOR ALL
+    TO service_role
+    USING (true)
+    WITH CHECK (true);
+
+-- Atomic counter (namespace generations). Counters never expire.
+CREATE OR REPLACE FUNCTION cache_incr(p_key text)
+RETURNS bigint
+LANGUAGE sql
+AS $$
+    INSERT INTO cache_entries (key, value, expires_at)
+    VALUES (p_key, '1'::jsonb, 'infinity')
+    ON CONFLICT (key) DO UPDATE
+        SET value = to_jsonb(cache_entries.value::text::bigint + 1),
+            updated_at = NOW()
+    RETURNING value::text::bigint;
+$$;
+
+-- Delete expired entries; call from a scheduled job
+CREATE OR REPLACE FUNCTION purge_expired_cache_entries()
+RETURNS int
+LANGUAGE sql
+AS $$
+    WITH deleted AS (
+        DELETE FROM cache_entries WHERE expires_at < NOW() RETURNING 1
+    )
+    SELECT count(*)::int FROM deleted;
+$$;
+
+COMMENT ON TABLE cache_entries IS 'Shared tier of the app cache (memory search, conversation context)';
@@ -0,0 +1,30 @@
+-- Migration: Rolling conversation summaries for chat context windows
+--
+-- When a conversation outgrows the chat history budget, the oldest turns
+-- are folded into a running summary (app/features/chat/context_window.py)
+-- instead of being dropped. One row per conversation; boundary_hash
+-- identifies the last folded message so later requests know which part of
+-- the client-sent history the summary already covers.
+
+CREATE TABLE IF NOT EXISTS chat_conversation_summaries (
+    conversation_id TEXT PRIMARY KEY,
+    summary TEXT NOT NULL,
+    boundary_hash TEXT NOT NULL,          -- Hash of the last folded messages
+    folded_messages INT DEFAULT 0,        -- Total messages folded so far
+    summary_tokens INT DEFAULT 0,
+    model TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_chat_conversation_summaries_updated
+    ON chat_conversation_summaries(updated_at DESC);
+
+ALTER TABLE chat_conversation_summaries ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role full access" ON chat_conversation_summaries
+    FOR ALL
+    USING (true)
+    WITH CHECK (true);
+
+COMMENT ON TABLE chat_conversation_summaries IS 'Rolling summaries of chat turns folded out of the context window';
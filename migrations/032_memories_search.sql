@@ -0,0 +1,128 @@
+-- Migration: Ranked full-text + vector search for memories
+-- Backs MemoryService.search in app/features/memory/service_supabase.py.
+-- Replaces the chained ILIKE '%word%' filters (sequential scan, first three
+-- words only, newest-first instead of relevance) with a GIN-indexed
+-- tsvector and, for memories that have one, pgvector similarity.
+
+CREATE EXTENSION IF NOT EXISTS vector;
+
+-- Generated tsvector column ('english' stems words and drops stop words)
+ALTER TABLE memories
+    ADD COLUMN IF NOT EXISTS memory_tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(memory, ''))) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_memories_memory_tsv
+    ON memories USING gin (memory_tsv)
+    WHERE deleted_at IS NULL;
+
+-- Optional embedding (text-embedding-ada-002, 1536 dims); NULL when
+-- MEMORY_EMBEDDINGS is off. Already present if 010 created it.
+ALTER TABLE memories
+    ADD COLUMN IF NOT EXISTS embedding vector(1536);
+
+-- HNSW works on an empty/growing table, unlike the ivfflat index from 010
+-- (whose lists are fixed when it is built)
+DROP INDEX IF EXISTS idx_memories_embedding;
+CREATE INDEX IF NOT EXISTS idx_memories_embedding_hnsw
+    ON memories USING hnsw (embedding vector_cosine_ops)
+    WHERE deleted_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_memories_user_live
+    ON memories(user_id, created_at DESC)
+    WHERE deleted_at IS NULL;
+
+-- Ranked memory search.
+-- Query terms are OR-ed (any term can match) and ranked with ts_rank_cd;
+-- if query_embedding is given, the nearest memories by cosine distance are
+-- ranked too. Both rankings are merged with weighted reciprocal rank
+-- fusion: score = sum(weight / (rrf_k + rank)). Each side pulls enough
+-- candidates to fill the requested page (match_offset + match_count).
+CREATE OR REPLACE FUNCTION search_memories_ranked(
+    query_text text,
+    query_embedding vector(1536) DEFAULT NULL,
+    match_count int DEFAULT 10,
+    match_offset int DEFAULT 0,
+    filter_user_id text DEFAULT NULL,
+    filter_memory_type text DEFAULT NULL,
+    filter_source text DEFAULT NULL,
+    text_weight float DEFAULT 1.0,
+    vector_weight float DEFAULT 1.0,
+    rrf_k int DEFAULT 60
+)
+RETURNS TABLE (
+    id uuid,
+    memory text,
+    memory_type text,
+    user_id text,
+    source text,
+    source_id text,
+    category text,
+    confidence float,
+    created_at timestamptz,
+    updated_at timestamptz,
+    text_rank float,
+    similarity float,
+    score float
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH tsq AS (
+        SELECT string_agg(quote_literal(t.lexeme), ' | ')::tsquery AS query
+        FROM unnest(to_tsvector('english', coalesce(query_text, ''))) AS t
+    ),
+    text_hits AS (
+        SELECT
+            m.id,
+            ts_rank_cd(m.memory_tsv, tsq.query)::float AS text_rank,
+            row_number() OVER (ORDER BY ts_rank_cd(m.memory_tsv, tsq.query) DESC, m.created_at DESC) AS rnk
+        FROM memories m, tsq
+        WHERE
+            tsq.query IS NOT NULL
+            AND m.deleted_at IS NULL
+            AND m.memory_tsv @@ tsq.query
+            AND (filter_user_id IS NULL OR m.user_id = filter_user_id)
+            AND (filter_memory_type IS NULL OR m.memory_type = filter_memory_type)
+            AND (filter_source IS NULL OR m.source = filter_source)
+        ORDER BY ts_rank_cd(m.memory_tsv, tsq.query) DESC, m.created_at DESC
+        LIMIT GREATEST((match_offset + match_count) * 4, 50)
+    ),
+    vector_hits AS (
+        SELECT
+            m.id,
+            (1 - (m.embedding <=> query_embedding))::float AS similarity,
+            row_number() OVER (ORDER BY m.embedding <=> query_embedding) AS rnk
+        FROM memories m
+        WHERE
+            query_embedding IS NOT NULL
+            AND m.embedding IS NOT NULL
+            AND m.deleted_at IS NULL
+            AND (filter_user_id IS NULL OR m.user_id = filter_user_id)
+            AND (filter_memory_type IS NULL OR m.memory_type = filter_memory_type)
+            AND (filter_source IS NULL OR m.source = filter_source)
+        ORDER BY m.embedding <=> query_embedding
+        LIMIT GREATEST((match_offset + match_count) * 4, 50)
+    ),
+    fused AS (
+        SELECT
+            coalesce(t.id, v.id) AS id,
+            t.text_rank,
+            v.similarity,
+            coalesce(text_weight / (rrf_k + t.rnk), 0)
+                + coalesce(vector_weight / (rrf_k + v.rnk), 0) AS score
+        FROM text_hits t
+        FULL OUTER JOIN vector_hits v ON v.id = t.id
+    )
+    SELECT
+        m.id, m.memory, m.memory_type, m.user_id, m.source, m.source_id,
+        m.category, m.confidence, m.created_at, m.updated_at,
+        f.text_rank, f.similarity, f.score::float
+    FROM fused f
+    JOIN memories m ON m.id = f.id
+    ORDER BY f.score DESC, m.created_at DESC
+    LIMIT match_count
+    OFFSET match_offset;
+$$;
+
+COMMENT ON FUNCTION search_memories_ranked IS 'Full-text + vector (reciprocal rank fusion) memory search with pagination';
+COMMENT ON COLUMN memories.memory_tsv IS 'Generated full-text vector of memory (search_memories_ranked)';
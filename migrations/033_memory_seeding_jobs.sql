@@ -0,0 +1,45 @@
+-- Migration: Persistent memory seeding jobs
+--
+-- /memory/seed/* used to run as one in-process BackgroundTasks closure:
+-- no progress, and a restart lost the whole run. Seeding now runs as jobs
+-- (app/features/memory/seeding.py) whose state lives here. Each stage
+-- (contacts, meetings, transcripts, beeper) keeps a keyset cursor that is
+-- checkpointed after every page, so a job picked up by another instance
+-- resumes where the last checkpoint left off.
+--
+-- Ownership: the running instance refreshes heartbeat_at; a running job
+-- whose heartbeat is stale (or NULL, released on shutdown) is claimed by
+-- the next instance that polls.
+
+CREATE TABLE IF NOT EXISTS memory_seeding_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    source TEXT NOT NULL,                  -- Endpoint that started it: contacts, meetings, transcripts, beeper, all
+    status TEXT NOT NULL DEFAULT 'running', -- running, completed, failed, cancelled
+    params JSONB NOT NULL DEFAULT '{}',    -- Limits and time window (fixed at creation)
+    stages JSONB NOT NULL DEFAULT '{}',    -- Per stage: status, cursor, processed, memories_added, errors
+    memories_added INT DEFAULT 0,
+    error TEXT,
+    worker_id TEXT,                        -- Instance currently running the job
+    heartbeat_at TIMESTAMPTZ,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    finished_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_memory_seeding_jobs_running
+    ON memory_seeding_jobs(heartbeat_at)
+    WHERE status = 'running';
+
+CREATE INDEX IF NOT EXISTS idx_memory_seeding_jobs_created
+    ON memory_seeding_jobs(created_at DESC);
+
+ALTER TABLE memory_seeding_jobs ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role has full access to memory_seeding_jobs"
+    ON memory_seeding_jobs
+    FOR ALL
+    TO service_role
+    USING (true)
+    WITH CHECK (true);
+
+COMMENT ON TABLE memory_seeding_jobs IS 'Resumable /memory/seed/* jobs with per-stage checkpoints';
@@ -0,0 +1,27 @@
+-- Migration: Per-source watermarks for memory consolidation
+--
+-- MemoryConsolidationService.consolidate_all (app/features/memory/consolidation.py)
+-- used to re-read a fixed hours_back window of every source on each run,
+-- re-extracting overlapping records and missing anything older than the
+-- window after a skipped run. Each source now records the (timestamp, id)
+-- of the last record it extracted; the next run continues after it.
+
+CREATE TABLE IF NOT EXISTS memory_consolidation_watermarks (
+    source TEXT PRIMARY KEY,              -- chat_messages, beeper_messages, transcripts, meetings, journals
+    watermark_ts TIMESTAMPTZ NOT NULL,    -- Timestamp of the last processed record
+    watermark_id TEXT NOT NULL,           -- Its id (tie-breaker for equal timestamps)
+    last_run_records INT DEFAULT 0,
+    last_run_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+ALTER TABLE memory_consolidation_watermarks ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role has full access to memory_consolidation_watermarks"
+    ON memory_consolidation_watermarks
+    FOR ALL
+    TO service_role
+    USING (true)
+    WITH CHECK (true);
+
+COMMENT ON TABLE memory_consolidation_watermarks IS 'Last record each memory consolidation source has extracted';
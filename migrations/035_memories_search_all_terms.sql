@@ -0,0 +1,109 @@
+-- Migration: Rank all-term matches first in search_memories_ranked
+--
+-- 032 OR-ed the query terms and ranked only by ts_rank_cd, so a memory
+-- repeating one common query word could outrank one containing every
+-- word. Memories matching all query terms now rank first; memories
+-- matching only some still follow (ordered by ts_rank_cd), so multi-word
+-- questions keep their recall. Signature and result columns are unchanged.
+
+CREATE OR REPLACE FUNCTION search_memories_ranked(
+    query_text text,
+    query_embedding vector(1536) DEFAULT NULL,
+    match_count int DEFAULT 10,
+    match_offset int DEFAULT 0,
+    filter_user_id text DEFAULT NULL,
+    filter_memory_type text DEFAULT NULL,
+    filter_source text DEFAULT NULL,
+    text_weight float DEFAULT 1.0,
+    vector_weight float DEFAULT 1.0,
+    rrf_k int DEFAULT 60
+)
+RETURNS TABLE (
+    id uuid,
+    memory text,
+    memory_type text,
+    user_id text,
+    source text,
+    source_id text,
+    category text,
+    confidence float,
+    created_at timestamptz,
+    updated_at timestamptz,
+    text_rank float,
+    similarity float,
+    score float
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH terms AS (
+        SELECT array_agg(quote_literal(t.lexeme)) AS lexemes
+        FROM unnest(to_tsvector('english', coalesce(query_text, ''))) AS t
+    ),
+    tsq AS (
+        SELECT
+            array_to_string(lexemes, ' & ')::tsquery AS all_terms,
+            array_to_string(lexemes, ' | ')::tsquery AS any_term
+        FROM terms
+    ),
+    text_hits AS (
+        SELECT
+            m.id,
+            ts_rank_cd(m.memory_tsv, tsq.any_term)::float AS text_rank,
+            row_number() OVER (
+                ORDER BY m.memory_tsv @@ tsq.all_terms DESC,
+                         ts_rank_cd(m.memory_tsv, tsq.any_term) DESC,
+                         m.created_at DESC
+            ) AS rnk
+        FROM memories m, tsq
+        WHERE
+            tsq.any_term IS NOT NULL
+            AND m.deleted_at IS NULL
+            AND m.memory_tsv @@ tsq.any_term
+            AND (filter_user_id IS NULL OR m.user_id = filter_user_id)
+            AND (filter_memory_type IS NULL OR m.memory_type = filter_memory_type)
+            AND (filter_source IS NULL OR m.source = filter_source)
+        ORDER BY
+            m.memory_tsv @@ tsq.all_terms DESC,
+            ts_rank_cd(m.memory_tsv, tsq.any_term) DESC,
+            m.created_at DESC
+        LIMIT GREATEST((match_offset + match_count) * 4, 50)
+    ),
+    vector_hits AS (
+        SELECT
+            m.id,
+            (1 - (m.embedding <=> query_embedding))::float AS similarity,
+            row_number() OVER (ORDER BY m.embedding <=> query_embedding) AS rnk
+        FROM memories m
+        WHERE
+            query_embedding IS NOT NULL
+            AND m.embedding IS NOT NULL
+            AND m.deleted_at IS NULL
+            AND (filter_user_id IS NULL OR m.user_id = filter_user_id)
+            AND (filter_memory_type IS NULL OR m.memory_type = filter_memory_type)
+            AND (filter_source IS NULL OR m.source = filter_source)
+        ORDER BY m.embedding <=> query_embedding
+        LIMIT GREATEST((match_offset + match_count) * 4, 50)
+    ),
+    fused AS (
+        SELECT
+            coalesce(t.id, v.id) AS id,
+            t.text_rank,
+            v.similarity,
+            coalesce(text_weight / (rrf_k + t.rnk), 0)
+                + coalesce(vector_weight / (rrf_k + v.rnk), 0) AS score
+        FROM text_hits t
+        FULL OUTER JOIN vector_hits v ON v.id = t.id
+    )
+    SELECT
+        m.id, m.memory, m.memory_type, m.user_id, m.source, m.source_id,
+        m.category, m.confidence, m.created_at, m.updated_at,
+        f.text_rank, f.similarity, f.score::float
+    FROM fused f
+    JOIN memories m ON m.id = f.id
+    ORDER BY f.score DESC, m.created_at DESC
+    LIMIT match_count
+    OFFSET match_offset;
+$$;
+
+COMMENT ON FUNCTION search_memories_ranked IS 'Full-text (all-term matches first) + vector (reciprocal rank fusion) memory search with pagination';
@@ -0,0 +1,42 @@
+-- Migration: Ingestion-time watermark column for chat and Beeper messages
+--
+-- Memory consolidation (app/features/memory/consolidation.py) watermarks
+-- each source on a timestamp and continues after it. For these two tables
+-- the existing timestamps are message time, not arrival time:
+-- - beeper_messages.timestamp is when the message was sent, so messages
+--   synced late (device offline, backfills) land behind the watermark
+-- - chat_messages.created_at is set by the app before the write-behind
+--   flush, so a delayed flush can commit rows older than the watermark
+-- ingested_at is assigned by the database on insert, so late rows always
+-- sort after the watermark. Existing rows are backfilled with their old
+-- timestamp, which keeps stored watermarks valid.
+
+-- beeper_messages
+ALTER TABLE beeper_messages ADD COLUMN IF NOT EXISTS ingested_at TIMESTAMPTZ;
+
+UPDATE beeper_messages
+SET ingested_at = COALESCE("timestamp", NOW())
+WHERE ingested_at IS NULL;
+
+ALTER TABLE beeper_messages ALTER COLUMN ingested_at SET DEFAULT NOW();
+ALTER TABLE beeper_messages ALTER COLUMN ingested_at SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_beeper_messages_ingested_at
+    ON beeper_messages(ingested_at, id);
+
+COMMENT ON COLUMN beeper_messages.ingested_at IS 'When the row was inserted (memory consolidation watermark)';
+
+-- chat_messages
+ALTER TABLE chat_messages ADD COLUMN IF NOT EXISTS ingested_at TIMESTAMPTZ;
+
+UPDATE chat_messages
+SET ingested_at = COALESCE(created_at, NOW())
+WHERE ingested_at IS NULL;
+
+ALTER TABLE chat_messages ALTER COLUMN ingested_at SET DEFAULT NOW();
+ALTER TABLE chat_messages ALTER COLUMN ingested_at SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_chat_messages_ingested_at
+    ON chat_messages(ingested_at, id);
+
+COMMENT ON COLUMN chat_messages.ingested_at IS 'When the row was inserted (memory consolidation watermark)';
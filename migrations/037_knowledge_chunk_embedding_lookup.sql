@@ -0,0 +1,33 @@
+-- Migration: One stored embedding per content hash
+-- Backs the knowledge_chunks tier of EmbeddingCache
+-- (app/features/knowledge/embedding_cache.py).
+--
+-- Before content-hash diffs (029), every reindex soft-deleted and
+-- re-inserted each chunk, so a popular content_hash can have dozens of
+-- rows. Selecting by content_hash pulled every one of them (1536 floats
+-- each) only for the client to keep the first. This returns exactly one
+-- row per hash, preferring live rows, then the newest.
+
+CREATE OR REPLACE FUNCTION get_chunk_embeddings_by_hash(
+    p_hashes text[]
+)
+RETURNS TABLE (
+    content_hash text,
+    embedding vector(1536)
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT DISTINCT ON (kc.content_hash)
+        kc.content_hash,
+        kc.embedding
+    FROM knowledge_chunks kc
+    WHERE kc.content_hash = ANY(p_hashes)
+      AND kc.embedding IS NOT NULL
+    ORDER BY kc.content_hash, (kc.deleted_at IS NULL) DESC, kc.created_at DESC;
+$$;
+
+COMMENT ON FUNCTION get_chunk_embeddings_by_hash IS 'Embedding cache lookup: one stored vector per content_hash (live rows first)';
+
+CREATE INDEX IF NOT EXISTS idx_knowledge_chunks_content_hash
+    ON knowledge_chunks(content_hash);
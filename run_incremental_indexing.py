@@ -4,9 +4,10 @@ Incremental Indexing Service for RAG Knowledge Base.
 
 This handles smart reindexing that:
 1. Only re-embeds content that has actually changed
-2. Uses content hashes to detect changes
-3. Handles new records automatically
-4. Can be run daily via Cloud Scheduler
+2. Uses per-chunk content hashes to detect changes (diffed inside index_content)
+3. Reuses cached embeddings for text that was embedded before
+4. Handles new records automatically
+5. Can be run daily via Cloud Scheduler
 
 Usage:
     python run_incremental_indexing.py                  # Incremental (last 24h)
@@ -17,7 +18,6 @@ Usage:
 import asyncio
 import logging
 import argparse
-import hashlib
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional
 
@@ -28,19 +28,15 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def content_hash(text: str) -> str:
-    """Generate hash for content comparison."""
-    return hashlib.md5(text.encode()).hexdigest()
-
-
 async def run_incremental_indexing(hours: int = 24, full: bool = False):
     """
     Run incremental indexing for recently updated content.
     
     Strategy:
     1. For each content type, find records updated since cutoff
-    2. Check if their content_hash differs from existing chunks
-    3. Only re-embed if content actually changed
+    2. Re-index them with force=True - the indexer diffs chunk hashes against
+       existing rows, so unchanged chunks are kept and nothing is re-embedded
+    3. Changed chunks reuse cached vectors (by content hash) where possible
     4. Also index any records missing from knowledge_chunks
     """
     from dotenv import load_dotenv
@@ -50,7 +46,7 @@ async def run_incremental_indexing(hours: int = 24, full: bool = False):
     from app.features.knowledge.indexer import (
         index_transcript, index_meeting, index_journal, index_reflection,
         index_contact, index_calendar_event, index_application, index_document,
-        TABLE_NAME_MAP
+        index_beeper_message,
     )
     
     db = SupabaseMultiDatabase()
@@ -68,17 +64,18 @@ async def run_incremental_indexing(hours: int = 24, full: bool = False):
     }
     
     content_types = [
-        ("transcript", "transcripts", index_transcript, "full_text"),
-        ("meeting", "meetings", index_meeting, "summary"),
-        ("journal", "journals", index_journal, "content"),
-        ("reflection", "reflections", index_reflection, "content"),
-        ("contact", "contacts", index_contact, None),  # Contact uses multiple fields
-        ("calendar", "calendar_events", index_calendar_event, "summary"),
-        ("application", "applications", index_application, "context"),
-        ("document", "documents", index_document, "content"),
+        ("transcript", "transcripts", index_transcript),
+        ("meeting", "meetings", index_meeting),
+        ("journal", "journals", index_journal),
+        ("reflection", "reflections", index_reflection),
+        ("contact", "contacts", index_contact),
+        ("calendar", "calendar_events", index_calendar_event),
+        ("application", "applications", index_application),
+        ("document", "documents", index_document),
+        ("beeper_message", "beeper_messages", index_beeper_message),
     ]
     
-    for source_type, table_name, index_func, content_field in content_types:
+    for source_type, table_name, index_func in content_types:
         logger.info(f"\nProcessing {source_type}...")
         type_results = {"checked": 0, "skipped": 0, "new": 0, "updated": 0, "errors": 0}
         
@@ -98,60 +95,31 @@ async def run_incremental_indexing(hours: int = 24, full: bool = False):
             
             logger.info(f"  Found {len(records.data)} records to check")
             
-            # Get existing chunks for comparison
+            # Which records already have live chunks (new vs. possibly updated)
             existing_chunks = db.client.table("knowledge_chunks").select(
-                "source_id, content_hash"
-            ).eq("source_type", source_type).execute()
-            
-            existing_hashes = {}
-            for chunk in existing_chunks.data:
-                sid = chunk["source_id"]
-                if sid not in existing_hashes:
-                    existing_hashes[sid] = set()
-                if chunk.get("content_hash"):
-                    existing_hashes[sid].add(chunk["content_hash"])
+                "source_id"
+            ).eq("source_type", source_type).is_("deleted_at", "null").execute()
+            indexed_ids = {chunk["source_id"] for chunk in existing_chunks.data}
             
             for record in records.data:
                 record_id = record["id"]
                 type_results["checked"] += 1
                 
                 try:
-                    # Check if this record needs reindexing
-                    needs_index = False
-                    is_new = record_id not in existing_hashes
+                    is_new = record_id not in indexed_ids
                     
-                    if is_new:
-                        # New record - definitely needs indexing
-                        needs_index = True
-                    elif content_field:
-                        # Get current content to compare hash
-                        full_record = db.client.table(table_name).select(
-                            content_field
-                        ).eq("id", record_id).execute()
-                        
-                        if full_record.data:
-                            current_content = full_record.data[0].get(content_field) or ""
-                            current_hash = content_hash(current_content)
-                            
-                            # Check if hash changed
-                            if current_hash not in existing_hashes.get(record_id, set()):
-                                needs_index = True
-                    else:
-                        # No simple content field (e.g., contacts) - reindex if updated
-                        needs_index = True
+                    # index_* diffs chunk hashes against existing rows, so an
+                    # unchanged record returns 0 without any embedding calls
+                    count = await index_func(record_id, db, force=True)
                     
-                    if needs_index:
-                        # Actually index the record
-                        count = await index_func(record_id, db, force=True)
-                        
-                        if is_new:
-                            type_results["new"] += 1
-                            logger.debug(f"  Indexed NEW {source_type} {record_id[:8]}...")
-                        else:
-                            type_results["updated"] += 1
-                            logger.debug(f"  Re-indexed UPDATED {source_type} {record_id[:8]}...")
-                    else:
+                    if count == 0 and not is_new:
                         type_results["skipped"] += 1
+                    elif is_new:
+                        type_results["new"] += 1
+                        logger.debug(f"  Indexed NEW {source_type} {record_id[:8]}...")
+                    else:
+                        type_results["updated"] += 1
+                        logger.debug(f"  Re-indexed UPDATED {source_type} {record_id[:8]}...")
                         
                 except Exception as e:
                     logger.error(f"  Error indexing {source_type} {record_id}: {e}")